@@ -0,0 +1,50 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Helpers for the nextpage_opaque_marker paging of SOL013 lists."""
+
+import base64
+from urllib import parse
+
+from oslo_utils import uuidutils
+
+
+MARKER_PARAMETER = 'nextpage_opaque_marker'
+
+
+def encode_marker(resource_id):
+    return base64.urlsafe_b64encode(
+        resource_id.encode()).decode().rstrip('=')
+
+
+def decode_marker(nextpage_opaque_marker):
+    """Return the resource id of a marker, or None if it is invalid."""
+    padding = '=' * (-len(nextpage_opaque_marker) % 4)
+    try:
+        resource_id = base64.urlsafe_b64decode(
+            nextpage_opaque_marker + padding).decode()
+    except (ValueError, UnicodeDecodeError):
+        return None
+    if not uuidutils.is_uuid_like(resource_id):
+        return None
+    return resource_id
+
+
+def get_next_page_link(request, resource_id):
+    """Return the Link header value of the page following resource_id.
+
+    The query parameters of the request other than the marker are kept.
+    """
+    query = [(key, value) for key, value in request.GET.items()
+             if key != MARKER_PARAMETER]
+    query.append((MARKER_PARAMETER, encode_marker(resource_id)))
+    return '<%s?%s>;rel="next"' % (request.path_url, parse.urlencode(query))
@@ -76,6 +76,7 @@ query_params_v1 = {
         'fields': {'type': 'string', 'minLength': 1},
         'all_fields': {'format': 'all_fields'},
         'exclude_default': {'format': 'exclude_default'},
+        'nextpage_opaque_marker': {'type': 'string', 'minLength': 1},
     },
     'additionalProperties': True,
 }
@@ -32,6 +32,40 @@ class ViewBuilder(base.BaseViewBuilder):
 
     FLATTEN_ATTRIBUTES = _vnf_instance.VnfInstance.FLATTEN_ATTRIBUTES
 
+    # Attributes of a VNF instance which are always returned.
+    SIMPLE_ATTRIBUTES = ['id', 'vnfInstanceName', 'vnfInstanceDescription',
+                         'instantiationState', 'vnfdId', 'vnfProvider',
+                         'vnfProductName', 'vnfSoftwareVersion',
+                         'vnfdVersion']
+
+    # Attributes of a VNF instance excluded by exclude_default, mapped to
+    # the JSON field they are loaded from.
+    COMPLEX_ATTRIBUTES = {
+        'instantiatedVnfInfo': None,
+        'vimConnectionInfo': 'vim_connection_info',
+        'metadata': 'vnf_metadata',
+    }
+
+    # Attributes of instantiatedVnfInfo, mapped to the JSON field of
+    # InstantiatedVnfInfo they are loaded from.
+    INSTANTIATED_VNF_INFO_ATTRIBUTES = {
+        'flavourId': None,
+        'vnfState': None,
+        'scaleStatus': 'scale_status',
+        'extCpInfo': 'ext_cp_info',
+        'extVirtualLinkInfo': 'ext_virtual_link_info',
+        'extManagedVirtualLinkInfo': 'ext_managed_virtual_link_info',
+        'vnfcResourceInfo': 'vnfc_resource_info',
+        'vnfVirtualLinkResourceInfo': 'vnf_virtual_link_resource_info',
+        'virtualStorageResourceInfo': 'virtual_storage_resource_info',
+        'vnfcInfo': 'vnfc_info',
+        'additionalParams': 'additional_params',
+    }
+
+    FLATTEN_COMPLEX_ATTRIBUTES = SIMPLE_ATTRIBUTES + [
+        'instantiatedVnfInfo/%s' % attribute
+        for attribute in INSTANTIATED_VNF_INFO_ATTRIBUTES]
+
     def _get_links(self, vnf_instance):
         links = {
             "self": {
@@ -116,13 +150,75 @@ class ViewBuilder(base.BaseViewBuilder):
 
         return {"_links": _links}
 
-    def _get_vnf_instance_info(self, vnf_instance):
+    def _expand_attributes(self, attributes):
+        expanded = set()
+        for attribute in attributes:
+            if attribute == 'instantiatedVnfInfo':
+                expanded.update(
+                    'instantiatedVnfInfo/%s' % inst_attribute for
+                    inst_attribute in self.INSTANTIATED_VNF_INFO_ATTRIBUTES)
+            else:
+                expanded.add(attribute)
+        return expanded
+
+    def get_include_fields(self, fields=None, exclude_fields=None,
+                           exclude_default=False):
+        """Return the attributes to return when listing VNF instances.
+
+        Attributes of instantiatedVnfInfo are returned as
+        'instantiatedVnfInfo/<attribute>'. None means all attributes.
+        """
+        if fields:
+            return set(self.SIMPLE_ATTRIBUTES).union(
+                self._expand_attributes(fields.split(',')))
+        elif exclude_default:
+            return set(self.SIMPLE_ATTRIBUTES)
+        elif exclude_fields:
+            all_attributes = self._expand_attributes(
+                self.SIMPLE_ATTRIBUTES + list(self.COMPLEX_ATTRIBUTES))
+            return all_attributes - self._expand_attributes(
+                exclude_fields.split(','))
+        return None
+
+    def get_vnf_instance_fields(self, include_fields):
+        """Return the JSON fields VNF instances have to be loaded with."""
+        if include_fields is None:
+            return None
+
+        vnf_instance_fields = set()
+        for attribute in include_fields:
+            if attribute.startswith('instantiatedVnfInfo/'):
+                field = self.INSTANTIATED_VNF_INFO_ATTRIBUTES[
+                    attribute.split('/', 1)[1]]
+                if field:
+                    vnf_instance_fields.add('instantiated_vnf_info.' + field)
+            elif self.COMPLEX_ATTRIBUTES.get(attribute):
+                vnf_instance_fields.add(self.COMPLEX_ATTRIBUTES[attribute])
+        return vnf_instance_fields
+
+    def _filter_attributes(self, vnf_instance_dict, include_fields):
+        for key in list(vnf_instance_dict):
+            if key == 'instantiatedVnfInfo':
+                inst_vnf_info = {
+                    inst_key: value for inst_key, value in
+                    vnf_instance_dict[key].items()
+                    if 'instantiatedVnfInfo/' + inst_key in include_fields}
+                if inst_vnf_info:
+                    vnf_instance_dict[key] = inst_vnf_info
+                else:
+                    del vnf_instance_dict[key]
+            elif key not in include_fields:
+                del vnf_instance_dict[key]
+
+    def _get_vnf_instance_info(self, vnf_instance, include_fields=None):
         vnf_instance_dict = vnf_instance.to_dict()
         vnf_metadata = vnf_instance_dict.pop("vnf_metadata")
         if vnf_metadata:
             vnf_instance_dict.update({"metadata": vnf_metadata})
         vnf_instance_dict = utils.convert_snakecase_to_camelcase(
             vnf_instance_dict)
+        if include_fields is not None:
+            self._filter_attributes(vnf_instance_dict, include_fields)
 
         links = self._get_links(vnf_instance)
 
@@ -146,8 +242,9 @@ class ViewBuilder(base.BaseViewBuilder):
     def show(self, vnf_instance):
         return self._get_vnf_instance_info(vnf_instance)
 
-    def index(self, vnf_instances):
-        return [self._get_vnf_instance_info(vnf_instance)
+    def index(self, vnf_instances, include_fields=None):
+        return [self._get_vnf_instance_info(vnf_instance,
+                                            include_fields=include_fields)
                 for vnf_instance in vnf_instances]
 
     def _get_subscription_links(self, vnf_lcm_subscription):
@@ -183,56 +280,18 @@ class ViewBuilder(base.BaseViewBuilder):
                 'callbackUri': vnf_lcm_subscription.callback_uri,
             }
 
-    def _subscription_filter(
-            self,
-            subscription_data,
-            nextpage_opaque_marker,
-            paging):
-        # filter processing
-        lcmsubscription = []
-        last_flg = False
-        start_num = CONF.vnf_lcm.subscription_num * (paging - 1)
-        # Subscription_data counter for comparing
-        # subscription_data and start_num
-        wk_counter = 0
-        for cnt, line in enumerate(subscription_data):
-            LOG.debug("cnt %d,line %s" % (cnt, line))
-
-            if start_num > wk_counter:
-                wk_counter = wk_counter + 1
-            else:
-                if (CONF.vnf_lcm.subscription_num > len(
-                        lcmsubscription) and nextpage_opaque_marker):
-                    # add lcmsubscription
-                    vnf_subscription_res = self._basic_subscription_info(
-                        line)
-                    links = self._get_subscription_links(line)
-                    vnf_subscription_res.update(links)
-                    lcmsubscription.append(vnf_subscription_res)
-                    if CONF.vnf_lcm.subscription_num == len(
-                            lcmsubscription):
-                        if cnt == len(subscription_data) - 1:
-                            last_flg = True
-                        break
-                elif not nextpage_opaque_marker:
-                    # add lcmsubscription
-                    vnf_subscription_res = self._basic_subscription_info(
-                        line)
-                    links = self._get_subscription_links(line)
-                    vnf_subscription_res.update(links)
-                    lcmsubscription.append(vnf_subscription_res)
-                    if CONF.vnf_lcm.subscription_num < len(
-                            lcmsubscription):
-                        return 400, False
-            if cnt == len(subscription_data) - 1:
-                last_flg = True
-
-        LOG.debug("len(lcmsubscription) %s" % len(lcmsubscription))
-        LOG.debug(
-            "CONF.vnf_lcm.subscription_num %s" %
-            CONF.vnf_lcm.subscription_num)
-
-        return lcmsubscription, last_flg
+    def _subscription_list_info(self, vnf_lcm_subscription):
+        lcm_filter = vnf_lcm_subscription.filter
+        if isinstance(lcm_filter, str):
+            lcm_filter = json.loads(lcm_filter)
+        vnf_subscription_res = {
+            'id': vnf_lcm_subscription.id,
+            'filter': lcm_filter,
+            'callbackUri': vnf_lcm_subscription.callback_uri,
+        }
+        vnf_subscription_res.update(
+            self._get_subscription_links(vnf_lcm_subscription))
+        return vnf_subscription_res
 
     def _get_vnf_lcm_subscription(self, vnf_lcm_subscription, filter=None):
         vnf_lcm_subscription_response = self._basic_subscription_info(
@@ -246,13 +305,9 @@ class ViewBuilder(base.BaseViewBuilder):
     def subscription_create(self, vnf_lcm_subscription, filter):
         return self._get_vnf_lcm_subscription(vnf_lcm_subscription, filter)
 
-    def subscription_list(
-            self,
-            vnf_lcm_subscriptions,
-            nextpage_opaque_marker,
-            paging):
-        return self._subscription_filter(
-            vnf_lcm_subscriptions, nextpage_opaque_marker, paging)
+    def subscription_list(self, vnf_lcm_subscriptions):
+        return [self._subscription_list_info(vnf_lcm_subscription)
+                for vnf_lcm_subscription in vnf_lcm_subscriptions]
 
     def subscription_show(self, vnf_lcm_subscriptions):
         return self._get_vnf_lcm_subscription(vnf_lcm_subscriptions)
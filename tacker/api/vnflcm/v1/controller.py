@@ -34,9 +34,9 @@ import re
 import traceback
 
 from http import client as http_client
-from urllib import parse
 
 from tacker._i18n import _
+from tacker.api.common import pagination
 from tacker.api.schemas import vnf_lcm
 from tacker.api import validation
 from tacker.api.views import vnf_lcm as vnf_lcm_view
@@ -510,18 +510,52 @@ class VnfLcmController(wsgi.Controller):
         return self._view_builder.show(vnf_instance)
 
     @wsgi.response(http_client.OK)
-    @wsgi.expected_errors((http_client.FORBIDDEN))
+    @wsgi.expected_errors((http_client.BAD_REQUEST, http_client.FORBIDDEN))
     def index(self, request):
         context = request.environ['tacker.context']
         context.can(vnf_lcm_policies.VNFLCM % 'index')
 
+        all_fields = 'all_fields' in request.GET
+        exclude_default = 'exclude_default' in request.GET
+        fields = request.GET.get('fields')
+        exclude_fields = request.GET.get('exclude_fields')
+        self._view_builder.validate_attribute_fields(all_fields=all_fields,
+            fields=fields, exclude_fields=exclude_fields,
+            exclude_default=exclude_default)
+        include_fields = self._view_builder.get_include_fields(
+            fields=fields, exclude_fields=exclude_fields,
+            exclude_default=exclude_default)
+
         filters = request.GET.get('filter')
         filters = self._view_builder.validate_filter(filters)
 
+        marker = None
+        nextpage_opaque_marker = request.GET.get(
+            pagination.MARKER_PARAMETER)
+        if nextpage_opaque_marker:
+            marker = pagination.decode_marker(nextpage_opaque_marker)
+            if not marker:
+                msg = (_("Invalid nextpage_opaque_marker: %s") %
+                       nextpage_opaque_marker)
+                raise webob.exc.HTTPBadRequest(explanation=msg)
+
+        # NOTE: one VNF instance more than a page is read to know whether
+        # a next page exists.
+        limit = CONF.vnf_lcm.vnf_instance_num
         vnf_instances = objects.VnfInstanceList.get_by_filters(
-            request.context, filters=filters)
+            request.context, filters=filters,
+            limit=limit + 1 if limit else None, marker=marker,
+            fields=self._view_builder.get_vnf_instance_fields(
+                include_fields))
+
+        result = self._view_builder.index(vnf_instances[:limit or None],
+                                          include_fields=include_fields)
+        if limit and len(vnf_instances) > limit:
+            link = pagination.get_next_page_link(
+                request, vnf_instances[limit - 1].id)
+            return wsgi.ResponseObject(result, headers={'Link': link})
 
-        return self._view_builder.index(vnf_instances)
+        return result
 
     @check_vnf_state(action="delete",
         instantiation_state=[fields.VnfInstanceState.NOT_INSTANTIATED],
@@ -887,6 +921,8 @@ class VnfLcmController(wsgi.Controller):
                 return self._make_problem_detail(
                     str(e), 500, title='Internal Server Error')
 
+        self._invalidate_subscription_index(request.context)
+
         result = self._view_builder.subscription_create(vnf_lcm_subscription,
                                                         filter)
         location = result.get('_links', {}).get('self', {}).get('href')
@@ -912,61 +948,41 @@ class VnfLcmController(wsgi.Controller):
 
     @wsgi.response(http_client.OK)
     def subscription_list(self, request):
-        nextpage_opaque_marker = ""
-        paging = 1
-
-        re_url = request.path_url
-        query_params = request.query_string
-        if query_params:
-            query_params = parse.unquote(query_params)
-        LOG.debug("query_params %s" % query_params)
-        if query_params:
-            query_param_list = query_params.split('&')
-            for query_param in query_param_list:
-                query_param_key_value = query_param.split('=')
-                if len(query_param_key_value) != 2:
-                    msg = _("Request query parameter error")
-                    return self._make_problem_detail(
-                        msg, 400, title='Bad Request')
-                if query_param_key_value[0] == 'nextpage_opaque_marker':
-                    nextpage_opaque_marker = query_param_key_value[1]
-                if query_param_key_value[0] == 'page':
-                    paging = int(query_param_key_value[1])
+        marker = None
+        nextpage_opaque_marker = request.GET.get(
+            pagination.MARKER_PARAMETER)
+        if nextpage_opaque_marker:
+            marker = pagination.decode_marker(nextpage_opaque_marker)
+            if not marker:
+                msg = (_("Invalid nextpage_opaque_marker: %s") %
+                       nextpage_opaque_marker)
+                return self._make_problem_detail(
+                    msg, 400, title='Bad Request')
 
+        limit = CONF.vnf_lcm.subscription_num
         try:
+            # NOTE: one subscription more than a page is read to know
+            # whether a next page exists.
             vnf_lcm_subscriptions = (
                 subscription_obj.LccnSubscriptionRequest.
-                vnf_lcm_subscriptions_list(request.context))
+                vnf_lcm_subscriptions_list(request.context,
+                                           limit=limit + 1, marker=marker))
             LOG.debug("vnf_lcm_subscriptions %s" % vnf_lcm_subscriptions)
-            subscription_data, last = self._view_builder.subscription_list(
-                vnf_lcm_subscriptions, nextpage_opaque_marker, paging)
-            LOG.debug("last %s" % last)
+            subscription_data = self._view_builder.subscription_list(
+                vnf_lcm_subscriptions[:limit])
         except Exception as e:
             LOG.error(traceback.format_exc())
             return self._make_problem_detail(
                 str(e), 500, title='Internal Server Error')
 
-        if subscription_data == 400:
-            msg = _("Number of records exceeds nextpage_opaque_marker")
-            return self._make_problem_detail(msg, 400, title='Bad Request')
-
         # make response
         res = webob.Response(content_type='application/json')
         res.body = jsonutils.dump_as_bytes(subscription_data)
         res.status_int = 200
-        if nextpage_opaque_marker:
-            if not last:
-                ln = '<%s?page=%s>;rel="next"; title*="next chapter"' % (
-                    re_url, paging + 1)
-                # Regarding the setting in http header related to
-                # nextpage control, RFC8288 and NFV-SOL013
-                # specifications have not been confirmed.
-                # Therefore, it is implemented by setting "page",
-                # which is a general control method of WebAPI,
-                # as "URI-Reference" of Link header.
-
-                links = ('Link', ln)
-                res.headerlist.append(links)
+        if len(vnf_lcm_subscriptions) > limit:
+            ln = pagination.get_next_page_link(
+                request, vnf_lcm_subscriptions[limit - 1].id)
+            res.headerlist.append(('Link', ln))
         LOG.debug("subscription_list res %s" % res)
 
         return res
@@ -986,6 +1002,17 @@ class VnfLcmController(wsgi.Controller):
             return self._make_problem_detail(
                 str(e), 500, title='Internal Server Error')
 
+        self._invalidate_subscription_index(request.context)
+
+    def _invalidate_subscription_index(self, context):
+        try:
+            self.rpc_api.invalidate_subscription_index(context)
+        except Exception as e:
+            # NOTE: the conductors reload their subscription index after
+            # [vnf_lcm] subscription_index_ttl seconds anyway.
+            LOG.warning("Failed to invalidate the subscription index of "
+                        "the conductors: %s", e)
+
     def _scale(self, context, vnf_info, vnf_instance, request_body):
         req_body = utils.convert_camelcase_to_snakecase(request_body)
         scale_vnf_request = objects.ScaleVnfRequest.obj_from_primitive(
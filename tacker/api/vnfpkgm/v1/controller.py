@@ -13,11 +13,14 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import functools
 from http import client as http_client
 from io import BytesIO
 import json
 import mimetypes
 import os
+import re
+from urllib import parse
 import webob
 import zipfile
 from zipfile import ZipFile
@@ -30,9 +33,11 @@ from oslo_utils import excutils
 from oslo_utils import uuidutils
 
 from tacker._i18n import _
+from tacker.api.common import pagination
 from tacker.api.schemas import vnf_packages
 from tacker.api import validation
 from tacker.api.views import vnf_packages as vnf_packages_view
+from tacker.api.vnfpkgm.v1 import download
 from tacker.common import csar_utils
 from tacker.common import exceptions
 from tacker.common import utils
@@ -48,6 +53,11 @@ LOG = logging.getLogger(__name__)
 
 CONF = cfg.CONF
 
+# Maximum number of ranges of a Range header
+MAX_RANGES = 64
+# A byte range of a Range header, "first-[last]" or a suffix "-length"
+RANGE_SPEC = re.compile(r'^(\d+-\d*|-\d+)$')
+
 
 class VnfPkgmController(wsgi.Controller):
 
@@ -145,12 +155,33 @@ class VnfPkgmController(wsgi.Controller):
 
         filters = self._view_builder.validate_filter(filters)
 
+        marker = None
+        nextpage_opaque_marker = request.GET.get(
+            pagination.MARKER_PARAMETER)
+        if nextpage_opaque_marker:
+            marker = pagination.decode_marker(nextpage_opaque_marker)
+            if not marker:
+                msg = (_("Invalid nextpage_opaque_marker: %s") %
+                       nextpage_opaque_marker)
+                raise webob.exc.HTTPBadRequest(explanation=msg)
+
+        # NOTE: one VNF package more than a page is read to know whether
+        # a next page exists.
+        limit = CONF.vnf_package.vnf_package_num
         vnf_packages = vnf_package_obj.VnfPackagesList.get_by_filters(
-            request.context, read_deleted='no', filters=filters)
+            request.context, read_deleted='no', filters=filters,
+            limit=limit + 1 if limit else None, marker=marker)
 
-        return self._view_builder.index(request, vnf_packages,
-                all_fields=all_fields, exclude_fields=exclude_fields,
-                fields=fields, exclude_default=exclude_default)
+        result = self._view_builder.index(
+            request, vnf_packages[:limit or None], all_fields=all_fields,
+            exclude_fields=exclude_fields, fields=fields,
+            exclude_default=exclude_default)
+        if limit and len(vnf_packages) > limit:
+            link = pagination.get_next_page_link(
+                request, vnf_packages[limit - 1].id)
+            return wsgi.ResponseObject(result, headers={'Link': link})
+
+        return result
 
     @wsgi.response(http_client.NO_CONTENT)
     @wsgi.expected_errors((http_client.FORBIDDEN, http_client.NOT_FOUND,
@@ -178,8 +209,8 @@ class VnfPkgmController(wsgi.Controller):
         self.rpc_api.delete_vnf_package(context, vnf_package)
 
     @wsgi.response(http_client.ACCEPTED)
-    @wsgi.expected_errors((http_client.FORBIDDEN, http_client.NOT_FOUND,
-                           http_client.CONFLICT,
+    @wsgi.expected_errors((http_client.BAD_REQUEST, http_client.FORBIDDEN,
+                           http_client.NOT_FOUND, http_client.CONFLICT,
                            http_client.REQUESTED_RANGE_NOT_SATISFIABLE))
     def fetch_vnf_package_content(self, request, id):
         context = request.environ['tacker.context']
@@ -208,54 +239,76 @@ class VnfPkgmController(wsgi.Controller):
         else:
             zip_file_size = vnf_package.size
 
-        range_val = self._get_range_from_request(request, zip_file_size)
-
-        return self._download(
-            request.response, range_val, id, vnf_package.location_glance_store,
-            zip_file_size)
-
-    def _download(self, response, range_val, uuid, location, zip_file_size):
-        offset, chunk_size = 0, None
-        if range_val:
-            if isinstance(range_val, webob.byterange.Range):
-                response_end = zip_file_size - 1
-                # NOTE(sameert): webob parsing is zero-indexed.
-                # i.e.,to download first 5 bytes of a 10 byte image,
-                # request should be "bytes=0-4" and the response would be
-                # "bytes 0-4/10".
-                # Range if validated, will never have 'start' object as None.
-                if range_val.start >= 0:
-                    offset = range_val.start
-                else:
-                    # NOTE(sameert): Negative start values needs to be
-                    # processed to allow suffix-length for Range request
-                    # like "bytes=-2" as per rfc7233.
-                    if abs(range_val.start) < zip_file_size:
-                        offset = zip_file_size + range_val.start
-
-                if range_val.end is not None and range_val.end < zip_file_size:
-                    chunk_size = range_val.end - offset
-                    response_end = range_val.end - 1
-                else:
-                    chunk_size = zip_file_size - offset
-
-            response.status_int = 206
-
-        response.headers['Content-Type'] = 'application/zip'
-
-        response.app_iter = self._get_csar_zip_data(uuid,
-            location, offset, chunk_size)
-        # NOTE(sameert): In case of a full zip download, when
-        # chunk_size was none, reset it to zip.size to set the
-        # response header's Content-Length.
-        if chunk_size is not None:
-            response.headers['Content-Range'] = 'bytes %s-%s/%s'\
-                                                % (offset,
-                                                    response_end,
-                                                    zip_file_size)
+        location = vnf_package.location_glance_store
+        file_path = self._get_csar_file_path(location)
+        if file_path:
+            read_range = functools.partial(download.iter_file_range,
+                                           file_path)
+        else:
+            def read_range(start, stop):
+                return self._get_csar_zip_data(id, location, start,
+                                               stop - start)
+
+        return self._make_download_response(
+            request, zip_file_size, 'application/zip', vnf_package.hash,
+            read_range, file_path)
+
+    @staticmethod
+    def _get_csar_file_path(location):
+        """Return the path of a CSAR stored on the local file system."""
+        url = parse.urlsplit(location or '')
+        if url.scheme == 'file' and os.path.isfile(url.path):
+            return url.path
+
+    def _make_download_response(self, request, size, content_type, etag,
+                                read_range, file_path=None):
+        """Return the response serving a file, or the ranges requested.
+
+        The ETag of the file is its hash. A request for an unmodified file
+        is answered with 304, a request for several ranges with a
+        multipart/byteranges body.
+
+        :param read_range: function returning an iterator over the bytes of
+            the file from a start up to a stop offset
+        :param file_path: path of the file, if on the local file system
+        """
+        response = request.response
+        response.headers['Content-Type'] = content_type
+        response.headers['Accept-Ranges'] = 'bytes'
+        if etag:
+            response.etag = etag
+            if etag in request.if_none_match:
+                response.status_int = http_client.NOT_MODIFIED
+                return response
+
+        ranges = None
+        if response in request.if_range:
+            ranges = self._get_ranges_from_request(request, size)
+
+        if not ranges:
+            file_wrapper = request.environ.get('wsgi.file_wrapper')
+            if file_path and file_wrapper:
+                # NOTE: The server may send the file with sendfile.
+                response.app_iter = file_wrapper(open(file_path, 'rb'),
+                                                 download.CHUNK_SIZE)
+            else:
+                response.app_iter = read_range(0, size)
+            response.headers['Content-Length'] = str(size)
+        elif len(ranges) == 1:
+            start, stop = ranges[0]
+            response.status_int = http_client.PARTIAL_CONTENT
+            response.app_iter = read_range(start, stop)
+            response.headers['Content-Range'] = 'bytes %s-%s/%s' % (
+                start, stop - 1, size)
+            response.headers['Content-Length'] = str(stop - start)
         else:
-            chunk_size = zip_file_size
-        response.headers['Content-Length'] = str(chunk_size)
+            multipart = download.MultipartByteranges(ranges, size,
+                                                     content_type)
+            response.status_int = http_client.PARTIAL_CONTENT
+            response.app_iter = multipart.iter(read_range)
+            response.headers['Content-Type'] = multipart.content_type
+            response.headers['Content-Length'] = str(
+                multipart.content_length)
         return response
 
     def _get_csar_zip_data(self, uuid, location, offset=0, chunk_size=None):
@@ -267,17 +320,33 @@ class VnfPkgmController(wsgi.Controller):
             raise webob.exc.HTTPServerError(explanation=msg)
         return resp
 
-    def _get_range_from_request(self, request, zip_file_size):
+    def _get_ranges_from_request(self, request, file_size):
+        """Return the (start, stop) byte ranges requested, if any.
+
+        The ranges starting after the end of the file are ignored, unless
+        all of them do.
+        """
         range_str = request._headers.environ.get('HTTP_RANGE')
-        if range_str is not None:
-            # NOTE(sameert): We do not support multi range requests.
-            if ',' in range_str:
-                msg = _("Requests with multiple ranges are not supported in "
-                       "Tacker. You may make multiple single-range requests "
-                       "instead.")
-                raise webob.exc.HTTPBadRequest(explanation=msg)
+        if range_str is None:
+            return None
+
+        unit, _sep, range_specs = range_str.partition('=')
+        range_specs = range_specs.split(',')
+        if len(range_specs) > MAX_RANGES:
+            msg = _("Requests with more than %s ranges are not supported "
+                    "in Tacker.") % MAX_RANGES
+            raise webob.exc.HTTPBadRequest(explanation=msg)
 
-            range_ = webob.byterange.Range.parse(range_str)
+        ranges = []
+        for range_spec in range_specs:
+            range_spec = range_spec.strip()
+            if not range_spec:
+                # NOTE: Empty list elements are ignored as per rfc7233.
+                continue
+            # NOTE: webob accepts some invalid ranges, e.g. "bytes=21-x".
+            range_ = (webob.byterange.Range.parse(
+                '%s=%s' % (unit, range_spec))
+                if RANGE_SPEC.match(range_spec) else None)
             if range_ is None:
                 range_err_msg = _("The byte range passed in the 'Range' header"
                  " did not match any available byte range in the VNF package"
@@ -286,13 +355,28 @@ class VnfPkgmController(wsgi.Controller):
                     explanation=range_err_msg)
             # NOTE(sameert): Ensure that a range like bytes=4- for an zip
             # size of 3 is invalidated as per rfc7233.
-            if range_.start >= zip_file_size:
-                msg = _("Invalid start position in Range header. "
-                       "Start position MUST be in the inclusive range"
-                       "[0, %s].") % (zip_file_size - 1)
-                raise webob.exc.HTTPRequestRangeNotSatisfiable(
-                    explanation=msg)
-            return range_
+            if range_.start >= file_size:
+                continue
+            # NOTE: webob parses a zero suffix-length "bytes=-0" as
+            # "bytes=0-", whereas it is unsatisfiable as per rfc7233.
+            if range_spec.startswith('-') and not int(range_spec[1:]):
+                continue
+            # NOTE(sameert): webob parsing is zero-indexed, and a negative
+            # start is a suffix-length like "bytes=-2" as per rfc7233.
+            if range_.start >= 0:
+                start = range_.start
+            else:
+                start = max(file_size + range_.start, 0)
+            stop = (file_size if range_.end is None
+                    else min(range_.end, file_size))
+            ranges.append((start, stop))
+
+        if not ranges:
+            msg = _("Invalid start position in Range header. "
+                   "Start position MUST be in the inclusive range"
+                   "[0, %s].") % (file_size - 1)
+            raise webob.exc.HTTPRequestRangeNotSatisfiable(explanation=msg)
+        return ranges
 
     @wsgi.response(http_client.ACCEPTED)
     @wsgi.expected_errors((http_client.FORBIDDEN, http_client.NOT_FOUND,
@@ -540,14 +624,11 @@ class VnfPkgmController(wsgi.Controller):
             raise webob.exc.HTTPConflict(explanation=msg % {"id": id,
                     "onboarded": fields.PackageOnboardingStateType.ONBOARDED})
 
-        offset, chunk_size = 0, None
-
-        # get all artifact's path
-        artifact_file_paths = []
-        for item in vnf_package.vnf_artifacts:
-            artifact_file_paths.append(item.artifact_path)
+        # get all artifact's hash by path
+        artifact_hashes = {item.artifact_path: item.hash
+                           for item in vnf_package.vnf_artifacts}
 
-        if artifact_path in artifact_file_paths:
+        if artifact_path in artifact_hashes:
             # get file's size
             csar_path = self._get_csar_path(vnf_package)
             absolute_artifact_path = os.path.join(csar_path, artifact_path)
@@ -557,54 +638,24 @@ class VnfPkgmController(wsgi.Controller):
                     % artifact_path
                 raise webob.exc.HTTPBadRequest(explanation=msg)
             artifact_size = os.path.getsize(absolute_artifact_path)
-            range_val = self._get_range_from_request(request, artifact_size)
-            # range_val exists
-            if range_val:
-                if isinstance(range_val, webob.byterange.Range):
-                    # get the position of the last byte in the artifact file
-                    response_end = artifact_size - 1
-                    if range_val.start >= 0:
-                        offset = range_val.start
-                    else:
-                        if abs(range_val.start) < artifact_size:
-                            offset = artifact_size + range_val.start
-                    if range_val.end is not None and \
-                            range_val.end < artifact_size:
-                        chunk_size = range_val.end - offset
-                        response_end = range_val.end - 1
-                    else:
-                        chunk_size = artifact_size - offset
-                request.response.status_int = 206
-            # range_val does not exist, download the whole content of file
-            else:
-                offset = 0
-                chunk_size = artifact_size
 
             # get file's mineType;
             mime_type = mimetypes.guess_type(artifact_path.split('/')[-1])[0]
-            if mime_type:
-                request.response.headers['Content-Type'] = mime_type
-            else:
-                request.response.headers['Content-Type'] = \
-                    'application/octet-stream'
+
+            def read_range(start, stop):
+                return self._download_vnf_artifact(
+                    absolute_artifact_path, start, stop - start)
+
             try:
-                artifact_data = self._download_vnf_artifact(
-                    absolute_artifact_path, offset, chunk_size)
+                return self._make_download_response(
+                    request, artifact_size,
+                    mime_type or 'application/octet-stream',
+                    artifact_hashes[artifact_path], read_range,
+                    absolute_artifact_path)
             except exceptions.FailedToGetVnfArtifact as e:
                 LOG.error(e.msg)
                 raise webob.exc.HTTPInternalServerError(
                     explanation=e.msg)
-            request.response.text = artifact_data.decode('utf-8')
-            if request.response.status_int == 206:
-                request.response.headers['Content-Range'] = 'bytes %s-%s/%s' \
-                                                            % (offset,
-                                                               response_end,
-                                                               artifact_size)
-            else:
-                chunk_size = artifact_size
-
-            request.response.headers['Content-Length'] = chunk_size
-            return request.response
         else:
             msg = _("Not Found Artifact File.")
             raise webob.exc.HTTPNotFound(explanation=msg)
@@ -628,11 +679,12 @@ class VnfPkgmController(wsgi.Controller):
 
     def _download_vnf_artifact(self, artifact_file_path, offset=0,
             chunk_size=None):
+        """Return an iterator over chunk_size bytes of an artifact."""
         try:
-            with open(artifact_file_path, 'rb') as f:
-                f.seek(offset, 1)
-                vnf_artifact_data = f.read(chunk_size)
-                return vnf_artifact_data
+            if chunk_size is None:
+                chunk_size = os.path.getsize(artifact_file_path) - offset
+            return download.iter_file_range(artifact_file_path, offset,
+                                            offset + chunk_size)
         except Exception as e:
             exc_msg = encodeutils.exception_to_unicode(e)
             msg = (_("Exception raised while reading artifact file"
@@ -0,0 +1,78 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Iterators over byte ranges of the VNF packages and their artifacts."""
+
+import mmap
+import os
+import uuid
+
+# Bytes yielded at once
+CHUNK_SIZE = 65536
+
+
+def _iter_mapped(mapped, start, stop):
+    with mapped:
+        for offset in range(start, stop, CHUNK_SIZE):
+            yield mapped[offset:min(offset + CHUNK_SIZE, stop)]
+
+
+def iter_file_range(path, start, stop):
+    """Return an iterator over the bytes of a file from start up to stop.
+
+    The range is memory mapped, the chunks are bytes copied from the pages
+    of the file, as WSGI requires, rather than read from it chunk by chunk.
+    The pages are unmapped once the iterator is exhausted or closed.
+
+    :raises OSError, ValueError: if the file can't be mapped
+    """
+    offset = start - start % mmap.ALLOCATIONGRANULARITY
+    with open(path, 'rb') as f:
+        stop = min(stop, os.fstat(f.fileno()).st_size)
+        if stop <= start:
+            return iter(())
+        mapped = mmap.mmap(f.fileno(), stop - offset, access=mmap.ACCESS_READ,
+                           offset=offset)
+    return _iter_mapped(mapped, start - offset, stop - offset)
+
+
+class MultipartByteranges(object):
+    """The multipart/byteranges body of a response to several ranges."""
+
+    def __init__(self, ranges, size, content_type):
+        """:param ranges: (start, stop) byte ranges of the parts"""
+        self.ranges = ranges
+        self.boundary = uuid.uuid4().hex
+        self._headers = [
+            ('--%s\r\nContent-Type: %s\r\nContent-Range: bytes %d-%d/%d'
+             '\r\n\r\n' % (self.boundary, content_type, start, stop - 1,
+                           size)).encode()
+            for start, stop in ranges]
+        self._end = ('--%s--\r\n' % self.boundary).encode()
+
+    @property
+    def content_type(self):
+        return 'multipart/byteranges; boundary=%s' % self.boundary
+
+    @property
+    def content_length(self):
+        return sum(len(header) + stop - start + 2 for header, (start, stop)
+                   in zip(self._headers, self.ranges)) + len(self._end)
+
+    def iter(self, read_range):
+        """Yield the body, with the ranges read by read_range(start, stop)."""
+        for header, (start, stop) in zip(self._headers, self.ranges):
+            yield header
+            for chunk in read_range(start, stop):
+                yield chunk
+            yield b'\r\n'
+        yield self._end
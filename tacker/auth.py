@@ -14,6 +14,8 @@
 
 import abc
 import base64
+import collections
+import hashlib
 from oslo_config import cfg
 from oslo_log import log as logging
 from oslo_middleware import base
@@ -21,14 +23,20 @@ import requests
 from tacker.api.vnflcm.v1 import router as vnflcm_router
 from tacker.api.vnfpkgm.v1 import router as vnfpkgm_router
 import threading
+import time
 import webob.dec
 import webob.exc
 
+from tacker.common import http_client
 from tacker.common import utils
 from tacker import context
 
 LOG = logging.getLogger(__name__)
 
+# Seconds between two sweeps of the expired tokens out of the cache of the
+# validated tokens
+TOKEN_SWEEP_INTERVAL = 60
+
 
 class TackerKeystoneContext(base.ConfigurableMiddleware):
     """Make a request context from keystone headers."""
@@ -117,6 +125,7 @@ class _OAuth2Session(requests.Session):
 
     def __init__(self, grant):
         super(_OAuth2Session, self).__init__()
+        http_client.mount(self)
         self.grant = grant
         self.__access_token_info = {}
         self.__lock = threading.RLock()
@@ -174,6 +183,7 @@ class _BasicAuthSession(requests.Session):
 
     def __init__(self, user_name, password):
         super(_BasicAuthSession, self).__init__()
+        http_client.mount(self)
         self.user_name = user_name
         self.password = password
         self.auth = requests.auth.HTTPBasicAuth(
@@ -213,7 +223,7 @@ class _AuthManager:
     ]
     cfg.CONF.register_opts(OPTS, group='authentication')
 
-    __DEFAULT_CLIENT = requests.Session()
+    __DEFAULT_CLIENT = http_client.new_session()
 
     def __init__(self):
         self.__manages = {}
@@ -323,18 +333,145 @@ class _AuthValidateIgnore(_AuthBase):
         return None
 
 
+class _TokenValidation(object):
+    """A validation of a token by the authorization server in progress."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.scope = None
+        self.error = None
+
+    def wait(self):
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.scope
+
+
+class _TokenValidationCache(object):
+    """LRU cache of the Bearer tokens validated by the authorization server.
+
+    A token is kept for the expires_in seconds of its validation, at most
+    token_cache_ttl seconds, and at most token_cache_size tokens are kept.
+    The expired tokens are dropped by a single sweeper thread. Concurrent
+    validations of the same token are collapsed into one request to the
+    authorization server, whose result or error all of them get.
+
+    Only the sha256 of the tokens are kept.
+    """
+
+    def __init__(self):
+        # sha256 of token => [expiry time, scope]
+        self._tokens = collections.OrderedDict()
+        # sha256 of token => _TokenValidation in progress
+        self._validations = {}
+        self._lock = threading.Lock()
+        self._sweeper = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def validate(self, token_value, validate_func):
+        """Return the scope of a token, validated if it is not cached.
+
+        validate_func requests the authorization server, it returns the
+        scope and the expires_in of the token, or raises if it is invalid.
+        """
+        key = hashlib.sha256(token_value.encode()).hexdigest()
+        shared = False
+        with self._lock:
+            entry = self._tokens.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._tokens.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            validation = self._validations.get(key)
+            if validation is None:
+                validation = self._validations[key] = _TokenValidation()
+                self.misses += 1
+            else:
+                # Being validated for another request, whose result is
+                # shared.
+                self.hits += 1
+                shared = True
+        if shared:
+            return validation.wait()
+
+        try:
+            validation.scope, expires_in = validate_func()
+        except Exception as e:
+            validation.error = e
+            raise
+        else:
+            self._put(key, validation.scope, expires_in)
+        finally:
+            with self._lock:
+                del self._validations[key]
+            validation.done.set()
+        return validation.scope
+
+    def _put(self, key, scope, expires_in):
+        max_size = cfg.CONF.authentication.token_cache_size
+        ttl = cfg.CONF.authentication.token_cache_ttl
+        if expires_in is not None:
+            ttl = min(ttl, expires_in)
+        if max_size <= 0 or ttl <= 0:
+            return
+        with self._lock:
+            self._tokens[key] = [time.monotonic() + ttl, scope]
+            self._tokens.move_to_end(key)
+            while len(self._tokens) > max_size:
+                self._tokens.popitem(last=False)
+                self.evictions += 1
+            if self._sweeper is None:
+                self._sweeper = threading.Thread(target=self._sweep_forever,
+                                                 daemon=True)
+                self._sweeper.start()
+
+    def _sweep_forever(self):
+        while True:
+            time.sleep(TOKEN_SWEEP_INTERVAL)
+            try:
+                self.sweep()
+            except Exception:
+                LOG.exception("Failed to sweep the expired tokens.")
+            else:
+                LOG.debug("Token validation cache stats: %s",
+                          self.get_stats())
+
+    def sweep(self):
+        """Drop the expired tokens."""
+        now = time.monotonic()
+        with self._lock:
+            for key, (expiry_time, _scope) in list(self._tokens.items()):
+                if expiry_time <= now:
+                    del self._tokens[key]
+                    self.expirations += 1
+
+    def clear(self):
+        with self._lock:
+            self._tokens.clear()
+
+    def get_stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {'size': len(self._tokens), 'hits': self.hits,
+                    'misses': self.misses, 'evictions': self.evictions,
+                    'expirations': self.expirations,
+                    'hit_rate': self.hits / lookups if lookups else 0.0}
+
+
 class _AuthValidateBearer(_AuthBase):
 
     def __init__(self, application_type, api_name, token_type, token_value):
         super().__init__(api_name, token_type, token_value)
         self.application_type = application_type
-        self.expires_in = 0
-        self.res_access_token = None
         self.__access_token_info = {}
 
     def request(self):
         auth_url = cfg.CONF.authentication.auth_url
-        response = requests.Session().get(auth_url)
+        response = http_client.new_session().get(auth_url)
         if response.status_code == 401:
             return None
 
@@ -343,51 +480,41 @@ class _AuthValidateBearer(_AuthBase):
     def do_auth(self):
         self._check_token_type()
 
-        if self.res_access_token is None:
-
-            response = self.request()
-
-            if response is None:
-                msg = "No responce from Authorization Server."
-                raise webob.exc.HTTPUnauthorized(msg)
+        # The scope is validated for each API, a token is validated once by
+        # the authorization server until it expires.
+        scope = token_validation_cache.validate(self.token_value,
+                                                self._validate_token)
+        self._validate_scope(scope)
 
-            response_body = response.json()
+    def _validate_token(self):
+        response = self.request()
 
-            if (response_body.get('access_token') is None or
-                    response_body.get('token_type') is None):
-                msg = "No access_token or token_type exist."
-                raise webob.exc.HTTPUnauthorized(msg)
+        if response is None:
+            msg = "No responce from Authorization Server."
+            raise webob.exc.HTTPUnauthorized(msg)
 
-            if self.token_value != response_body.get('access_token'):
-                msg = "access_token is invalid."
-                raise webob.exc.HTTPUnauthorized(msg)
+        response_body = response.json()
 
-            self.expires_in = response_body.get('expires_in')
-            self.res_access_token = response_body.get('access_token')
+        if (response_body.get('access_token') is None or
+                response_body.get('token_type') is None):
+            msg = "No access_token or token_type exist."
+            raise webob.exc.HTTPUnauthorized(msg)
 
-            self._validate_scope(response_body.get('scope'))
+        if self.token_value != response_body.get('access_token'):
+            msg = "access_token is invalid."
+            raise webob.exc.HTTPUnauthorized(msg)
 
-            self._scheduler_delete_token(response_body)
+        return response_body.get('scope'), self._get_expires_in(response_body)
 
-    def _scheduler_delete_token(self, response_body):
+    def _get_expires_in(self, response_body):
         if not (response_body.get('expires_in')):
             LOG.debug("'expires_in' does not exist in the response body.")
-            return
+            return None
 
         try:
-            expires_in = int(response_body.get('expires_in'))
-            expires_in_timer = threading.Timer(
-                expires_in, self._delete_access_token)
-            expires_in_timer.start()
-
-            LOG.info(
-                "expires_in=<{}> exist, scheduler regist.".format(expires_in))
+            return int(response_body.get('expires_in'))
         except (ValueError, TypeError):
-            pass
-
-    def _delete_access_token(self):
-        self.access_token = None
-        self.expires_in = 0
+            return None
 
     def _generate_api_scope_name(self):
         if self.application_type == vnflcm_router.VnflcmAPIRouter:
@@ -452,18 +579,22 @@ class _AuthValidateManager:
                 help="password used in basic authentication"),
         cfg.StrOpt('auth_url',
                 default=None,
-                help="URL of the authorization server")
+                help="URL of the authorization server"),
+        cfg.IntOpt('token_cache_size',
+                default=1024,
+                min=0,
+                help="Maximum number of Bearer tokens whose validation by "
+                     "the authorization server is cached, 0 disables the "
+                     "cache"),
+        cfg.IntOpt('token_cache_ttl',
+                default=3600,
+                min=0,
+                help="Maximum number of seconds the validation of a Bearer "
+                     "token is cached, it is cached for this time if the "
+                     "authorization server does not return its expires_in")
     ]
     cfg.CONF.register_opts(atuh_opts, group='authentication')
 
-    def __init__(self):
-        self.__manages = {}
-        self.__lock = threading.RLock()
-
-    def __add_manages(self, token_value, auth_obj):
-        with self.__lock:
-            self.__manages[token_value] = auth_obj
-
     def _parse_request_header(self, request):
         auth_req = request.headers.get('Authorization')
         if auth_req is None:
@@ -478,21 +609,14 @@ class _AuthValidateManager:
     def _get_auth_type(self, request, application):
         token_type, token_value = self._parse_request_header(request)
 
-        if token_value in self.__manages:
-            return self.__manages.get(token_value)
-
         match = application.map.match(request.path_info)
         api_name = match[0].get("action")
 
         if token_type == 'Bearer':
-            auth_obj = _AuthValidateBearer(
+            return _AuthValidateBearer(
                 type(application), api_name, token_type, token_value)
-            self.__add_manages(token_value, auth_obj)
-            return auth_obj
         elif token_type == 'Basic':
-            auth_obj = _AuthValidateBasic(api_name, token_type, token_value)
-            self.__add_manages(token_value, auth_obj)
-            return auth_obj
+            return _AuthValidateBasic(api_name, token_type, token_value)
 
         return _AuthValidateIgnore(api_name, token_type, token_value)
 
@@ -524,3 +648,4 @@ def pipeline_factory(loader, global_conf, **local_conf):
 
 auth_manager = _AuthManager()
 auth_validator_manager = _AuthValidateManager()
+token_validation_cache = _TokenValidationCache()
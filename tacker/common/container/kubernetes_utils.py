@@ -13,23 +13,144 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+import hashlib
 import os
 import re
 import tempfile
+import threading
+import time
+import weakref
 
 from cryptography import fernet
 from kubernetes import client
 from kubernetes.client import api_client
 from oslo_config import cfg
 from oslo_log import log as logging
+from oslo_serialization import jsonutils
+
+from tacker._i18n import _
+from tacker.common import utils
 
 LOG = logging.getLogger(__name__)
 CONF = cfg.CONF
 
+OPTS = [
+    cfg.IntOpt('client_idle_timeout',
+               default=600,
+               min=0,
+               help=_("Seconds after which the unused API client of a"
+                      " Kubernetes VIM, with its connections, is dropped")),
+]
+
+CONF.register_opts(OPTS, group='kubernetes_vim')
+
+# Maximum number of Kubernetes VIMs, i.e. endpoint and credentials, whose
+# API client is kept.
+CLIENT_CACHE_SIZE = 64
+
+# The credentials identifying the API client of a VIM
+_AUTH_KEYS = ('auth_url', 'username', 'password', 'bearer_token',
+              'ssl_ca_cert')
+
+
+class ClientCache(object):
+    """LRU cache of the Kubernetes API clients of the VIMs.
+
+    The operations on the same VIM share its API client, and so the
+    connections of its pool and the file of its CA certificate. A client
+    is dropped once unused for client_idle_timeout seconds, or when its
+    VIM is updated or deleted.
+    """
+
+    def __init__(self):
+        # (auth_url, fingerprint) => [api client, last use]
+        self._clients = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _get_key(auth_plugin):
+        fingerprint = hashlib.sha256(jsonutils.dump_as_bytes(
+            [auth_plugin.get(key) for key in _AUTH_KEYS])).hexdigest()
+        return auth_plugin['auth_url'], fingerprint
+
+    def get(self, auth_plugin, create_client):
+        """Return the API client of the VIM, created if needed."""
+        key = self._get_key(auth_plugin)
+        now = time.monotonic()
+        with self._lock:
+            self._evict_idle(now)
+            entry = self._clients.get(key)
+            if entry is not None:
+                entry[1] = now
+                self._clients.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        k8s_client = create_client()
+        with self._lock:
+            self._clients[key] = [k8s_client, now]
+            while len(self._clients) > CLIENT_CACHE_SIZE:
+                self._clients.popitem(last=False)
+                self.evictions += 1
+        return k8s_client
+
+    def _evict_idle(self, now):
+        idle_timeout = CONF.kubernetes_vim.client_idle_timeout
+        for key, (_k8s_client, last_use) in list(self._clients.items()):
+            if now - last_use <= idle_timeout:
+                # The next ones were used later.
+                break
+            del self._clients[key]
+            self.evictions += 1
+
+    def invalidate(self, auth_url=None):
+        """Drop the API clients of a VIM endpoint, or of all the VIMs."""
+        with self._lock:
+            for key in list(self._clients):
+                if auth_url in (None, key[0]):
+                    del self._clients[key]
+        LOG.debug("Invalidated Kubernetes API clients of %s, cache stats: "
+                  "%s", auth_url or 'all VIMs', self.get_stats())
+
+    def get_stats(self):
+        with self._lock:
+            return {'size': len(self._clients), 'hits': self.hits,
+                    'misses': self.misses, 'evictions': self.evictions}
+
+
+CLIENTS = ClientCache()
+
 
 class KubernetesHTTPAPI(object):
 
     def get_k8s_client(self, auth_plugin):
+        ca_cert = utils.none_from_string(auth_plugin.get('ssl_ca_cert'))
+        if ca_cert is None and auth_plugin.get('ca_cert_file') is not None:
+            # The file of the caller may be removed once it is done.
+            return self._create_k8s_client(auth_plugin,
+                                           auth_plugin['ca_cert_file'])
+        return CLIENTS.get(
+            auth_plugin,
+            lambda: self._create_cached_k8s_client(auth_plugin, ca_cert))
+
+    def _create_cached_k8s_client(self, auth_plugin, ca_cert):
+        ca_cert_file = None
+        if ca_cert is not None:
+            file_descriptor, ca_cert_file = \
+                self.create_ca_cert_tmp_file(ca_cert)
+            os.close(file_descriptor)
+        k8s_client = self._create_k8s_client(auth_plugin, ca_cert_file)
+        if ca_cert_file is not None:
+            # Removed once the client is neither cached nor used anymore.
+            weakref.finalize(k8s_client, os.remove, ca_cert_file)
+        return k8s_client
+
+    def _create_k8s_client(self, auth_plugin, ca_cert_file):
         config = client.Configuration()
         config.host = auth_plugin['auth_url']
         if ('username' in auth_plugin) and ('password' in auth_plugin)\
@@ -41,7 +162,6 @@ class KubernetesHTTPAPI(object):
         if 'bearer_token' in auth_plugin:
             config.api_key_prefix['authorization'] = 'Bearer'
             config.api_key['authorization'] = auth_plugin['bearer_token']
-        ca_cert_file = auth_plugin.get('ca_cert_file')
         if ca_cert_file is not None:
             config.ssl_ca_cert = ca_cert_file
             config.verify_ssl = True
@@ -146,11 +266,6 @@ class KubernetesHTTPAPI(object):
             raise Exception('Failed to create %s file', file_path)
         return file_descriptor, file_path
 
-    @staticmethod
-    def close_tmp_file(file_descriptor, file_path):
-        os.close(file_descriptor)
-        os.remove(file_path)
-
     def create_fernet_key(self):
         fernet_key = fernet.Fernet.generate_key()
         fernet_obj = fernet.Fernet(fernet_key)
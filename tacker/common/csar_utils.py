@@ -13,6 +13,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 from copy import deepcopy
 import hashlib
 import os
@@ -23,9 +24,11 @@ from urllib import request as urllib2
 import yaml
 import zipfile
 
+import eventlet
 from oslo_log import log as logging
 from oslo_utils import encodeutils
 from oslo_utils import excutils
+from oslo_utils import fileutils
 from tacker.common import utils
 from toscaparser.prereq.csar import CSAR
 from toscaparser.tosca_template import ToscaTemplate
@@ -47,6 +50,11 @@ TOSCA_META = 'TOSCA-Metadata/TOSCA.meta'
 ARTIFACT_KEYS = ['Source', 'Algorithm', 'Hash']
 IMAGE_FORMAT_LIST = ['raw', 'vhd', 'vhdx', 'vmdk', 'vdi', 'iso', 'ploop',
                    'qcow2', 'aki', 'ari', 'ami', 'img']
+# Bytes read at once when extracting and hashing the CSAR files
+CHUNK_SIZE = 65536
+# Directory of vnf_package_csar_path where the artifacts shared by the
+# extracted packages are stored, by algorithm and digest.
+ARTIFACT_STORE_DIR = '.artifacts'
 
 
 def _check_type(custom_def, node_type, type_list):
@@ -364,7 +372,7 @@ def _validate_sw_image_data_for_artifacts(tosca):
             template.entity_tpl, template.name)
 
 
-def _get_data_from_csar(tosca, context, id):
+def _get_data_from_csar(tosca, context, id, csar=None):
     for tp in tosca.nested_tosca_templates_with_topology:
         policies = tp.tpl.get("policies")
         if policies:
@@ -383,9 +391,14 @@ def _get_data_from_csar(tosca, context, id):
         error_msg = "No VNF flavours are available"
         raise exceptions.InvalidCSAR(error_msg)
 
-    csar = CSAR(tosca.input_path, tosca.a_file)
+    if csar is None:
+        csar = CSAR(tosca.input_path, tosca.a_file)
+        is_valid = csar.validate()
+    else:
+        # Validated while parsing the template.
+        is_valid = True
     vnf_artifacts = []
-    if csar.validate():
+    if is_valid:
         vnf_artifacts = _get_vnf_artifacts(csar)
 
     return vnf_data, flavours, vnf_artifacts
@@ -435,6 +448,7 @@ def _get_vnf_artifacts(csar):
 
 def _convert_artifacts(vnf_artifacts, artifacts_data, csar):
     artifacts_data_split = re.split(b'\n\n+', artifacts_data)
+    artifacts_to_verify = []
 
     for data in artifacts_data_split:
         if re.findall(b'.?Name:.?|.?Source:.?|', data):
@@ -467,62 +481,301 @@ def _convert_artifacts(vnf_artifacts, artifacts_data, csar):
                         in IMAGE_FORMAT_LIST:
                     continue
                 else:
-                    algorithm = artifact_data_dict.get('Algorithm')
-                    hash_code = artifact_data_dict.get('Hash')
-                    result = _validate_hash(algorithm, hash_code,
-                                            csar, artifact_path)
-                    if result:
-                        vnf_artifacts.append(artifact_data_dict)
-                    else:
-                        invalid_artifact_err_msg = \
-                            (('The hash "%(hash)s" of artifact file '
-                              '"%(artifact)s" is an invalid value.') %
-                             {'hash': hash_code, 'artifact': artifact_path})
-                        raise exceptions.InvalidCSAR(invalid_artifact_err_msg)
+                    artifacts_to_verify.append(artifact_data_dict)
 
+    _verify_artifacts(artifacts_to_verify, csar)
+    vnf_artifacts.extend(artifacts_to_verify)
     return vnf_artifacts
 
 
-def _validate_hash(algorithm, hash_code, csar, artifact_path):
-    z = zipfile.ZipFile(csar.path)
-    algorithm = algorithm.lower()
+def _update_hashes(hash_objs, fp):
+    for chunk in iter(lambda: fp.read(CHUNK_SIZE), b''):
+        for hash_obj in hash_objs:
+            hash_obj.update(chunk)
 
-    # validate Algorithm's value
-    if algorithm in HASH_DICT.keys():
-        hash_obj = HASH_DICT[algorithm]()
-    else:
+
+def _is_remote_artifact(artifact_path):
+    url = urlparse(artifact_path)
+    return url.scheme == 'file' or (bool(url.scheme) and bool(url.netloc))
+
+
+def _validate_hash_algorithm(algorithm, artifact_path):
+    algorithm = algorithm.lower()
+    if algorithm not in HASH_DICT:
         invalid_artifact_err_msg = (('The algorithm("%(algorithm)s") of '
                                      'artifact("%(artifact_path)s") is '
                                      'an invalid value.') %
                                     {'algorithm': algorithm,
                                      'artifact_path': artifact_path})
         raise exceptions.InvalidCSAR(invalid_artifact_err_msg)
-    filelist = csar.zfile.namelist()
-
-    # validate Source's value
-    if artifact_path in filelist:
-        hash_obj.update(z.read(artifact_path))
-    elif ((urlparse(artifact_path).scheme == 'file') or
-          (bool(urlparse(artifact_path).scheme) and
-           bool(urlparse(artifact_path).netloc))):
-        hash_obj.update(urllib2.urlopen(artifact_path).read())
+    return algorithm
+
+
+def _get_digests(csar, artifact_path, algorithms, remote_fetches):
+    """Return the hex digests of an artifact by algorithm.
+
+    The artifact is read once, in chunks, for all its algorithms, unless
+    it was hashed while the CSAR was extracted.
+    """
+    known_digests = getattr(csar, 'digests', {})
+    digests = {algorithm: known_digests[(artifact_path, algorithm)]
+               for algorithm in algorithms
+               if (artifact_path, algorithm) in known_digests}
+    hash_objs = {algorithm: HASH_DICT[algorithm]()
+                 for algorithm in algorithms if algorithm not in digests}
+    if not hash_objs:
+        return digests
+
+    if _is_remote_artifact(artifact_path):
+        with remote_fetches:
+            with urllib2.urlopen(artifact_path) as artifact:
+                _update_hashes(hash_objs.values(), artifact)
     else:
-        invalid_artifact_err_msg = (('The path("%(artifact_path)s") of '
-                                     'artifact Source is an invalid value.') %
-                                    {'artifact_path': artifact_path})
-        raise exceptions.InvalidCSAR(invalid_artifact_err_msg)
+        with csar.zfile.open(artifact_path) as artifact:
+            _update_hashes(hash_objs.values(), artifact)
+    digests.update((algorithm, hash_obj.hexdigest())
+                   for algorithm, hash_obj in hash_objs.items())
+    return digests
+
 
-    # validate Hash's value
-    if hash_code == hash_obj.hexdigest():
-        return True
+def _verify_artifacts(artifacts, csar):
+    """Verify the hashes of the artifacts of a manifest.
+
+    The artifacts are hashed concurrently by at most [vnf_package]
+    artifact_hash_workers green threads, of which at most [vnf_package]
+    remote_artifact_fetches fetch a remote artifact at once.
+
+    :raises InvalidCSAR: if an algorithm, a path or a hash of an artifact
+        is invalid
+    """
+    filelist = set(csar.zfile.namelist())
+    # artifact path => algorithms, in the order of the manifest
+    algorithms = collections.OrderedDict()
+    for artifact in artifacts:
+        artifact_path = artifact['Source']
+        algorithm = _validate_hash_algorithm(artifact['Algorithm'],
+                                             artifact_path)
+        if (artifact_path not in filelist and
+                not _is_remote_artifact(artifact_path)):
+            invalid_artifact_err_msg = (('The path("%(artifact_path)s") of '
+                                         'artifact Source is an invalid '
+                                         'value.') %
+                                        {'artifact_path': artifact_path})
+            raise exceptions.InvalidCSAR(invalid_artifact_err_msg)
+        algorithms.setdefault(artifact_path, set()).add(algorithm)
+    if not algorithms:
+        return
+
+    remote_fetches = eventlet.semaphore.Semaphore(
+        CONF.vnf_package.remote_artifact_fetches)
+    pool = eventlet.GreenPool(CONF.vnf_package.artifact_hash_workers)
+    digests = dict(zip(algorithms, pool.imap(
+        lambda artifact_path: _get_digests(
+            csar, artifact_path, algorithms[artifact_path], remote_fetches),
+        algorithms)))
+
+    for artifact in artifacts:
+        artifact_path = artifact['Source']
+        hash_code = artifact['Hash']
+        if hash_code != digests[artifact_path][artifact['Algorithm'].lower()]:
+            invalid_artifact_err_msg = \
+                (('The hash "%(hash)s" of artifact file '
+                  '"%(artifact)s" is an invalid value.') %
+                 {'hash': hash_code, 'artifact': artifact_path})
+            raise exceptions.InvalidCSAR(invalid_artifact_err_msg)
+
+
+def _get_artifact_algorithms(csar, include_images=False):
+    """Return the hash algorithms of the artifacts of a CSAR by path.
+
+    The manifests are only read here, they are validated afterwards by
+    _get_vnf_artifacts, which doesn't verify the images.
+    """
+    if csar.is_tosca_metadata:
+        paths = [TOSCA_META]
+        manifest_path = csar._get_metadata("ETSI-Entry-Manifest")
+        if manifest_path and manifest_path.lower().endswith(".mf"):
+            paths.append(manifest_path)
     else:
-        return False
+        paths = [path for path in csar.zfile.namelist()
+                 if path.lower().endswith(".mf")]
+
+    algorithms = {}
+    for path in paths:
+        try:
+            artifacts_data = csar.zfile.read(path)
+        except KeyError:
+            continue
+        for data in re.split(b'\n\n+', artifacts_data):
+            try:
+                artifact = yaml.safe_load(data)
+                source = artifact.get('Source', artifact.get('Name'))
+                algorithm = artifact['Algorithm'].lower()
+            except Exception:
+                continue
+            if (isinstance(source, str) and algorithm in HASH_DICT and
+                    (include_images or os.path.splitext(source)[-1][1:]
+                     not in IMAGE_FORMAT_LIST)):
+                algorithms.setdefault(source, set()).add(algorithm)
+    return algorithms
+
+
+def _get_artifact_store_path():
+    return os.path.join(CONF.vnf_package.vnf_package_csar_path,
+                        ARTIFACT_STORE_DIR)
+
+
+def _store_artifact(part_path, blob_path, target_path, size):
+    """Link an extracted artifact to its copy in the artifact store.
+
+    The artifact is stored if it isn't yet, otherwise the stored copy is
+    linked and the extracted one dropped. The hard links of a stored
+    artifact count the packages using it. A stored copy whose size is not
+    the size of the artifact was changed in place, it is stored again.
+    """
+    fileutils.ensure_tree(os.path.dirname(blob_path))
+    try:
+        if os.stat(blob_path).st_size != size:
+            LOG.warning("The stored artifact %s was modified, it is "
+                        "replaced.", blob_path)
+            os.remove(blob_path)
+    except OSError:
+        # Not stored yet.
+        pass
+    try:
+        os.link(blob_path, target_path)
+    except OSError:
+        # Not stored yet, or the file system has no hard links.
+        os.replace(part_path, target_path)
+        try:
+            os.link(target_path, blob_path)
+        except OSError:
+            # Stored meanwhile by another extraction.
+            pass
+    else:
+        os.remove(part_path)
+
+
+def sweep_artifact_store():
+    """Remove the stored artifacts no extracted package links anymore."""
+    for dir_path, _dir_names, file_names in os.walk(
+            _get_artifact_store_path()):
+        for file_name in file_names:
+            blob_path = os.path.join(dir_path, file_name)
+            try:
+                if os.stat(blob_path).st_nlink == 1:
+                    os.remove(blob_path)
+            except OSError as exc:
+                LOG.warning("Failed to remove the stored artifact "
+                            "%(path)s: %(exc)s",
+                            {'path': blob_path,
+                             'exc': encodeutils.exception_to_unicode(exc)})
+
+
+def _extract_members(zf, extract_path, algorithms=None, digests=None,
+                     store=False):
+    """Extract the files of a zip file, hashing them meanwhile.
+
+    Each file is read once, in chunks, and is hashed with its algorithms
+    while it is written. Like ZipFile.extractall, the absolute paths and
+    the '..' of the file names are ignored. With store, the hashed files
+    are shared with the other packages through the artifact store.
+    """
+    algorithms = algorithms or {}
+    for info in zf.infolist():
+        parts = [part for part in info.filename.split('/')
+                 if part not in ('', os.path.curdir, os.path.pardir)]
+        if not parts:
+            continue
+        target_path = os.path.join(extract_path, *parts)
+        if info.is_dir():
+            fileutils.ensure_tree(target_path)
+            continue
+        fileutils.ensure_tree(os.path.dirname(target_path))
+        # NOTE: An existing file may be a stored artifact, it must not be
+        # written through.
+        if os.path.lexists(target_path):
+            os.remove(target_path)
+
+        hash_objs = {algorithm: HASH_DICT[algorithm]()
+                     for algorithm in algorithms.get(info.filename, ())}
+        stored = store and bool(hash_objs)
+        write_path = target_path + '.part' if stored else target_path
+        with zf.open(info) as source, open(write_path, 'wb') as target:
+            for chunk in iter(lambda: source.read(CHUNK_SIZE), b''):
+                target.write(chunk)
+                for hash_obj in hash_objs.values():
+                    hash_obj.update(chunk)
+        for algorithm, hash_obj in hash_objs.items():
+            digests[(info.filename, algorithm)] = hash_obj.hexdigest()
+
+        if stored:
+            # Stored by the digest of the strongest algorithm, computed
+            # from the content rather than read from the manifest.
+            algorithm = max(hash_objs,
+                            key=lambda name: hash_objs[name].digest_size)
+            _store_artifact(write_path, os.path.join(
+                _get_artifact_store_path(), algorithm,
+                hash_objs[algorithm].hexdigest()), target_path,
+                info.file_size)
+
+
+class _ExtractedCSAR(CSAR):
+    """A CSAR extracted once, to the directory of its VNF package.
+
+    tosca-parser extracts a CSAR to a new temporary directory each time it
+    is validated or parsed. This one is extracted once, hashing the
+    artifacts of its manifests meanwhile, and its files are all read
+    through the same ZipFile. With [vnf_package] artifact_store, its
+    artifacts, images included, are shared with the other packages.
+    """
+
+    def __init__(self, zip_path, extract_path):
+        super(_ExtractedCSAR, self).__init__(zip_path, True)
+        self.extract_path = extract_path
+        # (artifact path, algorithm) => hex digest
+        self.digests = {}
+
+    def decompress(self):
+        if not self.is_validated:
+            self.validate()
+        if self.temp_dir is None:
+            store = CONF.vnf_package.artifact_store
+            _extract_members(self.zfile, self.extract_path,
+                             _get_artifact_algorithms(self, store),
+                             self.digests, store)
+            self.temp_dir = self.extract_path
+
+    def _validate_external_references(self, main_tpl):
+        # NOTE: Unlike tosca-parser, the extracted files are kept, they are
+        # those of the VNF package.
+        self.decompress()
+        self._validate_external_artifact_imports(
+            main_tpl, self.main_template_file_name)
+
+    def close(self):
+        if self.zfile is not None:
+            self.zfile.close()
+
+
+class _CSARToscaTemplate(ToscaTemplate):
+    """A ToscaTemplate parsed from the files of an _ExtractedCSAR."""
+
+    def __init__(self, csar):
+        self.csar = csar
+        super(_CSARToscaTemplate, self).__init__(csar.path, None, True)
+
+    def _get_path(self, path):
+        if self.csar.validate():
+            self.csar.decompress()
+            return os.path.join(self.csar.temp_dir,
+                                self.csar.get_main_template())
 
 
 def extract_csar_zip_file(file_path, extract_path):
     try:
         with zipfile.ZipFile(file_path, 'r') as zf:
-            zf.extractall(extract_path)
+            _extract_members(zf, extract_path)
     except (RuntimeError, zipfile.BadZipfile) as exp:
         with excutils.save_and_reraise_exception():
             LOG.error("Error encountered while extracting "
@@ -537,11 +790,12 @@ def load_csar_data(context, package_uuid, zip_path):
 
     extract_zip_path = os.path.join(CONF.vnf_package.vnf_package_csar_path,
                                     package_uuid)
-    extract_csar_zip_file(zip_path, extract_zip_path)
-
+    # The CSAR is extracted, and its artifacts hashed, while the template
+    # is parsed.
+    csar = _ExtractedCSAR(zip_path, extract_zip_path)
     try:
-        tosca = ToscaTemplate(zip_path, None, True)
-        return _get_data_from_csar(tosca, context, package_uuid)
+        tosca = _CSARToscaTemplate(csar)
+        return _get_data_from_csar(tosca, context, package_uuid, csar)
     except exceptions.InvalidCSAR as exp:
         with excutils.save_and_reraise_exception():
             LOG.error("Error processing CSAR file %(path)s for vnf package"
@@ -556,6 +810,8 @@ def load_csar_data(context, package_uuid, zip_path):
             exp.reraise = False
             raise exceptions.InvalidCSAR(encodeutils.exception_to_unicode
                                          (exp))
+    finally:
+        csar.close()
 
 
 def delete_csar_data(package_uuid):
@@ -573,3 +829,6 @@ def delete_csar_data(package_uuid):
         msg = _('Failed to delete csar folder: '
                 '%(csar_path)s, Error: %(exc)s')
         LOG.warning(msg, {'csar_path': csar_path, 'exc': exc_message})
+    finally:
+        if CONF.vnf_package.artifact_store:
+            sweep_artifact_store()
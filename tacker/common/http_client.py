@@ -0,0 +1,194 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Connection pools shared by the outbound HTTP requests of Tacker.
+
+The requests sessions of the notifications to the subscribers, of the
+authorization and of the requests to the NFVO mount the same adapter, so
+that they share one pool of keep-alive connections per destination,
+whichever session sends the request.
+"""
+
+import collections
+import threading
+import time
+from urllib import parse
+
+from oslo_log import log as logging
+import requests
+from requests import adapters
+from urllib3.util import retry
+
+import tacker.conf
+
+CONF = tacker.conf.CONF
+LOG = logging.getLogger(__name__)
+
+# Status codes counted as errors of a destination
+ERROR_STATUS = 500
+# Number of requests between two logs of the metrics
+STATS_LOG_INTERVAL = 1000
+
+
+class _Destination(object):
+    """The requests in flight to a destination, and their metrics."""
+
+    def __init__(self, max_requests):
+        self.slots = (threading.BoundedSemaphore(max_requests)
+                      if max_requests else None)
+        self.in_flight = 0
+        self.requests = 0
+        self.errors = 0
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+
+    def get_stats(self):
+        return {'requests': self.requests, 'errors': self.errors,
+                'in_flight': self.in_flight,
+                'latency_avg': (self.latency_sum / self.requests
+                                if self.requests else 0.0),
+                'latency_max': self.latency_max}
+
+
+class PooledHTTPAdapter(adapters.BaseAdapter):
+    """Adapter sending the requests through the shared connection pools.
+
+    The pools are created on the first request, once the configuration is
+    loaded, and keep at most [http_client] pool_maxsize connections alive
+    per destination, for [http_client] pool_hosts destinations. A
+    connection serves one request at a time and goes back to its pool once
+    its response is read, requests are never pipelined. A request which
+    failed to connect is retried once, a request whose connection broke
+    afterwards only if its method is idempotent, so that a request is not
+    sent twice on a kept alive connection closed by the server.
+
+    At most [http_client] max_requests_per_host requests are sent to a
+    destination at once. The number of requests, of errors, i.e. of
+    requests failed or answered with a 5xx status, and their latency are
+    recorded per destination, and logged every STATS_LOG_INTERVAL
+    requests.
+    """
+
+    def __init__(self):
+        super(PooledHTTPAdapter, self).__init__()
+        self._adapter = None
+        # scheme://host:port => _Destination, least recently used first
+        self._destinations = collections.OrderedDict()
+        self._requests = 0
+        self._lock = threading.Lock()
+
+    def _get_adapter(self):
+        with self._lock:
+            if self._adapter is None:
+                self._adapter = adapters.HTTPAdapter(
+                    pool_connections=CONF.http_client.pool_hosts,
+                    pool_maxsize=CONF.http_client.pool_maxsize,
+                    max_retries=retry.Retry(total=1, connect=1, read=1,
+                                            redirect=False, status=0,
+                                            raise_on_status=False))
+            return self._adapter
+
+    @staticmethod
+    def _get_key(url):
+        url = parse.urlsplit(url)
+        port = url.port or {'http': 80, 'https': 443}.get(url.scheme)
+        return '%s://%s:%s' % (url.scheme, url.hostname, port)
+
+    def _get_destination(self, key):
+        with self._lock:
+            destination = self._destinations.get(key)
+            if destination is None:
+                destination = self._destinations[key] = _Destination(
+                    CONF.http_client.max_requests_per_host)
+                # Forget the idle destinations least recently used.
+                for old_key, old_destination in list(
+                        self._destinations.items()):
+                    if len(self._destinations) <= CONF.http_client.pool_hosts:
+                        break
+                    if old_destination.in_flight == 0:
+                        del self._destinations[old_key]
+            self._destinations.move_to_end(key)
+            # Counted from now on, while waiting for a slot as well, so
+            # that the destination is not forgotten meanwhile.
+            destination.in_flight += 1
+            return destination
+
+    def send(self, request, **kwargs):
+        if not CONF.http_client.keepalive:
+            request.headers['Connection'] = 'close'
+        destination = self._get_destination(self._get_key(request.url))
+        if destination.slots is not None:
+            destination.slots.acquire()
+        start = time.monotonic()
+        response = None
+        try:
+            response = self._get_adapter().send(request, **kwargs)
+            return response
+        finally:
+            latency = time.monotonic() - start
+            if destination.slots is not None:
+                destination.slots.release()
+            with self._lock:
+                destination.in_flight -= 1
+                destination.requests += 1
+                destination.latency_sum += latency
+                destination.latency_max = max(destination.latency_max,
+                                              latency)
+                if response is None or response.status_code >= ERROR_STATUS:
+                    destination.errors += 1
+                self._requests += 1
+                log_stats = not self._requests % STATS_LOG_INTERVAL
+            if log_stats:
+                LOG.debug("Outbound HTTP request stats: %s",
+                          self.get_stats())
+
+    def close(self):
+        # NOTE: The adapter is shared by sessions, a closed session must
+        # not close the connections of the others.
+        pass
+
+    def clear(self):
+        """Close the connections, they are reopened by the next requests.
+
+        The metrics are reset as well.
+        """
+        with self._lock:
+            adapter, self._adapter = self._adapter, None
+            self._destinations.clear()
+            self._requests = 0
+        if adapter is not None:
+            adapter.close()
+
+    def get_stats(self):
+        """Return the metrics of the requests per destination."""
+        with self._lock:
+            return {key: destination.get_stats()
+                    for key, destination in self._destinations.items()}
+
+
+ADAPTER = PooledHTTPAdapter()
+
+
+def mount(session):
+    """Make a requests session use the shared connection pools."""
+    session.mount('http://', ADAPTER)
+    session.mount('https://', ADAPTER)
+    return session
+
+
+def new_session():
+    """Return a requests session using the shared connection pools."""
+    return mount(requests.Session())
+
+
+def get_stats():
+    return ADAPTER.get_stats()
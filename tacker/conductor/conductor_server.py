@@ -21,7 +21,6 @@ import os
 import oslo_messaging
 import shutil
 import sys
-import time
 import traceback
 import yaml
 
@@ -47,8 +46,12 @@ from tacker.common import log
 from tacker.common import safe_utils
 from tacker.common import topics
 from tacker.common import utils
+from tacker.conductor import notification_dispatcher
+from tacker.conductor import notification_outbox
+from tacker.conductor import subscription_index
 import tacker.conf
 from tacker import context as t_context
+from tacker.db import api as db_api
 from tacker.db.common_services import common_services_db
 from tacker.db.db_sqlalchemy import models
 from tacker.db.nfvo import nfvo_db
@@ -64,6 +67,7 @@ from tacker.objects import vnfd_attribute as vnfd_attribute_db
 from tacker.plugins.common import constants
 from tacker import service as tacker_service
 from tacker import version
+from tacker.vnflcm import template_cache
 from tacker.vnflcm import utils as vnflcm_utils
 from tacker.vnflcm import vnflcm_driver
 from tacker.vnfm import nfvo_client
@@ -117,6 +121,7 @@ def _delete_csar(context, vnf_package):
                              vnf_package.location_glance_store)
 
     csar_utils.delete_csar_data(vnf_package.id)
+    template_cache.invalidate(vnf_package.id)
 
 
 @utils.expects_func_args('vnf_package')
@@ -141,6 +146,7 @@ def revert_upload_vnf_package(function):
                             vnf_package.location_glance_store)
 
                     csar_utils.delete_csar_data(vnf_package.id)
+                    template_cache.invalidate(vnf_package.id)
 
                 # Delete the vnf_deployment_flavour if created.
                 if vnf_package.vnf_deployment_flavours:
@@ -302,6 +308,11 @@ class Conductor(manager.Manager):
         self.vnf_manager = driver_manager.DriverManager(
             'tacker.tacker.vnfm.drivers',
             cfg.CONF.tacker.infra_driver)
+        self._notification_dispatcher = \
+            notification_dispatcher.NotificationDispatcher()
+        self._notification_outbox = notification_outbox.NotificationOutbox(
+            self._notification_dispatcher, self._set_subscription_auth)
+        self._subscription_index = subscription_index.SubscriptionIndex()
 
     def start(self):
         coordination.COORDINATOR.start()
@@ -349,7 +360,7 @@ class Conductor(manager.Manager):
             t_admin_context.session.add(event_db)
         return status
 
-    def _create_software_images(self, context, sw_image, flavour_uuid):
+    def _build_software_image(self, context, sw_image, flavour_uuid):
         vnf_sw_image = objects.VnfSoftwareImage(context=context)
         vnf_sw_image.flavour_uuid = flavour_uuid
         vnf_sw_image.name = sw_image.get('name')
@@ -379,31 +390,37 @@ class Conductor(manager.Manager):
         vnf_sw_image.image_path = ''
         vnf_sw_image.software_image_id = sw_image['software_image_id']
         vnf_sw_image.metadata = sw_image.get('metadata', dict())
-        vnf_sw_image.create()
+        return vnf_sw_image
 
-    def _create_flavour(self, context, package_uuid, flavour):
+    def _build_flavour(self, context, package_uuid, flavour):
         deploy_flavour = objects.VnfDeploymentFlavour(context=context)
         deploy_flavour.package_uuid = package_uuid
         deploy_flavour.flavour_id = flavour['flavour_id']
         deploy_flavour.flavour_description = flavour['flavour_description']
         deploy_flavour.instantiation_levels = \
             flavour.get('instantiation_levels')
-        deploy_flavour.create()
+        return deploy_flavour
 
-        sw_images = flavour.get('sw_images')
-        if sw_images:
-            for sw_image in sw_images:
-                self._create_software_images(
-                    context, sw_image, deploy_flavour.id)
+    def _create_flavours(self, context, package_uuid, flavours):
+        deploy_flavours = [self._build_flavour(context, package_uuid, flavour)
+                           for flavour in flavours]
+        objects.VnfDeploymentFlavour.create_bulk(context, deploy_flavours)
 
-    def _create_vnf_artifacts(self, context, package_uuid, artifact):
+        sw_images = []
+        for flavour, deploy_flavour in zip(flavours, deploy_flavours):
+            for sw_image in flavour.get('sw_images') or []:
+                sw_images.append(self._build_software_image(
+                    context, sw_image, deploy_flavour.id))
+        objects.VnfSoftwareImage.create_bulk(context, sw_images)
+
+    def _build_vnf_artifact(self, context, package_uuid, artifact):
         vnf_artifact = objects.VnfPackageArtifactInfo(context=context)
         vnf_artifact.package_uuid = package_uuid
         vnf_artifact.artifact_path = artifact['Source']
         vnf_artifact.algorithm = artifact['Algorithm']
         vnf_artifact.hash = artifact['Hash']
         vnf_artifact._metadata = {}
-        vnf_artifact.create()
+        return vnf_artifact
 
     def _onboard_vnf_package(
             self,
@@ -412,24 +429,29 @@ class Conductor(manager.Manager):
             vnf_data,
             flavours,
             vnf_artifacts):
-        if vnf_artifacts:
-            for artifact in vnf_artifacts:
-                self._create_vnf_artifacts(context, vnf_package.id, artifact)
-
-        package_vnfd = objects.VnfPackageVnfd(context=context)
-        package_vnfd.package_uuid = vnf_package.id
-
-        package_vnfd.vnfd_id = vnf_data.get('descriptor_id')
-        package_vnfd.vnf_provider = vnf_data.get('provider')
-        package_vnfd.vnf_product_name = vnf_data.get('product_name')
-        package_vnfd.vnf_software_version = vnf_data.get('software_version')
-        package_vnfd.vnfd_version = vnf_data.get('descriptor_version')
-        package_vnfd.create()
-
-        self._onboard_vnfd(context, vnf_package, vnf_data, flavours)
-
-        for flavour in flavours:
-            self._create_flavour(context, vnf_package.id, flavour)
+        # All the metadata of the package is written in one transaction,
+        # the rows of a table at once, so that a package is never left
+        # half onboarded.
+        with db_api.context_manager.writer.using(context):
+            objects.VnfPackageArtifactInfo.create_bulk(
+                context, [self._build_vnf_artifact(context, vnf_package.id,
+                                                   artifact)
+                          for artifact in vnf_artifacts or []])
+
+            package_vnfd = objects.VnfPackageVnfd(context=context)
+            package_vnfd.package_uuid = vnf_package.id
+
+            package_vnfd.vnfd_id = vnf_data.get('descriptor_id')
+            package_vnfd.vnf_provider = vnf_data.get('provider')
+            package_vnfd.vnf_product_name = vnf_data.get('product_name')
+            package_vnfd.vnf_software_version = vnf_data.get(
+                'software_version')
+            package_vnfd.vnfd_version = vnf_data.get('descriptor_version')
+            package_vnfd.create()
+
+            self._onboard_vnfd(context, vnf_package, vnf_data, flavours)
+
+            self._create_flavours(context, vnf_package.id, flavours)
 
     def _onboard_vnfd(self, context, vnf_package, vnf_data, flavours):
         vnfd = vnfd_db.Vnfd(context=context)
@@ -824,6 +846,20 @@ class Conductor(manager.Manager):
                             " folder $(folder)s for vnf package %(uuid)s.",
                             {'zip': csar_path, 'folder': csar_zip_temp_path,
                              'uuid': vnf_pack.id})
+        if CONF.vnf_package.artifact_store:
+            csar_utils.sweep_artifact_store()
+
+    @periodic_task.periodic_task(
+        spacing=CONF.vnf_lcm.notification_poll_interval)
+    def _run_notification_outbox(self, context):
+        """Deliver notifications left in the notification outbox
+
+        Notifications are normally delivered right after they are
+        enqueued. This periodic task renews the leases of the
+        notifications being delivered by this conductor and picks up
+        notifications left behind by a conductor which stopped.
+        """
+        self._notification_outbox.poll()
 
     def _grant(self, context, grant_request):
         LOG.info(
@@ -1446,30 +1482,25 @@ class Conductor(manager.Manager):
                     notification_data['error'] = error
 
             # send notification
-            self.send_notification(context, notification_data)
+            self.send_notification(
+                context, notification_data,
+                vnf_instance=old_vnf_instance or vnf_instance)
         except Exception as ex:
             LOG.error(
                 "Failed to send notification {}. Details: {}".format(
                     vnf_lcm_op_occs_id, str(ex)))
 
-    def send_notification(self, context, notification):
+    def invalidate_subscription_index(self, context):
+        self._subscription_index.invalidate()
+
+    def send_notification(self, context, notification, vnf_instance=None):
         try:
             LOG.debug("send_notification start notification[%s]"
                       % notification)
-            if (notification.get('notificationType') ==
-                    'VnfLcmOperationOccurrenceNotification'):
-                vnf_lcm_subscriptions = \
-                    objects.LccnSubscriptionRequest.vnf_lcm_subscriptions_get(
-                        context,
-                        operation_type=notification.get('operation'),
-                        notification_type=notification.get('notificationType')
-                    )
-            else:
-                vnf_lcm_subscriptions = \
-                    objects.LccnSubscriptionRequest.vnf_lcm_subscriptions_get(
-                        context,
-                        notification_type=notification.get('notificationType')
-                    )
+            vnf_lcm_subscriptions = self._subscription_index.match(
+                context, notification,
+                vnf_instance=subscription_index.filter_attributes(
+                    vnf_instance))
             if not vnf_lcm_subscriptions:
                 LOG.warn(
                     "vnf_lcm_subscription not found id[%s]" %
@@ -1479,58 +1510,36 @@ class Conductor(manager.Manager):
             notification['id'] = uuidutils.generate_uuid()
 
             # Notification shipping
+            entries = []
             for line in vnf_lcm_subscriptions:
-                notification['subscriptionId'] = line.id
+                subscription_notification = copy.deepcopy(notification)
+                subscription_notification['subscriptionId'] = line.id
+                subscription_href = {
+                    'subscription': {
+                        'href': CONF.vnf_lcm.endpoint_url +
+                        "/vnflcm/v1/subscriptions/" + line.id}}
                 if (notification.get('notificationType') ==
                         'VnfLcmOperationOccurrenceNotification'):
-                    notification['_links'] = {}
-                    notification['_links']['subscription'] = {}
-                    notification['_links']['subscription']['href'] = \
-                        CONF.vnf_lcm.endpoint_url + \
-                        "/vnflcm/v1/subscriptions/" + line.id
+                    subscription_notification['_links'] = subscription_href
                 else:
-                    notification['links'] = {}
-                    notification['links']['subscription'] = {}
-                    notification['links']['subscription']['href'] = \
-                        CONF.vnf_lcm.endpoint_url + \
-                        "/vnflcm/v1/subscriptions/" + line.id
-                notification['timeStamp'] = datetime.datetime.utcnow(
-                ).isoformat()
+                    subscription_notification['links'] = subscription_href
+                subscription_notification['timeStamp'] = \
+                    datetime.datetime.utcnow().isoformat()
                 try:
-                    self.__set_auth_subscription(line)
-
-                    for num in range(CONF.vnf_lcm.retry_num):
-                        LOG.warn("send notify[%s]" % json.dumps(notification))
-                        auth_client = auth.auth_manager.get_auth_client(
-                            notification['subscriptionId'])
-                        response = auth_client.post(
-                            line.callback_uri.decode(),
-                            data=json.dumps(notification))
-                        if response.status_code == 204:
-                            LOG.info(
-                                "send success notify[%s]" %
-                                json.dumps(notification))
-                            break
-                        else:
-                            LOG.warning(
-                                "Notification failed id[%s] status[%s] \
-                                    callback_uri[%s]" %
-                                (notification['id'],
-                                response.status_code,
-                                line.callback_uri.decode()))
-                            LOG.debug(
-                                "retry_wait %s" %
-                                CONF.vnf_lcm.retry_wait)
-                            time.sleep(CONF.vnf_lcm.retry_wait)
-                            if num == CONF.vnf_lcm.retry_num:
-                                LOG.warn("Number of retries \
-                                    exceeded retry count")
-
-                            continue
+                    self._set_subscription_auth(
+                        line.id, line.subscription_authentication)
                 except Exception as e:
                     LOG.warn("send error[%s]" % str(e))
                     LOG.warn(traceback.format_exc())
                     continue
+                entries.append({
+                    'subscription_id': line.id,
+                    'callback_uri': line.callback_uri,
+                    'notification': subscription_notification})
+
+            # NOTE: notifications are only persisted here, they are
+            # delivered in the background by the notification outbox.
+            self._notification_outbox.enqueue(context, entries)
 
         except Exception as e:
             LOG.warn("Internal Sever Error[%s]" % str(e))
@@ -1775,15 +1784,15 @@ class Conductor(manager.Manager):
         self.vnflcm_driver.scale_vnf(
             context, vnf_info, vnf_instance, scale_vnf_request)
 
-    def __set_auth_subscription(self, vnf_lcm_subscription):
+    def _set_subscription_auth(self, subscription_id,
+                               subscription_authentication):
         def decode(val):
             return val if isinstance(val, str) else val.decode()
 
-        if not vnf_lcm_subscription.subscription_authentication:
+        if not subscription_authentication:
             return
 
-        subscription_authentication = decode(
-            vnf_lcm_subscription.subscription_authentication)
+        subscription_authentication = decode(subscription_authentication)
 
         authentication = utils.convert_camelcase_to_snakecase(
             json.loads(subscription_authentication))
@@ -1802,7 +1811,7 @@ class Conductor(manager.Manager):
             auth_type = 'OAUTH2_CLIENT_CREDENTIALS'
 
         auth.auth_manager.set_auth_client(
-            id=decode(vnf_lcm_subscription.id),
+            id=decode(subscription_id),
             auth_type=auth_type,
             auth_params=auth_params)
 
@@ -113,6 +113,15 @@ class VNFLcmRPCAPI(object):
         return rpc_method(context, 'send_notification',
                           notification=notification)
 
+    def invalidate_subscription_index(self, context):
+        serializer = objects_base.TackerObjectSerializer()
+
+        client = rpc.get_client(self.target, version_cap=None,
+                                serializer=serializer)
+        # NOTE: every conductor holds its own index of the subscriptions.
+        cctxt = client.prepare(fanout=True)
+        return cctxt.cast(context, 'invalidate_subscription_index')
+
     def rollback(self, context, vnf_info, vnf_instance,
             operation_params, cast=True):
         serializer = objects_base.TackerObjectSerializer()
@@ -0,0 +1,245 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import json
+import time
+
+import eventlet
+from eventlet import queue
+from oslo_log import log as logging
+
+from tacker import auth
+import tacker.conf
+
+CONF = tacker.conf.CONF
+LOG = logging.getLogger(__name__)
+
+# Upper bounds (in seconds) of the delivery latency histogram buckets.
+LATENCY_BUCKETS = (0.1, 0.5, 1, 5, 10, 30, 60, 300)
+
+
+class _Delivery(object):
+    """A single notification to be posted to one callback URI."""
+
+    def __init__(self, subscription_id, callback_uri, notification,
+                 on_done=None):
+        self.subscription_id = subscription_id
+        self.callback_uri = callback_uri
+        self.notification = notification
+        self.on_done = on_done
+        self.attempts = 0
+        self.enqueued_at = time.monotonic()
+
+
+class _Endpoint(object):
+    """FIFO of pending deliveries for a single callback URI.
+
+    At most one worker handles an endpoint at any time, so notifications
+    are delivered to a subscriber in the order they were dispatched, and
+    a slow or dead endpoint only delays its own queue.
+    """
+
+    def __init__(self, callback_uri):
+        self.callback_uri = callback_uri
+        self.pending = collections.deque()
+        self.scheduled = False
+
+
+class NotificationDispatcher(object):
+    """Deliver LCM notifications to subscribers concurrently.
+
+    Deliveries are queued per callback URI and drained by a bounded
+    pool of green threads. A failed delivery is retried with exponential
+    backoff without occupying a worker, so neither the caller nor the
+    other endpoints wait for it.
+    """
+
+    def __init__(self, pool_size=None):
+        self._pool_size = pool_size or CONF.vnf_lcm.notification_workers
+        self._pool = eventlet.GreenPool(self._pool_size)
+        self._ready = queue.LightQueue()
+        self._endpoints = {}
+        self._workers_started = False
+        self._in_flight = 0
+        self._stats = {
+            'delivered': 0,
+            'failed': 0,
+            'retried': 0,
+            'latency_sum': 0.0,
+            'latency_max': 0.0,
+            'latency_histogram': collections.OrderedDict(
+                [(bucket, 0) for bucket in LATENCY_BUCKETS + ('+Inf',)])}
+
+    def dispatch(self, subscription_id, callback_uri, notification,
+                 on_done=None):
+        """Queue a notification for delivery and return immediately.
+
+        :param subscription_id: id used to look up the auth client
+        :param callback_uri: URI the notification is posted to
+        :param notification: notification body (dict)
+        :param on_done: callable invoked with True once the notification is
+                        delivered, or with False once it is dropped
+        """
+        self._start_workers()
+        endpoint = self._endpoints.get(callback_uri)
+        if endpoint is None:
+            endpoint = _Endpoint(callback_uri)
+            self._endpoints[callback_uri] = endpoint
+
+        endpoint.pending.append(
+            _Delivery(subscription_id, callback_uri, notification, on_done))
+        if not endpoint.scheduled:
+            endpoint.scheduled = True
+            self._ready.put(endpoint)
+
+    def wait(self, timeout=None):
+        """Block until every queued notification is delivered or dropped.
+
+        :returns: True if the backlog was drained, False on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.backlog():
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            eventlet.sleep(0.01)
+        return True
+
+    def backlog(self):
+        return sum(len(ep.pending) for ep in self._endpoints.values())
+
+    def get_stats(self):
+        """Return delivery counters, latency and backlog metrics."""
+        stats = dict(self._stats)
+        stats['latency_histogram'] = dict(self._stats['latency_histogram'])
+        delivered = self._stats['delivered']
+        stats['latency_avg'] = (
+            self._stats['latency_sum'] / delivered if delivered else 0.0)
+        stats['backlog'] = self.backlog()
+        stats['endpoint_backlog'] = {
+            uri: len(ep.pending) for uri, ep in self._endpoints.items()
+            if ep.pending}
+        stats['in_flight'] = self._in_flight
+        return stats
+
+    def _start_workers(self):
+        if self._workers_started:
+            return
+        self._workers_started = True
+        for _ in range(self._pool_size):
+            self._pool.spawn_n(self._worker)
+
+    def _worker(self):
+        while True:
+            endpoint = self._ready.get()
+            try:
+                self._process(endpoint)
+            except Exception:
+                LOG.exception("Unexpected error while delivering "
+                              "notifications to %s", endpoint.callback_uri)
+                if endpoint.pending:
+                    self._finish(endpoint.pending.popleft(), False)
+                self._reschedule(endpoint)
+
+    def _process(self, endpoint):
+        while endpoint.pending:
+            delivery = endpoint.pending[0]
+            delivery.attempts += 1
+            if self._post(delivery):
+                endpoint.pending.popleft()
+                self._record_latency(delivery)
+                self._finish(delivery, True)
+                continue
+
+            if delivery.attempts >= CONF.vnf_lcm.retry_num:
+                LOG.warning("Number of retries exceeded retry count, "
+                            "notification id[%s] callback_uri[%s] dropped",
+                            delivery.notification.get('id'),
+                            delivery.callback_uri)
+                self._finish(endpoint.pending.popleft(), False)
+                continue
+
+            self._stats['retried'] += 1
+            delay = self._backoff(delivery.attempts)
+            LOG.debug("retry_wait %s callback_uri[%s]",
+                      delay, delivery.callback_uri)
+            eventlet.spawn_after(delay, self._ready.put, endpoint)
+            return
+
+        endpoint.scheduled = False
+        self._endpoints.pop(endpoint.callback_uri, None)
+
+    def _reschedule(self, endpoint):
+        if endpoint.pending:
+            self._ready.put(endpoint)
+        else:
+            endpoint.scheduled = False
+            self._endpoints.pop(endpoint.callback_uri, None)
+
+    def _finish(self, delivery, delivered):
+        if not delivered:
+            self._stats['failed'] += 1
+        if delivery.on_done is None:
+            return
+        try:
+            delivery.on_done(delivered)
+        except Exception:
+            LOG.exception("Failed to complete notification id[%s]",
+                          delivery.notification.get('id'))
+
+    def _backoff(self, attempts):
+        delay = CONF.vnf_lcm.retry_wait * (2 ** (attempts - 1))
+        return min(delay, CONF.vnf_lcm.retry_wait_max)
+
+    def _post(self, delivery):
+        body = json.dumps(delivery.notification)
+        LOG.debug("send notify[%s]", body)
+        self._in_flight += 1
+        try:
+            auth_client = auth.auth_manager.get_auth_client(
+                delivery.subscription_id)
+            response = auth_client.post(
+                delivery.callback_uri, data=body,
+                timeout=CONF.authentication.timeout)
+        except Exception as e:
+            # NOTE: a request that could not be sent at all is not
+            # retried, matching the behaviour of the synchronous sender.
+            LOG.warning("send error[%s] callback_uri[%s]",
+                        e, delivery.callback_uri)
+            delivery.attempts = CONF.vnf_lcm.retry_num
+            return False
+        finally:
+            self._in_flight -= 1
+
+        if response.status_code == 204:
+            LOG.info("send success notify[%s]", body)
+            return True
+
+        LOG.warning("Notification failed id[%s] status[%s] "
+                    "callback_uri[%s]",
+                    delivery.notification.get('id'),
+                    response.status_code, delivery.callback_uri)
+        return False
+
+    def _record_latency(self, delivery):
+        latency = time.monotonic() - delivery.enqueued_at
+        self._stats['delivered'] += 1
+        self._stats['latency_sum'] += latency
+        self._stats['latency_max'] = max(self._stats['latency_max'],
+                                         latency)
+        histogram = self._stats['latency_histogram']
+        for bucket in LATENCY_BUCKETS:
+            if latency <= bucket:
+                histogram[bucket] += 1
+                break
+        else:
+            histogram['+Inf'] += 1
@@ -0,0 +1,170 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import functools
+
+import eventlet
+from oslo_log import log as logging
+from oslo_utils import uuidutils
+
+import tacker.conf
+from tacker import context as t_context
+from tacker import objects
+
+CONF = tacker.conf.CONF
+LOG = logging.getLogger(__name__)
+
+# Seconds to wait before deleting delivered notifications, so that the
+# deletes of notifications completed close together share one statement.
+FLUSH_DELAY = 1
+
+# Maximum number of claimed notifications, counted in batches, that may wait
+# in memory for delivery before the outbox stops claiming new ones.
+MAX_BACKLOG_BATCHES = 10
+
+# Seconds between checks whether a running drain has finished.
+DRAIN_POLL_INTERVAL = 0.1
+
+
+class NotificationOutbox(object):
+    """Durable queue of LCM notifications.
+
+    Notifications are persisted in the vnf_lcm_notification_outbox table
+    and only deleted once they have been delivered or dropped after the
+    configured number of retries, so a conductor restart never loses them
+    (at-least-once delivery). Each conductor claims batches of undelivered
+    notifications with a lease and hands them to the notification
+    dispatcher; notifications of a conductor that died are claimed by
+    another one once the lease expires. Notifications of a subscription
+    are always delivered in the order they were enqueued.
+    """
+
+    def __init__(self, dispatcher, set_auth):
+        """Create the outbox.
+
+        :param dispatcher: NotificationDispatcher delivering notifications
+        :param set_auth: callable receiving a subscription id and its
+                         subscription_authentication, used to set up the
+                         auth client before a notification is sent
+        """
+        self._dispatcher = dispatcher
+        self._set_auth = set_auth
+        # NOTE: a unique owner per process, so that a restarted conductor
+        # does not mistake the leases of its previous run for its own.
+        self._owner = '%s:%s' % (CONF.host, uuidutils.generate_uuid())
+        self._completed = []
+        self._draining = False
+        self._drain_requested = False
+        self._flush_scheduled = False
+
+    def enqueue(self, context, entries):
+        """Persist notifications and trigger their delivery.
+
+        :param entries: list of dicts with subscription_id, callback_uri
+                        and notification keys
+        """
+        objects.VnfLcmNotificationOutbox.enqueue(context, entries)
+        self.kick()
+
+    def kick(self):
+        """Start draining the outbox in the background."""
+        eventlet.spawn_n(self.drain)
+
+    def drain(self):
+        """Claim undelivered notifications and hand them to the dispatcher.
+
+        Concurrent calls are coalesced into the running one.
+        """
+        if self._draining:
+            self._drain_requested = True
+            return
+
+        self._draining = True
+        context = t_context.get_admin_context()
+        batch_size = CONF.vnf_lcm.notification_batch_size
+        try:
+            self._flush(context)
+            objects.VnfLcmNotificationOutbox.renew(
+                context, self._owner, CONF.vnf_lcm.notification_lease_time)
+            while True:
+                self._drain_requested = False
+                if (self._dispatcher.backlog() >=
+                        batch_size * MAX_BACKLOG_BATCHES):
+                    LOG.debug("Notification backlog is full, claiming "
+                              "again on the next drain")
+                    break
+
+                claimed = objects.VnfLcmNotificationOutbox.claim(
+                    context, self._owner, batch_size,
+                    CONF.vnf_lcm.notification_lease_time)
+                for entry in claimed:
+                    self._deliver(entry)
+
+                if len(claimed) < batch_size and not self._drain_requested:
+                    break
+        except Exception:
+            LOG.exception("Failed to drain the notification outbox")
+        finally:
+            self._draining = False
+
+    def poll(self):
+        """Drain the outbox periodically, reporting the delivery metrics."""
+        self.drain()
+        LOG.debug("Notification delivery stats: %s",
+                  self._dispatcher.get_stats())
+
+    def wait(self, timeout=None):
+        """Deliver every claimable notification and wait for completion.
+
+        :returns: True if all notifications were delivered or dropped
+        """
+        # A drain started in the background would swallow this one.
+        while self._draining:
+            eventlet.sleep(DRAIN_POLL_INTERVAL)
+        self.drain()
+        drained = self._dispatcher.wait(timeout=timeout)
+        self._flush(t_context.get_admin_context())
+        return drained
+
+    def _deliver(self, entry):
+        try:
+            self._set_auth(entry.subscription_id,
+                           entry.subscription_authentication)
+        except Exception:
+            LOG.exception("Failed to set up authentication for "
+                          "subscription %s", entry.subscription_id)
+        self._dispatcher.dispatch(
+            entry.subscription_id, entry.callback_uri, entry.notification,
+            on_done=functools.partial(self._complete, entry.id))
+
+    def _complete(self, outbox_id, delivered):
+        self._completed.append(outbox_id)
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            eventlet.spawn_after(FLUSH_DELAY, self._flush_later)
+
+    def _flush_later(self):
+        self._flush_scheduled = False
+        try:
+            self._flush(t_context.get_admin_context())
+        except Exception:
+            LOG.exception("Failed to delete delivered notifications")
+
+    def _flush(self, context):
+        completed, self._completed = self._completed, []
+        if not completed:
+            return
+        try:
+            objects.VnfLcmNotificationOutbox.delete_by_ids(context, completed)
+        except Exception:
+            self._completed.extend(completed)
+            raise
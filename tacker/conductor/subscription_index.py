@@ -0,0 +1,268 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import itertools
+import json
+import time
+
+from oslo_log import log as logging
+
+import tacker.conf
+from tacker import objects
+from tacker.objects import fields
+
+CONF = tacker.conf.CONF
+LOG = logging.getLogger(__name__)
+
+# Key component matching every value of an attribute, used for subscriptions
+# whose filter does not restrict that attribute.
+ANY = None
+
+
+def _as_list(value):
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    return [value]
+
+
+def _decode(value):
+    if isinstance(value, bytes):
+        value = value.decode()
+    if isinstance(value, str):
+        value = json.loads(value) if value else {}
+    return value or {}
+
+
+def filter_attributes(vnf_instance):
+    """Return the attributes of a VnfInstance subscriptions filter on."""
+    if vnf_instance is None:
+        return None
+    return {attr: getattr(vnf_instance, attr)
+            if vnf_instance.obj_attr_is_set(attr) else None
+            for attr in ('vnfd_id', 'vnf_instance_name', 'vnf_provider',
+                         'vnf_product_name', 'vnf_software_version',
+                         'vnfd_version')}
+
+
+class CompiledSubscription(object):
+    """A subscription with its filter compiled for matching.
+
+    The index key attributes hold the values accepted by the filter, or
+    ``[ANY]`` if the filter does not restrict them. The remaining filter
+    attributes are checked by :meth:`residual_match`.
+    """
+
+    def __init__(self, subscription):
+        self.id = subscription.id
+        self.callback_uri = subscription.callback_uri
+        if isinstance(self.callback_uri, bytes):
+            self.callback_uri = self.callback_uri.decode()
+        self.subscription_authentication = \
+            subscription.subscription_authentication
+
+        lcm_filter = _decode(subscription.filter)
+        instance_filter = lcm_filter.get(
+            'vnfInstanceSubscriptionFilter', {}) or {}
+
+        self.notification_types = _as_list(
+            lcm_filter.get('notificationTypes')) or [ANY]
+        self.operation_types = _as_list(
+            lcm_filter.get('operationTypes')) or [ANY]
+        self.vnfd_ids = _as_list(instance_filter.get('vnfdIds')) or [ANY]
+        self.vnf_instance_ids = _as_list(
+            instance_filter.get('vnfInstanceIds')) or [ANY]
+        self.operation_states = set(_as_list(
+            lcm_filter.get('operationStates')))
+        self.vnf_instance_names = set(_as_list(
+            instance_filter.get('vnfInstanceNames')))
+        self.vnf_products = _as_list(
+            instance_filter.get('vnfProductsFromProviders'))
+
+    @property
+    def needs_vnf_instance(self):
+        """Whether matching requires attributes of the VNF instance."""
+        return (self.vnfd_ids != [ANY] or bool(self.vnf_instance_names) or
+                bool(self.vnf_products))
+
+    def residual_match(self, notification, vnf_instance):
+        if (self.operation_states and
+                notification.get('notificationType') ==
+                fields.LcmOccsNotificationType.VNF_OP_OCC_NOTIFICATION and
+                notification.get('operationState') not in
+                self.operation_states):
+            return False
+
+        if self.vnf_instance_names and (
+                vnf_instance is None or
+                vnf_instance.get('vnf_instance_name') not in
+                self.vnf_instance_names):
+            return False
+
+        if self.vnf_products:
+            return vnf_instance is not None and self._match_products(
+                vnf_instance)
+
+        return True
+
+    def _match_products(self, vnf_instance):
+        for provider in self.vnf_products:
+            if provider.get('vnfProvider') != vnf_instance.get(
+                    'vnf_provider'):
+                continue
+            products = provider.get('vnfProducts') or []
+            if not products:
+                return True
+            for product in products:
+                if product.get('vnfProductName') != vnf_instance.get(
+                        'vnf_product_name'):
+                    continue
+                versions = product.get('versions') or []
+                if not versions:
+                    return True
+                for version in versions:
+                    if version.get('vnfSoftwareVersion') != vnf_instance.get(
+                            'vnf_software_version'):
+                        continue
+                    vnfd_versions = version.get('vnfdVersions') or []
+                    if (not vnfd_versions or vnf_instance.get(
+                            'vnfd_version') in vnfd_versions):
+                        return True
+        return False
+
+
+class _Index(object):
+    """Subscriptions bucketed by the attributes of their filter.
+
+    The bucket keys are notificationType, operationType, vnfdId and
+    vnfInstanceId. A subscription is stored under every combination of the
+    values its filter accepts, using ``ANY`` for unrestricted attributes, so
+    a lookup only visits the buckets of the notification's own values and
+    ``ANY``.
+    Notifications other than VnfLcmOperationOccurrenceNotification have no
+    operation type and are looked up in buckets ignoring operationTypes.
+    """
+
+    def __init__(self, subscriptions):
+        self.op_buckets = collections.defaultdict(list)
+        self.buckets = collections.defaultdict(list)
+        self.needs_vnf_instance = False
+        self.size = 0
+        for subscription in subscriptions:
+            compiled = CompiledSubscription(subscription)
+            self.size += 1
+            self.needs_vnf_instance |= compiled.needs_vnf_instance
+            for key in itertools.product(
+                    compiled.notification_types, compiled.vnfd_ids,
+                    compiled.vnf_instance_ids):
+                self.buckets[key].append(compiled)
+                for operation_type in compiled.operation_types:
+                    self.op_buckets[(operation_type,) + key].append(compiled)
+
+    def lookup(self, notification_type, operation_type, vnfd_id,
+               vnf_instance_id):
+        if operation_type is None:
+            buckets = self.buckets
+            keys = itertools.product(
+                (notification_type, ANY), (vnfd_id, ANY),
+                (vnf_instance_id, ANY))
+        else:
+            buckets = self.op_buckets
+            keys = itertools.product(
+                (operation_type, ANY), (notification_type, ANY),
+                (vnfd_id, ANY), (vnf_instance_id, ANY))
+
+        seen = set()
+        for key in set(keys):
+            for subscription in buckets.get(key, ()):
+                if subscription.id not in seen:
+                    seen.add(subscription.id)
+                    yield subscription
+
+
+class SubscriptionIndex(object):
+    """In-memory index resolving the subscriptions of a notification.
+
+    The index is built from all subscriptions on first use and rebuilt
+    after :meth:`invalidate` is called, which happens whenever a
+    subscription is registered or deleted, or once
+    ``[vnf_lcm] subscription_index_ttl`` seconds passed. Resolving the
+    subscribers of a notification needs no database access, except for
+    reading the attributes of the VNF instance when a subscription filters
+    on them and the caller did not provide the instance.
+    """
+
+    def __init__(self):
+        self._index = None
+        self._built_at = 0
+        self._generation = 0
+
+    def invalidate(self):
+        self._generation += 1
+        self._index = None
+
+    def _get_index(self, context):
+        ttl = CONF.vnf_lcm.subscription_index_ttl
+        if (self._index is not None and ttl > 0 and
+                time.monotonic() - self._built_at > ttl):
+            self._index = None
+
+        if self._index is None:
+            generation = self._generation
+            subscriptions = \
+                objects.LccnSubscriptionRequest.vnf_lcm_subscriptions_get_all(
+                    context)
+            index = _Index(subscriptions or [])
+            LOG.debug("Built subscription index of %d subscriptions",
+                      index.size)
+            if generation != self._generation:
+                # Invalidated while loading, do not cache a stale index.
+                return index
+            self._index = index
+            self._built_at = time.monotonic()
+        return self._index
+
+    def match(self, context, notification, vnf_instance=None):
+        """Return the subscriptions the notification has to be sent to.
+
+        :param notification: notification (dict) with notificationType,
+                             vnfInstanceId and, for
+                             VnfLcmOperationOccurrenceNotification,
+                             operation and operationState
+        :param vnf_instance: optional dict with the vnfd_id,
+                             vnf_instance_name, vnf_provider,
+                             vnf_product_name, vnf_software_version and
+                             vnfd_version of the VNF instance
+        :returns: list of CompiledSubscription
+        """
+        index = self._get_index(context)
+        if not index.size:
+            return []
+
+        notification_type = notification.get('notificationType')
+        vnf_instance_id = notification.get('vnfInstanceId')
+        operation_type = None
+        if (notification_type ==
+                fields.LcmOccsNotificationType.VNF_OP_OCC_NOTIFICATION):
+            operation_type = notification.get('operation')
+
+        if (vnf_instance is None and index.needs_vnf_instance and
+                vnf_instance_id):
+            vnf_instance = objects.LccnSubscriptionRequest.\
+                vnf_instance_filter_attributes_get(context, vnf_instance_id)
+
+        vnfd_id = vnf_instance.get('vnfd_id') if vnf_instance else None
+        return [subscription for subscription in index.lookup(
+                notification_type, operation_type, vnfd_id, vnf_instance_id)
+                if subscription.residual_match(notification, vnf_instance)]
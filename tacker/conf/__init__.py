@@ -18,6 +18,7 @@ from oslo_config import cfg
 
 from tacker.conf import conductor
 from tacker.conf import coordination
+from tacker.conf import http_client
 from tacker.conf import vnf_lcm
 from tacker.conf import vnf_package
 
@@ -28,4 +29,5 @@ vnf_package.register_opts(CONF)
 vnf_lcm.register_opts(CONF)
 conductor.register_opts(CONF)
 coordination.register_opts(CONF)
+http_client.register_opts(CONF)
 glance_store.register_opts(CONF)
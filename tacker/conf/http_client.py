@@ -0,0 +1,56 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from oslo_config import cfg
+
+
+CONF = cfg.CONF
+
+OPTS = [
+    cfg.IntOpt(
+        'pool_hosts',
+        default=100,
+        min=1,
+        help="Number of destinations, i.e. scheme, host and port, whose "
+             "connections are kept alive for the HTTP requests of the "
+             "notifications, of the authorization and to the NFVO"),
+    cfg.IntOpt(
+        'pool_maxsize',
+        default=10,
+        min=1,
+        help="Number of connections kept alive per destination"),
+    cfg.BoolOpt(
+        'keepalive',
+        default=True,
+        help="Keep the connections alive for the next requests to the "
+             "same destination. If false, each connection is closed "
+             "after its request"),
+    cfg.IntOpt(
+        'max_requests_per_host',
+        default=20,
+        min=0,
+        help="Number of requests sent to a destination concurrently, the "
+             "next ones wait for one of them to complete. 0 does not limit "
+             "them")]
+
+http_client_group = cfg.OptGroup('http_client',
+    title='http_client options',
+    help="Outbound HTTP connections options group")
+
+
+def register_opts(conf):
+    conf.register_group(http_client_group)
+    conf.register_opts(OPTS, group=http_client_group)
+
+
+def list_opts():
+    return {http_client_group: OPTS}
@@ -24,6 +24,12 @@ OPTS = [
         'subscription_num',
         default=100,
         help="Number of subscriptions"),
+    cfg.IntOpt(
+        'vnf_instance_num',
+        default=100,
+        min=0,
+        help="Number of VNF instances returned per page when listing VNF "
+             "instances. 0 returns all VNF instances at once"),
     cfg.IntOpt(
         'retry_num',
         default=3,
@@ -31,7 +37,53 @@ OPTS = [
     cfg.IntOpt(
         'retry_wait',
         default=10,
-        help="Retry interval(sec)")]
+        help="Retry interval(sec)"),
+    cfg.IntOpt(
+        'retry_wait_max',
+        default=300,
+        help="Maximum retry interval(sec). The retry interval of a "
+             "notification doubles on every failed attempt up to this "
+             "value"),
+    cfg.IntOpt(
+        'notification_workers',
+        default=64,
+        min=1,
+        help="Number of green threads delivering notifications to "
+             "subscribers concurrently"),
+    cfg.IntOpt(
+        'notification_batch_size',
+        default=100,
+        min=1,
+        help="Number of undelivered notifications a conductor claims "
+             "from the notification outbox at once"),
+    cfg.IntOpt(
+        'notification_lease_time',
+        default=120,
+        min=1,
+        help="Seconds a claimed notification stays reserved for the "
+             "conductor delivering it. Notifications of a conductor "
+             "which stopped are delivered by another one afterwards"),
+    cfg.IntOpt(
+        'notification_poll_interval',
+        default=30,
+        min=1,
+        help="Seconds between checks of the notification outbox for "
+             "notifications left undelivered"),
+    cfg.IntOpt(
+        'subscription_index_ttl',
+        default=300,
+        min=0,
+        help="Seconds the in-memory index of LCM subscriptions is used "
+             "before it is reloaded from the database. The index is also "
+             "reloaded whenever a subscription is registered or deleted. "
+             "0 disables the expiry"),
+    cfg.IntOpt(
+        'template_cache_size',
+        default=64,
+        min=0,
+        help="Number of VNFDs and HOT templates parsed from VNF packages "
+             "kept in memory by each process for VNF LCM operations. 0 "
+             "disables the cache")]
 
 vnf_lcm_group = cfg.OptGroup('vnf_lcm',
     title='vnf_lcm options',
@@ -77,6 +77,43 @@ Related options:
                 'vnfm_info', 'flavour_id', 'flavour_description'],
                 help=_("List of del inputs from lower-vnfd")),
 
+    cfg.IntOpt('vnf_package_num',
+               default=100,
+               min=0,
+               help=_("Number of VNF packages returned per page when "
+                      "listing VNF packages. 0 returns all VNF packages at "
+                      "once")),
+
+    cfg.IntOpt('artifact_hash_workers',
+               default=8,
+               min=1,
+               help=_("Number of artifacts of a VNF package whose hash is "
+                      "verified concurrently while it is onboarded")),
+
+    cfg.IntOpt('remote_artifact_fetches',
+               default=4,
+               min=1,
+               help=_("Maximum number of artifacts referenced by URL "
+                      "fetched concurrently to verify their hash while "
+                      "a VNF package is onboarded")),
+
+    cfg.BoolOpt('artifact_store',
+                default=False,
+                help=_("""
+Share the artifacts of the extracted VNF packages.
+
+The artifacts listed in the manifests of the VNF packages, images
+included, are kept once in the '.artifacts' directory of
+vnf_package_csar_path, by their hash, and hard linked into the
+directories of the packages. A stored artifact is removed once no
+package links it anymore.
+
+NOTES:
+    * vnf_package_csar_path must be on a file system supporting hard
+      links, otherwise the artifacts are not shared.
+    * The extracted files of the packages must not be modified in place.
+""")),
+
 ]
 
 vnf_package_group = cfg.OptGroup('vnf_package',
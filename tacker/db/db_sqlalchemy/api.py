@@ -13,6 +13,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+
 from oslo_db.sqlalchemy import utils as sqlalchemyutils
 
 import tacker.context
@@ -54,3 +56,20 @@ def model_query(context, model, args=None, read_deleted=None,
         query = query.filter_by(tenant_id=context.project_id)
 
     return query
+
+
+def bulk_insert(context, model, values_list):
+    """Insert rows of a model with executemany statements.
+
+    The rows are inserted by one statement per set of columns, in the
+    session of the context so within its transaction.
+
+    :param context:     TackerContext of the transaction.
+    :param model:       Model of the rows.
+    :param values_list: Column values of the rows.
+    """
+    batches = collections.OrderedDict()
+    for values in values_list:
+        batches.setdefault(frozenset(values), []).append(values)
+    for batch in batches.values():
+        context.session.execute(model.__table__.insert(None), batch)
@@ -318,6 +318,25 @@ class VnfLcmOpOccs(model_base.BASE, models.SoftDeleteMixin,
     error_point = sa.Column(sa.Integer, nullable=False)
 
 
+class VnfLcmNotificationOutbox(model_base.BASE, models.TimestampMixin):
+    """Notifications waiting to be delivered to LCM subscribers."""
+
+    __tablename__ = 'vnf_lcm_notification_outbox'
+    __table_args__ = (
+        sa.Index('idx_vnf_lcm_notification_outbox_subscription_id',
+                 'subscription_id', 'id'),
+        sa.Index('idx_vnf_lcm_notification_outbox_claimed_by',
+                 'claimed_by', 'lease_expires'),
+    )
+    id = sa.Column(sa.Integer, nullable=False, primary_key=True,
+                   autoincrement=True)
+    subscription_id = sa.Column(sa.String(36), nullable=False)
+    callback_uri = sa.Column(sa.String(255), nullable=False)
+    notification = sa.Column(sa.JSON(), nullable=False)
+    claimed_by = sa.Column(sa.String(255), nullable=True)
+    lease_expires = sa.Column(sa.DateTime(), nullable=True)
+
+
 class PlacementConstraint(model_base.BASE, models.SoftDeleteMixin,
                 models.TimestampMixin, models_v1.HasId):
     """Represents a Vnf Placement Constraint."""
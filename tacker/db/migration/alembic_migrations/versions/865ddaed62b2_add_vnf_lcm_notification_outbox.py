@@ -0,0 +1,51 @@
+# Copyright 2021 OpenStack Foundation
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+
+"""add vnf_lcm_notification_outbox table
+
+Revision ID: 865ddaed62b2
+Revises: 329cd1619d41
+Create Date: 2021-03-01 10:12:31.614023
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '865ddaed62b2'
+down_revision = '329cd1619d41'
+
+
+def upgrade(active_plugins=None, options=None):
+    op.create_table(
+        'vnf_lcm_notification_outbox',
+        sa.Column('id', sa.Integer, autoincrement=True, nullable=False),
+        sa.Column('subscription_id', sa.String(length=36), nullable=False),
+        sa.Column('callback_uri', sa.String(length=255), nullable=False),
+        sa.Column('notification', sa.JSON(), nullable=False),
+        sa.Column('claimed_by', sa.String(length=255), nullable=True),
+        sa.Column('lease_expires', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        mysql_engine='InnoDB'
+    )
+    op.create_index('idx_vnf_lcm_notification_outbox_subscription_id',
+                    'vnf_lcm_notification_outbox',
+                    ['subscription_id', 'id'])
+    op.create_index('idx_vnf_lcm_notification_outbox_claimed_by',
+                    'vnf_lcm_notification_outbox',
+                    ['claimed_by', 'lease_expires'])
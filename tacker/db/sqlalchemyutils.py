@@ -13,6 +13,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import operator
+
 import sqlalchemy
 from sqlalchemy.orm.properties import RelationshipProperty
 
@@ -101,3 +103,132 @@ def paginate_query(query, model, limit, sorts, marker_obj=None):
         query = query.limit(limit)
 
     return query
+
+
+_FILTER_OPERATORS = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '>': operator.gt,
+    '>=': operator.ge,
+    '<': operator.lt,
+    '<=': operator.le,
+    'in': lambda column, values: column.in_(values),
+    'not_in': lambda column, values: column.notin_(values),
+}
+
+
+class _FilterCompiler(object):
+
+    def __init__(self, model, relations):
+        self.model = model
+        self.relations = relations or {}
+
+    def _get_model(self, model_name):
+        if model_name in (None, self.model.__name__):
+            return self.model
+        try:
+            return self.relations[model_name][0]
+        except KeyError:
+            msg = _("Filtering on model '%s' is not supported") % model_name
+            raise n_exc.BadRequest(resource=self.model.__tablename__,
+                                   msg=msg)
+
+    def _get_chain(self, model_name):
+        """Return the models joining the filtered model to model_name."""
+        chain = []
+        while model_name != self.model.__name__:
+            chain.insert(0, model_name)
+            model_name = self.relations[model_name][2]
+        return chain
+
+    def _leaf(self, spec):
+        model = self._get_model(spec.get('model'))
+        try:
+            column = getattr(model, spec['field'])
+        except AttributeError:
+            msg = _("%s is invalid attribute for filter") % spec['field']
+            raise n_exc.BadRequest(resource=model.__tablename__, msg=msg)
+
+        op = spec['op']
+        if op not in _FILTER_OPERATORS:
+            msg = _("%s is invalid operator for filter") % op
+            raise n_exc.BadRequest(resource=model.__tablename__, msg=msg)
+
+        value = spec.get('value')
+        if op in ('in', 'not_in'):
+            if not isinstance(value, (list, tuple, set)):
+                value = [value]
+            if len(value) == 1:
+                # Use the plain comparison usable by an index lookup.
+                op = '==' if op == 'in' else '!='
+                value = list(value)[0]
+        return model, _FILTER_OPERATORS[op](column, value)
+
+    def _collect(self, spec, clauses, child_clauses):
+        if isinstance(spec, (list, tuple)):
+            for sub_spec in spec:
+                self._collect(sub_spec, clauses, child_clauses)
+        elif 'and' in spec:
+            self._collect(spec['and'], clauses, child_clauses)
+        elif 'or' in spec:
+            clauses.append(sqlalchemy.or_(
+                *[self.compile(sub_spec) for sub_spec in spec['or']]))
+        elif 'not' in spec:
+            clauses.append(sqlalchemy.not_(self.compile(spec['not'])))
+        else:
+            model, clause = self._leaf(spec)
+            if model is self.model:
+                clauses.append(clause)
+                return
+            chain = self._get_chain(model.__name__)
+            models, conditions = child_clauses.setdefault(
+                chain[0], (set(), []))
+            models.update(chain)
+            conditions.append(clause)
+
+    def _exists(self, model_names, conditions):
+        join_conditions = []
+        for model_name in model_names:
+            model, foreign_key, parent_name = self.relations[model_name]
+            parent = self._get_model(parent_name)
+            join_conditions.append(getattr(model, foreign_key) == parent.id)
+        return sqlalchemy.exists().where(
+            sqlalchemy.and_(*(join_conditions + conditions)))
+
+    def compile(self, spec):
+        clauses = []
+        child_clauses = {}
+        self._collect(spec, clauses, child_clauses)
+        for model_names, conditions in child_clauses.values():
+            clauses.append(self._exists(model_names, conditions))
+        return sqlalchemy.and_(*clauses)
+
+
+def apply_filters(query, model, filters, relations=None):
+    """Returns a query with the filters added.
+
+    The filters are given in the filter-spec format of sqlalchemy-filters,
+    as generated by :mod:`tacker.api.common._filters`. Conditions on the
+    columns of child models are evaluated in correlated EXISTS subqueries
+    instead of joining the child tables to the query, so the rows returned
+    are not multiplied by the number of child rows, and limits and
+    pagination can be applied to the query.
+
+    The conditions on the models joined by the same chain of relations
+    and combined with 'and' are evaluated on the same rows, in a single
+    subquery. For example, the key and the value condition of a
+    key_value_pair attribute have to match the same row.
+
+    :param query: the query object to which we should add the filters
+    :param model: the ORM model class queried
+    :param filters: the filter-spec
+    :param relations: dict mapping the name of each child model which can
+                      be filtered on to a tuple of the model class, the
+                      name of its column referring to the id of its parent
+                      model and the name of the parent model
+    :rtype: sqlalchemy.orm.query.Query
+    :return: The query with the filters added.
+    """
+    if not filters:
+        return query
+    return query.filter(_FilterCompiler(model, relations).compile(filters))
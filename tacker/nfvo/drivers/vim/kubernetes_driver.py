@@ -62,30 +62,19 @@ class Kubernetes_Driver(abstract_vim_driver.VimAbstractDriver):
         """Validate VIM auth attributes
 
         """
-        auth_cred, file_descriptor = self._get_auth_creds(vim_obj)
-        self._validate_vim(auth_cred, file_descriptor)
-        self.clean_authenticate_vim(auth_cred, file_descriptor)
+        self._validate_vim(self._get_auth_creds(vim_obj))
 
     def _get_auth_creds(self, vim_obj):
+        # NOTE: The file of the CA certificate is kept by the cached API
+        # client of the VIM, see kubernetes_utils.ClientCache.
         auth_cred = vim_obj['auth_cred']
-        file_descriptor = self._create_ssl_ca_file(auth_cred)
         auth_cred['auth_url'] = vim_obj['auth_url']
         if ('username' not in auth_cred) and ('password' not in auth_cred):
             auth_cred['username'] = 'None'
             auth_cred['password'] = None
-        return auth_cred, file_descriptor
-
-    def _create_ssl_ca_file(self, auth_cred):
-        ca_cert = utils.none_from_string(auth_cred.get('ssl_ca_cert'))
-        if ca_cert:
-            file_descriptor, file_path = \
-                self.kubernetes.create_ca_cert_tmp_file(ca_cert)
-            auth_cred['ca_cert_file'] = file_path
-            return file_descriptor
-        else:
-            return None
+        return auth_cred
 
-    def _validate_vim(self, auth, file_descriptor):
+    def _validate_vim(self, auth):
         # If Tacker can get k8s_info, Kubernetes authentication is valid
         # if not, it is invalid
         auth_dict = dict(auth)
@@ -96,8 +85,6 @@ class Kubernetes_Driver(abstract_vim_driver.VimAbstractDriver):
             LOG.info(k8s_info)
         except Exception as e:
             LOG.info('VIM Kubernetes authentication is wrong.')
-            # delete temp file
-            self.clean_authenticate_vim(auth_dict, file_descriptor)
             raise nfvo.VimUnauthorizedException(message=str(e))
 
     def _find_regions(self, core_v1_api_client):
@@ -113,21 +100,13 @@ class Kubernetes_Driver(abstract_vim_driver.VimAbstractDriver):
         """
         # in Kubernetes environment, user can deploy resource
         # on specific namespace
-        auth_cred, file_descriptor = self._get_auth_creds(vim_obj)
+        auth_cred = self._get_auth_creds(vim_obj)
         core_v1_api_client = \
             self.kubernetes.get_core_v1_api_client(auth_cred)
         namespace_list = self._find_regions(core_v1_api_client)
-        self.clean_authenticate_vim(auth_cred, file_descriptor)
         vim_obj['placement_attr'] = {'regions': namespace_list}
         return vim_obj
 
-    def clean_authenticate_vim(self, vim_auth, file_descriptor):
-        # remove ca_cert_file from vim_obj if it exists
-        # close and delete temp ca_cert_file
-        if file_descriptor is not None:
-            file_path = vim_auth.pop('ca_cert_file')
-            self.kubernetes.close_tmp_file(file_descriptor, file_path)
-
     @log.log
     def register_vim(self, vim_obj):
         """Validate Kubernetes VIM."""
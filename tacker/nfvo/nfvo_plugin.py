@@ -30,6 +30,7 @@ from tempfile import mkstemp
 from toscaparser.tosca_template import ToscaTemplate
 
 from tacker._i18n import _
+from tacker.common.container import kubernetes_utils
 from tacker.common import driver_manager
 from tacker.common import exceptions
 from tacker.common import log
@@ -44,6 +45,7 @@ from tacker.keymgr import API as KEYMGR_API
 from tacker import manager
 from tacker.nfvo.workflows.vim_monitor import vim_monitor_utils
 from tacker.plugins.common import constants
+from tacker.vnfm.infra_drivers.openstack import heat_client as hc
 from tacker.vnfm import keystone
 from tacker.vnfm import vim_client
 
@@ -195,6 +197,8 @@ class NfvoPlugin(nfvo_db_plugin.NfvoPluginDb, vnffg_db.VnffgPluginDbMixin,
 
             vim_obj = super(NfvoPlugin, self).update_vim(
                 context, vim_id, vim_obj)
+            hc.RESOURCE_TYPES.invalidate(vim_id)
+            kubernetes_utils.CLIENTS.invalidate(old_vim_obj['auth_url'])
             if old_auth_need_delete:
                 try:
                     self._vim_drivers.invoke(vim_type,
@@ -228,6 +232,8 @@ class NfvoPlugin(nfvo_db_plugin.NfvoPluginDb, vnffg_db.VnffgPluginDbMixin,
         except Exception:
             LOG.exception("Failed to remove vim monitor")
         super(NfvoPlugin, self).delete_vim(context, vim_id)
+        hc.RESOURCE_TYPES.invalidate(vim_id)
+        kubernetes_utils.CLIENTS.invalidate(vim_obj['auth_url'])
 
     @log.log
     def monitor_vim(self, context, vim_obj):
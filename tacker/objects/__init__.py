@@ -40,6 +40,7 @@ def register_all():
     __import__('tacker.objects.terminate_vnf_req')
     __import__('tacker.objects.vnf_artifact')
     __import__('tacker.objects.vnf_lcm_subscriptions')
+    __import__('tacker.objects.vnf_lcm_notification_outbox')
     __import__('tacker.objects.scale_vnf_request')
     __import__('tacker.objects.grant')
     __import__('tacker.objects.grant_request')
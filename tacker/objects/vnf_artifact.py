@@ -12,6 +12,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 from oslo_log import log as logging
+from oslo_utils import uuidutils
 from oslo_versionedobjects import base as ovoo_base
 from tacker._i18n import _
 from tacker.common import exceptions
@@ -35,6 +36,11 @@ def _vnf_artifacts_create(context, values):
     return vnf_artifacts
 
 
+@db_api.context_manager.writer
+def _vnf_artifacts_create_bulk(context, values_list):
+    api.bulk_insert(context, models.VnfPackageArtifactInfo, values_list)
+
+
 @db_api.context_manager.reader
 def _vnf_artifact_get_by_id(context, id):
 
@@ -151,6 +157,21 @@ class VnfPackageArtifactInfo(base.TackerObject, base.TackerPersistentObject):
             self._context, updates)
         self._from_db_object(self._context, self, db_vnf_artifacts)
 
+    @classmethod
+    def create_bulk(cls, context, vnf_artifacts):
+        """Create artifacts with a single insert statement."""
+        values_list = []
+        for vnf_artifact in vnf_artifacts:
+            if vnf_artifact.obj_attr_is_set('id'):
+                raise exceptions.ObjectActionError(
+                    action='create', reason=_('already created'))
+            vnf_artifact.id = uuidutils.generate_uuid()
+            values_list.append(vnf_artifact.obj_get_changes())
+
+        _vnf_artifacts_create_bulk(context, values_list)
+        for vnf_artifact in vnf_artifacts:
+            vnf_artifact.obj_reset_changes()
+
     def to_dict(self, include_fields=None):
         response = dict()
         fields = ['additionalArtifacts/%s' % attribute for attribute in
@@ -45,6 +45,11 @@ def _vnf_deployment_flavour_create(context, values):
     return vnf_deployment_flavour
 
 
+@db_api.context_manager.writer
+def _vnf_deployment_flavour_create_bulk(context, values_list):
+    api.bulk_insert(context, models.VnfDeploymentFlavour, values_list)
+
+
 @db_api.context_manager.reader
 def _vnf_deployment_flavour_get_by_id(context, id, columns_to_join=None):
 
@@ -159,6 +164,27 @@ class VnfDeploymentFlavour(base.TackerObject, base.TackerPersistentObject):
         db_flavour = _vnf_deployment_flavour_create(self._context, updates)
         self._from_db_object(self._context, self, db_flavour)
 
+    @classmethod
+    def create_bulk(cls, context, flavours):
+        """Create flavours, without their software images, at once."""
+        values_list = []
+        for flavour in flavours:
+            if flavour.obj_attr_is_set('id'):
+                raise exceptions.ObjectActionError(action='create',
+                                                   reason='already created')
+            flavour.id = uuidutils.generate_uuid()
+            updates = flavour.obj_get_changes()
+            updates.pop('software_images', None)
+            special_key = 'instantiation_levels'
+            if special_key in updates:
+                updates[special_key] = jsonutils.dumps(
+                    updates.get(special_key))
+            values_list.append(updates)
+
+        _vnf_deployment_flavour_create_bulk(context, values_list)
+        for flavour in flavours:
+            flavour.obj_reset_changes()
+
     @base.remotable_classmethod
     def get_by_id(cls, context, id, expected_attrs=None):
         db_flavour = _vnf_deployment_flavour_get_by_id(
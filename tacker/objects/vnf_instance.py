@@ -18,8 +18,10 @@ from oslo_log import log as logging
 from oslo_utils import timeutils
 from oslo_utils import uuidutils
 from oslo_versionedobjects import base as ovoo_base
+import sqlalchemy as sa
 from sqlalchemy import exc
 from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import load_only
 from sqlalchemy_filters import apply_filters
 
 from tacker._i18n import _
@@ -28,6 +30,7 @@ from tacker.common import utils
 from tacker.db import api as db_api
 from tacker.db.db_sqlalchemy import api
 from tacker.db.db_sqlalchemy import models
+from tacker.db import sqlalchemyutils
 from tacker.db.vnfm import vnfm_db
 from tacker import objects
 from tacker.objects import base
@@ -108,32 +111,64 @@ def _vnf_instance_list(context, columns_to_join=None):
     return query.all()
 
 
+def _load_only(model, json_fields, fields):
+    return [attr.key for attr in sa.inspect(model).column_attrs
+            if attr.key not in json_fields or attr.key in fields]
+
+
 @db_api.context_manager.reader
 def _vnf_instance_list_by_filter(context, columns_to_join=None,
-                                 filters=None):
+                                 filters=None, limit=None, marker=None,
+                                 fields=None):
     query = api.model_query(context, models.VnfInstance,
                             read_deleted="no",
                             project_only=True)
 
+    # NOTE: JSON columns which are not in fields are not even read from
+    # the database.
+    if fields is not None:
+        query = query.options(load_only(*_load_only(
+            models.VnfInstance, VnfInstance.JSON_FIELDS, fields)))
+
     if columns_to_join:
         for column in columns_to_join:
-            query = query.options(joinedload(column))
+            option = joinedload(column)
+            if fields is not None and column == 'instantiated_vnf_info':
+                option = option.load_only(*_load_only(
+                    models.VnfInstantiatedInfo,
+                    objects.InstantiatedVnfInfo.JSON_FIELDS,
+                    _instantiated_vnf_info_fields(fields)))
+            query = query.options(option)
 
     if filters:
         query = apply_filters(query, filters)
 
+    if limit or marker:
+        marker_obj = models.VnfInstance(id=marker) if marker else None
+        query = sqlalchemyutils.paginate_query(
+            query, models.VnfInstance, limit, [('id', True)],
+            marker_obj=marker_obj)
+
     return query.all()
 
 
+def _instantiated_vnf_info_fields(fields):
+    if fields is None:
+        return None
+    prefix = 'instantiated_vnf_info.'
+    return {field[len(prefix):] for field in fields
+            if field.startswith(prefix)}
+
+
 def _make_vnf_instance_list(context, vnf_instance_list, db_vnf_instance_list,
-                            expected_attrs):
+                            expected_attrs, fields=None):
     vnf_instance_cls = VnfInstance
 
     vnf_instance_list.objects = []
     for db_vnf_instance in db_vnf_instance_list:
         vnf_instance_obj = vnf_instance_cls._from_db_object(
             context, vnf_instance_cls(context), db_vnf_instance,
-            expected_attrs=expected_attrs)
+            expected_attrs=expected_attrs, fields=fields)
         vnf_instance_list.objects.append(vnf_instance_obj)
 
     vnf_instance_list.obj_reset_changes()
@@ -361,28 +396,44 @@ class VnfInstance(base.TackerObject, base.TackerPersistentObject,
 
     FLATTEN_ATTRIBUTES = utils.flatten_dict(ALL_ATTRIBUTES.copy())
 
+    # Fields stored as JSON, which are only loaded when requested when
+    # listing VNF instances.
+    JSON_FIELDS = ['vim_connection_info', 'vnf_metadata']
+
     def __init__(self, context=None, **kwargs):
         super(VnfInstance, self).__init__(context, **kwargs)
         self.obj_set_defaults()
 
     @staticmethod
     def _from_db_object(context, vnf_instance, db_vnf_instance,
-                        expected_attrs=None):
-
+                        expected_attrs=None, fields=None):
+        """Populate vnf_instance from db_vnf_instance.
+
+        :param fields: JSON_FIELDS, and JSON_FIELDS of InstantiatedVnfInfo
+                       prefixed with 'instantiated_vnf_info.', to load. All
+                       of them are loaded if None, the other ones keep
+                       their default value.
+        """
         special_fields = ["instantiated_vnf_info", "vim_connection_info"]
         for key in vnf_instance.fields:
             if key in special_fields:
                 continue
+            if (fields is not None and key in VnfInstance.JSON_FIELDS and
+                    key not in fields):
+                continue
 
             setattr(vnf_instance, key, db_vnf_instance[key])
 
         VnfInstance._load_instantiated_vnf_info_from_db_object(
-            context, vnf_instance, db_vnf_instance)
+            context, vnf_instance, db_vnf_instance,
+            fields=_instantiated_vnf_info_fields(fields))
 
-        vim_connection_info = db_vnf_instance['vim_connection_info']
-        vim_connection_list = [objects.VimConnectionInfo.obj_from_primitive(
-            vim_info, context) for vim_info in vim_connection_info]
-        vnf_instance.vim_connection_info = vim_connection_list
+        if fields is None or 'vim_connection_info' in fields:
+            vim_connection_info = db_vnf_instance['vim_connection_info']
+            vim_connection_list = [
+                objects.VimConnectionInfo.obj_from_primitive(
+                    vim_info, context) for vim_info in vim_connection_info]
+            vnf_instance.vim_connection_info = vim_connection_list
 
         vnf_instance._context = context
         vnf_instance.obj_reset_changes()
@@ -391,10 +442,12 @@ class VnfInstance(base.TackerObject, base.TackerPersistentObject,
 
     @staticmethod
     def _load_instantiated_vnf_info_from_db_object(context, vnf_instance,
-                                                   db_vnf_instance):
+                                                   db_vnf_instance,
+                                                   fields=None):
         if db_vnf_instance['instantiated_vnf_info']:
             inst_vnf_info = objects.InstantiatedVnfInfo.obj_from_db_obj(
-                context, db_vnf_instance['instantiated_vnf_info'])
+                context, db_vnf_instance['instantiated_vnf_info'],
+                fields=fields)
             vnf_instance.instantiated_vnf_info = inst_vnf_info
 
     @base.remotable
@@ -543,14 +596,23 @@ class VnfInstanceList(ovoo_base.ObjectListBase, base.TackerObject):
 
     @base.remotable_classmethod
     def get_by_filters(cls, context, filters=None,
-                       expected_attrs=None):
+                       expected_attrs=None, limit=None, marker=None,
+                       fields=None):
+        """Return VNF instances matching filters, ordered by id.
+
+        :param limit: maximum number of VNF instances to return
+        :param marker: id of the last VNF instance of the previous page,
+                       only VNF instances following it are returned
+        :param fields: JSON fields to load, see VnfInstance._from_db_object.
+                       All fields are loaded if None.
+        """
         expected_attrs = ["instantiated_vnf_info"]
         db_vnf_instances = _vnf_instance_list_by_filter(
             context, columns_to_join=expected_attrs,
-            filters=filters)
+            filters=filters, limit=limit, marker=marker, fields=fields)
 
         return _make_vnf_instance_list(context, cls(), db_vnf_instances,
-                                       expected_attrs)
+                                       expected_attrs, fields=fields)
 
     @base.remotable_classmethod
     def vnf_instance_list(cls, vnfd_id, context):
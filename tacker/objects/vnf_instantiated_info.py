@@ -141,67 +141,45 @@ class InstantiatedVnfInfo(base.TackerObject, base.TackerObjectDictCompat,
 
     FLATTEN_ATTRIBUTES = utils.flatten_dict(ALL_ATTRIBUTES.copy())
 
+    # Fields stored as JSON, which are only loaded when requested when
+    # listing VNF instances.
+    JSON_FIELDS = ['scale_status', 'ext_cp_info', 'ext_virtual_link_info',
+                   'ext_managed_virtual_link_info', 'vnfc_resource_info',
+                   'vnf_virtual_link_resource_info',
+                   'virtual_storage_resource_info', 'vnfc_info',
+                   'additional_params']
+
     @staticmethod
-    def _from_db_object(context, inst_vnf_info, db_inst_vnf_info):
-
-        special_fields = ['scale_status',
-                          'ext_cp_info', 'ext_virtual_link_info',
-                          'ext_managed_virtual_link_info',
-                          'vnfc_resource_info',
-                          'vnf_virtual_link_resource_info',
-                          'virtual_storage_resource_info',
-                          'vnfc_info']
+    def _from_db_object(context, inst_vnf_info, db_inst_vnf_info,
+                        fields=None):
+        """Populate inst_vnf_info from db_inst_vnf_info.
+
+        :param fields: JSON_FIELDS to load, all of them if None. The other
+                       ones are set empty without being read, they may not
+                       have been loaded from the database.
+        """
+        object_list_fields = {
+            'scale_status': ScaleInfo,
+            'ext_cp_info': VnfExtCpInfo,
+            'ext_virtual_link_info': ExtVirtualLinkInfo,
+            'ext_managed_virtual_link_info': ExtManagedVirtualLinkInfo,
+            'vnfc_resource_info': VnfcResourceInfo,
+            'vnf_virtual_link_resource_info': VnfVirtualLinkResourceInfo,
+            'virtual_storage_resource_info': VirtualStorageResourceInfo,
+            'vnfc_info': VnfcInfo,
+        }
         for key in inst_vnf_info.fields:
-            if key in special_fields:
-                continue
-
-            setattr(inst_vnf_info, key, db_inst_vnf_info.get(key))
-
-        scale_status = db_inst_vnf_info['scale_status']
-        scale_status_list = [ScaleInfo.obj_from_primitive(scale, context)
-                    for scale in scale_status]
-        inst_vnf_info.scale_status = scale_status_list
-
-        ext_cp_info = db_inst_vnf_info['ext_cp_info']
-        ext_cp_info_list = [VnfExtCpInfo.obj_from_primitive(ext_cp, context)
-                    for ext_cp in ext_cp_info]
-        inst_vnf_info.ext_cp_info = ext_cp_info_list
-
-        vnfc_resource_info = db_inst_vnf_info['vnfc_resource_info']
-        vnfc_resource_info_list = [VnfcResourceInfo.obj_from_primitive(
-            vnfc_resource, context) for vnfc_resource in vnfc_resource_info]
-        inst_vnf_info.vnfc_resource_info = vnfc_resource_info_list
-
-        storage_res_info = db_inst_vnf_info['virtual_storage_resource_info']
-        storage_res_info_list = [VirtualStorageResourceInfo.
-            obj_from_primitive(storage_resource, context)
-            for storage_resource in storage_res_info]
-        inst_vnf_info.virtual_storage_resource_info = storage_res_info_list
-
-        ext_virtual_link_info = db_inst_vnf_info['ext_virtual_link_info']
-        ext_vl_info_list = [ExtVirtualLinkInfo.obj_from_primitive(
-            ext_vl_info, context) for ext_vl_info in ext_virtual_link_info]
-        inst_vnf_info.ext_virtual_link_info = ext_vl_info_list
-
-        ext_mng_vl_info = db_inst_vnf_info['ext_managed_virtual_link_info']
-        ext_managed_vl_info_list = [ExtManagedVirtualLinkInfo.
-            obj_from_primitive(ext_managed_vl_info, context) for
-            ext_managed_vl_info in ext_mng_vl_info]
-        inst_vnf_info.ext_managed_virtual_link_info = ext_managed_vl_info_list
-
-        vnf_vl_resource_info = db_inst_vnf_info[
-            'vnf_virtual_link_resource_info']
-        vnf_vl_info_list = [VnfVirtualLinkResourceInfo.
-            obj_from_primitive(vnf_vl_info, context) for vnf_vl_info in
-            vnf_vl_resource_info]
-        inst_vnf_info.vnf_virtual_link_resource_info = vnf_vl_info_list
-
-        vnfc_info = db_inst_vnf_info[
-            'vnfc_info']
-        vnfc_info_list = [VnfcInfo.
-            obj_from_primitive(vnfc, context) for vnfc in
-            vnfc_info]
-        inst_vnf_info.vnfc_info = vnfc_info_list
+            if (fields is not None and key in InstantiatedVnfInfo.JSON_FIELDS
+                    and key not in fields):
+                setattr(inst_vnf_info, key,
+                        [] if key in object_list_fields else {})
+            elif key in object_list_fields:
+                setattr(inst_vnf_info, key, [
+                    object_list_fields[key].obj_from_primitive(
+                        primitive, context)
+                    for primitive in db_inst_vnf_info[key]])
+            else:
+                setattr(inst_vnf_info, key, db_inst_vnf_info.get(key))
 
         inst_vnf_info._context = context
         inst_vnf_info.obj_reset_changes()
@@ -293,8 +271,8 @@ class InstantiatedVnfInfo(base.TackerObject, base.TackerObjectDictCompat,
         return instantiate_vnf_info
 
     @classmethod
-    def obj_from_db_obj(cls, context, db_obj):
-        return cls._from_db_object(context, cls(), db_obj)
+    def obj_from_db_obj(cls, context, db_obj, fields=None):
+        return cls._from_db_object(context, cls(), db_obj, fields=fields)
 
     @classmethod
     def _from_dict(cls, data_dict):
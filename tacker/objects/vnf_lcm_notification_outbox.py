@@ -0,0 +1,202 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import datetime
+
+from oslo_log import log as logging
+from oslo_serialization import jsonutils
+from oslo_utils import timeutils
+import sqlalchemy as sa
+
+from tacker.db import api as db_api
+from tacker.db.db_sqlalchemy import models
+from tacker.objects import base
+from tacker.objects import fields
+
+LOG = logging.getLogger(__name__)
+
+
+def _unclaimed(now):
+    model = models.VnfLcmNotificationOutbox
+    return sa.or_(model.claimed_by.is_(None), model.lease_expires < now)
+
+
+@db_api.context_manager.writer
+def _outbox_enqueue(context, entries):
+    context.session.execute(
+        models.VnfLcmNotificationOutbox.__table__.insert(None),
+        entries)
+
+
+@db_api.context_manager.writer
+def _outbox_claim_rows(context, owner, limit, lease_time):
+    model = models.VnfLcmNotificationOutbox
+    now = timeutils.utcnow()
+    candidates = [row.id for row in
+                  context.session.query(model.id).
+                  filter(_unclaimed(now)).
+                  order_by(model.id).
+                  limit(limit)]
+    if not candidates:
+        return []
+
+    context.session.query(model).\
+        filter(model.id.in_(candidates)).\
+        filter(_unclaimed(now)).\
+        update({'claimed_by': owner,
+                'lease_expires': now + datetime.timedelta(
+                    seconds=lease_time)},
+               synchronize_session=False)
+    return candidates
+
+
+@db_api.context_manager.writer
+def _outbox_release_out_of_order(context, owner, candidates):
+    """Give back claimed rows that would overtake an older notification.
+
+    Another conductor may have claimed an older notification of the same
+    subscription concurrently. Rows of such a subscription are released
+    so that notifications are always delivered in the order they were
+    enqueued.
+    """
+    model = models.VnfLcmNotificationOutbox
+    claimed = context.session.query(model).\
+        filter(model.id.in_(candidates)).\
+        filter(model.claimed_by == owner).\
+        order_by(model.id).all()
+
+    first_claimed = {}
+    for row in claimed:
+        first_claimed.setdefault(row.subscription_id, row.id)
+    if not first_claimed:
+        return []
+
+    others = context.session.query(
+        model.subscription_id, sa.func.min(model.id)).\
+        filter(model.subscription_id.in_(list(first_claimed))).\
+        filter(sa.or_(model.claimed_by.is_(None),
+                      model.claimed_by != owner)).\
+        group_by(model.subscription_id)
+    blocked = [subscription_id for subscription_id, min_id in others
+               if min_id < first_claimed[subscription_id]]
+    if blocked:
+        LOG.debug("Notifications of subscriptions %s are delivered by "
+                  "another conductor, releasing them", blocked)
+        context.session.query(model).\
+            filter(model.id.in_(candidates)).\
+            filter(model.claimed_by == owner).\
+            filter(model.subscription_id.in_(blocked)).\
+            update({'claimed_by': None, 'lease_expires': None},
+                   synchronize_session=False)
+
+    return [row for row in claimed if row.subscription_id not in blocked]
+
+
+@db_api.context_manager.reader
+def _subscription_authentications(context, subscription_ids):
+    model = models.VnfLcmSubscriptions
+    query = context.session.query(
+        model.id, model.subscription_authentication).\
+        filter(model.id.in_(subscription_ids))
+    authentications = {}
+    for row in query:
+        authentication = row.subscription_authentication
+        if authentication is not None and not isinstance(
+                authentication, (str, bytes)):
+            authentication = jsonutils.dumps(authentication)
+        authentications[row.id] = authentication
+    return authentications
+
+
+@db_api.context_manager.writer
+def _outbox_renew(context, owner, lease_time):
+    model = models.VnfLcmNotificationOutbox
+    context.session.query(model).\
+        filter(model.claimed_by == owner).\
+        update({'lease_expires': timeutils.utcnow() +
+                datetime.timedelta(seconds=lease_time)},
+               synchronize_session=False)
+
+
+@db_api.context_manager.writer
+def _outbox_delete(context, ids):
+    model = models.VnfLcmNotificationOutbox
+    context.session.query(model).\
+        filter(model.id.in_(ids)).\
+        delete(synchronize_session=False)
+
+
+@base.TackerObjectRegistry.register
+class VnfLcmNotificationOutbox(base.TackerObject, base.TackerPersistentObject):
+    """Notification persisted until it is delivered to a subscriber."""
+
+    # Version 1.0: Initial version
+    VERSION = '1.0'
+
+    fields = {
+        'id': fields.IntegerField(nullable=False),
+        'subscription_id': fields.StringField(nullable=False),
+        'callback_uri': fields.StringField(nullable=False),
+        'notification': fields.DictOfNullableField(nullable=False),
+        'subscription_authentication': fields.StringField(nullable=True),
+    }
+
+    @staticmethod
+    def _from_db_object(context, outbox, db_outbox, authentication=None):
+        for key in ('id', 'subscription_id', 'callback_uri',
+                    'notification', 'created_at', 'updated_at'):
+            setattr(outbox, key, db_outbox[key])
+        outbox.subscription_authentication = authentication
+        outbox._context = context
+        outbox.obj_reset_changes()
+        return outbox
+
+    @base.remotable_classmethod
+    def enqueue(cls, context, entries):
+        """Persist notifications with a single batched INSERT.
+
+        :param entries: list of dicts with subscription_id, callback_uri
+                        and notification keys
+        """
+        if entries:
+            _outbox_enqueue(context, entries)
+
+    @base.remotable_classmethod
+    def claim(cls, context, owner, limit, lease_time):
+        """Claim the oldest undelivered notifications for ``owner``.
+
+        Rows are leased for ``lease_time`` seconds and are claimable again
+        once the lease expires, e.g. when the owning conductor died.
+        """
+        candidates = _outbox_claim_rows(context, owner, limit, lease_time)
+        if not candidates:
+            return []
+
+        claimed = _outbox_release_out_of_order(context, owner, candidates)
+        if not claimed:
+            return []
+
+        authentications = _subscription_authentications(
+            context, list({row.subscription_id for row in claimed}))
+        return [cls._from_db_object(
+                context, cls(), row,
+                authentications.get(row.subscription_id))
+                for row in claimed]
+
+    @base.remotable_classmethod
+    def renew(cls, context, owner, lease_time):
+        _outbox_renew(context, owner, lease_time)
+
+    @base.remotable_classmethod
+    def delete_by_ids(cls, context, ids):
+        if ids:
+            _outbox_delete(context, ids)
@@ -19,6 +19,7 @@ import tacker.conf
 from tacker.db import api as db_api
 from tacker.db.db_sqlalchemy import api
 from tacker.db.db_sqlalchemy import models
+from tacker.db import sqlalchemyutils
 from tacker.objects import base
 from tacker.objects import fields
 
@@ -45,59 +46,34 @@ def _make_list(value):
 
 
 @db_api.context_manager.reader
-def _vnf_lcm_subscriptions_get(context,
-                               notification_type,
-                               operation_type=None
-                               ):
-
-    if notification_type == 'VnfLcmOperationOccurrenceNotification':
-        sql = (
-            "select"
-            " t1.id,t1.callback_uri,t1.subscription_authentication,t2.filter "
-            " from "
-            " vnf_lcm_subscriptions t1, "
-            " (select distinct subscription_uuid,filter from vnf_lcm_filters "
-            " where "
-            " (notification_types_len = 0 \
-                or JSON_CONTAINS(notification_types, '" +
-            _make_list(notification_type) +
-            "')) "
-            " and "
-            " (operation_types_len = 0 or JSON_CONTAINS(operation_types, '" +
-            _make_list(operation_type) +
-            "')) "
-            " order by "
-            "         notification_types_len desc,"
-            "         operation_types_len desc"
-            ") t2 "
-            " where "
-            " t1.id=t2.subscription_uuid "
-            " and t1.deleted=0")
-    else:
-        sql = (
-            "select"
-            " t1.id,t1.callback_uri,t1.subscription_authentication,t2.filter "
-            " from "
-            " vnf_lcm_subscriptions t1, "
-            " (select distinct subscription_uuid,filter from vnf_lcm_filters "
-            " where "
-            " (notification_types_len = 0 or \
-                JSON_CONTAINS(notification_types, '" +
-            _make_list(notification_type) +
-            "')) "
-            " order by "
-            "         notification_types_len desc,"
-            "         operation_types_len desc"
-            ") t2 "
-            " where "
-            " t1.id=t2.subscription_uuid "
-            " and t1.deleted=0")
-
-    result_list = []
-    result = context.session.execute(sql)
-    for line in result:
-        result_list.append(line)
-    return result_list
+def _vnf_lcm_subscriptions_get_all(context):
+    query = context.session.query(
+        models.VnfLcmSubscriptions.id,
+        models.VnfLcmSubscriptions.callback_uri,
+        models.VnfLcmSubscriptions.subscription_authentication,
+        models.VnfLcmFilters.filter).\
+        join(models.VnfLcmFilters,
+             models.VnfLcmFilters.subscription_uuid ==
+             models.VnfLcmSubscriptions.id).\
+        filter(models.VnfLcmSubscriptions.deleted == 0)
+    return query.all()
+
+
+@db_api.context_manager.reader
+def _vnf_instance_filter_attributes_get(context, vnf_instance_id):
+    # NOTE: deleted instances are read as well, the notification of the
+    # deletion of a VNF identifier is sent after the instance is deleted.
+    query = api.model_query(
+        context, models.VnfInstance,
+        args=(models.VnfInstance.vnf_instance_name,
+              models.VnfInstance.vnf_provider,
+              models.VnfInstance.vnf_product_name,
+              models.VnfInstance.vnf_software_version,
+              models.VnfInstance.vnfd_version,
+              models.VnfInstance.vnfd_id),
+        read_deleted='yes').filter_by(id=vnf_instance_id)
+    result = query.first()
+    return dict(result._asdict()) if result else None
 
 
 @db_api.context_manager.reader
@@ -124,24 +100,25 @@ def _vnf_lcm_subscriptions_show(context, subscriptionId):
 
 
 @db_api.context_manager.reader
-def _vnf_lcm_subscriptions_all(context):
-
-    sql = text(
-        "select "
-        "t1.id,t1.callback_uri,t2.filter "
-        "from vnf_lcm_subscriptions t1, "
-        "(select distinct subscription_uuid,filter from vnf_lcm_filters) t2 "
-        "where t1.id = t2.subscription_uuid "
-        "and deleted = 0 ")
-    result_list = []
-    try:
-        result = context.session.execute(sql)
-        for line in result:
-            result_list.append(line)
-    except Exception as e:
-        raise e
-
-    return result_list
+def _vnf_lcm_subscriptions_all(context, limit=None, marker=None):
+    query = context.session.query(
+        models.VnfLcmSubscriptions.id,
+        models.VnfLcmSubscriptions.callback_uri,
+        models.VnfLcmFilters.filter).\
+        join(models.VnfLcmFilters,
+             models.VnfLcmFilters.subscription_uuid ==
+             models.VnfLcmSubscriptions.id).\
+        filter(models.VnfLcmSubscriptions.deleted == 0)
+
+    # NOTE: the marker does not have to exist anymore, only its id is
+    # compared, so a subscription deleted meanwhile does not break paging.
+    marker_obj = None
+    if marker:
+        marker_obj = models.VnfLcmSubscriptions(id=marker)
+    query = sqlalchemyutils.paginate_query(
+        query, models.VnfLcmSubscriptions, limit, [('id', True)],
+        marker_obj=marker_obj)
+    return query.all()
 
 
 @db_api.context_manager.reader
@@ -308,22 +285,28 @@ class LccnSubscriptionRequest(base.TackerObject, base.TackerPersistentObject):
         return vnf_lcm_subscriptions
 
     @base.remotable_classmethod
-    def vnf_lcm_subscriptions_list(cls, context):
-        # get vnf_lcm_subscriptions data
-        try:
-            vnf_lcm_subscriptions = _vnf_lcm_subscriptions_all(context)
-        except Exception as e:
-            raise e
+    def vnf_lcm_subscriptions_list(cls, context, limit=None, marker=None):
+        """Return subscriptions ordered by id.
 
-        return vnf_lcm_subscriptions
+        :param limit: maximum number of subscriptions to return
+        :param marker: id of the last subscription of the previous page,
+                       only subscriptions following it are returned
+        """
+        return _vnf_lcm_subscriptions_all(context, limit=limit, marker=marker)
+
+    @base.remotable_classmethod
+    def vnf_lcm_subscriptions_get_all(cls, context):
+        """Return all subscriptions with their filter.
+
+        The filters are returned as they are stored, matching them against
+        notifications is done by the subscription index of the conductor.
+        """
+        return _vnf_lcm_subscriptions_get_all(context)
 
     @base.remotable_classmethod
-    def vnf_lcm_subscriptions_get(cls, context,
-                                  notification_type,
-                                  operation_type=None):
-        return _vnf_lcm_subscriptions_get(context,
-                                          notification_type,
-                                          operation_type)
+    def vnf_instance_filter_attributes_get(cls, context, vnf_instance_id):
+        """Return the VNF instance attributes a subscription filters on."""
+        return _vnf_instance_filter_attributes_get(context, vnf_instance_id)
 
     @base.remotable_classmethod
     def destroy(cls, context, subscriptionId):
@@ -14,15 +14,14 @@
 
 from oslo_db import exception as db_exc
 from oslo_log import log as logging
-from oslo_serialization import jsonutils as json
 from oslo_utils import excutils
 from oslo_utils import timeutils
 from oslo_utils import uuidutils
 from oslo_utils import versionutils
 from oslo_versionedobjects import base as ovoo_base
 from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import selectinload
 from sqlalchemy.sql import func
-from sqlalchemy_filters import apply_filters
 
 from tacker._i18n import _
 from tacker.common import exceptions
@@ -30,6 +29,7 @@ from tacker.common import utils
 from tacker.db import api as db_api
 from tacker.db.db_sqlalchemy import api
 from tacker.db.db_sqlalchemy import models
+from tacker.db import sqlalchemyutils
 from tacker import objects
 from tacker.objects import base
 from tacker.objects import fields
@@ -162,30 +162,42 @@ def _vnf_package_list(context, columns_to_join=None):
     return query.all()
 
 
+# Child models of VnfPackage which can be filtered on, mapped to the model,
+# its column referring to the parent model and the name of the parent model.
+_FILTER_RELATIONS = {
+    'VnfPackageVnfd': (models.VnfPackageVnfd, 'package_uuid', 'VnfPackage'),
+    'VnfPackageUserData': (models.VnfPackageUserData, 'package_uuid',
+                           'VnfPackage'),
+    'VnfPackageArtifactInfo': (models.VnfPackageArtifactInfo,
+                               'package_uuid', 'VnfPackage'),
+    'VnfDeploymentFlavour': (models.VnfDeploymentFlavour, 'package_uuid',
+                             'VnfPackage'),
+    'VnfSoftwareImage': (models.VnfSoftwareImage, 'flavour_uuid',
+                         'VnfDeploymentFlavour'),
+    'VnfSoftwareImageMetadata': (models.VnfSoftwareImageMetadata,
+                                 'image_uuid', 'VnfSoftwareImage'),
+}
+
+
 @db_api.context_manager.reader
-def _vnf_package_list_by_filters(context, read_deleted=None, filters=None):
+def _vnf_package_list_by_filters(context, read_deleted=None, filters=None,
+                                 limit=None, marker=None):
     query = api.model_query(context, models.VnfPackage,
                             read_deleted=read_deleted,
-                            project_only=True).options(joinedload('_metadata'))
+                            project_only=True).options(
+        selectinload('_metadata'))
+
+    # NOTE: Filters on the attributes of the vnfd, software images,
+    # artifacts and user defined data are evaluated in EXISTS subqueries,
+    # so the child tables are not joined to the packages.
+    query = sqlalchemyutils.apply_filters(query, models.VnfPackage, filters,
+                                          relations=_FILTER_RELATIONS)
 
-    if filters:
-        # Need to join VnfDeploymentFlavour, VnfSoftwareImage and
-        # VnfSoftwareImageMetadata db table explicitly
-        # only when filters contains one of the column matching
-        # from VnfSoftwareImage or VnfSoftwareImageMetadata db table.
-        filter_data = json.dumps(filters)
-        if 'VnfSoftwareImageMetadata' in filter_data:
-            query = query.join(models.VnfDeploymentFlavour).join(
-                models.VnfSoftwareImage).join(
-                models.VnfSoftwareImageMetadata)
-        elif 'VnfSoftwareImage' in filter_data:
-            query = query.join(models.VnfDeploymentFlavour).join(
-                models.VnfSoftwareImage)
-
-        if 'VnfPackageArtifactInfo' in filter_data:
-            query = query.join(models.VnfPackageArtifactInfo)
-
-        query = apply_filters(query, filters)
+    if limit or marker:
+        marker_obj = models.VnfPackage(id=marker) if marker else None
+        query = sqlalchemyutils.paginate_query(
+            query, models.VnfPackage, limit, [('id', True)],
+            marker_obj=marker_obj)
 
     return query.all()
 
@@ -672,8 +684,10 @@ class VnfPackagesList(ovoo_base.ObjectListBase, base.TackerObject):
                                        expected_attrs)
 
     @base.remotable_classmethod
-    def get_by_filters(cls, context, read_deleted=None, filters=None):
+    def get_by_filters(cls, context, read_deleted=None, filters=None,
+                       limit=None, marker=None):
         db_vnf_packages = _vnf_package_list_by_filters(context,
                                             read_deleted=read_deleted,
-                                            filters=filters)
+                                            filters=filters, limit=limit,
+                                            marker=marker)
         return _make_vnf_packages_list(context, cls(), db_vnf_packages)
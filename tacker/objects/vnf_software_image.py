@@ -64,6 +64,12 @@ def _vnf_sw_image_create(context, values, metadata=None):
     return vnf_sw_image
 
 
+@db_api.context_manager.writer
+def _vnf_sw_image_create_bulk(context, values_list, metadata_list):
+    api.bulk_insert(context, models.VnfSoftwareImage, values_list)
+    api.bulk_insert(context, models.VnfSoftwareImageMetadata, metadata_list)
+
+
 @db_api.context_manager.reader
 def _vnf_sw_image_get_by_id(context, id):
 
@@ -225,6 +231,27 @@ class VnfSoftwareImage(base.TackerObject, base.TackerPersistentObject):
                                            metadata=metadata)
         self._from_db_object(self._context, self, db_sw_image)
 
+    @classmethod
+    def create_bulk(cls, context, sw_images):
+        """Create software images, and their metadata, at once."""
+        values_list = []
+        metadata_list = []
+        for sw_image in sw_images:
+            if sw_image.obj_attr_is_set('id'):
+                raise exceptions.ObjectActionError(
+                    action='create', reason=_('already created'))
+            sw_image.id = uuidutils.generate_uuid()
+            updates = sw_image.obj_get_changes()
+            metadata = updates.pop('metadata', None) or {}
+            values_list.append(updates)
+            metadata_list.extend({"key": key, "value": value,
+                                  "image_uuid": sw_image.id}
+                                 for key, value in metadata.items())
+
+        _vnf_sw_image_create_bulk(context, values_list, metadata_list)
+        for sw_image in sw_images:
+            sw_image.obj_reset_changes()
+
     @base.remotable_classmethod
     def get_by_id(cls, context, id, expected_attrs=None):
         db_sw_image = _vnf_sw_image_get_by_id(context, id)
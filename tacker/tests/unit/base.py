@@ -19,8 +19,14 @@ from oslo_config import cfg
 from oslo_config import fixture as config_fixture
 from requests_mock.contrib import fixture as requests_mock_fixture
 
+from tacker import auth
+from tacker.common.container import kubernetes_utils
+from tacker.common import http_client
 from tacker.tests import base
 from tacker.tests.unit import fixtures as tacker_fixtures
+from tacker.vnflcm import template_cache
+from tacker.vnfm.infra_drivers.openstack import heat_client
+from tacker.vnfm.infra_drivers.openstack import translate_template
 
 CONF = cfg.CONF
 
@@ -35,6 +41,21 @@ class TestCase(base.BaseTestCase):
         # Limit the amount of DeprecationWarning messages in the unit test logs
         self.useFixture(tacker_fixtures.WarningsFixture())
 
+        # Do not share parsed templates of VNF packages between tests.
+        self.addCleanup(template_cache.invalidate)
+        # Nor the heat and Kubernetes API clients, which are mocked by each
+        # test.
+        heat_client.clear_client_cache()
+        self.addCleanup(heat_client.clear_client_cache)
+        kubernetes_utils.CLIENTS.invalidate()
+        self.addCleanup(kubernetes_utils.CLIENTS.invalidate)
+        self.addCleanup(translate_template.TOSCA_TEMPLATES.clear)
+        # Nor the tokens validated by the mocked authorization servers.
+        auth.token_validation_cache.clear()
+        self.addCleanup(auth.token_validation_cache.clear)
+        # Nor the outbound HTTP connections and their metrics.
+        self.addCleanup(http_client.ADAPTER.clear)
+
     def _mock(self, target, new=mock.DEFAULT):
         patcher = mock.patch(target, new)
         return patcher.start()
@@ -12,6 +12,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import hashlib
+import io
 import os
 import shutil
 import tempfile
@@ -20,11 +22,17 @@ from unittest import mock
 import uuid
 import zipfile
 
+import eventlet
+import fixtures
+from oslo_config import cfg
+from oslo_config import fixture as config_fixture
+
 from tacker.common import csar_utils
 from tacker.common import exceptions
 from tacker import context
 from tacker.tests import constants
 from tacker.tests import utils
+from tacker.tests import uuidsentinel
 
 
 class TestCSARUtils(testtools.TestCase):
@@ -32,12 +40,15 @@ class TestCSARUtils(testtools.TestCase):
     def setUp(self):
         super(TestCSARUtils, self).setUp()
         self.context = context.get_admin_context()
+        # The CSARs are extracted while they are loaded.
+        self.csar_path = self.useFixture(fixtures.TempDir()).path
+        self.useFixture(config_fixture.Config(cfg.CONF)).config(
+            vnf_package_csar_path=self.csar_path, group='vnf_package')
 
     def _get_csar_file_path(self, file_name):
         return os.path.join("./tacker/tests/etc/samples", file_name)
 
-    @mock.patch('tacker.common.csar_utils.extract_csar_zip_file')
-    def test_load_csar_data(self, mock_extract_csar_zip_file):
+    def test_load_csar_data(self):
         file_path, _ = utils.create_csar_with_unique_vnfd_id(
             './tacker/tests/etc/samples/etsi/nfv/'
             'sample_vnfpkg_tosca_vnfd')
@@ -48,10 +59,21 @@ class TestCSARUtils(testtools.TestCase):
         self.assertEqual(vnf_data['vnfm_info'], ['Tacker'])
         self.assertEqual(flavours[0]['flavour_id'], 'simple')
         self.assertIsNotNone(flavours[0]['sw_images'])
-
-    @mock.patch('tacker.common.csar_utils.extract_csar_zip_file')
-    def test_load_csar_data_with_single_yaml(
-            self, mock_extract_csar_zip_file):
+        # The CSAR is extracted while it is loaded.
+        extract_path = os.path.join(self.csar_path, constants.UUID)
+        extracted = {}
+        for dir_path, _dirs, file_names in os.walk(extract_path):
+            for file_name in file_names:
+                path = os.path.join(dir_path, file_name)
+                with open(path, 'rb') as f:
+                    extracted[os.path.relpath(path, extract_path)] = f.read()
+        with zipfile.ZipFile(file_path) as zf:
+            self.assertEqual(
+                {info.filename: zf.read(info) for info in zf.infolist()
+                 if not info.is_dir()},
+                extracted)
+
+    def test_load_csar_data_with_single_yaml(self):
         file_path, _ = utils.create_csar_with_unique_vnfd_id(
             './tacker/tests/etc/samples/etsi/nfv/'
             'sample_vnfpkg_no_meta_single_vnfd')
@@ -93,9 +115,7 @@ class TestCSARUtils(testtools.TestCase):
         zcsar.close()
         return tempname
 
-    @mock.patch('tacker.common.csar_utils.extract_csar_zip_file')
-    def test_load_csar_data_in_meta_and_manifest_with_vnf_artifact(
-            self, mock_extract_csar_zip_file):
+    def test_load_csar_data_in_meta_and_manifest_with_vnf_artifact(self):
         file_path = utils.create_csar_with_unique_artifact(
             './tacker/tests/etc/samples/etsi/nfv/'
             'sample_vnf_package_csar_in_meta_and_manifest')
@@ -113,9 +133,7 @@ class TestCSARUtils(testtools.TestCase):
             flag = item.get('Source').lower().endswith('.img')
             self.assertEqual(flag, False)
 
-    @mock.patch('tacker.common.csar_utils.extract_csar_zip_file')
-    def test_load_csar_data_with_single_manifest_with_vnf_artifact(
-            self, mock_extract_csar_zip_file):
+    def test_load_csar_data_with_single_manifest_with_vnf_artifact(self):
         file_path = utils.create_csar_with_unique_artifact(
             './tacker/tests/etc/samples/etsi/nfv/'
             'sample_vnf_package_csar_manifest')
@@ -130,9 +148,7 @@ class TestCSARUtils(testtools.TestCase):
         self.assertIsNotNone(vnf_artifacts[0]['Source'])
         self.assertIsNotNone(vnf_artifacts[0]['Hash'])
 
-    @mock.patch('tacker.common.csar_utils.extract_csar_zip_file')
-    def test_load_csar_data_with_single_meta_with_vnf_artifact(
-            self, mock_extract_csar_zip_file):
+    def test_load_csar_data_with_single_meta_with_vnf_artifact(self):
         file_path = utils.create_csar_with_unique_artifact(
             './tacker/tests/etc/samples/etsi/nfv/'
             'sample_vnf_package_csar_meta')
@@ -147,9 +163,7 @@ class TestCSARUtils(testtools.TestCase):
         self.assertIsNotNone(vnf_artifacts[0]['Source'])
         self.assertIsNotNone(vnf_artifacts[0]['Hash'])
 
-    @mock.patch('tacker.common.csar_utils.extract_csar_zip_file')
-    def test_load_csar_data_meta_in_manifest_with_vnf_artifact(
-            self, mock_extract_csar_zip_file):
+    def test_load_csar_data_meta_in_manifest_with_vnf_artifact(self):
         file_path = utils.create_csar_with_unique_artifact(
             './tacker/tests/etc/samples/etsi/nfv/'
             'sample_vnf_package_csar_meta_in_manifest')
@@ -164,9 +178,7 @@ class TestCSARUtils(testtools.TestCase):
         self.assertIsNotNone(vnf_artifacts[0]['Source'])
         self.assertIsNotNone(vnf_artifacts[0]['Hash'])
 
-    @mock.patch('tacker.common.csar_utils.extract_csar_zip_file')
-    def test_load_csar_data_false_mf_with_vnf_artifact(
-            self, mock_extract_csar_zip_file):
+    def test_load_csar_data_false_mf_with_vnf_artifact(self):
         file_path = utils.create_csar_with_unique_artifact(
             './tacker/tests/etc/samples/etsi/nfv/'
             'sample_vnf_package_csar_in_meta_and_manifest_false')
@@ -180,9 +192,7 @@ class TestCSARUtils(testtools.TestCase):
                {'manifest': manifest_path, 'csar': file_path})
         self.assertEqual(msg, exc.format_message())
 
-    @mock.patch('tacker.common.csar_utils.extract_csar_zip_file')
-    def test_load_csar_data_false_mf_name_with_vnf_artifact(
-            self, mock_extract_csar_zip_file):
+    def test_load_csar_data_false_mf_name_with_vnf_artifact(self):
         file_path = utils.create_csar_with_unique_artifact(
             './tacker/tests/etc/samples/etsi/nfv/'
             'sample_vnf_package_csar_in_single_manifest_false_name')
@@ -197,9 +207,7 @@ class TestCSARUtils(testtools.TestCase):
                {'manifest': manifest_path})
         self.assertEqual(msg, exc.format_message())
 
-    @mock.patch('tacker.common.csar_utils.extract_csar_zip_file')
-    def test_load_csar_data_false_hash_with_vnf_artifact(
-            self, mock_extract_csar_zip_file):
+    def test_load_csar_data_false_hash_with_vnf_artifact(self):
         file_path = utils.create_csar_with_unique_artifact(
             './tacker/tests/etc/samples/etsi/nfv/'
             'sample_vnf_package_csar_in_meta_and_manifest_false_hash')
@@ -215,9 +223,7 @@ class TestCSARUtils(testtools.TestCase):
                {'hash': hash_code, 'artifact': artifact_path})
         self.assertEqual(msg, exc.format_message())
 
-    @mock.patch('tacker.common.csar_utils.extract_csar_zip_file')
-    def test_load_csar_data_missing_key_with_vnf_artifact(
-            self, mock_extract_csar_zip_file):
+    def test_load_csar_data_missing_key_with_vnf_artifact(self):
         file_path = utils.create_csar_with_unique_artifact(
             './tacker/tests/etc/samples/etsi/nfv/'
             'sample_vnf_package_csar_in_meta_and_manifest_missing_key')
@@ -230,9 +236,7 @@ class TestCSARUtils(testtools.TestCase):
                 'the key("%(key)s")') % {'key': key_name})
         self.assertEqual(msg, exc.format_message())
 
-    @mock.patch('tacker.common.csar_utils.extract_csar_zip_file')
-    def test_load_csar_data_missing_value_with_vnf_artifact(
-            self, mock_extract_csar_zip_file):
+    def test_load_csar_data_missing_value_with_vnf_artifact(self):
         file_path = utils.create_csar_with_unique_artifact(
             './tacker/tests/etc/samples/etsi/nfv/'
             'sample_vnf_package_csar_in_meta_and_manifest_missing_value')
@@ -245,9 +249,7 @@ class TestCSARUtils(testtools.TestCase):
                 'the key value("%(key)s")') % {'key': key_name})
         self.assertEqual(msg, exc.format_message())
 
-    @mock.patch('tacker.common.csar_utils.extract_csar_zip_file')
-    def test_load_csar_data_false_source_with_vnf_artifact(
-            self, mock_extract_csar_zip_file):
+    def test_load_csar_data_false_source_with_vnf_artifact(self):
         file_path = utils.create_csar_with_unique_artifact(
             './tacker/tests/etc/samples/etsi/nfv/'
             'sample_vnf_package_csar_in_meta_and_manifest_false_source')
@@ -261,9 +263,7 @@ class TestCSARUtils(testtools.TestCase):
                {'artifact_path': artifact_path})
         self.assertEqual(msg, exc.format_message())
 
-    @mock.patch('tacker.common.csar_utils.extract_csar_zip_file')
-    def test_load_csar_data_false_algorithm_with_vnf_artifact(
-            self, mock_extract_csar_zip_file):
+    def test_load_csar_data_false_algorithm_with_vnf_artifact(self):
         file_path = utils.create_csar_with_unique_artifact(
             './tacker/tests/etc/samples/etsi/nfv/'
             'sample_vnf_package_csar_in_meta_and_manifest_false_algorithm')
@@ -280,9 +280,7 @@ class TestCSARUtils(testtools.TestCase):
                 'artifact_path': artifact_path})
         self.assertEqual(msg, exc.format_message())
 
-    @mock.patch('tacker.common.csar_utils.extract_csar_zip_file')
-    def test_load_csar_data_without_instantiation_level(
-            self, mock_extract_csar_zip_file):
+    def test_load_csar_data_without_instantiation_level(self):
         file_path = self._get_csar_zip_from_dir(
             'csar_without_instantiation_level')
         exc = self.assertRaises(exceptions.InvalidCSAR,
@@ -292,9 +290,7 @@ class TestCSARUtils(testtools.TestCase):
                ' "tosca.policies.nfv.InstantiationLevels is not defined.')
         self.assertEqual(msg, exc.format_message())
 
-    @mock.patch('tacker.common.csar_utils.extract_csar_zip_file')
-    def test_load_csar_data_with_invalid_instantiation_level(
-            self, mock_extract_csar_zip_file):
+    def test_load_csar_data_with_invalid_instantiation_level(self):
         file_path = self._get_csar_zip_from_dir(
             'csar_invalid_instantiation_level')
         exc = self.assertRaises(exceptions.InvalidCSAR,
@@ -305,9 +301,7 @@ class TestCSARUtils(testtools.TestCase):
                "defined levels %s") % ",".join(sorted(levels))
         self.assertEqual(msg, exc.format_message())
 
-    @mock.patch('tacker.common.csar_utils.extract_csar_zip_file')
-    def test_load_csar_data_with_invalid_default_instantiation_level(
-            self, mock_extract_csar_zip_file):
+    def test_load_csar_data_with_invalid_default_instantiation_level(self):
         file_path = self._get_csar_zip_from_dir(
             'csar_with_invalid_default_instantiation_level')
         exc = self.assertRaises(exceptions.InvalidCSAR,
@@ -318,9 +312,7 @@ class TestCSARUtils(testtools.TestCase):
                "defined levels %s") % ",".join(sorted(levels))
         self.assertEqual(msg, exc.format_message())
 
-    @mock.patch('tacker.common.csar_utils.extract_csar_zip_file')
-    def test_load_csar_data_without_vnfd_info(
-            self, mock_extract_csar_zip_file):
+    def test_load_csar_data_without_vnfd_info(self):
         file_path = self._get_csar_zip_from_dir(
             'csar_without_vnfd_info')
         exc = self.assertRaises(exceptions.InvalidCSAR,
@@ -328,9 +320,7 @@ class TestCSARUtils(testtools.TestCase):
                                 self.context, constants.UUID, file_path)
         self.assertEqual("VNF properties are mandatory", exc.format_message())
 
-    @mock.patch('tacker.common.csar_utils.extract_csar_zip_file')
-    def test_load_csar_data_with_artifacts_and_without_sw_image_data(
-            self, mock_extract_csar_zip_file):
+    def test_load_csar_data_with_artifacts_and_without_sw_image_data(self):
         file_path = self._get_csar_zip_from_dir(
             'csar_without_sw_image_data')
         exc = self.assertRaises(exceptions.InvalidCSAR,
@@ -340,9 +330,7 @@ class TestCSARUtils(testtools.TestCase):
                'artifact sw_image for node VDU1.')
         self.assertEqual(msg, exc.format_message())
 
-    @mock.patch('tacker.common.csar_utils.extract_csar_zip_file')
-    def test_load_csar_data_with_multiple_sw_image_data(
-            self, mock_extract_csar_zip_file):
+    def test_load_csar_data_with_multiple_sw_image_data(self):
         file_path = self._get_csar_zip_from_dir(
             'csar_with_multiple_sw_image_data')
         exc = self.assertRaises(exceptions.InvalidCSAR,
@@ -352,9 +340,7 @@ class TestCSARUtils(testtools.TestCase):
                ' is added more than one time for node VDU1.')
         self.assertEqual(msg, exc.format_message())
 
-    @mock.patch('tacker.common.csar_utils.extract_csar_zip_file')
-    def test_csar_with_missing_sw_image_data_in_main_template(
-            self, mock_extract_csar_zip_file):
+    def test_csar_with_missing_sw_image_data_in_main_template(self):
         file_path = self._get_csar_zip_from_dir(
             'csar_with_missing_sw_image_data_in_main_template')
         exc = self.assertRaises(exceptions.InvalidCSAR,
@@ -364,18 +350,14 @@ class TestCSARUtils(testtools.TestCase):
                ' artifact sw_image for node VDU1.')
         self.assertEqual(msg, exc.format_message())
 
-    @mock.patch('tacker.common.csar_utils.extract_csar_zip_file')
-    def test_load_csar_data_without_flavour_info(
-            self, mock_extract_csar_zip_file):
+    def test_load_csar_data_without_flavour_info(self):
         file_path = self._get_csar_zip_from_dir('csar_without_flavour_info')
         exc = self.assertRaises(exceptions.InvalidCSAR,
                                 csar_utils.load_csar_data,
                                 self.context, constants.UUID, file_path)
         self.assertEqual("No VNF flavours are available", exc.format_message())
 
-    @mock.patch('tacker.common.csar_utils.extract_csar_zip_file')
-    def test_load_csar_data_without_flavour_info_in_main_template(
-            self, mock_extract_csar_zip_file):
+    def test_load_csar_data_without_flavour_info_in_main_template(self):
         file_path = self._get_csar_zip_from_dir(
             'csar_without_flavour_info_in_main_template')
         exc = self.assertRaises(exceptions.InvalidCSAR,
@@ -391,9 +373,7 @@ class TestCSARUtils(testtools.TestCase):
         mock_rmtree.assert_called()
         mock_remove.assert_called()
 
-    @mock.patch('tacker.common.csar_utils.extract_csar_zip_file')
-    def test_load_csar_data_without_policies(
-            self, mock_extract_csar_zip_file):
+    def test_load_csar_data_without_policies(self):
         file_path = self._get_csar_zip_from_dir(
             'csar_without_policies')
         vnf_data, flavours, vnf_artifacts = csar_utils.load_csar_data(
@@ -401,9 +381,8 @@ class TestCSARUtils(testtools.TestCase):
         self.assertIsNone(flavours[0].get('instantiation_levels'))
         self.assertEqual(vnf_data['descriptor_version'], '1.0')
 
-    @mock.patch('tacker.common.csar_utils.extract_csar_zip_file')
     def test_load_csar_with_artifacts_short_notation_without_sw_image_data(
-            self, mock_extract_csar_zip_file):
+            self):
         file_path = "./tacker/tests/etc/samples/etsi/nfv/" \
                     "csar_short_notation_for_artifacts_without_sw_image_data"
         zip_name, uniqueid = utils.create_csar_with_unique_vnfd_id(file_path)
@@ -415,9 +394,7 @@ class TestCSARUtils(testtools.TestCase):
         self.assertEqual(msg, exc.format_message())
         os.remove(zip_name)
 
-    @mock.patch('tacker.common.csar_utils.extract_csar_zip_file')
-    def test_load_csar_data_with_artifacts_short_notation(
-            self, mock_extract_csar_zip_file):
+    def test_load_csar_data_with_artifacts_short_notation(self):
         file_path = "./tacker/tests/etc/samples/etsi/nfv/" \
                     "csar_with_short_notation_for_artifacts"
         zip_name, uniqueid = utils.create_csar_with_unique_vnfd_id(file_path)
@@ -430,9 +407,8 @@ class TestCSARUtils(testtools.TestCase):
         self.assertIsNotNone(flavours[0]['sw_images'])
         os.remove(zip_name)
 
-    @mock.patch('tacker.common.csar_utils.extract_csar_zip_file')
     def test_load_csar_data_with_multiple_sw_image_data_with_short_notation(
-            self, mock_extract_csar_zip_file):
+            self):
 
         file_path = "./tacker/tests/etc/samples/etsi/nfv/" \
                     "csar_multiple_sw_image_data_with_short_notation"
@@ -445,9 +421,7 @@ class TestCSARUtils(testtools.TestCase):
         self.assertEqual(msg, exc.format_message())
         os.remove(zip_name)
 
-    @mock.patch('tacker.common.csar_utils.extract_csar_zip_file')
-    def test_load_csar_data_with_unit_conversion(
-            self, mock_extract_csar_zip_file):
+    def test_load_csar_data_with_unit_conversion(self):
         file_path, _ = utils.create_csar_with_unique_vnfd_id(
             './tacker/tests/etc/samples/etsi/nfv/sample_vnfpkg_tosca_vnfd')
         self.addCleanup(os.remove, file_path)
@@ -464,3 +438,153 @@ class TestCSARUtils(testtools.TestCase):
         self.assertEqual(flavours[0]['sw_images'][1]['min_disk'], 2000000000)
         self.assertEqual(flavours[0]['sw_images'][1]['size'], 2000000000)
         self.assertEqual(flavours[0]['sw_images'][1]['min_ram'], 8590458880)
+
+    def test_extract_members_hash(self):
+        zip_path = os.path.join(self.csar_path, 'test.zip')
+        with zipfile.ZipFile(zip_path, 'w') as zf:
+            zf.writestr('Scripts/install.sh', b'echo install\n' * 10000)
+            zf.writestr('../Files/outside.txt', b'outside')
+        extract_path = os.path.join(self.csar_path, 'extracted')
+        digests = {}
+
+        with zipfile.ZipFile(zip_path) as zf:
+            csar_utils._extract_members(
+                zf, extract_path, {'Scripts/install.sh': {'sha-256'}},
+                digests)
+        self.assertEqual(
+            {('Scripts/install.sh', 'sha-256'):
+             hashlib.sha256(b'echo install\n' * 10000).hexdigest()},
+            digests)
+        with open(os.path.join(extract_path, 'Scripts/install.sh'),
+                  'rb') as f:
+            self.assertEqual(b'echo install\n' * 10000, f.read())
+        # The '..' of a file name is ignored.
+        self.assertTrue(os.path.exists(
+            os.path.join(extract_path, 'Files/outside.txt')))
+
+    def _get_artifacts_csar(self):
+        zip_path = os.path.join(self.csar_path, 'artifacts.zip')
+        with zipfile.ZipFile(zip_path, 'w') as zf:
+            zf.writestr('Scripts/install.sh', b'echo install\n')
+        remote_path = os.path.join(self.csar_path, 'remote.yaml')
+        with open(remote_path, 'wb') as f:
+            f.write(b'remote: true\n')
+        csar = mock.Mock(zfile=zipfile.ZipFile(zip_path), digests={})
+        self.addCleanup(csar.zfile.close)
+        return csar, 'file://' + remote_path
+
+    def test_verify_artifacts(self):
+        csar, remote_url = self._get_artifacts_csar()
+        artifacts = [
+            {'Source': 'Scripts/install.sh', 'Algorithm': 'SHA-256',
+             'Hash': hashlib.sha256(b'echo install\n').hexdigest()},
+            {'Source': 'Scripts/install.sh', 'Algorithm': 'SHA-512',
+             'Hash': hashlib.sha512(b'echo install\n').hexdigest()},
+            {'Source': remote_url, 'Algorithm': 'SHA-256',
+             'Hash': hashlib.sha256(b'remote: true\n').hexdigest()}]
+
+        with mock.patch.object(csar.zfile, 'open',
+                               wraps=csar.zfile.open) as mock_open:
+            csar_utils._verify_artifacts(artifacts, csar)
+        # Hashed with both algorithms in a single read.
+        mock_open.assert_called_once_with('Scripts/install.sh')
+
+    def test_verify_artifacts_invalid_hash(self):
+        csar, remote_url = self._get_artifacts_csar()
+        artifacts = [
+            {'Source': 'Scripts/install.sh', 'Algorithm': 'SHA-256',
+             'Hash': hashlib.sha256(b'echo install\n').hexdigest()},
+            {'Source': remote_url, 'Algorithm': 'SHA-256',
+             'Hash': 'invalid'}]
+
+        exc = self.assertRaises(exceptions.InvalidCSAR,
+                                csar_utils._verify_artifacts, artifacts, csar)
+        self.assertEqual('The hash "invalid" of artifact file "%s" is an '
+                         'invalid value.' % remote_url, exc.format_message())
+
+    def test_verify_artifacts_remote_fetches(self):
+        self.useFixture(config_fixture.Config(cfg.CONF)).config(
+            remote_artifact_fetches=2, group='vnf_package')
+        csar, remote_url = self._get_artifacts_csar()
+        artifacts = [{'Source': '%s?%d' % (remote_url, i),
+                      'Algorithm': 'SHA-256',
+                      'Hash': hashlib.sha256(b'').hexdigest()}
+                     for i in range(6)]
+        fetches = []
+
+        def urlopen(url):
+            fetches.append(url)
+            self.assertLessEqual(len(fetches), 2)
+            eventlet.sleep(0.01)
+            fetches.remove(url)
+            return io.BytesIO()
+
+        with mock.patch.object(csar_utils.urllib2, 'urlopen',
+                               side_effect=urlopen) as mock_urlopen:
+            csar_utils._verify_artifacts(artifacts, csar)
+        self.assertEqual(6, mock_urlopen.call_count)
+
+    def test_extract_members_artifact_store(self):
+        self.useFixture(config_fixture.Config(cfg.CONF)).config(
+            artifact_store=True, group='vnf_package')
+        image = b'image' * 10000
+        algorithms = {'Files/images/image.qcow2': {'sha-256', 'sha-512'}}
+        zip_path = os.path.join(self.csar_path, 'test.zip')
+        with zipfile.ZipFile(zip_path, 'w') as zf:
+            zf.writestr('Files/images/image.qcow2', image)
+            zf.writestr('Definitions/vnfd.yaml', b'vnfd')
+        blob_path = os.path.join(self.csar_path, '.artifacts', 'sha-512',
+                                 hashlib.sha512(image).hexdigest())
+
+        image_paths = []
+        for package_uuid in (uuidsentinel.package1, uuidsentinel.package2):
+            extract_path = os.path.join(self.csar_path, package_uuid)
+            with open(extract_path + '.zip', 'wb'):
+                pass
+            with zipfile.ZipFile(zip_path) as zf:
+                csar_utils._extract_members(zf, extract_path, algorithms,
+                                            {}, store=True)
+            image_paths.append(
+                os.path.join(extract_path, 'Files/images/image.qcow2'))
+            self.assertEqual([], [name for name in os.listdir(
+                os.path.dirname(image_paths[-1])) if name.endswith('.part')])
+
+        # The image is stored once, linked by both packages.
+        self.assertEqual(3, os.stat(blob_path).st_nlink)
+        self.assertTrue(all(os.path.samefile(blob_path, image_path)
+                            for image_path in image_paths))
+        with open(image_paths[1], 'rb') as f:
+            self.assertEqual(image, f.read())
+        self.assertEqual(1, os.stat(os.path.join(
+            self.csar_path, uuidsentinel.package1,
+            'Definitions/vnfd.yaml')).st_nlink)
+
+        csar_utils.delete_csar_data(uuidsentinel.package1)
+        self.assertEqual(2, os.stat(blob_path).st_nlink)
+        csar_utils.delete_csar_data(uuidsentinel.package2)
+        self.assertFalse(os.path.exists(blob_path))
+
+    def test_extract_members_artifact_store_modified(self):
+        self.useFixture(config_fixture.Config(cfg.CONF)).config(
+            artifact_store=True, group='vnf_package')
+        image = b'image' * 10000
+        algorithms = {'Files/images/image.qcow2': {'sha-256'}}
+        zip_path = os.path.join(self.csar_path, 'test.zip')
+        with zipfile.ZipFile(zip_path, 'w') as zf:
+            zf.writestr('Files/images/image.qcow2', image)
+        blob_path = os.path.join(self.csar_path, '.artifacts', 'sha-256',
+                                 hashlib.sha256(image).hexdigest())
+        os.makedirs(os.path.dirname(blob_path))
+        # The stored copy was truncated in place.
+        with open(blob_path, 'wb') as f:
+            f.write(image[:100])
+
+        extract_path = os.path.join(self.csar_path, uuidsentinel.package1)
+        with zipfile.ZipFile(zip_path) as zf:
+            csar_utils._extract_members(zf, extract_path, algorithms, {},
+                                        store=True)
+        image_path = os.path.join(extract_path, 'Files/images/image.qcow2')
+        with open(image_path, 'rb') as f:
+            self.assertEqual(image, f.read())
+        # It is stored again.
+        self.assertTrue(os.path.samefile(blob_path, image_path))
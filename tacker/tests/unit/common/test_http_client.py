@@ -0,0 +1,159 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+import time
+from unittest import mock
+
+import requests
+
+from tacker import auth
+from tacker.common import http_client
+from tacker.tests.unit import base
+
+
+class TestPooledHTTPAdapter(base.TestCase):
+
+    def setUp(self):
+        super(TestPooledHTTPAdapter, self).setUp()
+        self.adapter = http_client.PooledHTTPAdapter()
+        self.mock_adapter = mock.Mock()
+        self.mock_adapter.send.side_effect = self._send
+        patcher = mock.patch.object(self.adapter, '_get_adapter',
+                                    return_value=self.mock_adapter)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.status_codes = []
+
+    def _send(self, request, **kwargs):
+        status_code = self.status_codes.pop(0)
+        if isinstance(status_code, Exception):
+            raise status_code
+        response = requests.Response()
+        response.status_code = status_code
+        return response
+
+    def _send_request(self, url, method='GET'):
+        request = requests.Request(method, url).prepare()
+        return self.adapter.send(request, timeout=20)
+
+    def test_shared_by_sessions(self):
+        sessions = [http_client.new_session(),
+                    auth._BasicAuthSession('user', 'password'),
+                    auth.auth_manager.get_auth_client()]
+
+        for session in sessions:
+            self.assertIs(http_client.ADAPTER,
+                          session.get_adapter('https://nfvo:9890/grant'))
+        # A closed session does not close the connections of the others.
+        sessions[0].close()
+        self.assertIsNotNone(http_client.ADAPTER._get_adapter())
+
+    def test_get_adapter(self):
+        self.config(pool_hosts=5, pool_maxsize=3, group='http_client')
+        adapter = http_client.PooledHTTPAdapter()
+
+        http_adapter = adapter._get_adapter()
+        self.assertIs(http_adapter, adapter._get_adapter())
+        self.assertEqual((5, 3), (http_adapter._pool_connections,
+                                  http_adapter._pool_maxsize))
+        # Only the idempotent requests are sent again once sent.
+        self.assertEqual(1, http_adapter.max_retries.connect)
+        self.assertFalse(http_adapter.max_retries._is_method_retryable(
+            'POST'))
+        self.assertTrue(http_adapter.max_retries._is_method_retryable(
+            'GET'))
+
+    def test_send_stats(self):
+        self.status_codes = [204, 503, requests.ConnectionError()]
+
+        self.assertEqual(204, self._send_request(
+            'http://subscriber/notify').status_code)
+        self.assertEqual(503, self._send_request(
+            'http://subscriber:80/notify', method='POST').status_code)
+        self.assertRaises(requests.ConnectionError, self._send_request,
+                          'https://nfvo/grants')
+
+        stats = self.adapter.get_stats()
+        self.assertEqual(['http://subscriber:80', 'https://nfvo:443'],
+                         list(stats))
+        self.assertEqual(
+            (2, 1, 0),
+            tuple(stats['http://subscriber:80'][key]
+                  for key in ('requests', 'errors', 'in_flight')))
+        self.assertEqual((1, 1), (stats['https://nfvo:443']['requests'],
+                                  stats['https://nfvo:443']['errors']))
+        self.mock_adapter.send.assert_called_with(mock.ANY, timeout=20)
+
+    @mock.patch.object(http_client.LOG, 'debug')
+    @mock.patch.object(http_client, 'STATS_LOG_INTERVAL', 2)
+    def test_send_log_stats(self, mock_log_debug):
+        self.status_codes = [204, 204, 204]
+
+        self._send_request('http://subscriber/notify')
+        mock_log_debug.assert_not_called()
+        self._send_request('http://subscriber/notify')
+        mock_log_debug.assert_called_once_with(
+            "Outbound HTTP request stats: %s", self.adapter.get_stats())
+        self._send_request('http://subscriber/notify')
+        self.assertEqual(1, mock_log_debug.call_count)
+
+    def test_send_keepalive_disabled(self):
+        self.config(keepalive=False, group='http_client')
+        self.status_codes = [200]
+
+        self._send_request('http://subscriber/notify')
+        request = self.mock_adapter.send.call_args[0][0]
+        self.assertEqual('close', request.headers['Connection'])
+
+    def test_send_max_requests_per_host(self):
+        self.config(max_requests_per_host=1, group='http_client')
+        release = threading.Event()
+
+        def send(request, **kwargs):
+            release.wait(10)
+            response = requests.Response()
+            response.status_code = 204
+            return response
+
+        self.mock_adapter.send.side_effect = send
+        threads = [threading.Thread(target=self._send_request,
+                                    args=('http://subscriber/notify',))
+                   for _i in range(2)]
+        for thread in threads:
+            thread.start()
+        for _i in range(1000):
+            stats = self.adapter.get_stats()
+            if (stats.get('http://subscriber:80', {}).get('in_flight') == 2
+                    and self.mock_adapter.send.called):
+                break
+            time.sleep(0.01)
+        time.sleep(0.05)
+
+        # The second request waits for the first one.
+        self.assertEqual(1, self.mock_adapter.send.call_count)
+        release.set()
+        for thread in threads:
+            thread.join(10)
+        self.assertEqual(2, self.mock_adapter.send.call_count)
+        self.assertEqual(
+            2, self.adapter.get_stats()['http://subscriber:80']['requests'])
+
+    def test_forget_idle_destinations(self):
+        self.config(pool_hosts=2, group='http_client')
+        self.status_codes = [204, 204, 204, 204]
+
+        for host in ('subscriber1', 'subscriber2', 'subscriber1',
+                     'subscriber3'):
+            self._send_request('http://%s/notify' % host)
+        self.assertEqual(['http://subscriber1:80', 'http://subscriber3:80'],
+                         list(self.adapter.get_stats()))
@@ -0,0 +1,106 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import gc
+import os
+from unittest import mock
+
+from tacker.common.container import kubernetes_utils
+from tacker.tests.unit import base
+
+
+CA_CERT = ('-----BEGIN CERTIFICATE----- '
+           'MIIC5zCCAc+gAwIBAgIBADANBgkqhkiG9w0BAQsFADAVMRMwEQYDVQQDEwprdWJl '
+           '-----END CERTIFICATE-----')
+
+
+class TestKubernetesHTTPAPI(base.TestCase):
+
+    def setUp(self):
+        super(TestKubernetesHTTPAPI, self).setUp()
+        self.kubernetes = kubernetes_utils.KubernetesHTTPAPI()
+        self.auth = {'auth_url': 'https://127.0.0.1:6443',
+                     'username': 'None', 'password': None,
+                     'bearer_token': 'secret-token'}
+
+    def test_get_k8s_client_cached(self):
+        misses = kubernetes_utils.CLIENTS.get_stats()['misses']
+        k8s_client = self.kubernetes.get_k8s_client(self.auth)
+        api_clients = self.kubernetes.get_k8s_client_dict(self.auth)
+
+        self.assertEqual({k8s_client},
+                         {api.api_client for api in api_clients.values()})
+        self.assertEqual('Bearer secret-token',
+                         k8s_client.configuration.get_api_key_with_prefix(
+                             'authorization'))
+        self.assertFalse(k8s_client.configuration.verify_ssl)
+        stats = kubernetes_utils.CLIENTS.get_stats()
+        self.assertEqual((1, misses + 1), (stats['size'], stats['misses']))
+
+    def test_get_k8s_client_credentials_changed(self):
+        k8s_client = self.kubernetes.get_k8s_client(self.auth)
+        self.auth['bearer_token'] = 'new-secret-token'
+
+        self.assertIsNot(k8s_client,
+                         self.kubernetes.get_k8s_client(self.auth))
+
+    def test_get_k8s_client_ca_cert(self):
+        self.auth['ssl_ca_cert'] = CA_CERT
+        k8s_client = self.kubernetes.get_k8s_client(self.auth)
+        ca_cert_file = k8s_client.configuration.ssl_ca_cert
+
+        self.assertTrue(k8s_client.configuration.verify_ssl)
+        with open(ca_cert_file) as f:
+            self.assertIn('-----BEGIN CERTIFICATE-----\nMIIC', f.read())
+        self.assertIs(k8s_client, self.kubernetes.get_k8s_client(self.auth))
+
+        kubernetes_utils.CLIENTS.invalidate(self.auth['auth_url'])
+        self.assertTrue(os.path.exists(ca_cert_file))
+        del k8s_client
+        gc.collect()
+        self.assertFalse(os.path.exists(ca_cert_file))
+
+    def test_get_k8s_client_ca_cert_file(self):
+        # A file of the caller, its client is not cached.
+        self.auth['ca_cert_file'] = '/tmp/ca.crt'
+        k8s_client = self.kubernetes.get_k8s_client(self.auth)
+
+        self.assertEqual('/tmp/ca.crt', k8s_client.configuration.ssl_ca_cert)
+        self.assertIsNot(k8s_client,
+                         self.kubernetes.get_k8s_client(self.auth))
+        self.assertEqual(0, kubernetes_utils.CLIENTS.get_stats()['size'])
+
+    @mock.patch.object(kubernetes_utils.time, 'monotonic')
+    def test_get_k8s_client_idle(self, mock_monotonic):
+        self.config(client_idle_timeout=600, group='kubernetes_vim')
+        evictions = kubernetes_utils.CLIENTS.get_stats()['evictions']
+        mock_monotonic.return_value = 1000
+        k8s_client = self.kubernetes.get_k8s_client(self.auth)
+        mock_monotonic.return_value = 1600
+        self.assertIs(k8s_client, self.kubernetes.get_k8s_client(self.auth))
+
+        mock_monotonic.return_value = 2201
+        self.assertIsNot(k8s_client,
+                         self.kubernetes.get_k8s_client(self.auth))
+        self.assertEqual(evictions + 1,
+                         kubernetes_utils.CLIENTS.get_stats()['evictions'])
+
+    def test_invalidate(self):
+        k8s_client = self.kubernetes.get_k8s_client(self.auth)
+        other_auth = dict(self.auth, auth_url='https://10.0.0.1:6443')
+        other_k8s_client = self.kubernetes.get_k8s_client(other_auth)
+
+        kubernetes_utils.CLIENTS.invalidate(self.auth['auth_url'])
+        self.assertIsNot(k8s_client,
+                         self.kubernetes.get_k8s_client(self.auth))
+        self.assertIs(other_k8s_client,
+                      self.kubernetes.get_k8s_client(other_auth))
@@ -124,7 +124,8 @@ def get_vnf_lcm_subscriptions():
     subscription_id = uuidsentinel.subscription_id
     return {
         "id": subscription_id.encode(),
-        "callback_uri": b'http://localhost:9890/'
+        "callback_uri": b'http://localhost:9890/',
+        "filter": {}
     }
 
 
@@ -38,6 +38,7 @@ from tacker.common import csar_utils
 from tacker.common import driver_manager
 from tacker.common import exceptions
 from tacker.conductor import conductor_server
+from tacker.conductor import notification_outbox
 import tacker.conf
 from tacker import context
 from tacker import context as t_context
@@ -236,6 +237,73 @@ class TestConductor(SqlTestCase, unit_base.FixturedTestCase):
         self.assertEqual('multihash', self.vnf_package.hash)
         self.assertEqual('location', self.vnf_package.location_glance_store)
 
+    def _get_onboard_data(self):
+        vnf_data = {'descriptor_id': uuidsentinel.vnfd_id,
+                    'provider': 'Company', 'product_name': 'Sample VNF',
+                    'software_version': '1.0', 'descriptor_version': '1.0'}
+        sw_image = {'name': 'image', 'version': '1.0',
+                    'checksum': {'algorithm': 'sha-256', 'hash': 'b9c3'},
+                    'container_format': 'bare', 'disk_format': 'qcow2',
+                    'min_disk': 1, 'size': 1, 'software_image_id': 'VDU1'}
+        flavours = [
+            {'flavour_id': 'simple', 'flavour_description': 'simple',
+             'tpl_dict': {},
+             'sw_images': [dict(sw_image, metadata={'os': 'cirros'}),
+                           dict(sw_image, software_image_id='VDU2')]},
+            {'flavour_id': 'complex', 'flavour_description': 'complex',
+             'instantiation_levels': {'levels': {}},
+             'sw_images': [dict(sw_image, checksum=None, min_ram=0)]}]
+        vnf_artifacts = [{'Source': 'Scripts/install.sh',
+                          'Algorithm': 'SHA-256', 'Hash': 'a9c3'},
+                         {'Source': 'Scripts/remove.sh',
+                          'Algorithm': 'SHA-256', 'Hash': 'c9c3'}]
+        return vnf_data, flavours, vnf_artifacts
+
+    def test_onboard_vnf_package(self):
+        self.context.tenant_id = uuidsentinel.tenant_id
+        vnf_data, flavours, vnf_artifacts = self._get_onboard_data()
+
+        self.conductor._onboard_vnf_package(
+            self.context, self.vnf_package, vnf_data, flavours,
+            vnf_artifacts)
+        vnf_package = objects.VnfPackage.get_by_id(
+            self.context, self.vnf_package.id,
+            expected_attrs=['vnf_deployment_flavours', 'vnf_artifacts'])
+        self.assertEqual(
+            ['Scripts/install.sh', 'Scripts/remove.sh'],
+            sorted(artifact.artifact_path
+                   for artifact in vnf_package.vnf_artifacts))
+        sw_images = {flavour.flavour_id: sorted(
+            (sw_image.software_image_id, sw_image.metadata)
+            for sw_image in flavour.software_images)
+            for flavour in vnf_package.vnf_deployment_flavours}
+        self.assertEqual({'simple': [('VDU1', {'os': 'cirros'}),
+                                     ('VDU2', {})],
+                          'complex': [('VDU1', {})]}, sw_images)
+        self.assertEqual(
+            uuidsentinel.vnfd_id,
+            objects.VnfPackageVnfd.get_by_packageId(
+                self.context, self.vnf_package.id).vnfd_id)
+
+    @mock.patch.object(objects.VnfSoftwareImage, 'create_bulk')
+    def test_onboard_vnf_package_failed(self, mock_create_images):
+        self.context.tenant_id = uuidsentinel.tenant_id
+        vnf_data, flavours, vnf_artifacts = self._get_onboard_data()
+        mock_create_images.side_effect = exceptions.DBAccessError()
+
+        self.assertRaises(exceptions.DBAccessError,
+                          self.conductor._onboard_vnf_package,
+                          self.context, self.vnf_package, vnf_data,
+                          flavours, vnf_artifacts)
+        # Nothing of the package was written.
+        vnf_package = objects.VnfPackage.get_by_id(
+            self.context, self.vnf_package.id,
+            expected_attrs=['vnf_deployment_flavours', 'vnf_artifacts'])
+        self.assertEqual(0, len(vnf_package.vnf_artifacts))
+        self.assertEqual(0, len(vnf_package.vnf_deployment_flavours))
+        self.assertIsNone(objects.VnfPackageVnfd.get_by_packageId(
+            self.context, self.vnf_package.id))
+
     @mock.patch.object(glance_store, 'delete_csar')
     def test_delete_vnf_package(self, mock_delete_csar):
         self.vnf_package.__setattr__('onboarding_state', 'ONBOARDED')
@@ -608,7 +676,7 @@ class TestConductor(SqlTestCase, unit_base.FixturedTestCase):
     @mock.patch.object(coordination.Coordinator, 'get_lock')
     @mock.patch.object(objects.VnfPackage, 'is_package_in_use')
     @mock.patch.object(objects.LccnSubscriptionRequest,
-        'vnf_lcm_subscriptions_get')
+        'vnf_lcm_subscriptions_get_all')
     @mock.patch.object(objects.VnfLcmOpOcc, "get_by_id")
     def test_instantiate_vnf_instance_with_vnf_package_in_use(
             self,
@@ -651,7 +719,7 @@ class TestConductor(SqlTestCase, unit_base.FixturedTestCase):
     @mock.patch.object(objects.VnfLcmOpOcc, "save")
     @mock.patch.object(coordination.Coordinator, 'get_lock')
     @mock.patch.object(objects.LccnSubscriptionRequest,
-        'vnf_lcm_subscriptions_get')
+        'vnf_lcm_subscriptions_get_all')
     @mock.patch('tacker.vnflcm.utils._get_vnfd_dict')
     @mock.patch('tacker.vnflcm.utils._convert_desired_capacity')
     @mock.patch('tacker.conductor.conductor_server.LOG')
@@ -2253,7 +2321,7 @@ class TestConductor(SqlTestCase, unit_base.FixturedTestCase):
             'ROLLED_BACK')
 
     @mock.patch.object(objects.LccnSubscriptionRequest,
-                       'vnf_lcm_subscriptions_get')
+                       'vnf_lcm_subscriptions_get_all')
     def test_send_notification_not_found_subscription(self,
                                                    mock_subscriptions_get):
         mock_subscriptions_get.return_value = None
@@ -2267,7 +2335,7 @@ class TestConductor(SqlTestCase, unit_base.FixturedTestCase):
         mock_subscriptions_get.assert_called()
 
     @mock.patch.object(objects.LccnSubscriptionRequest,
-                       'vnf_lcm_subscriptions_get')
+                       'vnf_lcm_subscriptions_get_all')
     def test_send_notification_vnf_lcm_operation_occurrence(self,
                                                     mock_subscriptions_get):
         self.requests_mock.register_uri('POST',
@@ -2285,6 +2353,7 @@ class TestConductor(SqlTestCase, unit_base.FixturedTestCase):
             '_links': {}}
 
         result = self.conductor.send_notification(self.context, notification)
+        self.conductor._notification_outbox.wait()
 
         self.assertEqual(result, 0)
         mock_subscriptions_get.assert_called()
@@ -2295,7 +2364,7 @@ class TestConductor(SqlTestCase, unit_base.FixturedTestCase):
         self.assertEqual(1, req_count)
 
     @mock.patch.object(objects.LccnSubscriptionRequest,
-                       'vnf_lcm_subscriptions_get')
+                       'vnf_lcm_subscriptions_get_all')
     def test_send_notification_vnf_identifier_creation(self,
                                                     mock_subscriptions_get):
         self.requests_mock.register_uri(
@@ -2312,6 +2381,7 @@ class TestConductor(SqlTestCase, unit_base.FixturedTestCase):
             'links': {}}
 
         result = self.conductor.send_notification(self.context, notification)
+        self.conductor._notification_outbox.wait()
 
         self.assertEqual(result, 0)
         mock_subscriptions_get.assert_called()
@@ -2322,7 +2392,57 @@ class TestConductor(SqlTestCase, unit_base.FixturedTestCase):
         self.assertEqual(1, req_count)
 
     @mock.patch.object(objects.LccnSubscriptionRequest,
-                       'vnf_lcm_subscriptions_get')
+                       'vnf_lcm_subscriptions_get_all')
+    def test_send_notification_persists_until_delivered(
+            self, mock_subscriptions_get):
+        self.requests_mock.register_uri(
+            'POST',
+            "https://localhost/callback",
+            headers={
+                'Content-Type': 'application/json'},
+            status_code=204)
+
+        mock_subscriptions_get.return_value = self._create_subscriptions()
+        notification = {
+            'vnfInstanceId': 'Test',
+            'notificationType': 'VnfIdentifierCreationNotification',
+            'links': {}}
+
+        result = self.conductor.send_notification(self.context, notification)
+
+        self.assertEqual(result, 0)
+        outbox = self.context.session.query(
+            models.VnfLcmNotificationOutbox).all()
+        self.assertEqual(1, len(outbox))
+        self.assertEqual(uuidsentinel.lcm_subscription_id,
+                         outbox[0].subscription_id)
+        self.assertEqual('https://localhost/callback',
+                         outbox[0].callback_uri)
+
+        self.conductor._notification_outbox.wait()
+
+        history = self.requests_mock.request_history
+        req_count = nfvo_client._count_mock_history(
+            history, "https://localhost")
+        self.assertEqual(1, req_count)
+        self.assertEqual([], self.context.session.query(
+            models.VnfLcmNotificationOutbox).all())
+
+    @mock.patch.object(notification_outbox.LOG, 'debug')
+    @mock.patch.object(notification_outbox.NotificationOutbox, 'drain')
+    def test_run_notification_outbox(self, mock_drain, mock_log_debug):
+        self.conductor._run_notification_outbox(self.context)
+
+        mock_drain.assert_called_once_with()
+        # The delivery metrics are reported on each poll.
+        mock_log_debug.assert_called_once_with(
+            "Notification delivery stats: %s", mock.ANY)
+        stats = mock_log_debug.call_args[0][1]
+        self.assertEqual(0, stats['backlog'])
+        self.assertIn('latency_histogram', stats)
+
+    @mock.patch.object(objects.LccnSubscriptionRequest,
+                       'vnf_lcm_subscriptions_get_all')
     def test_send_notification_with_auth_basic(self, mock_subscriptions_get):
         self.requests_mock.register_uri('POST',
             "https://localhost/callback",
@@ -2343,6 +2463,7 @@ class TestConductor(SqlTestCase, unit_base.FixturedTestCase):
             'links': {}}
 
         result = self.conductor.send_notification(self.context, notification)
+        self.conductor._notification_outbox.wait()
 
         self.assertEqual(result, 0)
         mock_subscriptions_get.assert_called()
@@ -2357,7 +2478,7 @@ class TestConductor(SqlTestCase, unit_base.FixturedTestCase):
             auth_password)
 
     @mock.patch.object(objects.LccnSubscriptionRequest,
-                       'vnf_lcm_subscriptions_get')
+                       'vnf_lcm_subscriptions_get_all')
     def test_send_notification_with_auth_client_credentials(
             self, mock_subscriptions_get):
         auth.auth_manager = auth._AuthManager()
@@ -2390,6 +2511,7 @@ class TestConductor(SqlTestCase, unit_base.FixturedTestCase):
             'links': {}}
 
         result = self.conductor.send_notification(self.context, notification)
+        self.conductor._notification_outbox.wait()
 
         self.assertEqual(result, 0)
         mock_subscriptions_get.assert_called()
@@ -2402,9 +2524,10 @@ class TestConductor(SqlTestCase, unit_base.FixturedTestCase):
         self.assert_auth_client_credentials(history[1], "test_token")
 
     @mock.patch.object(objects.LccnSubscriptionRequest,
-                       'vnf_lcm_subscriptions_get')
+                       'vnf_lcm_subscriptions_get_all')
     def test_send_notification_rety_notification(self,
                                               mock_subscriptions_get):
+        self.config(retry_wait=0, group='vnf_lcm')
         self.requests_mock.register_uri('POST',
             "https://localhost/callback",
             headers={
@@ -2418,6 +2541,7 @@ class TestConductor(SqlTestCase, unit_base.FixturedTestCase):
             'links': {}}
 
         result = self.conductor.send_notification(self.context, notification)
+        self.conductor._notification_outbox.wait()
 
         self.assertEqual(result, 0)
         mock_subscriptions_get.assert_called()
@@ -2428,7 +2552,7 @@ class TestConductor(SqlTestCase, unit_base.FixturedTestCase):
         self.assertEqual(3, req_count)
 
     @mock.patch.object(objects.LccnSubscriptionRequest,
-                       'vnf_lcm_subscriptions_get')
+                       'vnf_lcm_subscriptions_get_all')
     def test_sendNotification_sendError(self,
                                         mock_subscriptions_get):
         self.requests_mock.register_uri(
@@ -2443,6 +2567,7 @@ class TestConductor(SqlTestCase, unit_base.FixturedTestCase):
             'links': {}}
 
         result = self.conductor.send_notification(self.context, notification)
+        self.conductor._notification_outbox.wait()
 
         self.assertEqual(result, 0)
         mock_subscriptions_get.assert_called()
@@ -2453,7 +2578,7 @@ class TestConductor(SqlTestCase, unit_base.FixturedTestCase):
         self.assertEqual(1, req_count)
 
     @mock.patch.object(objects.LccnSubscriptionRequest,
-                       'vnf_lcm_subscriptions_get')
+                       'vnf_lcm_subscriptions_get_all')
     def test_send_notification_internal_server_error(
             self, mock_subscriptions_get):
         mock_subscriptions_get.side_effect = Exception("MockException")
@@ -0,0 +1,96 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+
+from requests_mock.contrib import fixture as requests_mock_fixture
+
+from tacker.conductor import notification_dispatcher
+from tacker.tests.unit import base
+
+
+class TestNotificationDispatcher(base.TestCase):
+
+    def setUp(self):
+        super(TestNotificationDispatcher, self).setUp()
+        self.requests_mock = self.useFixture(requests_mock_fixture.Fixture())
+        self.dispatcher = notification_dispatcher.NotificationDispatcher(
+            pool_size=4)
+
+    def _history(self, url):
+        return [req for req in self.requests_mock.request_history
+                if req.url == url]
+
+    def test_dispatch_does_not_block_on_failing_endpoint(self):
+        self.config(retry_wait=60, group='vnf_lcm')
+        self.requests_mock.register_uri(
+            'POST', 'https://dead/callback', status_code=503)
+        self.requests_mock.register_uri(
+            'POST', 'https://alive/callback', status_code=204)
+
+        self.dispatcher.dispatch('sub-1', 'https://dead/callback', {'id': 1})
+        self.dispatcher.dispatch('sub-2', 'https://alive/callback',
+                                 {'id': 2})
+
+        # The failed delivery waits 60 seconds for its retry, the healthy
+        # endpoint is served in the meantime.
+        self.assertFalse(self.dispatcher.wait(timeout=1))
+        self.assertEqual(1, len(self._history('https://dead/callback')))
+        self.assertEqual(1, len(self._history('https://alive/callback')))
+
+        stats = self.dispatcher.get_stats()
+        self.assertEqual(1, stats['delivered'])
+        self.assertEqual(1, stats['retried'])
+        self.assertEqual(1, stats['backlog'])
+        self.assertEqual({'https://dead/callback': 1},
+                         stats['endpoint_backlog'])
+
+    def test_dispatch_retries_until_retry_num(self):
+        self.config(retry_wait=0, retry_num=3, group='vnf_lcm')
+        self.requests_mock.register_uri(
+            'POST', 'https://localhost/callback', status_code=400)
+
+        self.dispatcher.dispatch('sub-1', 'https://localhost/callback',
+                                 {'id': 1})
+
+        self.assertTrue(self.dispatcher.wait(timeout=5))
+        self.assertEqual(3, len(self._history('https://localhost/callback')))
+        stats = self.dispatcher.get_stats()
+        self.assertEqual(0, stats['delivered'])
+        self.assertEqual(1, stats['failed'])
+        self.assertEqual(0, stats['backlog'])
+
+    def test_dispatch_keeps_order_per_endpoint(self):
+        self.config(retry_wait=0, group='vnf_lcm')
+        self.requests_mock.register_uri(
+            'POST', 'https://localhost/callback',
+            [{'status_code': 500}, {'status_code': 204},
+             {'status_code': 204}])
+
+        self.dispatcher.dispatch('sub-1', 'https://localhost/callback',
+                                 {'id': 'START'})
+        self.dispatcher.dispatch('sub-1', 'https://localhost/callback',
+                                 {'id': 'RESULT'})
+
+        self.assertTrue(self.dispatcher.wait(timeout=5))
+        sent = [json.loads(req.body)['id'] for req in
+                self._history('https://localhost/callback')]
+        self.assertEqual(['START', 'START', 'RESULT'], sent)
+        self.assertEqual(2, self.dispatcher.get_stats()['delivered'])
+
+    def test_backoff_is_capped(self):
+        self.config(retry_wait=10, retry_wait_max=30, group='vnf_lcm')
+
+        self.assertEqual(10, self.dispatcher._backoff(1))
+        self.assertEqual(20, self.dispatcher._backoff(2))
+        self.assertEqual(30, self.dispatcher._backoff(3))
+        self.assertEqual(30, self.dispatcher._backoff(10))
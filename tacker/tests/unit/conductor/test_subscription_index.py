@@ -0,0 +1,151 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+from tacker.conductor import subscription_index
+from tacker import context
+from tacker.db.db_sqlalchemy import models
+from tacker import objects
+from tacker.tests.unit.db.base import SqlTestCase
+from tacker.tests import uuidsentinel
+
+
+OP_OCC = 'VnfLcmOperationOccurrenceNotification'
+CREATION = 'VnfIdentifierCreationNotification'
+
+
+class TestSubscriptionIndex(SqlTestCase):
+
+    def setUp(self):
+        super(TestSubscriptionIndex, self).setUp()
+        self.context = context.get_admin_context()
+        self.index = subscription_index.SubscriptionIndex()
+        self.vnf_instance = {
+            'vnfd_id': uuidsentinel.vnfd_id,
+            'vnf_instance_name': 'vnf1',
+            'vnf_provider': 'Company',
+            'vnf_product_name': 'Sample VNF',
+            'vnf_software_version': '1.0',
+            'vnfd_version': '1.0'}
+
+    def _subscribe(self, subscription_id, lcm_filter=None, deleted=False):
+        with self.context.session.begin(subtransactions=True):
+            self.context.session.add(models.VnfLcmSubscriptions(
+                id=subscription_id,
+                callback_uri='https://localhost/%s' % subscription_id,
+                deleted=deleted))
+            self.context.session.flush()
+            self.context.session.add(models.VnfLcmFilters(
+                subscription_uuid=subscription_id,
+                filter=lcm_filter or {}))
+
+    def _match(self, notification, vnf_instance=None):
+        return sorted(subscription.id for subscription in self.index.match(
+            self.context, notification, vnf_instance=vnf_instance))
+
+    def _op_occ(self, operation='INSTANTIATE', operation_state='STARTING'):
+        return {'notificationType': OP_OCC,
+                'vnfInstanceId': uuidsentinel.vnf_instance_id,
+                'operation': operation,
+                'operationState': operation_state}
+
+    def test_match_notification_and_operation_types(self):
+        self._subscribe(uuidsentinel.all)
+        self._subscribe(uuidsentinel.creation,
+                        {'notificationTypes': [CREATION]})
+        self._subscribe(uuidsentinel.scale,
+                        {'notificationTypes': [OP_OCC],
+                         'operationTypes': ['SCALE']})
+        self._subscribe(uuidsentinel.deleted, deleted=True)
+
+        self.assertEqual(sorted([uuidsentinel.all, uuidsentinel.scale]),
+                         self._match(self._op_occ(operation='SCALE')))
+        self.assertEqual([uuidsentinel.all], self._match(self._op_occ()))
+        # operationTypes do not apply to notifications without operation.
+        self.assertEqual(sorted([uuidsentinel.all, uuidsentinel.creation]),
+                         self._match({'notificationType': CREATION,
+                                      'vnfInstanceId': 'id'}))
+
+    def test_match_operation_states(self):
+        self._subscribe(uuidsentinel.completed,
+                        {'operationStates': ['COMPLETED']})
+
+        self.assertEqual([], self._match(self._op_occ()))
+        self.assertEqual([uuidsentinel.completed], self._match(
+            self._op_occ(operation_state='COMPLETED')))
+
+    def test_match_vnf_instance_subscription_filter(self):
+        self._subscribe(uuidsentinel.by_id, {
+            'vnfInstanceSubscriptionFilter': {
+                'vnfInstanceIds': [uuidsentinel.vnf_instance_id]}})
+        self._subscribe(uuidsentinel.by_vnfd, {
+            'vnfInstanceSubscriptionFilter': {
+                'vnfdIds': [uuidsentinel.other_vnfd_id]}})
+        self._subscribe(uuidsentinel.by_name, {
+            'vnfInstanceSubscriptionFilter': {
+                'vnfInstanceNames': ['vnf1']}})
+        self._subscribe(uuidsentinel.by_product, {
+            'vnfInstanceSubscriptionFilter': {
+                'vnfProductsFromProviders': [{
+                    'vnfProvider': 'Company',
+                    'vnfProducts': [{
+                        'vnfProductName': 'Sample VNF',
+                        'versions': [{'vnfSoftwareVersion': '1.0',
+                                      'vnfdVersions': ['2.0']}]}]}]}})
+
+        self.assertEqual(
+            sorted([uuidsentinel.by_id, uuidsentinel.by_name]),
+            self._match(self._op_occ(), vnf_instance=self.vnf_instance))
+
+        self.vnf_instance.update(vnfd_id=uuidsentinel.other_vnfd_id,
+                                 vnfd_version='2.0')
+        self.assertEqual(
+            sorted([uuidsentinel.by_id, uuidsentinel.by_vnfd,
+                    uuidsentinel.by_name, uuidsentinel.by_product]),
+            self._match(self._op_occ(), vnf_instance=self.vnf_instance))
+
+    @mock.patch.object(objects.LccnSubscriptionRequest,
+                       'vnf_instance_filter_attributes_get')
+    def test_match_reads_vnf_instance_only_when_filtered(self, mock_get):
+        mock_get.return_value = self.vnf_instance
+        self._subscribe(uuidsentinel.all)
+
+        self.assertEqual([uuidsentinel.all], self._match(self._op_occ()))
+        mock_get.assert_not_called()
+
+        self._subscribe(uuidsentinel.by_name, {
+            'vnfInstanceSubscriptionFilter': {
+                'vnfInstanceNames': ['vnf1']}})
+        self.index.invalidate()
+
+        self.assertEqual(sorted([uuidsentinel.all, uuidsentinel.by_name]),
+                         self._match(self._op_occ()))
+        mock_get.assert_called_once_with(
+            self.context, uuidsentinel.vnf_instance_id)
+
+    @mock.patch.object(objects.LccnSubscriptionRequest,
+                       'vnf_lcm_subscriptions_get_all',
+                       wraps=objects.LccnSubscriptionRequest.
+                       vnf_lcm_subscriptions_get_all)
+    def test_index_is_cached_until_invalidated(self, mock_get_all):
+        self._subscribe(uuidsentinel.first)
+        self.assertEqual([uuidsentinel.first], self._match(self._op_occ()))
+
+        self._subscribe(uuidsentinel.second)
+        self.assertEqual([uuidsentinel.first], self._match(self._op_occ()))
+        self.assertEqual(1, mock_get_all.call_count)
+
+        self.index.invalidate()
+        self.assertEqual(sorted([uuidsentinel.first, uuidsentinel.second]),
+                         self._match(self._op_occ()))
+        self.assertEqual(2, mock_get_all.call_count)
@@ -144,10 +144,10 @@ class TestKubernetes_Driver(base.TestCase):
         mock_fernet_key = 'test_fernet_key'
         self.kubernetes_api.create_fernet_key.return_value = (mock_fernet_key,
                                                               mock_fernet_obj)
-        self.kubernetes_api.create_ca_cert_tmp_file.\
-            return_value = ('file_descriptor', 'file_path')
         self.kubernetes_driver.register_vim(vim_obj)
         mock_fernet_obj.encrypt.assert_called_once_with(mock.ANY)
+        # The file of the CA certificate is kept by the cached API client.
+        self.kubernetes_api.create_ca_cert_tmp_file.assert_not_called()
 
     def test_deregister_vim_barbican(self):
         self.keymgr.delete.return_value = None
@@ -21,6 +21,7 @@ from unittest.mock import patch
 
 from oslo_utils import uuidutils
 
+from tacker.common.container import kubernetes_utils
 from tacker.common import exceptions
 from tacker import context
 from tacker.db.common_services import common_services_db_plugin
@@ -35,6 +36,7 @@ from tacker.plugins.common import constants
 from tacker.tests import constants as test_constants
 from tacker.tests.unit.db import base as db_base
 from tacker.tests.unit.db import utils
+from tacker.vnfm.infra_drivers.openstack import heat_client
 from tacker.vnfm import vim_client
 
 SECRET_PASSWORD = '***'
@@ -325,10 +327,13 @@ class TestNfvoPlugin(db_base.SqlTestCase):
                    ).start()
         self._cos_db_plugin =\
             common_services_db_plugin.CommonServicesPluginDb()
+        mock_invalidate = mock.patch.object(
+            kubernetes_utils.CLIENTS, 'invalidate').start()
         self.nfvo_plugin.delete_vim(self.context, vim_id)
         self._driver_manager.invoke.assert_called_once_with(
             vim_type, 'deregister_vim',
             vim_obj=vim_obj)
+        mock_invalidate.assert_called_once_with(vim_obj['auth_url'])
         self._cos_db_plugin.create_event.assert_called_with(
             self.context, evt_type=constants.RES_EVT_DELETE, res_id=mock.ANY,
             res_state=mock.ANY, res_type=constants.RES_TYPE_VIM,
@@ -353,6 +358,10 @@ class TestNfvoPlugin(db_base.SqlTestCase):
                    ).start()
         self._cos_db_plugin =\
             common_services_db_plugin.CommonServicesPluginDb()
+        mock_invalidate = mock.patch.object(
+            heat_client.RESOURCE_TYPES, 'invalidate').start()
+        mock_invalidate_clients = mock.patch.object(
+            kubernetes_utils.CLIENTS, 'invalidate').start()
         res = self.nfvo_plugin.update_vim(self.context, vim_dict['vim']['id'],
                                           vim_dict)
         vim_obj = self.nfvo_plugin._get_vim(
@@ -361,6 +370,8 @@ class TestNfvoPlugin(db_base.SqlTestCase):
         self._driver_manager.invoke.assert_called_with(
             vim_type, 'register_vim',
             vim_obj=vim_obj)
+        mock_invalidate.assert_called_once_with(vim_dict['vim']['id'])
+        mock_invalidate_clients.assert_called_once_with(vim_obj['auth_url'])
         self.assertIsNotNone(res)
         self.assertIn('id', res)
         self.assertIn('placement_attr', res)
@@ -209,6 +209,30 @@ class TestVnfInstance(SqlTestCase):
             self.context, filters=filters)
         self.assertEqual(1, len(vnf_instance_list))
 
+    def test_vnf_instance_list_get_by_filters_paginated(self):
+        vnf_instance_ids = []
+        for _ in range(3):
+            vnf_instance = objects.VnfInstance(
+                context=self.context, **fakes.get_vnf_instance_data(
+                    self.vnf_package.vnfd_id))
+            vnf_instance.create()
+            vnf_instance_ids.append(vnf_instance.id)
+        vnf_instance_ids.sort()
+
+        first_page = objects.VnfInstanceList.get_by_filters(
+            self.context, limit=2, fields=set())
+        self.assertEqual(vnf_instance_ids[:2],
+                         [vnf_instance.id for vnf_instance in first_page])
+        # Unrequested JSON fields are not loaded.
+        self.assertEqual({}, first_page[0].vnf_metadata)
+
+        second_page = objects.VnfInstanceList.get_by_filters(
+            self.context, limit=2, marker=first_page[1].id,
+            fields={'vnf_metadata'})
+        self.assertEqual(vnf_instance_ids[2:],
+                         [vnf_instance.id for vnf_instance in second_page])
+        self.assertEqual({"key": "value"}, second_page[0].vnf_metadata)
+
     @mock.patch('tacker.objects.vnf_instance._destroy_vnf_instance')
     def test_destroy(self, mock_vnf_destroy):
         vnf_instance_data = fakes.get_vnf_instance_data(
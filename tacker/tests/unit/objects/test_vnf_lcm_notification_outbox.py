@@ -0,0 +1,96 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from tacker import context
+from tacker.db.db_sqlalchemy import models
+from tacker import objects
+from tacker.tests.unit.db.base import SqlTestCase
+from tacker.tests import uuidsentinel
+
+
+class TestVnfLcmNotificationOutbox(SqlTestCase):
+
+    def setUp(self):
+        super(TestVnfLcmNotificationOutbox, self).setUp()
+        self.context = context.get_admin_context()
+
+    def _enqueue(self, *subscription_ids):
+        objects.VnfLcmNotificationOutbox.enqueue(
+            self.context,
+            [{'subscription_id': subscription_id,
+              'callback_uri': 'https://localhost/%s' % subscription_id,
+              'notification': {'seq': seq}}
+             for seq, subscription_id in enumerate(subscription_ids)])
+
+    def _rows(self):
+        return self.context.session.query(
+            models.VnfLcmNotificationOutbox).order_by(
+            models.VnfLcmNotificationOutbox.id).all()
+
+    def test_enqueue(self):
+        self._enqueue(uuidsentinel.sub1, uuidsentinel.sub2)
+
+        rows = self._rows()
+        self.assertEqual(2, len(rows))
+        self.assertEqual({'seq': 0}, rows[0].notification)
+        self.assertIsNone(rows[0].claimed_by)
+
+    def test_claim(self):
+        self._enqueue(uuidsentinel.sub1, uuidsentinel.sub2,
+                      uuidsentinel.sub3)
+
+        claimed = objects.VnfLcmNotificationOutbox.claim(
+            self.context, 'owner-a', 2, 60)
+
+        self.assertEqual([{'seq': 0}, {'seq': 1}],
+                         [entry.notification for entry in claimed])
+        # Claimed notifications are not handed out twice.
+        claimed = objects.VnfLcmNotificationOutbox.claim(
+            self.context, 'owner-b', 10, 60)
+        self.assertEqual([{'seq': 2}],
+                         [entry.notification for entry in claimed])
+
+    def test_claim_keeps_subscription_order(self):
+        self._enqueue(uuidsentinel.sub1)
+        objects.VnfLcmNotificationOutbox.claim(self.context, 'owner-a', 1, 60)
+        self._enqueue(uuidsentinel.sub1, uuidsentinel.sub2)
+
+        claimed = objects.VnfLcmNotificationOutbox.claim(
+            self.context, 'owner-b', 10, 60)
+
+        # owner-a still delivers an older notification of sub1.
+        self.assertEqual([uuidsentinel.sub2],
+                         [entry.subscription_id for entry in claimed])
+        self.assertEqual(['owner-a', None, 'owner-b'],
+                         [row.claimed_by for row in self._rows()])
+
+    def test_claim_expired_lease(self):
+        self._enqueue(uuidsentinel.sub1)
+        objects.VnfLcmNotificationOutbox.claim(self.context, 'owner-a', 1, -1)
+
+        claimed = objects.VnfLcmNotificationOutbox.claim(
+            self.context, 'owner-b', 10, 60)
+
+        self.assertEqual(1, len(claimed))
+        self.assertEqual('owner-b', self._rows()[0].claimed_by)
+
+    def test_delete_by_ids(self):
+        self._enqueue(uuidsentinel.sub1, uuidsentinel.sub2)
+        claimed = objects.VnfLcmNotificationOutbox.claim(
+            self.context, 'owner-a', 1, 60)
+
+        objects.VnfLcmNotificationOutbox.delete_by_ids(
+            self.context, [claimed[0].id])
+
+        self.assertEqual([{'seq': 1}],
+                         [row.notification for row in self._rows()])
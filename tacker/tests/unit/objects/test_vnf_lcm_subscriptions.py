@@ -13,6 +13,7 @@
 from unittest import mock
 
 from tacker import context
+from tacker.db.db_sqlalchemy import models
 from tacker import objects
 from tacker.tests.unit.db.base import SqlTestCase
 from tacker.tests.unit.objects import fakes
@@ -298,6 +299,27 @@ class TestVnfd(SqlTestCase):
         result = subscription_obj.vnf_lcm_subscriptions_list(self.context)
         self.assertTrue(filter, result)
 
+    def test_list_paginated(self):
+        subscription_ids = sorted([uuidsentinel.subscription_1,
+                                   uuidsentinel.subscription_2,
+                                   uuidsentinel.subscription_3])
+        for subscription_id in subscription_ids:
+            with self.context.session.begin(subtransactions=True):
+                self.context.session.add(models.VnfLcmSubscriptions(
+                    id=subscription_id, callback_uri='http://localhost/xxx'))
+                self.context.session.flush()
+                self.context.session.add(models.VnfLcmFilters(
+                    subscription_uuid=subscription_id, filter={}))
+
+        result = objects.LccnSubscriptionRequest.vnf_lcm_subscriptions_list(
+            self.context, limit=2)
+        self.assertEqual(subscription_ids[:2], [row.id for row in result])
+
+        result = objects.LccnSubscriptionRequest.vnf_lcm_subscriptions_list(
+            self.context, limit=2, marker=result[-1].id)
+        self.assertEqual(subscription_ids[2:], [row.id for row in result])
+        self.assertEqual({}, result[0].filter)
+
     @mock.patch.object(objects.vnf_lcm_subscriptions,
                        '_destroy_vnf_lcm_subscription')
     @mock.patch.object(objects.vnf_lcm_subscriptions, '_get_by_subscriptionid')
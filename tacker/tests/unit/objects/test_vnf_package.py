@@ -187,6 +187,87 @@ class TestVnfPackage(SqlTestCase):
             self.context, filters=filters)
         self.assertEqual(1, len(vnfpkgm_list))
 
+    def _create_vnf_package_with_user_data(self):
+        vnf_package = objects.VnfPackage(
+            context=self.context, onboarding_state='CREATED',
+            operational_state='DISABLED', usage_state='NOT_IN_USE',
+            tenant_id=uuidsentinel.tenant_id, user_data={'abc': 'xyz'})
+        vnf_package.create()
+        return vnf_package
+
+    def _create_vnf_package_with_software_images(self, *software_images):
+        vnf_package = self._create_vnf_package_with_user_data()
+        flavour = objects.VnfDeploymentFlavour(
+            context=self.context, **dict(fakes.vnf_deployment_flavour,
+                                         package_uuid=vnf_package.id))
+        flavour.create()
+        for software_image in software_images:
+            objects.VnfSoftwareImage(
+                context=self.context,
+                **dict(fakes.software_image, flavour_uuid=flavour.id,
+                       **software_image)).create()
+        return vnf_package
+
+    def test_vnf_package_list_by_filter_software_images(self):
+        vnf_package = self._create_vnf_package_with_software_images(
+            {'size': 1, 'name': 'image1', 'metadata': {'key1': 'value1'}},
+            {'size': 2, 'name': 'image2', 'metadata': {'key1': 'value2'}},
+            {'size': 2, 'name': 'image3', 'metadata': {}})
+
+        def _list(filters):
+            return [vnf_package.id for vnf_package in
+                    objects.VnfPackagesList.get_by_filters(
+                        self.context, filters=filters)]
+
+        # A package is returned once, whatever its number of matching
+        # software images.
+        self.assertEqual([vnf_package.id], _list(
+            {'field': 'size', 'model': 'VnfSoftwareImage', 'value': '2',
+             'op': '=='}))
+        # Conditions combined with 'and' have to match the same image.
+        self.assertEqual([], _list({'and': [
+            {'field': 'size', 'model': 'VnfSoftwareImage', 'value': '1',
+             'op': '=='},
+            {'field': 'name', 'model': 'VnfSoftwareImage',
+             'value': ['image2'], 'op': 'in'}]}))
+        self.assertEqual([vnf_package.id], _list({'and': [
+            {'field': 'size', 'model': 'VnfSoftwareImage', 'value': '2',
+             'op': '=='},
+            {'and': [
+                {'field': 'key', 'model': 'VnfSoftwareImageMetadata',
+                 'value': 'key1', 'op': '=='},
+                {'field': 'value', 'model': 'VnfSoftwareImageMetadata',
+                 'value': 'value2', 'op': '=='}]}]}))
+        self.assertEqual([], _list({'and': [
+            {'field': 'key', 'model': 'VnfSoftwareImageMetadata',
+             'value': 'key1', 'op': '=='},
+            {'field': 'value', 'model': 'VnfSoftwareImageMetadata',
+             'value': ['value3', 'value4'], 'op': 'in'}]}))
+
+    def test_vnf_package_list_by_filter_paginated(self):
+        vnf_package_ids = sorted(
+            self._create_vnf_package_with_user_data().id for _ in range(3))
+        filters = {'and': [
+            {'field': 'onboarding_state', 'model': 'VnfPackage',
+             'value': 'CREATED', 'op': '=='},
+            {'and': [
+                {'field': 'key', 'model': 'VnfPackageUserData',
+                 'value': 'abc', 'op': '=='},
+                {'field': 'value', 'model': 'VnfPackageUserData',
+                 'value': 'xyz', 'op': '=='}]}]}
+
+        first_page = objects.VnfPackagesList.get_by_filters(
+            self.context, filters=filters, limit=2)
+        self.assertEqual(vnf_package_ids[:2],
+                         [vnf_package.id for vnf_package in first_page])
+        self.assertEqual({'abc': 'xyz'}, first_page[0].user_data)
+
+        second_page = objects.VnfPackagesList.get_by_filters(
+            self.context, filters=filters, limit=2,
+            marker=first_page[1].id)
+        self.assertEqual(vnf_package_ids[2:],
+                         [vnf_package.id for vnf_package in second_page])
+
     def test_obj_make_compatible(self):
         data = {'id': self.vnf_package.id}
         vnf_package_obj = objects.VnfPackage(context=self.context, **data)
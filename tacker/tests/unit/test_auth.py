@@ -27,6 +27,7 @@ from tacker.tests.unit import base as unit_base
 from tacker.tests.unit import fake_auth
 
 import threading
+import time
 
 from tacker.tests import uuidsentinel
 
@@ -771,6 +772,159 @@ class TestAuthValidateBearer(unit_base.FixturedTestCase):
         req_count = _count_mock_history(history, 'http://auth')
         self.assertEqual(1, req_count)
 
+    def _register_auth_response(self, **update):
+        cfg.CONF.set_override('token_type', 'Bearer',
+                              group='authentication')
+        cfg.CONF.set_override('auth_url', 'http://auth/authorize/',
+                              group='authentication')
+        cfg.CONF.set_override('vnflcm_dummy_scope', ['create'],
+                              group='authentication')
+        json = fake_auth.fake_response(**update)
+        self.requests_mock.register_uri('GET',
+            self.url,
+            json=json,
+            headers={'Content-Type': 'application/json'},
+            status_code=200)
+
+    def test_do_auth_cached(self):
+        self._register_auth_response()
+        stats = auth.token_validation_cache.get_stats()
+
+        self.auth_bearer.do_auth()
+        auth._AuthValidateBearer(
+            vnflcm_router.VnflcmAPIRouter, 'dummy', 'Bearer',
+            'SampleAccessToken').do_auth()
+
+        history = self.requests_mock.request_history
+        self.assertEqual(1, _count_mock_history(history, 'http://auth'))
+        new_stats = auth.token_validation_cache.get_stats()
+        self.assertEqual(1, new_stats['size'])
+        self.assertEqual(
+            (stats['hits'] + 1, stats['misses'] + 1),
+            (new_stats['hits'], new_stats['misses']))
+        self.assertGreater(new_stats['hit_rate'], 0)
+
+    def test_do_auth_cached_scope_per_api(self):
+        self._register_auth_response()
+        self.auth_bearer.do_auth()
+
+        # The scope of the token is checked for each API.
+        self.config_fixture.register_opts(
+            [cfg.ListOpt('vnflcm_other_scope', default=['delete'])],
+            group='authentication')
+        auth_bearer = auth._AuthValidateBearer(
+            vnflcm_router.VnflcmAPIRouter, 'other', 'Bearer',
+            'SampleAccessToken')
+        self.assertRaises(webob.exc.HTTPForbidden, auth_bearer.do_auth)
+        history = self.requests_mock.request_history
+        self.assertEqual(1, _count_mock_history(history, 'http://auth'))
+
+    def test_do_auth_invalid_token_not_cached(self):
+        self._register_auth_response(access_token='Test')
+
+        self.assertRaises(webob.exc.HTTPUnauthorized, self.auth_bearer.do_auth)
+        self.assertRaises(webob.exc.HTTPUnauthorized, self.auth_bearer.do_auth)
+        history = self.requests_mock.request_history
+        self.assertEqual(2, _count_mock_history(history, 'http://auth'))
+        self.assertEqual(0, auth.token_validation_cache.get_stats()['size'])
+
+    @mock.patch.object(auth.time, 'monotonic')
+    def test_do_auth_expired(self, mock_monotonic):
+        cfg.CONF.set_override('token_cache_ttl', 60,
+                              group='authentication')
+        self._register_auth_response(expires_in=3600)
+        mock_monotonic.return_value = 1000
+        self.auth_bearer.do_auth()
+        mock_monotonic.return_value = 1059
+        self.auth_bearer.do_auth()
+        history = self.requests_mock.request_history
+        self.assertEqual(1, _count_mock_history(history, 'http://auth'))
+
+        mock_monotonic.return_value = 1060
+        self.auth_bearer.do_auth()
+        self.assertEqual(2, _count_mock_history(history, 'http://auth'))
+
+    @mock.patch.object(auth.time, 'monotonic')
+    def test_sweep(self, mock_monotonic):
+        self._register_auth_response(expires_in=10)
+        stats = auth.token_validation_cache.get_stats()
+        mock_monotonic.return_value = 1000
+        self.auth_bearer.do_auth()
+        mock_monotonic.return_value = 1005
+        auth.token_validation_cache.sweep()
+        self.assertEqual(1, auth.token_validation_cache.get_stats()['size'])
+
+        mock_monotonic.return_value = 1010
+        auth.token_validation_cache.sweep()
+        new_stats = auth.token_validation_cache.get_stats()
+        self.assertEqual(0, new_stats['size'])
+        self.assertEqual(stats['expirations'] + 1, new_stats['expirations'])
+
+    @mock.patch.object(auth.LOG, 'debug')
+    @mock.patch.object(auth.time, 'sleep')
+    def test_sweep_forever_logs_stats(self, mock_sleep, mock_log_debug):
+        # The second sleep stops the sweeper.
+        mock_sleep.side_effect = [None, SystemExit]
+
+        self.assertRaises(SystemExit,
+                          auth.token_validation_cache._sweep_forever)
+        mock_sleep.assert_called_with(auth.TOKEN_SWEEP_INTERVAL)
+        mock_log_debug.assert_called_once_with(
+            "Token validation cache stats: %s",
+            auth.token_validation_cache.get_stats())
+
+    def test_do_auth_cache_size(self):
+        cfg.CONF.set_override('token_cache_size', 1,
+                              group='authentication')
+        self._register_auth_response()
+        stats = auth.token_validation_cache.get_stats()
+        self.auth_bearer.do_auth()
+        self._register_auth_response(access_token='OtherAccessToken')
+        auth._AuthValidateBearer(
+            vnflcm_router.VnflcmAPIRouter, 'dummy', 'Bearer',
+            'OtherAccessToken').do_auth()
+
+        new_stats = auth.token_validation_cache.get_stats()
+        self.assertEqual(1, new_stats['size'])
+        self.assertEqual(stats['evictions'] + 1, new_stats['evictions'])
+
+    @mock.patch.object(auth._AuthValidateBearer, 'request')
+    def test_do_auth_concurrent(self, mock_request):
+        self._register_auth_response()
+        stats = auth.token_validation_cache.get_stats()
+        release = threading.Event()
+
+        def request():
+            release.wait(10)
+            return mock.Mock(json=mock.Mock(
+                return_value=fake_auth.fake_response()))
+
+        mock_request.side_effect = request
+        errors = []
+
+        def do_auth():
+            try:
+                self.auth_bearer.do_auth()
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=do_auth) for _i in range(3)]
+        for thread in threads:
+            thread.start()
+        # Let all of them wait for the validation.
+        for _i in range(1000):
+            new_stats = auth.token_validation_cache.get_stats()
+            if (new_stats['hits'] + new_stats['misses'] ==
+                    stats['hits'] + stats['misses'] + 3):
+                break
+            time.sleep(0.01)
+        release.set()
+        for thread in threads:
+            thread.join(10)
+
+        self.assertEqual([], errors)
+        mock_request.assert_called_once_with()
+
 
 class TestAuthValidateBasic(unit_base.FixturedTestCase):
     def setUp(self):
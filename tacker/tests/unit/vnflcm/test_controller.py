@@ -25,6 +25,7 @@ from webob import exc
 
 from oslo_serialization import jsonutils
 
+from tacker.api.common import pagination
 from tacker.api.vnflcm.v1 import controller
 from tacker.api.vnflcm.v1 import sync_resource
 from tacker.common import exceptions
@@ -1621,6 +1622,53 @@ class TestController(base.TestCase):
             fields.VnfInstanceState.INSTANTIATED)]
         self.assertEqual(expected_result, resp)
 
+    @mock.patch.object(objects.LccnSubscriptionRequest,
+                       "vnf_lcm_subscriptions_list")
+    def test_subscription_list_paginated(self, mock_subscription_list):
+        self.config(subscription_num=2, group='vnf_lcm')
+        subscriptions = [
+            mock.Mock(id=subscription_id, callback_uri='http://localhost/',
+                      filter={})
+            for subscription_id in (uuidsentinel.subscription_1,
+                                    uuidsentinel.subscription_2,
+                                    uuidsentinel.subscription_3)]
+        mock_subscription_list.return_value = subscriptions
+        req = fake_request.HTTPRequest.blank('/subscriptions')
+
+        resp = self.controller.subscription_list(req)
+
+        self.assertEqual(
+            [uuidsentinel.subscription_1, uuidsentinel.subscription_2],
+            [subscription['id'] for subscription in resp.json])
+        mock_subscription_list.assert_called_once_with(
+            req.context, limit=3, marker=None)
+        marker = pagination.encode_marker(
+            uuidsentinel.subscription_2)
+        self.assertEqual(
+            '<%s?nextpage_opaque_marker=%s>;rel="next"' % (
+                req.path_url, marker), resp.headers['Link'])
+
+        mock_subscription_list.reset_mock()
+        mock_subscription_list.return_value = subscriptions[2:]
+        req = fake_request.HTTPRequest.blank(
+            '/subscriptions?nextpage_opaque_marker=%s' % marker)
+
+        resp = self.controller.subscription_list(req)
+
+        self.assertEqual([uuidsentinel.subscription_3],
+                         [subscription['id'] for subscription in resp.json])
+        mock_subscription_list.assert_called_once_with(
+            req.context, limit=3, marker=uuidsentinel.subscription_2)
+        self.assertNotIn('Link', resp.headers)
+
+    def test_subscription_list_invalid_marker(self):
+        req = fake_request.HTTPRequest.blank(
+            '/subscriptions?nextpage_opaque_marker=invalid')
+
+        resp = self.controller.subscription_list(req)
+
+        self.assertEqual(http_client.BAD_REQUEST, resp.status_code)
+
     @mock.patch.object(objects.VnfInstanceList, "get_by_filters")
     def test_index_empty_response(self, mock_vnf_list):
         req = fake_request.HTTPRequest.blank('/vnf_instances')
@@ -1628,6 +1676,74 @@ class TestController(base.TestCase):
         resp = self.controller.index(req)
         self.assertEqual([], resp)
 
+    @mock.patch.object(objects.VnfInstanceList, "get_by_filters")
+    def test_index_paginated(self, mock_vnf_list):
+        self.config(vnf_instance_num=1, group='vnf_lcm')
+        vnf_instance_1 = fakes.return_vnf_instance()
+        vnf_instance_2 = fakes.return_vnf_instance(
+            id=uuidsentinel.vnf_instance_id_2)
+        mock_vnf_list.return_value = [vnf_instance_1, vnf_instance_2]
+        req = fake_request.HTTPRequest.blank(
+            '/vnf_instances?exclude_default')
+
+        resp = self.controller.index(req)
+
+        self.assertEqual([uuidsentinel.vnf_instance_id],
+                         [vnf_instance['id'] for vnf_instance in resp.obj])
+        self.assertNotIn('metadata', resp.obj[0])
+        mock_vnf_list.assert_called_once_with(
+            req.context, filters=None, limit=2, marker=None,
+            fields=set())
+        marker = pagination.encode_marker(
+            uuidsentinel.vnf_instance_id)
+        self.assertEqual(
+            '<%s?exclude_default=&nextpage_opaque_marker=%s>;rel="next"' % (
+                req.path_url, marker), resp.headers['Link'])
+
+        mock_vnf_list.reset_mock()
+        mock_vnf_list.return_value = [vnf_instance_2]
+        req = fake_request.HTTPRequest.blank(
+            '/vnf_instances?nextpage_opaque_marker=%s' % marker)
+
+        resp = self.controller.index(req)
+
+        self.assertEqual([uuidsentinel.vnf_instance_id_2],
+                         [vnf_instance['id'] for vnf_instance in resp])
+        mock_vnf_list.assert_called_once_with(
+            req.context, filters=None, limit=2,
+            marker=uuidsentinel.vnf_instance_id, fields=None)
+
+    @mock.patch.object(objects.VnfInstanceList, "get_by_filters")
+    def test_index_with_fields(self, mock_vnf_list):
+        mock_vnf_list.return_value = [fakes.return_vnf_instance(
+            fields.VnfInstanceState.INSTANTIATED)]
+        req = fake_request.HTTPRequest.blank(
+            '/vnf_instances?fields=instantiatedVnfInfo/flavourId,'
+            'instantiatedVnfInfo/extCpInfo')
+
+        resp = self.controller.index(req)
+
+        expected_result = fakes.fake_vnf_instance_response(
+            fields.VnfInstanceState.INSTANTIATED)
+        expected_result.pop('vimConnectionInfo')
+        expected_result.pop('metadata')
+        expected_result['instantiatedVnfInfo'] = {
+            'flavourId': 'simple', 'extCpInfo': []}
+        self.assertEqual([expected_result], resp)
+        mock_vnf_list.assert_called_once_with(
+            req.context, filters=None, limit=101, marker=None,
+            fields={'instantiated_vnf_info.ext_cp_info'})
+
+    @ddt.data('fields=vnfPkgId', 'all_fields&exclude_default',
+              'nextpage_opaque_marker=invalid')
+    def test_index_invalid_query_parameters(self, query):
+        req = fake_request.HTTPRequest.blank('/vnf_instances?%s' % query)
+        req.method = 'GET'
+
+        resp = req.get_response(self.app)
+
+        self.assertEqual(http_client.BAD_REQUEST, resp.status_code)
+
     @mock.patch.object(TackerManager, 'get_service_plugins',
                        return_value={'VNFM':
                        test_nfvo_plugin.FakeVNFMPlugin()})
@@ -14,13 +14,19 @@
 # limitations under the License.
 
 import os
+import shutil
+import tempfile
+from unittest import mock
 
 import ddt
 from oslo_config import cfg
+import yaml
 
 from tacker.tests.unit import base
 from tacker.tests.unit.vnflcm import fakes
+from tacker.tests import utils as test_utils
 from tacker.tests import uuidsentinel
+from tacker.vnflcm import template_cache
 from tacker.vnflcm import utils as vnflcm_utils
 
 
@@ -57,3 +63,72 @@ class VnfLcmUtilsTestCase(base.TestCase):
         expected_flavour_description = 'A simple flavor'
         self.assertEqual(expected_flavour_description,
                          param_value['flavour_description'])
+
+
+@mock.patch.object(vnflcm_utils, '_get_vnf_package_id',
+                   return_value=uuidsentinel.package_uuid)
+@mock.patch.object(vnflcm_utils.yaml, 'safe_load', wraps=yaml.safe_load)
+class VnfLcmUtilsTemplateCacheTestCase(base.TestCase):
+
+    def setUp(self):
+        super(VnfLcmUtilsTemplateCacheTestCase, self).setUp()
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        self.config(vnf_package_csar_path=temp_dir, group='vnf_package')
+        self.csar_path = os.path.join(temp_dir, uuidsentinel.package_uuid)
+        test_utils.copy_csar_files(self.csar_path, 'vnflcm4',
+                                   read_vnfd_only=True)
+
+    def _get_vnfd_dict(self):
+        return vnflcm_utils._get_vnfd_dict(None, uuidsentinel.vnfd_id,
+                                           'simple')
+
+    def test_get_vnfd_dict_cached(self, mock_safe_load,
+                                  mock_get_vnf_package_id):
+        vnfd_dict = self._get_vnfd_dict()
+        load_count = mock_safe_load.call_count
+        self.assertTrue(load_count)
+
+        # Modifying the returned VNFD does not modify the cached one.
+        vnfd_dict['topology_template']['node_templates'].clear()
+        cached_vnfd_dict = self._get_vnfd_dict()
+
+        self.assertEqual(load_count, mock_safe_load.call_count)
+        self.assertIn('VNF',
+                      cached_vnfd_dict['topology_template']['node_templates'])
+        self.assertNotIn('requirements', cached_vnfd_dict[
+            'topology_template']['substitution_mappings'])
+
+    def test_get_vnfd_dict_reloaded_on_file_change(
+            self, mock_safe_load, mock_get_vnf_package_id):
+        self._get_vnfd_dict()
+        load_count = mock_safe_load.call_count
+
+        vnfd_file = os.path.join(self.csar_path, 'Definitions',
+                                 'helloworld3_df_simple.yaml')
+        with open(vnfd_file, 'a') as f:
+            f.write('# modified\n')
+        self._get_vnfd_dict()
+        self.assertEqual(2 * load_count, mock_safe_load.call_count)
+
+        template_cache.invalidate(uuidsentinel.package_uuid)
+        self._get_vnfd_dict()
+        self.assertEqual(3 * load_count, mock_safe_load.call_count)
+
+    def test_template_cache_lru_eviction(self, mock_safe_load,
+                                         mock_get_vnf_package_id):
+        self.config(template_cache_size=1, group='vnf_lcm')
+        stats = template_cache.CACHE.get_stats()
+
+        self._get_vnfd_dict()
+        self.assertIsNone(vnflcm_utils._get_base_hot_dict(
+            None, uuidsentinel.vnfd_id))
+        self.assertIsNone(vnflcm_utils._get_base_hot_dict(
+            None, uuidsentinel.vnfd_id))
+        self._get_vnfd_dict()
+
+        new_stats = template_cache.CACHE.get_stats()
+        self.assertEqual(1, new_stats['size'])
+        self.assertEqual(1, new_stats['hits'] - stats['hits'])
+        self.assertEqual(3, new_stats['misses'] - stats['misses'])
+        self.assertEqual(2, new_stats['evictions'] - stats['evictions'])
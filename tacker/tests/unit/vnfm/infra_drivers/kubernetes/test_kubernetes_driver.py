@@ -40,6 +40,9 @@ from unittest import mock
 class TestKubernetes(base.TestCase):
     def setUp(self):
         super(TestKubernetes, self).setUp()
+        # The status checks are tested against the mocked reads of each
+        # object, see test_readiness_tracker for the other modes.
+        self.config(readiness_tracking='read', group='kubernetes_vim')
         self.kubernetes = kubernetes_driver.Kubernetes()
         self.kubernetes.STACK_RETRIES = 1
         self.kubernetes.STACK_RETRY_WAIT = 5
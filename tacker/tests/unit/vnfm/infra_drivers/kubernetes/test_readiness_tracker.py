@@ -0,0 +1,191 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+import eventlet
+from kubernetes import client
+
+from tacker.tests.unit import base
+from tacker.tests.unit.db import utils
+from tacker.tests.unit.vnfm.infra_drivers.kubernetes import fakes
+from tacker.vnfm.infra_drivers.kubernetes import kubernetes_driver
+from tacker.vnfm.infra_drivers.kubernetes import readiness_tracker
+
+
+class FakeCoreV1Api(object):
+    """Stand-in of the Kubernetes API server for the pods."""
+
+    def __init__(self):
+        self.pods = {}
+        self.resource_version = 0
+        self.events = eventlet.queue.LightQueue()
+        self.list_calls = []
+        self.read_calls = []
+        self.list_error = None
+        self.watch_error = None
+
+    def set_pod(self, name, phase, namespace='curryns'):
+        event_type = 'MODIFIED' if name in self.pods else 'ADDED'
+        self.resource_version += 1
+        pod = client.V1Pod(
+            metadata=client.V1ObjectMeta(
+                name=name, namespace=namespace,
+                resource_version=str(self.resource_version)),
+            status=client.V1PodStatus(phase=phase))
+        self.pods[name] = pod
+        self.events.put({'type': event_type, 'object': pod})
+
+    def list_namespaced_pod(self, namespace, **kwargs):
+        self.list_calls.append(namespace)
+        if self.list_error:
+            raise self.list_error
+        return client.V1PodList(
+            items=list(self.pods.values()),
+            metadata=client.V1ListMeta(
+                resource_version=str(self.resource_version)))
+
+    def read_namespaced_pod(self, name, namespace):
+        self.read_calls.append(name)
+        return self.pods[name]
+
+
+class FakeWatch(object):
+
+    def __init__(self):
+        self.resource_version = None
+
+    def stream(self, func, resource_version, **kwargs):
+        api = func.__self__
+        if api.watch_error:
+            raise api.watch_error
+        while True:
+            event = api.events.get()
+            version = event['object'].metadata.resource_version
+            # The older changes are in the list watched from.
+            if int(version) > int(resource_version):
+                self.resource_version = version
+                yield event
+
+
+class TestReadinessTracker(base.TestCase):
+
+    def setUp(self):
+        super(TestReadinessTracker, self).setUp()
+        self.api = FakeCoreV1Api()
+        self.api.set_pod('curry-test001', 'Pending')
+        self.api.set_pod('curry-test002', 'Pending')
+        patcher = mock.patch.object(readiness_tracker.watch, 'Watch',
+                                    FakeWatch)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(readiness_tracker.time, 'sleep')
+        self.mock_sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _get_tracker(self, mode):
+        tracker = readiness_tracker.ReadinessTracker(mode)
+        self.addCleanup(tracker.stop)
+        return tracker
+
+    def _read_phase(self, api, name):
+        return api.read_namespaced_pod(name=name,
+                                       namespace='curryns').status.phase
+
+    def test_watch(self):
+        tracker = self._get_tracker('watch')
+        api = tracker.api(self.api)
+        self.assertEqual('Pending', self._read_phase(api, 'curry-test001'))
+        self.assertEqual('Pending', self._read_phase(api, 'curry-test002'))
+
+        eventlet.spawn_n(self.api.set_pod, 'curry-test001', 'Running')
+        self.assertTrue(tracker.wait(60))
+        self.assertEqual('Running', self._read_phase(api, 'curry-test001'))
+        self.assertEqual(
+            ['Running', 'Pending'],
+            [pod.status.phase for pod in
+             api.list_namespaced_pod(namespace='curryns').items])
+        self.assertEqual(['curryns'], self.api.list_calls)
+        self.assertEqual([], self.api.read_calls)
+        self.mock_sleep.assert_not_called()
+
+    def test_watch_wait_timeout(self):
+        tracker = self._get_tracker('watch')
+        api = tracker.api(self.api)
+        self._read_phase(api, 'curry-test001')
+
+        self.assertFalse(tracker.wait(0.01))
+
+    def test_watch_unavailable(self):
+        self.api.watch_error = client.rest.ApiException(status=405)
+        tracker = self._get_tracker('watch')
+        api = tracker.api(self.api)
+        self._read_phase(api, 'curry-test001')
+        # Let the watch fail.
+        eventlet.sleep(0)
+
+        self.api.set_pod('curry-test001', 'Running')
+        self.assertFalse(tracker.wait(5))
+        self.mock_sleep.assert_called_once_with(5)
+        self.assertEqual('Running', self._read_phase(api, 'curry-test001'))
+        self.assertEqual(['curryns', 'curryns'], self.api.list_calls)
+
+    def test_list(self):
+        tracker = self._get_tracker('list')
+        api = tracker.api(self.api)
+        self._read_phase(api, 'curry-test001')
+        self._read_phase(api, 'curry-test002')
+        self.assertEqual(['curryns'], self.api.list_calls)
+
+        self.api.set_pod('curry-test002', 'Running')
+        self.assertFalse(tracker.wait(5))
+        self.assertEqual('Running', self._read_phase(api, 'curry-test002'))
+        self.assertEqual(['curryns', 'curryns'], self.api.list_calls)
+        self.assertEqual([], self.api.read_calls)
+
+    def test_list_not_found(self):
+        api = self._get_tracker('list').api(self.api)
+
+        exc = self.assertRaises(client.rest.ApiException, self._read_phase,
+                                api, 'curry-test003')
+        self.assertEqual(404, exc.status)
+
+    def test_list_forbidden(self):
+        self.api.list_error = client.rest.ApiException(status=403)
+        api = self._get_tracker('list').api(self.api)
+
+        self.assertEqual('Pending', self._read_phase(api, 'curry-test001'))
+        self.assertEqual('Pending', self._read_phase(api, 'curry-test002'))
+        self.assertEqual(['curryns'], self.api.list_calls)
+        self.assertEqual(['curry-test001', 'curry-test002'],
+                         self.api.read_calls)
+
+    def test_read(self):
+        tracker = self._get_tracker('read')
+
+        self.assertIs(self.api, tracker.api(self.api))
+        self.assertFalse(tracker.wait(5))
+        self.mock_sleep.assert_called_once_with(5)
+
+    def test_create_wait_k8s(self):
+        kubernetes = kubernetes_driver.Kubernetes()
+        kubernetes.STACK_RETRIES = 1
+        k8s_objs = fakes.fake_k8s_objs_pod()
+        eventlet.spawn_after(0.01, self.api.set_pod, 'curry-test001',
+                             'Running')
+
+        checked_objs = kubernetes.create_wait_k8s(
+            k8s_objs, {'v1': self.api}, utils.get_dummy_vnf_instance())
+        self.assertEqual('Create_complete', checked_objs[0]['status'])
+        self.assertEqual(['test'], self.api.list_calls)
+        self.assertEqual([], self.api.read_calls)
+        self.mock_sleep.assert_not_called()
@@ -16,6 +16,9 @@
 import os
 from unittest import mock
 
+import eventlet
+from kubernetes import client
+
 from tacker.common import exceptions
 from tacker.tests.unit import base
 from tacker.tests.unit import fake_request
@@ -57,6 +60,111 @@ class TestTransformer(base.TestCase):
         self.assertIsNotNone(new_k8s_objs)
         self.assertEqual(new_k8s_objs[0]['status'], 'Creating')
 
+    def _get_k8s_objs(self, *kinds):
+        return [{'namespace': 'curryns',
+                 'object': getattr(client, 'V1' + kind)(
+                     api_version=api_version, kind=kind,
+                     metadata=client.V1ObjectMeta(name=name))}
+                for api_version, kind, name in kinds]
+
+    @mock.patch.object(translate_outputs.Transformer,
+                       "_select_k8s_client_and_api")
+    def test_deploy_k8s_tiers(self, mock_k8s_client_and_api):
+        created = []
+
+        def _create(kind, namespace, api_version, body):
+            # Let the other resources of the tier be created meanwhile.
+            eventlet.sleep(0)
+            created.append(body.metadata.name)
+
+        mock_k8s_client_and_api.side_effect = _create
+        k8s_objs = self._get_k8s_objs(
+            ('apps/v1', 'Deployment', 'deployment'),
+            ('v1', 'Service', 'service'),
+            ('v1', 'ConfigMap', 'config-map'),
+            ('v1', 'ServiceAccount', 'service-account'),
+            ('v1', 'Namespace', 'curryns'))
+
+        new_k8s_objs = self.transfromer.deploy_k8s(k8s_objs)
+        self.assertEqual(['curryns', 'service-account', 'service',
+                          'config-map', 'deployment'], created)
+        self.assertEqual(['Creating'] * 5,
+                         [obj['status'] for obj in new_k8s_objs])
+
+    @mock.patch.object(translate_outputs.Transformer,
+                       "_select_k8s_client_and_api")
+    def test_deploy_k8s_create_concurrency(self, mock_k8s_client_and_api):
+        self.config(create_concurrency=2, group='kubernetes_vim')
+        running = []
+        max_running = []
+
+        def _create(kind, namespace, api_version, body):
+            running.append(body)
+            max_running.append(len(running))
+            eventlet.sleep(0)
+            running.remove(body)
+
+        mock_k8s_client_and_api.side_effect = _create
+        k8s_objs = self._get_k8s_objs(
+            *[('v1', 'ConfigMap', 'config-map-%d' % i) for i in range(5)])
+
+        self.transfromer.deploy_k8s(k8s_objs)
+        self.assertEqual(5, mock_k8s_client_and_api.call_count)
+        self.assertEqual(2, max(max_running))
+
+    def test_deploy_k8s_rollback(self):
+        core_v1_api = mock.Mock()
+        apps_v1_api = mock.Mock()
+
+        def _create_deployment(namespace, body):
+            eventlet.sleep(0)
+            if body.metadata.name == 'deployment-2':
+                raise client.rest.ApiException(status=409)
+
+        apps_v1_api.create_namespaced_deployment.side_effect = \
+            _create_deployment
+        self.transfromer.k8s_client_dict = {'v1': core_v1_api,
+                                            'apps/v1': apps_v1_api}
+        k8s_objs = self._get_k8s_objs(
+            ('v1', 'Namespace', 'curryns'),
+            ('v1', 'ConfigMap', 'config-map'),
+            ('apps/v1', 'Deployment', 'deployment-1'),
+            ('apps/v1', 'Deployment', 'deployment-2'))
+
+        self.assertRaises(exceptions.CreateApiFalse,
+                          self.transfromer.deploy_k8s, k8s_objs)
+        body = client.V1DeleteOptions(propagation_policy='Foreground')
+        apps_v1_api.delete_namespaced_deployment.assert_called_once_with(
+            name='deployment-1', namespace='curryns', body=body)
+        core_v1_api.delete_namespaced_config_map.assert_called_once_with(
+            name='config-map', namespace='curryns', body=body)
+        core_v1_api.delete_namespace.assert_called_once_with(
+            name='curryns', body=body)
+
+    @mock.patch.object(translate_outputs.eventlet, 'sleep')
+    @mock.patch.object(translate_outputs.time, 'monotonic')
+    @mock.patch.object(translate_outputs.Transformer,
+                       "_select_k8s_client_and_api")
+    def test_deploy_k8s_create_rate_limit(self, mock_k8s_client_and_api,
+                                          mock_monotonic, mock_sleep):
+        self.config(create_rate_limit=4, group='kubernetes_vim')
+        mock_monotonic.return_value = 100.0
+        k8s_objs = self._get_k8s_objs(
+            *[('v1', 'ConfigMap', 'config-map-%d' % i) for i in range(3)])
+
+        self.transfromer.deploy_k8s(k8s_objs)
+        self.assertEqual(3, mock_k8s_client_and_api.call_count)
+        # The first call is not delayed, the next ones are 0.25s apart.
+        self.assertEqual([mock.call(0.25), mock.call(0.5)],
+                         mock_sleep.call_args_list)
+
+    @mock.patch.object(translate_outputs.eventlet, 'sleep')
+    def test_rate_limiter_no_limit(self, mock_sleep):
+        rate_limiter = translate_outputs._RateLimiter(0)
+        for _i in range(3):
+            rate_limiter.wait()
+        mock_sleep.assert_not_called()
+
     def test_deployment(self):
         k8s_objs = self.transfromer.get_k8s_objs_from_yaml(
             ['deployment.yaml'], self.yaml_path
@@ -0,0 +1,73 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+from tacker.tests.unit import base
+from tacker.vnfm.infra_drivers.openstack import heat_client as hc
+from tacker.vnfm.infra_drivers.openstack import openstack  # noqa
+
+
+class TestResourceTypeCache(base.TestCase):
+
+    def setUp(self):
+        super(TestResourceTypeCache, self).setUp()
+        self.cache = hc.ResourceTypeCache()
+        patcher = mock.patch.object(hc, 'RESOURCE_TYPES', self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.heat_client = mock.Mock()
+        self.heat_client.resource_types.get.return_value = {
+            'attributes': {'port_security_enabled': {}}}
+        self.vim_key = ('vim-1', 'RegionOne')
+
+    def _attr_support(self, vim_key):
+        return hc.HeatClient.resource_attr_support(
+            self.heat_client, 'OS::Neutron::Port', 'port_security_enabled',
+            vim_key=vim_key)
+
+    def test_resource_attr_support_cached(self):
+        self.assertTrue(self._attr_support(self.vim_key))
+        self.assertTrue(self._attr_support(self.vim_key))
+        self.assertTrue(self._attr_support(('vim-2', 'RegionOne')))
+
+        self.assertEqual(2, self.heat_client.resource_types.get.call_count)
+
+    def test_resource_attr_support_not_cached(self):
+        self._attr_support(None)
+        self._attr_support(None)
+        self.config(resource_type_cache_ttl=0, group='openstack_vim')
+        self._attr_support(self.vim_key)
+        self._attr_support(self.vim_key)
+
+        self.assertEqual(4, self.heat_client.resource_types.get.call_count)
+
+    @mock.patch('time.monotonic')
+    def test_resource_attr_support_expired(self, mock_monotonic):
+        self.config(resource_type_cache_ttl=60, group='openstack_vim')
+        mock_monotonic.return_value = 1000
+        self._attr_support(self.vim_key)
+        mock_monotonic.return_value = 1059
+        self._attr_support(self.vim_key)
+        mock_monotonic.return_value = 1061
+        self._attr_support(self.vim_key)
+
+        self.assertEqual(2, self.heat_client.resource_types.get.call_count)
+
+    def test_invalidate(self):
+        self._attr_support(self.vim_key)
+        self._attr_support(('vim-2', 'RegionOne'))
+        self.cache.invalidate('vim-1')
+        self._attr_support(self.vim_key)
+        self._attr_support(('vim-2', 'RegionOne'))
+
+        self.assertEqual(3, self.heat_client.resource_types.get.call_count)
@@ -26,6 +26,7 @@ from tacker.extensions import vnfm
 from tacker.tests.unit import base
 from tacker.tests.unit.db import utils
 from tacker.vnfm.infra_drivers.openstack import openstack
+from tacker.vnfm.infra_drivers.openstack import translate_template
 
 
 vnf_dict = {
@@ -418,6 +419,26 @@ class TestOpenStack(base.TestCase):
         self._test_assert_equal_for_tosca_templates('test_tosca_openwrt.yaml',
             'hot_tosca_openwrt.yaml')
 
+    def test_create_tosca_cached_template(self):
+        cache = translate_template.TOSCA_TEMPLATES
+        stats = cache.get_stats()
+        self._test_assert_equal_for_tosca_templates('test_tosca_openwrt.yaml',
+            'hot_tosca_openwrt.yaml')
+        self.heat_client.create.reset_mock()
+        self._test_assert_equal_for_tosca_templates('test_tosca_openwrt.yaml',
+            'hot_tosca_openwrt.yaml')
+        self.assertEqual({'size': 1, 'hits': stats['hits'] + 1,
+                          'misses': stats['misses'] + 1,
+                          'evictions': stats['evictions']},
+                         cache.get_stats())
+
+    def test_create_tosca_template_cache_disabled(self):
+        self.config(tosca_template_cache_size=0, group='openstack_vim')
+        self._test_assert_equal_for_tosca_templates('test_tosca_openwrt.yaml',
+            'hot_tosca_openwrt.yaml')
+        self.assertEqual(0, translate_template.TOSCA_TEMPLATES.get_stats()[
+            'size'])
+
     def test_create_tosca_with_userdata(self):
         self._test_assert_equal_for_tosca_templates(
             'test_tosca_openwrt_userdata.yaml',
@@ -20,6 +20,7 @@ import tempfile
 from unittest import mock
 
 import ddt
+import eventlet
 import requests
 import yaml
 
@@ -1303,6 +1304,71 @@ class TestOpenStack(base.FixturedTestCase):
         delete_call_count = 2 if exception_in_delete else 1
         self.assertEqual(delete_image_url.call_count, delete_call_count)
 
+    def _mock_glance_client(self, mock_glance_client, vnf_software_image,
+                            hash_mismatch=None):
+        glance_client = mock_glance_client.return_value
+        created = []
+
+        def _create(name, **image_data):
+            image = mock.Mock(id='image-%d' % len(created))
+            created.append(image.id)
+            # Let the other images be created meanwhile.
+            eventlet.sleep(0)
+            return image
+
+        def _get(image_id):
+            hash_value = vnf_software_image.hash
+            if image_id == hash_mismatch:
+                hash_value = 'diff-hash-value'
+            return mock.Mock(id=image_id, status='active',
+                             hash_value=hash_value)
+
+        glance_client.create.side_effect = _create
+        glance_client.get.side_effect = _get
+        return glance_client, created
+
+    @mock.patch.object(openstack.gc, 'GlanceClient')
+    def test_pre_instantiation_vnf_concurrent_images(self,
+                                                     mock_glance_client):
+        self.config(image_upload_concurrency=2, group='openstack_vim')
+        vnf_instance = fd_utils.get_vnf_instance_object()
+        vnf_software_image = fd_utils.get_vnf_software_image_object()
+        vnf_software_images = {'node_name%d' % i: vnf_software_image
+                               for i in range(3)}
+        glance_client, created = self._mock_glance_client(
+            mock_glance_client, vnf_software_image)
+
+        vnf_resources = self.openstack.pre_instantiation_vnf(
+            self.context, vnf_instance, None, vnf_software_images)
+
+        self.assertEqual(set(vnf_software_images), set(vnf_resources))
+        self.assertEqual(set(created),
+                         {resources[0].resource_identifier
+                          for resources in vnf_resources.values()})
+        glance_client.delete.assert_not_called()
+
+    @mock.patch.object(openstack.gc, 'GlanceClient')
+    def test_pre_instantiation_vnf_concurrent_images_rollback(
+            self, mock_glance_client):
+        self.config(image_upload_concurrency=3, group='openstack_vim')
+        vnf_instance = fd_utils.get_vnf_instance_object()
+        vnf_software_image = fd_utils.get_vnf_software_image_object()
+        vnf_software_images = {'node_name%d' % i: vnf_software_image
+                               for i in range(3)}
+        glance_client, created = self._mock_glance_client(
+            mock_glance_client, vnf_software_image, hash_mismatch='image-1')
+
+        self.assertRaises(exceptions.VnfPreInstantiationFailed,
+                          self.openstack.pre_instantiation_vnf,
+                          self.context, vnf_instance, None,
+                          vnf_software_images)
+
+        # The failed image and the images which got active are deleted.
+        self.assertEqual(3, len(created))
+        self.assertEqual(sorted(created),
+                         sorted(call[0][0] for call in
+                                glance_client.delete.call_args_list))
+
     @mock.patch('tacker.vnfm.infra_drivers.openstack.openstack.LOG')
     def test_delete_vnf_instance_resource(self, mock_log):
         vnf_instance = fd_utils.get_vnf_instance_object()
@@ -0,0 +1,90 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+import eventlet
+
+from tacker.tests.unit import base
+from tacker.vnfm.infra_drivers.openstack import heat_client as hc
+from tacker.vnfm.infra_drivers.openstack import stack_watcher
+
+
+class TestStackWatcher(base.TestCase):
+
+    def setUp(self):
+        super(TestStackWatcher, self).setUp()
+        self.watcher = stack_watcher.StackWatcher()
+        self.heatclient = mock.Mock()
+
+        def _get(stack_id):
+            # Let the other callers queue their stacks meanwhile.
+            eventlet.sleep(0)
+            return mock.Mock(id=stack_id, stack_status='CREATE_COMPLETE')
+
+        self.heatclient.get.side_effect = _get
+        self.heatclient.list_by_ids.side_effect = lambda stack_ids: [
+            mock.Mock(id=stack_id, stack_status='CREATE_IN_PROGRESS')
+            for stack_id in stack_ids if stack_id != 'unknown']
+
+    def test_get_poll_intervals(self):
+        self.assertEqual([1, 2, 4, 8, 10, 10, 10, 10, 10],
+                         stack_watcher.get_poll_intervals(1, 10, 6))
+        self.assertEqual([0, 10, 10],
+                         stack_watcher.get_poll_intervals(0, 10, 2))
+        self.assertEqual([10, 10, 10],
+                         stack_watcher.get_poll_intervals(30, 10, 3))
+        self.assertEqual([0, 0, 0],
+                         stack_watcher.get_poll_intervals(1, 0, 3))
+        self.assertEqual([10], stack_watcher.get_poll_intervals(1, 10, 0))
+
+    def test_get_single_stack(self):
+        stack = self.watcher.get(self.heatclient, 'stack-1')
+
+        self.assertEqual('stack-1', stack.id)
+        self.heatclient.get.assert_called_once_with('stack-1')
+        self.heatclient.list_by_ids.assert_not_called()
+
+    def test_get_concurrent_stacks(self):
+        pool = eventlet.GreenPool()
+        stack_ids = ['stack-1', 'stack-2', 'stack-3', 'stack-2', 'unknown']
+        stacks = list(pool.imap(
+            lambda stack_id: self.watcher.get(self.heatclient, stack_id),
+            stack_ids))
+
+        self.assertEqual(stack_ids, [stack.id for stack in stacks])
+        # The first caller got its stack alone, the others were queued
+        # meanwhile and looked up by a single list.
+        self.heatclient.list_by_ids.assert_called_once_with(
+            ['stack-2', 'stack-3', 'unknown'])
+        self.assertEqual([mock.call('stack-1'), mock.call('unknown')],
+                         self.heatclient.get.call_args_list)
+        self.assertEqual({}, self.watcher._vims)
+
+    def test_get_error(self):
+        self.heatclient.get.side_effect = ValueError('heat error')
+
+        self.assertRaises(ValueError, self.watcher.get, self.heatclient,
+                          'stack-1')
+        self.assertEqual({}, self.watcher._vims)
+
+    @mock.patch.object(hc, 'HeatClient')
+    def test_get_heat_client(self, mock_heat_client):
+        mock_heat_client.side_effect = lambda *args: mock.Mock()
+        auth_attr = {'auth_url': 'http://keystone', 'username': 'admin'}
+        heatclient = hc.get_heat_client(auth_attr, 'RegionOne')
+
+        self.assertIs(heatclient,
+                      hc.get_heat_client(dict(auth_attr), 'RegionOne'))
+        self.assertIsNot(heatclient,
+                         hc.get_heat_client(auth_attr, 'RegionTwo'))
+        self.assertEqual(2, mock_heat_client.call_count)
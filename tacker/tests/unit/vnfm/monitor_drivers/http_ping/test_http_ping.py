@@ -14,7 +14,9 @@
 
 import testtools
 from unittest import mock
-from urllib import error as urlerr
+
+from oslo_config import cfg
+import requests
 
 from tacker.vnfm.monitor_drivers.http_ping import http_ping
 
@@ -24,20 +26,28 @@ class TestVNFMonitorHTTPPing(testtools.TestCase):
     def setUp(self):
         super(TestVNFMonitorHTTPPing, self).setUp()
         self.monitor_http_ping = http_ping.VNFMonitorHTTPPing()
+        self.prober = http_ping.HTTPProber()
+        patcher = mock.patch.object(http_ping, 'PROBER', self.prober)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch('requests.Session.request')
+        self.mock_request = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_request.return_value = mock.Mock(status_code=200)
 
-    @mock.patch('urllib.request.urlopen')
-    def test_monitor_call_for_success(self, mock_urlopen):
+    def test_monitor_call_for_success(self):
         test_vnf = {}
         test_kwargs = {
             'mgmt_ip': 'a.b.c.d'
         }
         self.monitor_http_ping.monitor_call(test_vnf,
                                             test_kwargs)
-        mock_urlopen.assert_called_once_with('http://a.b.c.d:80', timeout=5)
+        self.mock_request.assert_called_once_with(
+            'GET', 'http://a.b.c.d:80/', timeout=5)
 
-    @mock.patch('urllib.request.urlopen')
-    def test_monitor_call_for_failure(self, mock_urlopen):
-        mock_urlopen.side_effect = urlerr.URLError("MOCK Error")
+    def test_monitor_call_for_failure(self):
+        self.mock_request.side_effect = requests.ConnectionError(
+            "MOCK Error")
         test_vnf = {}
         test_kwargs = {
             'mgmt_ip': 'a.b.c.d'
@@ -45,6 +55,50 @@ class TestVNFMonitorHTTPPing(testtools.TestCase):
         monitor_return = self.monitor_http_ping.monitor_call(test_vnf,
                                                              test_kwargs)
         self.assertEqual('failure', monitor_return)
+        self.assertEqual(5, self.mock_request.call_count)
+        self.assertEqual(5, self.prober.get_stats()['failures'])
+
+    def test_monitor_call_unexpected_status(self):
+        self.mock_request.side_effect = [mock.Mock(status_code=503),
+                                         mock.Mock(status_code=204)]
+        test_kwargs = {
+            'mgmt_ip': 'a:b:c:d:e:f:1:2',
+            'port': 8080,
+            'method': 'HEAD',
+            'path': '/health',
+            'expected_status': '204',
+            'retry': 3
+        }
+        monitor_return = self.monitor_http_ping.monitor_call({},
+                                                             test_kwargs)
+        self.assertTrue(monitor_return)
+        self.mock_request.assert_called_with(
+            'HEAD', 'http://[a:b:c:d:e:f:1:2]:8080/health', timeout=5)
+        self.assertEqual(2, self.mock_request.call_count)
+
+    def test_monitor_call_expected_status_ranges(self):
+        cfg.CONF.set_override('expected_status', ['200', '401-403'],
+                              group='monitor_http_ping')
+        self.addCleanup(cfg.CONF.clear_override, 'expected_status',
+                        group='monitor_http_ping')
+        self.mock_request.return_value = mock.Mock(status_code=401)
+        monitor_return = self.monitor_http_ping.monitor_call(
+            {}, {'mgmt_ip': 'a.b.c.d', 'retry': 1})
+        self.assertTrue(monitor_return)
+
+        self.mock_request.return_value = mock.Mock(status_code=302)
+        monitor_return = self.monitor_http_ping.monitor_call(
+            {}, {'mgmt_ip': 'a.b.c.d', 'retry': 1})
+        self.assertEqual('failure', monitor_return)
+
+    def test_prober_reuses_session(self):
+        session = self.prober.session
+        self.monitor_http_ping.monitor_call({}, {'mgmt_ip': 'a.b.c.d'})
+        self.monitor_http_ping.monitor_call({}, {'mgmt_ip': 'e.f.g.h'})
+        self.assertIs(session, self.prober.session)
+        stats = self.prober.get_stats()
+        self.assertEqual(2, stats['probes'])
+        self.assertEqual(2, sum(stats['latency'].values()))
 
     def test_monitor_url(self):
         test_vnf = {
@@ -15,6 +15,10 @@
 import testtools
 from unittest import mock
 
+import eventlet
+from oslo_config import cfg
+
+from tacker.vnfm.monitor_drivers.ping import batch
 from tacker.vnfm.monitor_drivers.ping import ping
 
 
@@ -95,3 +99,74 @@ class TestVNFMonitorPing(testtools.TestCase):
                                        test_kwargs)
         self.assertEqual(check_retury_counts,
                          mock_utils_execute.call_count)
+
+    def _set_prober_fping(self):
+        cfg.CONF.set_override('prober', 'fping', group='monitor_ping')
+        self.addCleanup(cfg.CONF.clear_override, 'prober',
+                        group='monitor_ping')
+        patcher = mock.patch.object(batch, 'BATCHER', batch.PingBatcher())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @mock.patch('tacker.agent.linux.utils.execute')
+    def test_monitor_call_fping_batched(self, mock_utils_execute):
+        self._set_prober_fping()
+        mock_utils_execute.return_value = (
+            b'',
+            b'10.0.0.1 : xmt/rcv/%loss = 5/4/20%, min/avg/max = 0.1/0.2/0.3\n'
+            b'10.0.0.2 : xmt/rcv/%loss = 5/0/100%\n')
+        pool = eventlet.GreenPool()
+        results = list(pool.imap(
+            lambda mgmt_ip: self.monitor_ping.monitor_call(
+                {}, {'mgmt_ip': mgmt_ip}),
+            ['10.0.0.1', '10.0.0.2', '10.0.0.3']))
+
+        self.assertEqual([True, 'failure', 'failure'], results)
+        mock_utils_execute.assert_called_once_with(
+            ['fping', '-q', '-c', 5, '-t', 5000, '-p', 1000,
+             '10.0.0.1', '10.0.0.2', '10.0.0.3'],
+            check_exit_code=False, return_stderr=True)
+
+    @mock.patch('tacker.agent.linux.utils.execute')
+    def test_monitor_call_fping_batch_size(self, mock_utils_execute):
+        self._set_prober_fping()
+        cfg.CONF.set_override('batch_size', 2, group='monitor_ping')
+        self.addCleanup(cfg.CONF.clear_override, 'batch_size',
+                        group='monitor_ping')
+        mock_utils_execute.return_value = (b'', b'')
+        pool = eventlet.GreenPool()
+        list(pool.imap(
+            lambda mgmt_ip: self.monitor_ping.monitor_call(
+                {}, {'mgmt_ip': mgmt_ip}),
+            ['10.0.0.1', '10.0.0.2', '10.0.0.3']))
+
+        self.assertEqual(2, mock_utils_execute.call_count)
+
+    @mock.patch('tacker.agent.linux.utils.execute')
+    def test_monitor_call_fping_retry(self, mock_utils_execute):
+        self._set_prober_fping()
+        mock_utils_execute.side_effect = [
+            (b'', b'10.0.0.1 : xmt/rcv/%loss = 2/0/100%\n'),
+            (b'', b'10.0.0.1 : xmt/rcv/%loss = 2/2/0%\n')]
+        test_kwargs = {
+            'mgmt_ip': '10.0.0.1',
+            'count': 2,
+            'timeout': 0.5,
+            'interval': 0.2,
+            'retry': 3
+        }
+        monitor_return = self.monitor_ping.monitor_call({}, test_kwargs)
+
+        self.assertTrue(monitor_return)
+        self.assertEqual(2, mock_utils_execute.call_count)
+        mock_utils_execute.assert_called_with(
+            ['fping', '-q', '-c', 2, '-t', 500, '-p', 200, '10.0.0.1'],
+            check_exit_code=False, return_stderr=True)
+
+    @mock.patch('tacker.agent.linux.utils.execute')
+    def test_monitor_call_fping_error(self, mock_utils_execute):
+        self._set_prober_fping()
+        mock_utils_execute.side_effect = OSError()
+        monitor_return = self.monitor_ping.monitor_call(
+            {}, {'mgmt_ip': '10.0.0.1'})
+        self.assertEqual('failure', monitor_return)
@@ -12,8 +12,11 @@
 #    under the License.
 #
 
+import datetime
 from unittest import mock
 
+import eventlet
+from oslo_config import cfg
 from oslo_serialization import jsonutils
 from oslo_utils import timeutils
 import testtools
@@ -21,6 +24,7 @@ import testtools
 from tacker import context
 from tacker.db.common_services import common_services_db_plugin
 from tacker.plugins.common import constants
+from tacker.tests import uuidsentinel
 from tacker.vnfm import monitor
 from tacker.vnfm import plugin
 
@@ -91,6 +95,26 @@ class TestVNFMonitor(testtools.TestCase):
         self._cos_db_plugin =\
             common_services_db_plugin.CommonServicesPluginDb()
         self.addCleanup(p.stop)
+        for attr, value in (('_hosting_vnfs', {}), ('_schedule', []),
+                            ('_due', {}), ('_in_flight', set()),
+                            ('_driver_semaphores', {})):
+            patcher = mock.patch.object(monitor.VNFMonitor, attr, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _add_hosting_vnf(self, vnfmonitor, vnf_id):
+        vnf_dict = {
+            'id': vnf_id,
+            'mgmt_ip_address': '{"vdu1": "a.b.c.d"}',
+            'attributes': {
+                'monitoring_policy': jsonutils.dump_as_bytes(
+                    MOCK_VNF['monitoring_policy'])
+            },
+            'status': 'ACTIVE'
+        }
+        hosting_vnf = vnfmonitor.to_hosting_vnf(vnf_dict, mock.MagicMock())
+        vnfmonitor.add_hosting_vnf(hosting_vnf)
+        return hosting_vnf
 
     def test_to_hosting_vnf(self):
         test_vnf_dict = {
@@ -207,6 +231,83 @@ class TestVNFMonitor(testtools.TestCase):
             'vnf']['status']
         self.assertEqual('PENDING_HEAL', test_device_status)
 
+    @mock.patch('tacker.vnfm.monitor.VNFMonitor.__run__')
+    @mock.patch('tacker.vnfm.monitor.VNFMonitor.run_monitor')
+    def test_run_due_probes(self, mock_run_monitor, mock_monitor_run):
+        test_vnfmonitor = monitor.VNFMonitor(30, check_intvl=0)
+        vnf_a = self._add_hosting_vnf(test_vnfmonitor, uuidsentinel.vnf_a)
+        self._add_hosting_vnf(test_vnfmonitor, uuidsentinel.vnf_b)
+        vnf_c = self._add_hosting_vnf(test_vnfmonitor, uuidsentinel.vnf_c)
+        vnf_c['dead'] = True
+        test_vnfmonitor.delete_hosting_vnf(uuidsentinel.vnf_b)
+
+        test_vnfmonitor._run_due_probes()
+        test_vnfmonitor._pool.waitall()
+
+        mock_run_monitor.assert_called_once_with(vnf_a)
+        # The VNFs still monitored are due again check_intvl after their
+        # probe completed.
+        self.assertEqual({uuidsentinel.vnf_a, uuidsentinel.vnf_c},
+                         set(test_vnfmonitor._due))
+        self.assertEqual(set(), test_vnfmonitor._in_flight)
+
+    @mock.patch('tacker.vnfm.monitor.VNFMonitor.__run__')
+    @mock.patch('tacker.vnfm.monitor.VNFMonitor.run_monitor')
+    def test_run_due_probes_not_due(self, mock_run_monitor,
+                                    mock_monitor_run):
+        test_vnfmonitor = monitor.VNFMonitor(30, check_intvl=60)
+        self._add_hosting_vnf(test_vnfmonitor, uuidsentinel.vnf_a)
+
+        timeout = test_vnfmonitor._run_due_probes()
+        test_vnfmonitor._pool.waitall()
+
+        mock_run_monitor.assert_not_called()
+        self.assertTrue(0 < timeout <= 60)
+
+    @mock.patch('tacker.vnfm.monitor.VNFMonitor.__run__')
+    @mock.patch('tacker.vnfm.monitor.VNFMonitor.run_monitor')
+    def test_run_due_probes_vnf_in_flight(self, mock_run_monitor,
+                                          mock_monitor_run):
+        test_vnfmonitor = monitor.VNFMonitor(30, check_intvl=0)
+        self._add_hosting_vnf(test_vnfmonitor, uuidsentinel.vnf_a)
+        test_vnfmonitor._in_flight.add(uuidsentinel.vnf_a)
+
+        test_vnfmonitor._run_due_probes()
+        test_vnfmonitor._pool.waitall()
+
+        mock_run_monitor.assert_not_called()
+
+    @mock.patch('tacker.vnfm.monitor.VNFMonitor.__run__')
+    @mock.patch('tacker.vnfm.monitor.VNFMonitor.monitor_call')
+    def test_run_monitor_driver_concurrency(self, mock_monitor_call,
+                                            mock_monitor_run):
+        cfg.CONF.set_override('driver_concurrency', {'ping': '1'},
+                              group='monitor')
+        self.addCleanup(cfg.CONF.clear_override, 'driver_concurrency',
+                        group='monitor')
+        running = []
+        max_running = []
+
+        def _monitor_call(driver, vnf, params):
+            running.append(vnf['id'])
+            max_running.append(len(running))
+            eventlet.sleep(0)
+            running.remove(vnf['id'])
+            return 1
+
+        mock_monitor_call.side_effect = _monitor_call
+        test_vnfmonitor = monitor.VNFMonitor(30, check_intvl=0)
+        for vnf_id in (uuidsentinel.vnf_a, uuidsentinel.vnf_b):
+            self._add_hosting_vnf(test_vnfmonitor, vnf_id)
+            test_vnfmonitor._hosting_vnfs[vnf_id]['boot_at'] = (
+                timeutils.utcnow() - datetime.timedelta(seconds=60))
+
+        test_vnfmonitor._run_due_probes()
+        test_vnfmonitor._pool.waitall()
+
+        self.assertEqual(2, mock_monitor_call.call_count)
+        self.assertEqual([1, 1], max_running)
+
 
 class TestVNFReservationAlarmMonitor(testtools.TestCase):
 
@@ -23,6 +23,7 @@ import uuid
 import zipfile
 
 import ddt
+import fixtures
 from oslo_config import cfg
 from requests_mock.contrib import fixture as requests_mock_fixture
 from tacker import auth
@@ -435,6 +436,81 @@ class TestVnfPackageRequest(base.BaseTestCase):
         actual_zip = zipfile.ZipFile(res)
         self.assert_zipfile(actual_zip, [], [test_yaml_filepath])
 
+    def _register_stream_contents(self):
+        fetch_base_url = os.path.join(self.url, uuidsentinel.vnf_pkg_id)
+        package_content = io.BytesIO()
+        with zipfile.ZipFile(package_content, 'w') as package_content_zip:
+            package_content_zip.writestr(
+                'TOSCA-Metadata/TOSCA.meta', b'TOSCA-Meta-File-Version: 1.0',
+                compress_type=zipfile.ZIP_STORED)
+            package_content_zip.writestr(
+                'Definitions/vnfd.yaml', b'tosca_definitions_version: 1.2',
+                compress_type=zipfile.ZIP_DEFLATED)
+        self.requests_mock.register_uri(
+            'GET',
+            os.path.join(fetch_base_url, 'package_content'),
+            content=package_content.getvalue(),
+            headers={'Content-Type': 'application/zip'},
+            status_code=200)
+
+        artifact_path = 'tacker/tests/etc/samples/vnfd_lcm_user_data.yaml'
+        with open(artifact_path, 'rb') as artifact_path_obj:
+            self.requests_mock.register_uri(
+                'GET',
+                os.path.join(fetch_base_url, 'artifacts', artifact_path),
+                headers={'Content-Type': 'application/octet-stream'},
+                status_code=200,
+                content=artifact_path_obj.read())
+
+        spool_dir = self.useFixture(fixtures.TempDir()).path
+        cfg.CONF.set_override('vnf_package_csar_path', spool_dir,
+                              group='vnf_package')
+        cfg.CONF.set_override('stream_download', True,
+                              group='connect_vnf_packages')
+        cfg.CONF.set_override('pipeline', ['package_content', 'artifacts'],
+                              group='connect_vnf_packages')
+        return zipfile.ZipFile(package_content), artifact_path, spool_dir
+
+    def test_download_vnf_packages_stream(self):
+        expected_zip, artifact_path, spool_dir = \
+            self._register_stream_contents()
+
+        res = nfvo_client.VnfPackageRequest.download_vnf_packages(
+            uuidsentinel.vnf_pkg_id, [artifact_path])
+
+        self.assertNotIsInstance(res, io.BytesIO)
+        # The spooled contents are temporary files, removed once closed.
+        self.assertEqual([], os.listdir(spool_dir))
+        with res:
+            actual_zip = zipfile.ZipFile(res)
+            self.assert_zipfile(actual_zip, [expected_zip], [artifact_path])
+            # The members are copied without being compressed again.
+            self.assertEqual(
+                [zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED,
+                 zipfile.ZIP_DEFLATED],
+                [info.compress_type for info in actual_zip.infolist()])
+
+        history = self.requests_mock.request_history
+        self.assertEqual(2, _count_mock_history(history, self.nfvo_url))
+
+    def test_download_vnf_packages_stream_raise_not_found(self):
+        _expected_zip, artifact_path, spool_dir = \
+            self._register_stream_contents()
+        self.requests_mock.register_uri(
+            'GET',
+            os.path.join(self.url, uuidsentinel.vnf_pkg_id, 'artifacts',
+                         'missing.yaml'),
+            headers=self.headers,
+            status_code=404)
+        nfvo_client.VnfPackageRequest._connector = nfvo_client._Connect(
+            0, 0, 20)
+
+        self.assertRaises(
+            requests.exceptions.RequestException,
+            nfvo_client.VnfPackageRequest.download_vnf_packages,
+            uuidsentinel.vnf_pkg_id, [artifact_path, 'missing.yaml'])
+        self.assertEqual([], os.listdir(spool_dir))
+
     def test_download_vnf_packages_non_content_disposition_raise_download(
             self):
         fetch_base_url = os.path.join(self.url, uuidsentinel.vnf_pkg_id)
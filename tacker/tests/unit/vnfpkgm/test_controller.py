@@ -15,6 +15,7 @@
 
 
 import ddt
+import fixtures
 from http import client as http_client
 import json
 import os
@@ -24,6 +25,7 @@ from webob import exc
 
 from oslo_serialization import jsonutils
 
+from tacker.api.common import pagination
 from tacker.api.vnfpkgm.v1 import controller
 from tacker.common import exceptions as tacker_exc
 from tacker.conductor.conductorrpc.vnf_pkgm_rpc import VNFPackageRPCAPI
@@ -37,6 +39,7 @@ from tacker.tests import constants
 from tacker.tests.unit import base
 from tacker.tests.unit import fake_request
 from tacker.tests.unit.vnfpkgm import fakes
+from tacker.tests import uuidsentinel
 
 
 @ddt.ddt
@@ -123,6 +126,48 @@ class TestController(base.TestCase):
                 'additionalArtifacts'])
         self.assertEqual(expected_result, res_dict)
 
+    @mock.patch.object(VnfPackagesList, "get_by_filters")
+    def test_index_paginated(self, mock_vnf_list):
+        self.config(vnf_package_num=1, group='vnf_package')
+        vnf_packages = [
+            fakes.return_vnfpkg_obj(vnf_package_updates={'id': package_id})
+            for package_id in (uuidsentinel.package_1,
+                               uuidsentinel.package_2)]
+        mock_vnf_list.return_value = vnf_packages
+        req = fake_request.HTTPRequest.blank(
+            '/vnfpkgm/v1/vnf_packages?exclude_default')
+
+        resp = self.controller.index(req)
+
+        self.assertEqual([uuidsentinel.package_1],
+                         [vnf_package['id'] for vnf_package in resp.obj])
+        mock_vnf_list.assert_called_once_with(
+            req.context, read_deleted='no', filters=None, limit=2,
+            marker=None)
+        marker = pagination.encode_marker(uuidsentinel.package_1)
+        self.assertEqual(
+            '<%s?exclude_default=&nextpage_opaque_marker=%s>;rel="next"' % (
+                req.path_url, marker), resp.headers['Link'])
+
+        mock_vnf_list.reset_mock()
+        mock_vnf_list.return_value = vnf_packages[1:]
+        req = fake_request.HTTPRequest.blank(
+            '/vnfpkgm/v1/vnf_packages?nextpage_opaque_marker=%s' % marker)
+
+        resp = self.controller.index(req)
+
+        self.assertEqual([uuidsentinel.package_2],
+                         [vnf_package['id'] for vnf_package in resp])
+        mock_vnf_list.assert_called_once_with(
+            req.context, read_deleted='no', filters=None, limit=2,
+            marker=uuidsentinel.package_1)
+
+    def test_index_invalid_marker(self):
+        req = fake_request.HTTPRequest.blank(
+            '/vnfpkgm/v1/vnf_packages?nextpage_opaque_marker=invalid')
+
+        self.assertRaises(exc.HTTPBadRequest, self.controller.index, req)
+
     @mock.patch.object(VnfPackagesList, "get_by_filters")
     def test_index_attribute_selector_all_fields(self, mock_vnf_list):
         params = {'all_fields': ''}
@@ -994,26 +1039,138 @@ class TestController(base.TestCase):
         request = fake_request.HTTPRequest.blank(
             '/vnf_packages/%s/package_content/')
         request.headers["Range"] = 'bytes=10-99'
-        range_ = self.controller._get_range_from_request(request, 120)
-        self.assertEqual(10, range_.start)
-        self.assertEqual(100, range_.end)  # non-inclusive
+        ranges = self.controller._get_ranges_from_request(request, 120)
+        self.assertEqual([(10, 100)], ranges)  # non-inclusive
 
     def test_fetch_vnf_package_content_invalid_range(self):
         request = fake_request.HTTPRequest.blank(
             '/vnf_packages/%s/package_content/')
         request.headers["Range"] = 'bytes=150-'
         self.assertRaises(exc.HTTPRequestRangeNotSatisfiable,
-                          self.controller._get_range_from_request,
+                          self.controller._get_ranges_from_request,
                           request, 120)
 
+    def test_fetch_vnf_package_content_multiple_range(self):
+        request = fake_request.HTTPRequest.blank(
+            '/vnf_packages/%s/package_content/')
+        request.headers["Range"] = 'bytes=10-20, -30,150-'
+        self.assertEqual(
+            [(10, 21), (90, 120)],
+            self.controller._get_ranges_from_request(request, 120))
+        # Empty elements and zero suffix-lengths are ignored.
+        request.headers["Range"] = 'bytes=0-1,, -0,'
+        self.assertEqual(
+            [(0, 2)], self.controller._get_ranges_from_request(request, 120))
+
     def test_fetch_vnf_package_content_invalid_multiple_range(self):
         request = fake_request.HTTPRequest.blank(
             '/vnf_packages/%s/package_content/')
-        request.headers["Range"] = 'bytes=10-20,21-30'
+        request.headers["Range"] = 'bytes=150-,200-'
+        self.assertRaises(exc.HTTPRequestRangeNotSatisfiable,
+                          self.controller._get_ranges_from_request, request,
+                          120)
+        for range_str in ('bytes=-0', 'bytes=-', 'bytes=-+1', 'bytes=0-1_0',
+                          'bytes=,'):
+            request.headers["Range"] = range_str
+            self.assertRaises(exc.HTTPRequestRangeNotSatisfiable,
+                              self.controller._get_ranges_from_request,
+                              request, 120)
+        request.headers["Range"] = 'bytes=' + ','.join(
+            ['0-1'] * (controller.MAX_RANGES + 1))
         self.assertRaises(exc.HTTPBadRequest,
-                          self.controller._get_range_from_request, request,
+                          self.controller._get_ranges_from_request, request,
                           120)
 
+    def _fetch_vnf_package_content(self, headers=None):
+        req = fake_request.HTTPRequest.blank(
+            '/vnf_packages/%s/package_content' % constants.UUID)
+        req.headers.update(headers or {})
+        req.method = 'GET'
+        return req.get_response(self.app)
+
+    def _mock_csar_file(self, mock_vnf_by_id):
+        csar_path = self.useFixture(fixtures.TempDir()).path
+        file_path = os.path.join(csar_path, constants.UUID)
+        with open(file_path, 'wb') as f:
+            f.write(b'0123456789')
+        mock_vnf_by_id.return_value = fakes.return_vnfpkg_obj(
+            vnf_package_updates={'location_glance_store':
+                                 'file://' + file_path,
+                                 'size': 10, 'hash': 'csarhash'})
+
+    @mock.patch.object(vnf_package.VnfPackage, "get_by_id")
+    def test_fetch_vnf_package_content_from_file(self, mock_vnf_by_id):
+        self._mock_csar_file(mock_vnf_by_id)
+
+        resp = self._fetch_vnf_package_content()
+        self.assertEqual(http_client.OK, resp.status_code)
+        self.assertEqual(b'0123456789', resp.body)
+        self.assertEqual(('"csarhash"', 'bytes', 'application/zip', '10'),
+                         (resp.headers['ETag'], resp.headers['Accept-Ranges'],
+                          resp.headers['Content-Type'],
+                          resp.headers['Content-Length']))
+
+        resp = self._fetch_vnf_package_content({'Range': 'bytes=-3'})
+        self.assertEqual(http_client.PARTIAL_CONTENT, resp.status_code)
+        self.assertEqual(b'789', resp.body)
+        self.assertEqual('bytes 7-9/10', resp.headers['Content-Range'])
+
+    @mock.patch.object(vnf_package.VnfPackage, "get_by_id")
+    def test_fetch_vnf_package_content_multiple_ranges(self, mock_vnf_by_id):
+        self._mock_csar_file(mock_vnf_by_id)
+
+        resp = self._fetch_vnf_package_content(
+            {'Range': 'bytes=0-1,5-6,20-'})
+        self.assertEqual(http_client.PARTIAL_CONTENT, resp.status_code)
+        content_type, boundary = resp.headers['Content-Type'].split(
+            '; boundary=')
+        self.assertEqual('multipart/byteranges', content_type)
+        self.assertEqual(str(len(resp.body)), resp.headers['Content-Length'])
+        self.assertEqual(
+            ('--%(boundary)s\r\n'
+             'Content-Type: application/zip\r\n'
+             'Content-Range: bytes 0-1/10\r\n\r\n01\r\n'
+             '--%(boundary)s\r\n'
+             'Content-Type: application/zip\r\n'
+             'Content-Range: bytes 5-6/10\r\n\r\n56\r\n'
+             '--%(boundary)s--\r\n' % {'boundary': boundary}).encode(),
+            resp.body)
+
+    @mock.patch.object(vnf_package.VnfPackage, "get_by_id")
+    def test_fetch_vnf_package_content_conditional(self, mock_vnf_by_id):
+        self._mock_csar_file(mock_vnf_by_id)
+
+        resp = self._fetch_vnf_package_content(
+            {'If-None-Match': '"csarhash"'})
+        self.assertEqual(http_client.NOT_MODIFIED, resp.status_code)
+        self.assertEqual(b'', resp.body)
+
+        # The range of a modified package is not sent.
+        resp = self._fetch_vnf_package_content(
+            {'If-Range': '"oldhash"', 'Range': 'bytes=0-1'})
+        self.assertEqual(http_client.OK, resp.status_code)
+        self.assertEqual(b'0123456789', resp.body)
+        resp = self._fetch_vnf_package_content(
+            {'If-Range': '"csarhash"', 'Range': 'bytes=0-1'})
+        self.assertEqual(http_client.PARTIAL_CONTENT, resp.status_code)
+        self.assertEqual(b'01', resp.body)
+
+    @mock.patch.object(glance_store, 'load_csar_iter')
+    @mock.patch.object(vnf_package.VnfPackage, "get_by_id")
+    def test_fetch_vnf_package_content_from_glance_store(
+            self, mock_vnf_by_id, mock_load_csar_iter):
+        mock_vnf_by_id.return_value = fakes.return_vnfpkg_obj(
+            vnf_package_updates={'size': 10})
+        mock_load_csar_iter.side_effect = (
+            lambda uuid, location, offset, chunk_size:
+            (iter([b'0123456789'[offset:offset + chunk_size]]), chunk_size))
+
+        resp = self._fetch_vnf_package_content({'Range': 'bytes=2-4'})
+        self.assertEqual(http_client.PARTIAL_CONTENT, resp.status_code)
+        self.assertEqual(b'234', resp.body)
+        mock_load_csar_iter.assert_called_once_with(
+            constants.UUID, 'fake location', offset=2, chunk_size=3)
+
     def test_fetch_vnf_package_artifacts_with_invalid_uuid(
             self):
         # invalid_uuid
@@ -1058,7 +1215,7 @@ class TestController(base.TestCase):
         req.headers['Range'] = 'bytes=150-'
         req.method = 'GET'
         self.assertRaises(exc.HTTPRequestRangeNotSatisfiable,
-                          self.controller._get_range_from_request, req,
+                          self.controller._get_ranges_from_request, req,
                           33)
 
     @mock.patch.object(vnf_package.VnfPackage, "get_by_id")
@@ -1069,10 +1226,10 @@ class TestController(base.TestCase):
         req = fake_request.HTTPRequest.blank(
             '/vnf_packages/%s/artifacts/%s'
             % (constants.UUID, constants.ARTIFACT_PATH))
-        req.headers['Range'] = 'bytes=10-20,21-30'
+        req.headers['Range'] = 'bytes=10-20,abc'
         req.method = 'GET'
-        self.assertRaises(exc.HTTPBadRequest,
-                          self.controller._get_range_from_request, req,
+        self.assertRaises(exc.HTTPRequestRangeNotSatisfiable,
+                          self.controller._get_ranges_from_request, req,
                           33)
 
     @mock.patch.object(controller.VnfPkgmController, "_get_csar_path")
@@ -1098,7 +1255,37 @@ class TestController(base.TestCase):
         artifact_data = \
             self.controller._download_vnf_artifact(
                 absolute_artifact_path, 10, 20)
-        self.assertEqual(data, artifact_data)
+        self.assertEqual(data, b''.join(artifact_data))
+
+    @mock.patch.object(controller.VnfPkgmController, "_get_csar_path")
+    @mock.patch.object(vnf_package.VnfPackage, "get_by_id")
+    def test_fetch_vnf_package_artifacts_response(
+            self, mock_vnf_by_id, mock_get_csar_path):
+        mock_vnf_by_id.return_value = fakes.return_vnfpkg_obj()
+        base_path = os.path.dirname(os.path.abspath(__file__))
+        extract_path = os.path.join(base_path, '../../etc/samples/'
+                    'sample_vnf_package_csar_in_meta_and_manifest')
+        mock_get_csar_path.return_value = extract_path
+        with open(os.path.join(extract_path, constants.ARTIFACT_PATH),
+                  'rb') as f:
+            data = f.read()
+        artifact_hash = fakes._fake_artifact()['hash']
+        req = fake_request.HTTPRequest.blank(
+            '/vnf_packages/%s/artifacts/%s'
+            % (constants.UUID, constants.ARTIFACT_PATH))
+        req.headers['Range'] = 'bytes=10-29'
+        req.method = 'GET'
+
+        resp = req.get_response(self.app)
+        self.assertEqual(http_client.PARTIAL_CONTENT, resp.status_code)
+        self.assertEqual(data[10:30], resp.body)
+        self.assertEqual('"%s"' % artifact_hash, resp.headers['ETag'])
+        self.assertEqual('bytes 10-29/%d' % len(data),
+                         resp.headers['Content-Range'])
+
+        req.headers['If-None-Match'] = '"%s"' % artifact_hash
+        resp = req.get_response(self.app)
+        self.assertEqual(http_client.NOT_MODIFIED, resp.status_code)
 
     @mock.patch.object(vnf_package.VnfPackage, "get_by_id")
     def test_fetch_vnf_package_artifacts_with_non_existing_vnf_package(
@@ -1133,7 +1320,7 @@ class TestController(base.TestCase):
         artifact_data = \
             self.controller._download_vnf_artifact(
                 absolute_artifact_path, 0, 34)
-        self.assertEqual(data, artifact_data)
+        self.assertEqual(data, b''.join(artifact_data))
 
     @mock.patch.object(vnf_package.VnfPackage, "get_by_id")
     def test_fetch_vnf_package_artifacts_with_invalid_status(
@@ -0,0 +1,113 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import os
+import pickle
+import threading
+
+from oslo_log import log as logging
+
+import tacker.conf
+
+CONF = tacker.conf.CONF
+LOG = logging.getLogger(__name__)
+
+
+def _file_stamp(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+class _Entry(object):
+
+    def __init__(self, value, paths):
+        # NOTE: The value is kept pickled, so the cached copy can not be
+        # modified by callers and each of them gets its own copy.
+        self.value = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        self.stamps = tuple((path, _file_stamp(path)) for path in paths)
+
+    def is_fresh(self):
+        return all(_file_stamp(path) == stamp for path, stamp in self.stamps)
+
+
+class TemplateCache(object):
+    """LRU cache of the VNFDs and HOT templates parsed from VNF packages.
+
+    Entries are keyed by VNF package id and by a key naming the template,
+    e.g. ('vnfd', flavour_id). Each entry records the files and directories
+    it was read from, and is discarded once one of them was modified,
+    replaced or removed. The entries of a VNF package are also dropped by
+    :meth:`invalidate` when the package is deleted.
+
+    Every :meth:`get` returns a new copy of the cached template, which the
+    caller is free to modify.
+    """
+
+    def __init__(self):
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, vnf_package_id, key, default=None):
+        """Return a copy of a cached template, or default if not cached."""
+        cache_key = (vnf_package_id, key)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None and not entry.is_fresh():
+                del self._entries[cache_key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(cache_key)
+            self.hits += 1
+        return pickle.loads(entry.value)
+
+    def put(self, vnf_package_id, key, value, paths):
+        """Cache a template read from the given files and directories."""
+        max_size = CONF.vnf_lcm.template_cache_size
+        if max_size <= 0:
+            return
+        entry = _Entry(value, paths)
+        with self._lock:
+            self._entries[(vnf_package_id, key)] = entry
+            self._entries.move_to_end((vnf_package_id, key))
+            while len(self._entries) > max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, vnf_package_id=None):
+        """Drop the templates of a VNF package, or of all packages."""
+        with self._lock:
+            for cache_key in list(self._entries):
+                if vnf_package_id in (None, cache_key[0]):
+                    del self._entries[cache_key]
+
+    def get_stats(self):
+        with self._lock:
+            return {'size': len(self._entries), 'hits': self.hits,
+                    'misses': self.misses, 'evictions': self.evictions}
+
+
+CACHE = TemplateCache()
+
+
+def invalidate(vnf_package_id=None):
+    CACHE.invalidate(vnf_package_id)
+    LOG.debug("Invalidated parsed templates of VNF package %s, cache "
+              "stats: %s", vnf_package_id or 'all', CACHE.get_stats())
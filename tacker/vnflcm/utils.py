@@ -29,11 +29,14 @@ from tacker.extensions import nfvo
 from tacker import objects
 from tacker.objects import fields
 from tacker.tosca import utils as toscautils
+from tacker.vnflcm import template_cache
 from tacker.vnfm import vim_client
 
 LOG = logging.getLogger(__name__)
 CONF = cfg.CONF
 
+_NOT_CACHED = object()
+
 
 def _get_vim(context, vim_connection_info):
     vim_client_obj = vim_client.VimClient()
@@ -65,9 +68,15 @@ def _get_vim(context, vim_connection_info):
 
 def _get_vnfd_dict(context, vnfd_id, flavour_id):
     vnf_package_id = _get_vnf_package_id(context, vnfd_id)
-    vnf_package_base_path = cfg.CONF.vnf_package.vnf_package_csar_path
-    vnf_package_csar_path = vnf_package_base_path + '/' + vnf_package_id
-    vnfd_dict = _get_flavour_based_vnfd(vnf_package_csar_path, flavour_id)
+    vnfd_dict = template_cache.CACHE.get(vnf_package_id, ('vnfd', flavour_id))
+    if vnfd_dict is None:
+        vnf_package_base_path = cfg.CONF.vnf_package.vnf_package_csar_path
+        vnf_package_csar_path = vnf_package_base_path + '/' + vnf_package_id
+        loaded_paths = []
+        vnfd_dict = _get_flavour_based_vnfd(vnf_package_csar_path, flavour_id,
+                                            loaded_paths=loaded_paths)
+        template_cache.CACHE.put(vnf_package_id, ('vnfd', flavour_id),
+                                 vnfd_dict, loaded_paths)
 
     # Remove requirements from substitution mapping
     vnfd_dict.get('topology_template').get(
@@ -411,16 +420,25 @@ def _make_final_vnf_dict(vnfd_dict, id, name, param_values, vnf_dict=None):
                 'stack_name': name or ("vnflcm_" + id)}}
 
 
-def _get_flavour_based_vnfd(csar_path, flavour_id):
+def _get_flavour_based_vnfd(csar_path, flavour_id, loaded_paths=None):
+    """Return the VNFD of a deployment flavour from an extracted CSAR.
+
+    The directories listed and files read are appended to loaded_paths.
+    """
+    if loaded_paths is None:
+        loaded_paths = []
     ext = [".yaml", ".yml"]
     file_path_and_data = {}
     imp_list = []
+    loaded_paths.append(csar_path)
     for item in os.listdir(csar_path):
         src_path = os.path.join(csar_path, item)
         if os.path.isdir(src_path):
+            loaded_paths.append(src_path)
             for file in os.listdir(src_path):
                 if file.endswith(tuple(ext)):
                     source_file_path = os.path.join(src_path, file)
+                    loaded_paths.append(source_file_path)
                     with open(source_file_path) as file_obj:
                         data = yaml.safe_load(file_obj)
                     substitution_map = data.get(
@@ -437,7 +455,9 @@ def _get_flavour_based_vnfd(csar_path, flavour_id):
                         return data
 
         elif src_path.endswith(tuple(ext)):
-            file_data = yaml.safe_load(io.open(src_path))
+            loaded_paths.append(src_path)
+            with io.open(src_path) as file_obj:
+                file_data = yaml.safe_load(file_obj)
             substitution_map = file_data.get(
                 'topology_template', {}).get('substitution_mappings', {})
             if substitution_map.get(
@@ -1046,47 +1066,65 @@ def _get_vnf_package_path(context, vnfd_id):
     return vnf_package_path
 
 
-def _get_base_hot_dict(context, vnfd_id):
-    vnf_package_id = _get_vnf_package_id(context, vnfd_id)
-    vnf_package_base_path = cfg.CONF.vnf_package.vnf_package_csar_path
-    vnf_package_csar_path = vnf_package_base_path + '/' + vnf_package_id
-    base_hot_dir = 'BaseHOT'
+def _load_hot_files(hot_path, loaded_paths):
+    """Return the HOT templates of a directory, keyed by file name."""
     ext = [".yaml", ".yml"]
-
-    base_hot_path = vnf_package_csar_path + '/' + base_hot_dir
-    base_hot_dict = None
-    if os.path.exists(base_hot_path):
-        for file in os.listdir(base_hot_path):
+    hot_dict = {}
+    loaded_paths.append(hot_path)
+    if os.path.exists(hot_path):
+        for file in os.listdir(hot_path):
             if file.endswith(tuple(ext)):
-                source_file_path = os.path.join(base_hot_path, file)
-                base_hot_dict = yaml.safe_load(open(source_file_path))
+                source_file_path = os.path.join(hot_path, file)
+                loaded_paths.append(source_file_path)
+                with open(source_file_path) as file_obj:
+                    hot_dict[file] = yaml.safe_load(file_obj)
+    return hot_dict
+
+
+def _get_base_hot_dict(context, vnfd_id):
+    vnf_package_id = _get_vnf_package_id(context, vnfd_id)
+    base_hot_dict = template_cache.CACHE.get(
+        vnf_package_id, ('base_hot',), default=_NOT_CACHED)
+    if base_hot_dict is _NOT_CACHED:
+        vnf_package_base_path = cfg.CONF.vnf_package.vnf_package_csar_path
+        vnf_package_csar_path = vnf_package_base_path + '/' + vnf_package_id
+        base_hot_dir = 'BaseHOT'
+
+        base_hot_path = vnf_package_csar_path + '/' + base_hot_dir
+        loaded_paths = []
+        base_hot_dict = None
+        for base_hot in _load_hot_files(base_hot_path,
+                                        loaded_paths).values():
+            base_hot_dict = base_hot
+        template_cache.CACHE.put(vnf_package_id, ('base_hot',),
+                                 base_hot_dict, loaded_paths)
     LOG.debug("Loaded base hot: %s", base_hot_dict)
     return base_hot_dict
 
 
 def get_base_nest_hot_dict(context, flavour_id, vnfd_id):
     vnf_package_id = _get_vnf_package_id(context, vnfd_id)
-    vnf_package_base_path = cfg.CONF.vnf_package.vnf_package_csar_path
-    vnf_package_csar_path = vnf_package_base_path + '/' + vnf_package_id
-    base_hot_dir = 'BaseHOT'
-    ext = [".yaml", ".yml"]
-
-    base_hot_path = vnf_package_csar_path + '/' + \
-        base_hot_dir + '/' + flavour_id
-    base_hot_dict = None
-    nested_hot_path = base_hot_path + '/nested'
-    nested_hot_dict = {}
-    if os.path.exists(base_hot_path):
-        for file in os.listdir(base_hot_path):
-            if file.endswith(tuple(ext)):
-                source_file_path = os.path.join(base_hot_path, file)
-                base_hot_dict = yaml.safe_load(open(source_file_path))
-    if os.path.exists(nested_hot_path):
-        for file in os.listdir(nested_hot_path):
-            if file.endswith(tuple(ext)):
-                source_file_path = os.path.join(nested_hot_path, file)
-                nested_hot = yaml.safe_load(open(source_file_path))
-                nested_hot_dict[file] = nested_hot
+    cache_key = ('base_nest_hot', flavour_id)
+    cached = template_cache.CACHE.get(vnf_package_id, cache_key)
+    if cached is None:
+        vnf_package_base_path = cfg.CONF.vnf_package.vnf_package_csar_path
+        vnf_package_csar_path = vnf_package_base_path + '/' + vnf_package_id
+        base_hot_dir = 'BaseHOT'
+
+        base_hot_path = vnf_package_csar_path + '/' + \
+            base_hot_dir + '/' + flavour_id
+        nested_hot_path = base_hot_path + '/nested'
+        loaded_paths = []
+        base_hot_dict = None
+        for base_hot in _load_hot_files(base_hot_path,
+                                        loaded_paths).values():
+            base_hot_dict = base_hot
+        nested_hot_dict = _load_hot_files(nested_hot_path, loaded_paths)
+        template_cache.CACHE.put(vnf_package_id, cache_key,
+                                 (base_hot_dict, nested_hot_dict),
+                                 loaded_paths)
+    else:
+        base_hot_dict, nested_hot_dict = cached
     LOG.debug("Loaded base hot: %s", base_hot_dict)
     LOG.debug("Loaded nested_hot_dict: %s", nested_hot_dict)
     return base_hot_dict, nested_hot_dict
@@ -15,20 +15,41 @@
 
 import os
 import re
+import time
 import toscaparser.utils.yamlparser
 from urllib.parse import urlparse
 import urllib.request as urllib2
 import yaml
 
+import eventlet
 from kubernetes import client
 from oslo_config import cfg
 from oslo_log import log as logging
+from oslo_utils import excutils
+
+from tacker._i18n import _
 from tacker.common import exceptions
 
 
 LOG = logging.getLogger(__name__)
 CONF = cfg.CONF
 
+OPTS = [
+    cfg.IntOpt('create_concurrency',
+               default=10,
+               min=1,
+               help=_("Number of Kubernetes objects of a CNF created"
+                      " concurrently, among the objects which do not"
+                      " depend on each other")),
+    cfg.FloatOpt('create_rate_limit',
+                 default=0,
+                 min=0,
+                 help=_("Maximum number of Kubernetes objects of a CNF"
+                        " created per second, 0 for no limit")),
+]
+
+CONF.register_opts(OPTS, group='kubernetes_vim')
+
 YAML_LOADER = toscaparser.utils.yamlparser.load_yaml
 NEWLINE_CHARACTER = "\n"
 COLON_CHARACTER = ':'
@@ -42,6 +63,27 @@ DASH_CHARACTER = '_'
 # to ensure that when multiple resources are to be created, the order of
 # other resources is after NetworkPolicy and before Service.
 OTHER_RESOURCE_SORT_POSITION = 8
+# The resources of the kinds not mentioned in self.RESOURCE_CREATION_TIERS,
+# e.g. ServiceAccount or Role, are created with the namespace policies, as
+# the workloads may depend on them.
+OTHER_RESOURCE_TIER = 1
+
+
+class _RateLimiter(object):
+    """Spaces out the calls to at most rate per second, 0 for no limit"""
+
+    def __init__(self, rate):
+        self._interval = 1.0 / rate if rate > 0 else 0
+        self._next_call = 0
+
+    def wait(self):
+        if not self._interval:
+            return
+        now = time.monotonic()
+        delay = self._next_call - now
+        self._next_call = max(now, self._next_call) + self._interval
+        if delay > 0:
+            eventlet.sleep(delay)
 
 
 class Transformer(object):
@@ -75,6 +117,19 @@ class Transformer(object):
             'DaemonSet',
             'Pod'
         ]
+        # The resources of a tier are created concurrently, once the
+        # resources of the previous tiers, which they may depend on, are.
+        # The Services are created before the workloads so that their
+        # environment variables are set in the containers.
+        self.RESOURCE_CREATION_TIERS = [
+            ['StorageClass', 'PersistentVolume', 'PriorityClass',
+             'Namespace'],
+            ['LimitRange', 'ResourceQuota', 'NetworkPolicy'],
+            ['HorizontalPodAutoscaler', 'Service', 'Endpoints',
+             'PersistentVolumeClaim', 'ConfigMap', 'Secret'],
+            ['StatefulSet', 'Job', 'Deployment', 'DaemonSet', 'ReplicaSet',
+             'Pod']
+        ]
         self.method_value = {
             "Pod": 'create_namespaced_pod',
             "Service": 'create_namespaced_service',
@@ -392,42 +447,105 @@ class Transformer(object):
         return a list name of services
         """
         kubernetes_objects = self._sort_k8s_obj(kubernetes_objects)
-        new_k8s_objs = list()
+        rate_limiter = _RateLimiter(CONF.kubernetes_vim.create_rate_limit)
+        created_tiers = []
+        try:
+            for tier in self._get_creation_tiers(kubernetes_objects):
+                created = []
+                created_tiers.append(created)
+                errors = []
+                pool = eventlet.GreenPool(
+                    CONF.kubernetes_vim.create_concurrency)
+                for kubernetes_object in tier:
+                    pool.spawn_n(self._create_k8s_obj, kubernetes_object,
+                                 rate_limiter, created, errors)
+                pool.waitall()
+                if errors:
+                    raise errors[0]
+        except Exception:
+            with excutils.save_and_reraise_exception():
+                for created in reversed(created_tiers):
+                    self._delete_created_k8s_objs(created)
+        return kubernetes_objects
+
+    def _get_creation_tiers(self, kubernetes_objects):
+        tiers = [[] for _tier in self.RESOURCE_CREATION_TIERS]
         for kubernetes_object in kubernetes_objects:
-            namespace = kubernetes_object.get('namespace', '')
             kind = kubernetes_object.get('object', '').kind
-            api_version = kubernetes_object.get('object', '').api_version
-            body = kubernetes_object.get('object', '')
-            if kubernetes_object.get('object', '').metadata:
-                name = kubernetes_object.get('object', '').metadata.name
+            for index, kinds in enumerate(self.RESOURCE_CREATION_TIERS):
+                if kind in kinds:
+                    tiers[index].append(kubernetes_object)
+                    break
             else:
-                name = ''
+                tiers[OTHER_RESOURCE_TIER].append(kubernetes_object)
+        return [tier for tier in tiers if tier]
+
+    def _create_k8s_obj(self, kubernetes_object, rate_limiter, created,
+                        errors):
+        if errors:
+            # Another resource of the tier failed, it is rolled back.
+            return
+        namespace = kubernetes_object.get('namespace', '')
+        kind = kubernetes_object.get('object', '').kind
+        api_version = kubernetes_object.get('object', '').api_version
+        body = kubernetes_object.get('object', '')
+        if kubernetes_object.get('object', '').metadata:
+            name = kubernetes_object.get('object', '').metadata.name
+        else:
+            name = ''
+        try:
+            rate_limiter.wait()
+            LOG.debug("{kind} begin create.".format(kind=kind))
+            self._select_k8s_client_and_api(
+                kind, namespace, api_version, body)
+            kubernetes_object['status'] = 'Creating'
+            created.append(kubernetes_object)
+        except Exception as e:
+            if isinstance(e, client.rest.ApiException):
+                kubernetes_object['status'] = 'creating_failed'
+                msg = '''The request to create a resource failed.
+                namespace: {namespace}, name: {name},kind: {kind},
+                Reason: {exception}'''.format(
+                    namespace=namespace, name=name, kind=kind,
+                    exception=e.body
+                )
+            else:
+                kubernetes_object['status'] = 'creating_failed'
+                msg = '''The request to create a resource failed.
+                namespace: {namespace}, name: {name},kind: {kind},
+                Reason: {exception}'''.format(
+                    namespace=namespace, name=name, kind=kind,
+                    exception=e
+                )
+            LOG.error(msg)
+            errors.append(exceptions.CreateApiFalse(error=msg))
+
+    def _delete_created_k8s_objs(self, kubernetes_objects):
+        """Delete the resources created by a failed deploy_k8s"""
+        for kubernetes_object in reversed(kubernetes_objects):
+            namespace = kubernetes_object.get('namespace', '')
+            k8s_obj = kubernetes_object.get('object')
+            delete_method = self.method_value[k8s_obj.kind].replace(
+                'create_', 'delete_', 1)
+            k8s_client_obj = self.k8s_client_dict[k8s_obj.api_version]
+            if not k8s_obj.metadata or \
+                    not hasattr(k8s_client_obj, delete_method):
+                # e.g. a review, nothing is left to delete.
+                continue
+            # The pods of the Jobs and ReplicationControllers are orphaned
+            # by default.
+            kwargs = {'name': k8s_obj.metadata.name,
+                      'body': client.V1DeleteOptions(
+                          propagation_policy='Foreground')}
+            if 'namespaced' in delete_method:
+                kwargs['namespace'] = namespace
             try:
-                LOG.debug("{kind} begin create.".format(kind=kind))
-                self._select_k8s_client_and_api(
-                    kind, namespace, api_version, body)
-                kubernetes_object['status'] = 'Creating'
+                getattr(k8s_client_obj, delete_method)(**kwargs)
             except Exception as e:
-                if isinstance(e, client.rest.ApiException):
-                    kubernetes_object['status'] = 'creating_failed'
-                    msg = '''The request to create a resource failed.
-                    namespace: {namespace}, name: {name},kind: {kind},
-                    Reason: {exception}'''.format(
-                        namespace=namespace, name=name, kind=kind,
-                        exception=e.body
-                    )
-                else:
-                    kubernetes_object['status'] = 'creating_failed'
-                    msg = '''The request to create a resource failed.
-                    namespace: {namespace}, name: {name},kind: {kind},
-                    Reason: {exception}'''.format(
-                        namespace=namespace, name=name, kind=kind,
-                        exception=e
-                    )
-                LOG.error(msg)
-                raise exceptions.CreateApiFalse(error=msg)
-            new_k8s_objs.append(kubernetes_object)
-        return new_k8s_objs
+                LOG.warning("Failed to roll back %(kind)s %(name)s: "
+                            "%(error)s",
+                            {'kind': k8s_obj.kind,
+                             'name': k8s_obj.metadata.name, 'error': e})
 
     def _get_lower_case_name(self, name):
         name = name.strip()
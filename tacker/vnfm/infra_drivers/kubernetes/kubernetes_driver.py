@@ -15,7 +15,6 @@
 
 import os
 import re
-import time
 import urllib.request as urllib2
 import yaml
 
@@ -37,6 +36,7 @@ from tacker.objects import vnf_resources as vnf_resource_obj
 from tacker.vnflcm import utils as vnflcm_utils
 from tacker.vnfm.infra_drivers import abstract_driver
 from tacker.vnfm.infra_drivers.kubernetes.k8s import translate_outputs
+from tacker.vnfm.infra_drivers.kubernetes import readiness_tracker
 from tacker.vnfm.infra_drivers.kubernetes import translate_template
 from tacker.vnfm.infra_drivers import scale_driver
 from urllib.parse import urlparse
@@ -55,13 +55,22 @@ OPTS = [
                default=5,
                help=_("Wait time (in seconds) between consecutive stack"
                       " create/delete retries")),
+    cfg.StrOpt('readiness_tracking',
+               default='watch',
+               choices=['watch', 'list', 'read'],
+               help=_("How the status of the Kubernetes objects is tracked"
+                      " while waiting for them. 'watch' lists the objects"
+                      " of each kind and namespace once then watches their"
+                      " changes, 'list' lists them on each retry and 'read'"
+                      " reads each object on each retry.")),
 ]
 
 CONF.register_opts(OPTS, group='kubernetes_vim')
 
 
 def config_opts():
-    return [('kubernetes_vim', OPTS)]
+    return [('kubernetes_vim',
+             OPTS + translate_outputs.OPTS + kubernetes_utils.OPTS)]
 
 
 SCALING_POLICY = 'tosca.policies.tacker.Scaling'
@@ -116,7 +125,7 @@ class Kubernetes(abstract_driver.VnfAbstractDriver,
         """
         LOG.debug('vnf %s', vnf)
         # initialize Kubernetes APIs
-        auth_cred, file_descriptor = self._get_auth_creds(auth_attr)
+        auth_cred = self._get_auth_creds(auth_attr)
         try:
             core_v1_api_client = self.kubernetes.get_core_v1_api_client(
                 auth=auth_cred)
@@ -133,8 +142,6 @@ class Kubernetes(abstract_driver.VnfAbstractDriver,
         except Exception as e:
             LOG.error('Creating VNF got an error due to %s', e)
             raise
-        finally:
-            self.clean_authenticate_vim(auth_cred, file_descriptor)
         return deployment_names
 
     def create_wait(self, plugin, context, vnf_dict, vnf_id, auth_attr):
@@ -145,10 +152,11 @@ class Kubernetes(abstract_driver.VnfAbstractDriver,
         """
         # initialize Kubernetes APIs
         if '{' not in vnf_id and '}' not in vnf_id:
-            auth_cred, file_descriptor = self._get_auth_creds(auth_attr)
+            auth_cred = self._get_auth_creds(auth_attr)
+            tracker = self._get_readiness_tracker()
             try:
-                core_v1_api_client = \
-                    self.kubernetes.get_core_v1_api_client(auth=auth_cred)
+                core_v1_api_client = tracker.api(
+                    self.kubernetes.get_core_v1_api_client(auth=auth_cred))
                 deployment_info = vnf_id.split(COMMA_CHARACTER)
                 mgmt_ips = dict()
                 pods_information = self._get_pods_information(
@@ -158,14 +166,15 @@ class Kubernetes(abstract_driver.VnfAbstractDriver,
                 stack_retries = self.STACK_RETRIES
                 error_reason = None
                 while status == 'Pending' and stack_retries > 0:
-                    time.sleep(self.STACK_RETRY_WAIT)
+                    changed = tracker.wait(self.STACK_RETRY_WAIT)
                     pods_information = \
                         self._get_pods_information(
                             core_v1_api_client=core_v1_api_client,
                             deployment_info=deployment_info)
                     status = self._get_pod_status(pods_information)
                     LOG.debug('status: %s', status)
-                    stack_retries = stack_retries - 1
+                    if not changed:
+                        stack_retries = stack_retries - 1
 
                 LOG.debug('VNF initializing status: %(service_name)s '
                           '%(status)s',
@@ -204,11 +213,17 @@ class Kubernetes(abstract_driver.VnfAbstractDriver,
                 LOG.error('Creating wait VNF got an error due to %s', e)
                 raise
             finally:
-                self.clean_authenticate_vim(auth_cred, file_descriptor)
+                tracker.stop()
+
+    def _get_readiness_tracker(self):
+        return readiness_tracker.ReadinessTracker(
+            CONF.kubernetes_vim.readiness_tracking)
 
     def create_wait_k8s(self, k8s_objs, k8s_client_dict, vnf_instance):
+        tracker = self._get_readiness_tracker()
+        k8s_client_dict = tracker.clients(k8s_client_dict)
         try:
-            time.sleep(self.STACK_RETRY_WAIT)
+            tracker.wait(self.STACK_RETRY_WAIT)
             keep_going = True
             stack_retries = self.STACK_RETRIES
             while keep_going and stack_retries > 0:
@@ -252,8 +267,7 @@ class Kubernetes(abstract_driver.VnfAbstractDriver,
                                     name='',
                                     kind=k8s_obj.get('object').kind)
                             )
-                if keep_going:
-                    time.sleep(self.STACK_RETRY_WAIT)
+                if keep_going and not tracker.wait(self.STACK_RETRY_WAIT):
                     stack_retries -= 1
             if stack_retries == 0 and keep_going:
                 LOG.error('It is time out, When instantiate cnf,'
@@ -281,6 +295,8 @@ class Kubernetes(abstract_driver.VnfAbstractDriver,
         except Exception as e:
             LOG.error('Creating wait CNF got an error due to %s', e)
             raise e
+        finally:
+            tracker.stop()
 
     def _select_check_status_by_kind(self, kind):
         check_dict = {
@@ -570,7 +586,7 @@ class Kubernetes(abstract_driver.VnfAbstractDriver,
         ConfigMap data
         """
         # initialize Kubernetes APIs
-        auth_cred, file_descriptor = self._get_auth_creds(auth_attr)
+        auth_cred = self._get_auth_creds(auth_attr)
         try:
             core_v1_api_client = \
                 self.kubernetes.get_core_v1_api_client(auth=auth_cred)
@@ -615,8 +631,6 @@ class Kubernetes(abstract_driver.VnfAbstractDriver,
         except Exception as e:
             LOG.error('Updating VNF got an error due to %s', e)
             raise
-        finally:
-            self.clean_authenticate_vim(auth_cred, file_descriptor)
 
     @log.log
     def update_wait(self, plugin, context, vnf_id, auth_attr,
@@ -804,7 +818,7 @@ class Kubernetes(abstract_driver.VnfAbstractDriver,
     def delete(self, plugin, context, vnf_id, auth_attr, region_name=None,
                vnf_instance=None, terminate_vnf_req=None):
         """Delete function"""
-        auth_cred, file_descriptor = self._get_auth_creds(auth_attr)
+        auth_cred = self._get_auth_creds(auth_attr)
         try:
             if not vnf_instance:
                 # execute legacy delete method
@@ -867,8 +881,6 @@ class Kubernetes(abstract_driver.VnfAbstractDriver,
         except Exception as e:
             LOG.error('Deleting VNF got an error due to %s', e)
             raise
-        finally:
-            self.clean_authenticate_vim(auth_cred, file_descriptor)
 
     def _delete_wait_legacy(self, vnf_id, auth_cred):
         """Delete wait function for legacy
@@ -878,13 +890,14 @@ class Kubernetes(abstract_driver.VnfAbstractDriver,
         When Tacker can not get any information about service, the VNF will be
         marked as deleted.
         """
+        tracker = self._get_readiness_tracker()
         try:
-            core_v1_api_client = self.kubernetes.get_core_v1_api_client(
-                auth=auth_cred)
-            app_v1_api_client = self.kubernetes.get_app_v1_api_client(
-                auth=auth_cred)
-            scaling_api_client = self.kubernetes.get_scaling_api_client(
-                auth=auth_cred)
+            core_v1_api_client = tracker.api(
+                self.kubernetes.get_core_v1_api_client(auth=auth_cred))
+            app_v1_api_client = tracker.api(
+                self.kubernetes.get_app_v1_api_client(auth=auth_cred))
+            scaling_api_client = tracker.api(
+                self.kubernetes.get_scaling_api_client(auth=auth_cred))
 
             deployment_names = vnf_id.split(COMMA_CHARACTER)
             keep_going = True
@@ -923,15 +936,18 @@ class Kubernetes(abstract_driver.VnfAbstractDriver,
                         count = count + 1
                     except Exception:
                         pass
-                stack_retries = stack_retries - 1
                 # If one of objects is still alive, keeps on waiting
                 if count > 0:
                     keep_going = True
+                    if not tracker.wait(self.STACK_RETRY_WAIT):
+                        stack_retries = stack_retries - 1
                 else:
                     keep_going = False
         except Exception as e:
             LOG.error('Deleting wait VNF got an error due to %s', e)
             raise
+        finally:
+            tracker.stop()
 
     def _select_k8s_obj_read_api(self, k8s_client_dict, namespace, name,
                                  kind, api_version):
@@ -968,7 +984,8 @@ class Kubernetes(abstract_driver.VnfAbstractDriver,
         marked as deleted.
         """
         # initialize Kubernetes APIs
-        auth_cred, file_descriptor = self._get_auth_creds(auth_attr)
+        auth_cred = self._get_auth_creds(auth_attr)
+        tracker = self._get_readiness_tracker()
 
         try:
             if not vnf_instance:
@@ -977,8 +994,8 @@ class Kubernetes(abstract_driver.VnfAbstractDriver,
             else:
                 vnf_resources = objects.VnfResourceList.\
                     get_by_vnf_instance_id(context, vnf_instance.id)
-                k8s_client_dict = self.kubernetes.\
-                    get_k8s_client_dict(auth=auth_cred)
+                k8s_client_dict = tracker.clients(
+                    self.kubernetes.get_k8s_client_dict(auth=auth_cred))
 
                 keep_going = True
                 stack_retries = self.STACK_RETRIES
@@ -1007,18 +1024,18 @@ class Kubernetes(abstract_driver.VnfAbstractDriver,
                         except Exception:
                             pass
 
-                    stack_retries = stack_retries - 1
                     # If one of objects is still alive, keeps on waiting
                     if count > 0:
                         keep_going = True
-                        time.sleep(self.STACK_RETRY_WAIT)
+                        if not tracker.wait(self.STACK_RETRY_WAIT):
+                            stack_retries = stack_retries - 1
                     else:
                         keep_going = False
         except Exception as e:
             LOG.error('Deleting wait VNF got an error due to %s', e)
             raise
         finally:
-            self.clean_authenticate_vim(auth_cred, file_descriptor)
+            tracker.stop()
 
     @log.log
     def scale(self, context, plugin, auth_attr, policy, region_name):
@@ -1030,7 +1047,7 @@ class Kubernetes(abstract_driver.VnfAbstractDriver,
         """
         LOG.debug("VNF are scaled by updating instance of deployment")
         # initialize Kubernetes APIs
-        auth_cred, file_descriptor = self._get_auth_creds(auth_attr)
+        auth_cred = self._get_auth_creds(auth_attr)
         try:
             app_v1_api_client = self.kubernetes.get_app_v1_api_client(
                 auth=auth_cred)
@@ -1077,8 +1094,6 @@ class Kubernetes(abstract_driver.VnfAbstractDriver,
         except Exception as e:
             LOG.error('Scaling VNF got an error due to %s', e)
             raise
-        finally:
-            self.clean_authenticate_vim(auth_cred, file_descriptor)
 
     def scale_wait(self, context, plugin, auth_attr, policy, region_name,
                    last_event_id):
@@ -1088,10 +1103,11 @@ class Kubernetes(abstract_driver.VnfAbstractDriver,
         from Pod objects is RUNNING.
         """
         # initialize Kubernetes APIs
-        auth_cred, file_descriptor = self._get_auth_creds(auth_attr)
+        auth_cred = self._get_auth_creds(auth_attr)
+        tracker = self._get_readiness_tracker()
         try:
-            core_v1_api_client = self.kubernetes.get_core_v1_api_client(
-                auth=auth_cred)
+            core_v1_api_client = tracker.api(
+                self.kubernetes.get_core_v1_api_client(auth=auth_cred))
             deployment_info = policy['instance_id'].split(",")
 
             pods_information = self._get_pods_information(
@@ -1102,7 +1118,7 @@ class Kubernetes(abstract_driver.VnfAbstractDriver,
             stack_retries = self.STACK_RETRIES
             error_reason = None
             while status == 'Pending' and stack_retries > 0:
-                time.sleep(self.STACK_RETRY_WAIT)
+                changed = tracker.wait(self.STACK_RETRY_WAIT)
 
                 pods_information = self._get_pods_information(
                     core_v1_api_client=core_v1_api_client,
@@ -1110,7 +1126,8 @@ class Kubernetes(abstract_driver.VnfAbstractDriver,
                 status = self._get_pod_status(pods_information)
 
                 # LOG.debug('status: %s', status)
-                stack_retries = stack_retries - 1
+                if not changed:
+                    stack_retries = stack_retries - 1
 
             LOG.debug('VNF initializing status: %(service_name)s %(status)s',
                       {'service_name': str(deployment_info), 'status': status})
@@ -1132,7 +1149,7 @@ class Kubernetes(abstract_driver.VnfAbstractDriver,
             LOG.error('Scaling wait VNF got an error due to %s', e)
             raise
         finally:
-            self.clean_authenticate_vim(auth_cred, file_descriptor)
+            tracker.stop()
 
     @log.log
     def get_resource_info(self, plugin, context, vnf_info, auth_attr,
@@ -1141,28 +1158,12 @@ class Kubernetes(abstract_driver.VnfAbstractDriver,
         pass
 
     def _get_auth_creds(self, auth_cred):
-        file_descriptor = self._create_ssl_ca_file(auth_cred)
+        # NOTE: The file of the CA certificate is kept by the cached API
+        # client of the VIM, see kubernetes_utils.ClientCache.
         if ('username' not in auth_cred) and ('password' not in auth_cred):
             auth_cred['username'] = 'None'
             auth_cred['password'] = None
-        return auth_cred, file_descriptor
-
-    def _create_ssl_ca_file(self, auth_attr):
-        ca_cert = utils.none_from_string(auth_attr.get('ssl_ca_cert'))
-        if ca_cert is not None:
-            file_descriptor, file_path = \
-                self.kubernetes.create_ca_cert_tmp_file(ca_cert)
-            auth_attr['ca_cert_file'] = file_path
-            return file_descriptor
-        else:
-            return None
-
-    def clean_authenticate_vim(self, vim_auth, file_descriptor):
-        # remove ca_cert_file from vim_obj if it exists
-        # close and delete temp ca_cert_file
-        if file_descriptor is not None:
-            file_path = vim_auth.pop('ca_cert_file')
-            self.kubernetes.close_tmp_file(file_descriptor, file_path)
+        return auth_cred
 
     def heal_vdu(self, plugin, context, vnf_dict, heal_request_data):
         pass
@@ -1267,7 +1268,7 @@ class Kubernetes(abstract_driver.VnfAbstractDriver,
                 None, context, vnf_instance, auth_attr)
             return instance_id
         else:
-            auth_cred, file_descriptor = self._get_auth_creds(auth_attr)
+            auth_cred = self._get_auth_creds(auth_attr)
             k8s_client_dict = self.kubernetes.get_k8s_client_dict(auth_cred)
             if vnf_package_path is None:
                 vnf_package_path = vnflcm_utils._get_vnf_package_path(
@@ -1297,7 +1298,6 @@ class Kubernetes(abstract_driver.VnfAbstractDriver,
             # all the deployment object will store into resource_info_str.
             # and the instance_id is created from all deployment_dict.
             resource_info_str = ';'.join(deployment_str_list)
-            self.clean_authenticate_vim(auth_cred, file_descriptor)
             vnfd_dict['instance_id'] = resource_info_str
             return resource_info_str
 
@@ -0,0 +1,237 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import time
+import types
+
+import eventlet
+from kubernetes import client
+from kubernetes import watch
+from oslo_log import log as logging
+
+
+LOG = logging.getLogger(__name__)
+
+# Seconds after which the API server ends a watch, it is then resumed from
+# the last resource version seen.
+WATCH_TIMEOUT = 300
+
+
+class _ObjectCache(object):
+    """The objects of one kind in one namespace, or in the cluster.
+
+    The objects are listed once, then kept up to date by watching their
+    changes from the resource version of the list. If they can't be
+    watched, they are listed again on each poll of the tracker.
+    """
+
+    def __init__(self, tracker, list_func, namespace, use_watch):
+        self._tracker = tracker
+        self._list_func = list_func
+        self._kwargs = {'namespace': namespace} if namespace else {}
+        self._use_watch = use_watch
+        self._objects = {}
+        self._resource_version = None
+        # Poll of the tracker at which the objects were last listed
+        self._listed = None
+        self._thread = None
+        self.listable = True
+
+    @property
+    def watched(self):
+        return self._thread is not None
+
+    def objects(self):
+        """Return the objects by name."""
+        if not self.watched and self._listed != self._tracker.polls:
+            self._list()
+            if self._use_watch:
+                self._thread = eventlet.spawn(self._watch)
+        return self._objects
+
+    def stop(self):
+        if self._thread is not None:
+            self._thread.kill()
+            self._thread = None
+
+    def _list(self):
+        result = self._list_func(**self._kwargs)
+        self._objects = {obj.metadata.name: obj for obj in result.items}
+        self._resource_version = result.metadata.resource_version
+        self._listed = self._tracker.polls
+
+    def _watch(self):
+        try:
+            while True:
+                watcher = watch.Watch()
+                try:
+                    for event in watcher.stream(
+                            self._list_func,
+                            resource_version=self._resource_version,
+                            timeout_seconds=WATCH_TIMEOUT,
+                            **self._kwargs):
+                        self._apply(event)
+                except client.rest.ApiException as e:
+                    if e.status != 410:
+                        raise
+                    # The resource version is too old to be watched from.
+                    self._list()
+                    self._tracker.notify()
+                    continue
+                self._resource_version = (watcher.resource_version or
+                                          self._resource_version)
+        except Exception as e:
+            LOG.warning("Failed to watch %(func)s %(kwargs)s, listing them "
+                        "on each poll instead: %(error)s",
+                        {'func': self._list_func.__name__,
+                         'kwargs': self._kwargs, 'error': e})
+            self._use_watch = False
+            self._listed = None
+            self._thread = None
+            self._tracker.notify()
+
+    def _apply(self, event):
+        obj = event['object']
+        if event['type'] in ('ADDED', 'MODIFIED'):
+            self._objects[obj.metadata.name] = obj
+        elif event['type'] == 'DELETED':
+            self._objects.pop(obj.metadata.name, None)
+        else:
+            # e.g. BOOKMARK, only a newer resource version.
+            return
+        self._tracker.notify()
+
+
+class _TrackedApi(object):
+    """An API client whose reads and lists are served by the tracker.
+
+    ``read_*(name=..., namespace=...)`` and ``list_*(namespace=...)``
+    calls of the kinds which can be listed return the tracked objects,
+    any other call goes to the API client.
+    """
+
+    def __init__(self, tracker, api_client):
+        self._tracker = tracker
+        self._api_client = api_client
+
+    def __getattr__(self, attr_name):
+        func = getattr(self._api_client, attr_name)
+        verb, _sep, kind = attr_name.partition('_')
+        list_name = 'list_' + kind
+        if verb not in ('read', 'list') or \
+                not hasattr(self._api_client, list_name):
+            return func
+
+        def call(*args, **kwargs):
+            if args or set(kwargs) - {'name', 'namespace'}:
+                return func(*args, **kwargs)
+            cache = self._tracker.get_cache(self._api_client, list_name,
+                                            kwargs.get('namespace'))
+            if not cache.listable:
+                return func(**kwargs)
+            try:
+                objects = cache.objects()
+            except client.rest.ApiException as e:
+                if e.status != 403:
+                    raise
+                LOG.warning("Not allowed to %(func)s %(kwargs)s, reading "
+                            "them one by one instead",
+                            {'func': list_name, 'kwargs': kwargs})
+                cache.listable = False
+                return func(**kwargs)
+
+            if verb == 'list':
+                return types.SimpleNamespace(items=list(objects.values()))
+            try:
+                return objects[kwargs['name']]
+            except KeyError:
+                raise client.rest.ApiException(status=404,
+                                               reason='Not Found')
+
+        return call
+
+
+class ReadinessTracker(object):
+    """Tracks the status of Kubernetes objects while waiting for them.
+
+    With the ``watch`` mode, the objects of each kind and namespace are
+    listed once and their changes are watched, so that :meth:`wait`
+    returns as soon as one of them changes. With the ``list`` mode, or if
+    they can't be watched, they are listed once per poll. With the
+    ``read`` mode the API clients are used as is, each object is read on
+    each poll.
+    """
+
+    def __init__(self, mode):
+        self.mode = mode
+        # Number of polls, i.e. of waits, so far
+        self.polls = 0
+        self._caches = {}
+        self._changed = eventlet.event.Event()
+        self._waited = 0
+
+    def api(self, api_client):
+        """Return the API client to get the tracked objects with."""
+        if self.mode == 'read':
+            return api_client
+        return _TrackedApi(self, api_client)
+
+    def clients(self, k8s_client_dict):
+        return {api_version: self.api(api_client)
+                for api_version, api_client in k8s_client_dict.items()}
+
+    def get_cache(self, api_client, list_name, namespace):
+        key = (id(api_client), list_name, namespace)
+        cache = self._caches.get(key)
+        if cache is None:
+            cache = self._caches[key] = _ObjectCache(
+                self, getattr(api_client, list_name), namespace,
+                self.mode == 'watch')
+        return cache
+
+    def notify(self):
+        if not self._changed.ready():
+            self._changed.send()
+
+    def wait(self, interval):
+        """Wait for the tracked objects to change.
+
+        :returns: False once interval seconds have been waited since the
+            previous False, True if woken up earlier by a change
+        """
+        if self.mode == 'read':
+            time.sleep(interval)
+            return False
+        if not self._caches:
+            # Nothing tracked yet, the next check gets the objects.
+            return True
+        try:
+            if not any(cache.watched for cache in self._caches.values()):
+                time.sleep(interval)
+                self._waited = interval
+            else:
+                start = time.monotonic()
+                with eventlet.Timeout(interval - self._waited, False):
+                    self._changed.wait()
+                self._waited += time.monotonic() - start
+        finally:
+            self.polls += 1
+            self._changed = eventlet.event.Event()
+
+        if self._waited >= interval:
+            self._waited = 0
+            return False
+        return True
+
+    def stop(self):
+        for cache in self._caches.values():
+            cache.stop()
@@ -10,16 +10,94 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import collections
 import sys
+import threading
+import time
 
 from heatclient import exc as heatException
+from oslo_config import cfg
 from oslo_log import log as logging
+from oslo_serialization import jsonutils
 
 from tacker.common import clients
 from tacker.extensions import vnfm
 
 LOG = logging.getLogger(__name__)
 
+# Number of VIMs whose authenticated clients are kept by get_heat_client.
+CLIENT_CACHE_SIZE = 64
+
+_clients = collections.OrderedDict()
+_clients_lock = threading.Lock()
+
+
+def get_heat_client(auth_attr, region_name=None):
+    """Return a HeatClient shared by all the callers using the same VIM.
+
+    The keystone session of the client is authenticated once and renews
+    its token when needed, so waiting for stacks does not authenticate
+    again for every wait.
+    """
+    key = (jsonutils.dumps(auth_attr, sort_keys=True), region_name)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is not None:
+            _clients.move_to_end(key)
+            return client
+    client = HeatClient(auth_attr, region_name)
+    with _clients_lock:
+        client = _clients.setdefault(key, client)
+        while len(_clients) > CLIENT_CACHE_SIZE:
+            _clients.popitem(last=False)
+    return client
+
+
+def clear_client_cache():
+    with _clients_lock:
+        _clients.clear()
+
+
+class ResourceTypeCache(object):
+    """Per VIM cache of the heat resource type schemas.
+
+    The schemas are keyed by (vim_id, region_name) and resource type, and
+    expire after [openstack_vim] resource_type_cache_ttl seconds. The
+    schemas of a VIM are also dropped by :meth:`invalidate` when the VIM
+    is updated or deleted.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # ((vim_id, region_name), resource_type) => (expires_at, schema)
+        self._schemas = {}
+
+    def get(self, vim_key, heat_client, resource_type):
+        ttl = cfg.CONF.openstack_vim.resource_type_cache_ttl
+        if vim_key is None or ttl <= 0:
+            return heat_client.resource_types.get(resource_type)
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._schemas.get((vim_key, resource_type))
+        if entry is not None and entry[0] > now:
+            return entry[1]
+
+        schema = heat_client.resource_types.get(resource_type)
+        with self._lock:
+            self._schemas[(vim_key, resource_type)] = (now + ttl, schema)
+        return schema
+
+    def invalidate(self, vim_id=None):
+        """Drop the schemas of a VIM, or of all VIMs."""
+        with self._lock:
+            for key in list(self._schemas):
+                if vim_id in (None, key[0][0]):
+                    del self._schemas[key]
+
+
+RESOURCE_TYPES = ResourceTypeCache()
+
 
 class HeatClient(object):
     def __init__(self, auth_attr, region_name=None):
@@ -63,6 +141,11 @@ class HeatClient(object):
     def get(self, stack_id):
         return self.stacks.get(stack_id)
 
+    def list_by_ids(self, stack_ids):
+        """Return the stacks with the given ids, deleted ones included."""
+        return self.stacks.list(filters={'id': list(stack_ids)},
+                                show_deleted=True, show_nested=True)
+
     def get_stack_nested_depth(self, stack_id):
         stack_ids = self._stack_ids(stack_id)
         if stack_ids:
@@ -77,8 +160,14 @@ class HeatClient(object):
             type_, value, tb = sys.exc_info()
             raise vnfm.HeatClientException(msg=value)
 
-    def resource_attr_support(self, resource_name, property_name):
-        resource = self.resource_types.get(resource_name)
+    def resource_attr_support(self, resource_name, property_name,
+                              vim_key=None):
+        """Check whether a resource type supports a property.
+
+        :param vim_key: (vim_id, region_name) of the heat endpoint, under
+                        which the resource type schema is cached
+        """
+        resource = RESOURCE_TYPES.get(vim_key, self, resource_name)
         return property_name in resource['attributes']
 
     def resource_get_list(self, stack_id, nested_depth=0):
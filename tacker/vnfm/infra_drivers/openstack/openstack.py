@@ -28,7 +28,6 @@ from oslo_config import cfg
 from oslo_log import log as logging
 from oslo_serialization import jsonutils
 from oslo_utils import encodeutils
-from oslo_utils import excutils
 from oslo_utils import uuidutils
 from tacker._i18n import _
 from tacker.common import exceptions
@@ -46,6 +45,7 @@ from tacker.vnfm.infra_drivers import abstract_driver
 from tacker.vnfm.infra_drivers.openstack import constants as infra_cnst
 from tacker.vnfm.infra_drivers.openstack import glance_client as gc
 from tacker.vnfm.infra_drivers.openstack import heat_client as hc
+from tacker.vnfm.infra_drivers.openstack import stack_watcher
 from tacker.vnfm.infra_drivers.openstack import translate_template
 from tacker.vnfm.infra_drivers.openstack import vdu
 from tacker.vnfm.infra_drivers import scale_driver
@@ -71,6 +71,22 @@ OPTS = [
                default=10,
                help=_("Wait time (in seconds) between consecutive stack"
                       " create/delete retries")),
+    cfg.IntOpt('stack_poll_min_wait',
+               default=1,
+               min=0,
+               help=_("Wait time (in seconds) before the first retry while "
+                      "waiting for a stack. The wait time doubles at each "
+                      "retry up to stack_retry_wait")),
+    cfg.IntOpt('resource_type_cache_ttl',
+               default=3600,
+               min=0,
+               help=_("Time (in seconds) the heat resource type schemas of "
+                      "a VIM are cached for. 0 disables the cache")),
+    cfg.IntOpt('image_upload_concurrency',
+               default=4,
+               min=1,
+               help=_("Number of software images of a VNF created in "
+                      "glance concurrently")),
 ]
 
 CONF.register_opts(OPTS, group='openstack_vim')
@@ -113,6 +129,7 @@ class OpenStack(abstract_driver.VnfAbstractDriver,
         super(OpenStack, self).__init__()
         self.STACK_RETRIES = cfg.CONF.openstack_vim.stack_retries
         self.STACK_RETRY_WAIT = cfg.CONF.openstack_vim.stack_retry_wait
+        self.STACK_POLL_MIN_WAIT = cfg.CONF.openstack_vim.stack_poll_min_wait
         self.IMAGE_RETRIES = 10
         self.IMAGE_RETRY_WAIT = 10
         self.LOCK_RETRIES = 10
@@ -363,7 +380,7 @@ class OpenStack(abstract_driver.VnfAbstractDriver,
     def create_wait(self, plugin, context, vnf_dict, vnf_id, auth_attr):
         region_name = vnf_dict.get('placement_attr', {}).get(
             'region_name', None)
-        heatclient = hc.HeatClient(auth_attr, region_name)
+        heatclient = hc.get_heat_client(auth_attr, region_name)
 
         stack = self._wait_until_stack_ready(
             vnf_id, auth_attr, infra_cnst.STACK_CREATE_IN_PROGRESS,
@@ -386,20 +403,21 @@ class OpenStack(abstract_driver.VnfAbstractDriver,
     def _wait_until_stack_ready(self, vnf_id, auth_attr, wait_status,
                                 expected_status, exception_class,
                                 region_name=None):
-        heatclient = hc.HeatClient(auth_attr, region_name)
-        stack_retries = self.STACK_RETRIES
+        heatclient = hc.get_heat_client(auth_attr, region_name)
+        poll_intervals = self._get_stack_poll_intervals()
+        stack_retries = len(poll_intervals)
         status = wait_status
         stack = None
-        while stack_retries > 0:
+        for poll_interval in poll_intervals:
             try:
                 stack_retries = stack_retries - 1
-                stack = heatclient.get(vnf_id)
+                stack = stack_watcher.WATCHER.get(heatclient, vnf_id)
                 status = stack.stack_status
                 if status == expected_status:
                     LOG.debug('stack status: %(stack)s %(status)s',
                               {'stack': str(stack), 'status': status})
                     return stack
-                time.sleep(self.STACK_RETRY_WAIT)
+                time.sleep(poll_interval)
                 LOG.debug('status: %s', status)
             except Exception:
                 LOG.warning("VNF Instance setup may not have "
@@ -420,6 +438,11 @@ class OpenStack(abstract_driver.VnfAbstractDriver,
                 LOG.warning(error_reason)
                 raise exception_class(reason=error_reason)
 
+    def _get_stack_poll_intervals(self):
+        return stack_watcher.get_poll_intervals(
+            self.STACK_POLL_MIN_WAIT, self.STACK_RETRY_WAIT,
+            self.STACK_RETRIES)
+
     def _find_mgmt_ips(self, outputs):
         LOG.debug('outputs %s', outputs)
         mgmt_ips = dict((output['output_key'][len(OUTPUT_PREFIX):],
@@ -518,7 +541,7 @@ class OpenStack(abstract_driver.VnfAbstractDriver,
                   region_name=None):
         region_name = vnf_dict.get('placement_attr', {}).get(
             'region_name', None)
-        heatclient = hc.HeatClient(auth_attr, region_name)
+        heatclient = hc.get_heat_client(auth_attr, region_name)
         stack_id = vnf_dict.get('heal_stack_id', vnf_dict['instance_id'])
 
         stack = self._wait_until_stack_ready(stack_id,
@@ -605,15 +628,17 @@ class OpenStack(abstract_driver.VnfAbstractDriver,
     @log.log
     def scale_wait(self, context, plugin, auth_attr, policy, region_name,
                    last_event_id):
-        heatclient = hc.HeatClient(auth_attr, region_name)
+        heatclient = hc.get_heat_client(auth_attr, region_name)
 
-        stack_retries = self.STACK_RETRIES
+        poll_intervals = self._get_stack_poll_intervals()
+        stack_retries = len(poll_intervals)
+        poll_intervals = iter(poll_intervals)
         stack_id = policy['instance_id']
         grp = heatclient.resource_get(stack_id, policy['name'] + '_group')
         while (True):
             try:
                 judge = 0
-                time.sleep(self.STACK_RETRY_WAIT)
+                time.sleep(next(poll_intervals, self.STACK_RETRY_WAIT))
                 policy_name = get_scaling_policy_name(
                     policy_name=policy['name'], action=policy['action'])
                 scale_rsc_list = heatclient.resource_get_list(
@@ -729,7 +754,15 @@ class OpenStack(abstract_driver.VnfAbstractDriver,
                                   {"uuid": vnf_resource.resource_identifier,
                                   "id": vnf_instance.id})
 
-        for node_name, vnf_sw_image in vnf_software_images.items():
+        # NOTE: The images are created, uploaded and waited for
+        # concurrently. Once one of them failed, no new image is created
+        # and all the images created are deleted when the others are done.
+        errors = []
+
+        def _create_image(node_name, vnf_sw_image):
+            if errors:
+                return
+
             name = vnf_sw_image.name
             image_path = vnf_sw_image.image_path
             is_url = utils.is_url(image_path)
@@ -757,19 +790,13 @@ class OpenStack(abstract_driver.VnfAbstractDriver,
                 LOG.info("Image %(name)s created successfully for vnf %(id)s",
                          {"name": name, "id": vnf_instance.id})
             except Exception as exp:
-                with excutils.save_and_reraise_exception():
-                    exp.reraise = False
-                    LOG.error("Failed to create image %(name)s for vnf %(id)s "
-                              "due to error: %(error)s",
-                              {"name": name, "id": vnf_instance.id,
-                              "error": encodeutils.exception_to_unicode(exp)})
-
-                    # Delete previously created images
-                    _roll_back_images()
-
-                    raise exceptions.VnfPreInstantiationFailed(
-                        id=vnf_instance.id,
-                        error=encodeutils.exception_to_unicode(exp))
+                LOG.error("Failed to create image %(name)s for vnf %(id)s "
+                          "due to error: %(error)s",
+                          {"name": name, "id": vnf_instance.id,
+                          "error": encodeutils.exception_to_unicode(exp)})
+                errors.append(exp)
+                return
+
             try:
                 if is_url:
                     glance_client.import_image(image, image_path)
@@ -783,27 +810,32 @@ class OpenStack(abstract_driver.VnfAbstractDriver,
                     resource_status="CREATED", resource_identifier=image.id)
                 vnf_resources[node_name] = [vnf_resource]
             except Exception as exp:
-                with excutils.save_and_reraise_exception():
-                    exp.reraise = False
-                    LOG.error("Image %(name)s not active for vnf %(id)s "
-                              "error: %(error)s",
-                              {"name": name, "id": vnf_instance.id,
-                              "error": encodeutils.exception_to_unicode(exp)})
-
-                    err_msg = "Failed to delete image %(uuid)s for vnf %(id)s"
-                    # Delete the image
-                    try:
-                        glance_client.delete(image.id)
-                    except Exception:
-                        LOG.error(err_msg, {"uuid": image.id,
-                                  "id": vnf_instance.id})
+                LOG.error("Image %(name)s not active for vnf %(id)s "
+                          "error: %(error)s",
+                          {"name": name, "id": vnf_instance.id,
+                          "error": encodeutils.exception_to_unicode(exp)})
+                errors.append(exp)
+
+                err_msg = "Failed to delete image %(uuid)s for vnf %(id)s"
+                # Delete the image
+                try:
+                    glance_client.delete(image.id)
+                except Exception:
+                    LOG.error(err_msg, {"uuid": image.id,
+                              "id": vnf_instance.id})
+
+        pool = eventlet.GreenPool(CONF.openstack_vim.image_upload_concurrency)
+        for node_name, vnf_sw_image in vnf_software_images.items():
+            pool.spawn_n(_create_image, node_name, vnf_sw_image)
+        pool.waitall()
 
-                    # Delete all previously created images for vnf
-                    _roll_back_images()
+        if errors:
+            # Delete all created images for vnf
+            _roll_back_images()
 
-                    raise exceptions.VnfPreInstantiationFailed(
-                        id=vnf_instance.id,
-                        error=encodeutils.exception_to_unicode(exp))
+            raise exceptions.VnfPreInstantiationFailed(
+                id=vnf_instance.id,
+                error=encodeutils.exception_to_unicode(errors[0]))
 
         return vnf_resources
 
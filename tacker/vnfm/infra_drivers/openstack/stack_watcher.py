@@ -0,0 +1,117 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import collections
+import threading
+
+import eventlet
+from oslo_log import log as logging
+
+
+LOG = logging.getLogger(__name__)
+
+
+def get_poll_intervals(min_wait, max_wait, retries):
+    """Return the waits between the polls of a stack.
+
+    The waits start at min_wait and double up to max_wait, so that short
+    operations are noticed early, until they add up to retries * max_wait.
+    """
+    if max_wait <= 0:
+        return [0] * max(retries, 1)
+    timeout = retries * max_wait
+    intervals = []
+    interval = min(min_wait, max_wait)
+    while sum(intervals) < timeout:
+        intervals.append(interval)
+        interval = min(interval * 2, max_wait) or max_wait
+    return intervals or [max_wait]
+
+
+class _VimPolls(object):
+
+    def __init__(self):
+        # stack_id => [event, ...] of the callers waiting for the next poll
+        self.pending = collections.defaultdict(list)
+        self.polling = False
+
+
+class StackWatcher(object):
+    """Looks up the stacks of concurrent LCM operations together.
+
+    While a lookup of the stacks of a VIM is running, the stacks requested
+    by other callers for the same VIM are queued and looked up by a single
+    stack list request as soon as it completes. A caller alone is served
+    by a plain stack get, without waiting for other callers.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._vims = {}
+
+    def get(self, heatclient, stack_id):
+        """Return the stack, looked up together with the other callers.
+
+        The stack returned by a batched lookup is a stack list item, whose
+        missing attributes, e.g. outputs, are fetched on first access.
+        """
+        result = eventlet.event.Event()
+        with self._lock:
+            polls = self._vims.setdefault(id(heatclient), _VimPolls())
+            polls.pending[stack_id].append(result)
+            lead = not polls.polling
+            polls.polling = True
+        if lead:
+            self._poll(heatclient, polls)
+        return result.wait()
+
+    def _poll(self, heatclient, polls):
+        with self._lock:
+            batch = polls.pending
+            polls.pending = collections.defaultdict(list)
+        try:
+            stacks = self._lookup(heatclient, list(batch))
+            for stack_id, events in batch.items():
+                for event in events:
+                    event.send(stacks[stack_id])
+        except Exception as e:
+            for events in batch.values():
+                for event in events:
+                    if not event.ready():
+                        event.send_exception(e)
+        finally:
+            with self._lock:
+                if polls.pending:
+                    # Serve the callers queued meanwhile in the background,
+                    # the leader got its stack.
+                    eventlet.spawn_n(self._poll, heatclient, polls)
+                else:
+                    polls.polling = False
+                    del self._vims[id(heatclient)]
+
+    @staticmethod
+    def _lookup(heatclient, stack_ids):
+        if len(stack_ids) == 1:
+            return {stack_ids[0]: heatclient.get(stack_ids[0])}
+
+        LOG.debug('Looking up stacks %s', stack_ids)
+        stacks = {stack.id: stack
+                  for stack in heatclient.list_by_ids(stack_ids)}
+        for stack_id in stack_ids:
+            if stack_id not in stacks:
+                # e.g. a stack name rather than an id, let heat resolve it
+                # or raise the expected error.
+                stacks[stack_id] = heatclient.get(stack_id)
+        return stacks
+
+
+WATCHER = StackWatcher()
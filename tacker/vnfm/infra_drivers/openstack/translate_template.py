@@ -10,6 +10,11 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import collections
+import hashlib
+import pickle
+import threading
+
 from oslo_config import cfg
 from oslo_log import log as logging
 from oslo_serialization import jsonutils
@@ -35,10 +40,87 @@ OPTS = [
     cfg.DictOpt('flavor_extra_specs',
                default={},
                help=_("Flavor Extra Specs")),
+    cfg.IntOpt('tosca_template_cache_size',
+               default=128,
+               min=0,
+               help=_("Number of parsed VNFD TOSCA templates kept for the "
+                      "next VNFs created from the same VNFD and parameter "
+                      "values. 0 disables the cache")),
 ]
 
 CONF.register_opts(OPTS, group='openstack_vim')
 
+
+class ToscaTemplateCache(object):
+    """LRU cache of the TOSCA templates parsed by tosca-parser.
+
+    The templates are keyed by a digest of the VNFD and of the parameter
+    values, the only inputs of the parsing. They are kept pickled as
+    parsed, since the translation modifies the template, and every
+    :meth:`get` returns a new copy.
+    """
+
+    def __init__(self):
+        self._templates = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _digest(vnfd_dict, parsed_params):
+        return hashlib.sha256(jsonutils.dump_as_bytes(
+            [vnfd_dict, parsed_params], sort_keys=True)).hexdigest()
+
+    def get(self, vnfd_dict, parsed_params):
+        """Return a parsed copy of the VNFD.
+
+        :raises: exceptions of tosca-parser if the VNFD is invalid
+        """
+        max_size = CONF.openstack_vim.tosca_template_cache_size
+        if max_size <= 0:
+            return tosca_template.ToscaTemplate(
+                parsed_params=parsed_params, a_file=False,
+                yaml_dict_tpl=vnfd_dict)
+
+        key = self._digest(vnfd_dict, parsed_params)
+        with self._lock:
+            template = self._templates.get(key)
+            if template is not None:
+                self._templates.move_to_end(key)
+                self.hits += 1
+                return pickle.loads(template)
+            self.misses += 1
+
+        tosca = tosca_template.ToscaTemplate(parsed_params=parsed_params,
+                                             a_file=False,
+                                             yaml_dict_tpl=vnfd_dict)
+        try:
+            template = pickle.dumps(tosca, pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            LOG.debug("TOSCA template not cached: %s", e)
+            return tosca
+
+        with self._lock:
+            self._templates[key] = template
+            while len(self._templates) > max_size:
+                self._templates.popitem(last=False)
+                self.evictions += 1
+        LOG.debug("Parsed TOSCA template cache stats: %s", self.get_stats())
+        return tosca
+
+    def clear(self):
+        with self._lock:
+            self._templates.clear()
+
+    def get_stats(self):
+        with self._lock:
+            return {'size': len(self._templates), 'hits': self.hits,
+                    'misses': self.misses, 'evictions': self.evictions}
+
+
+TOSCA_TEMPLATES = ToscaTemplateCache()
+
 HEAT_VERSION_INCOMPATIBILITY_MAP = {'OS::Neutron::Port': {
     'port_security_enabled': 'value_specs', }, }
 
@@ -240,11 +322,17 @@ class TOSCAToHOT(object):
     @log.log
     def _get_unsupported_resource_props(self, heat_client):
         unsupported_resource_props = {}
+        vim_key = None
+        if self.vnf.get('vim_id'):
+            vim_key = (self.vnf['vim_id'],
+                       (self.vnf.get('placement_attr') or {}).get(
+                           'region_name'))
 
         for res, prop_dict in (HEAT_VERSION_INCOMPATIBILITY_MAP).items():
             unsupported_props = {}
             for prop, val in (prop_dict).items():
-                if not heat_client.resource_attr_support(res, prop):
+                if not heat_client.resource_attr_support(res, prop,
+                                                         vim_key=vim_key):
                     unsupported_props.update(prop_dict)
             if unsupported_props:
                 unsupported_resource_props[res] = unsupported_props
@@ -275,9 +363,7 @@ class TOSCAToHOT(object):
             )
 
         try:
-            tosca = tosca_template.ToscaTemplate(parsed_params=parsed_params,
-                                                 a_file=False,
-                                                 yaml_dict_tpl=vnfd_dict)
+            tosca = TOSCA_TEMPLATES.get(vnfd_dict, parsed_params)
 
         except Exception as e:
             LOG.debug("tosca-parser error: %s", str(e))
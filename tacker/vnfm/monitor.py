@@ -16,12 +16,14 @@
 
 import ast
 import copy
+import heapq
 import inspect
 import random
 import string
 import threading
 import time
 
+import eventlet
 from oslo_config import cfg
 from oslo_log import log as logging
 from oslo_serialization import jsonutils
@@ -40,6 +42,17 @@ OPTS = [
     cfg.IntOpt('check_intvl',
                default=10,
                help=_("check interval for monitor")),
+    cfg.IntOpt('max_concurrent_probes',
+               default=100,
+               min=1,
+               help=_("Maximum number of VNFs probed concurrently by the "
+                      "VNF monitor")),
+    cfg.DictOpt('driver_concurrency',
+                default={},
+                help=_("Maximum number of concurrent calls of each monitor "
+                       "driver, e.g. ping:50,http_ping:20. The calls of "
+                       "drivers not listed are only limited by "
+                       "max_concurrent_probes")),
 ]
 CONF.register_opts(OPTS, group='monitor')
 
@@ -52,12 +65,27 @@ def config_opts():
 
 
 class VNFMonitor(object):
-    """VNF Monitor."""
+    """VNF Monitor.
+
+    Every hosting VNF is probed check_intvl seconds after its previous
+    probe completed. The VNFs due are taken from a heap ordered by due
+    time and probed concurrently on a pool of green threads, so a slow or
+    unreachable VNF does not delay the others. _lock only guards the
+    registry and the schedule, it is not held while probing.
+    """
 
     _instance = None
     _hosting_vnfs = dict()   # vnf_id => dict of parameters
     _status_check_intvl = 0
     _lock = threading.RLock()
+    # Heap of (due time, vnf_id). An entry whose due time differs from
+    # _due[vnf_id] was superseded and is skipped.
+    _schedule = []
+    _due = dict()
+    _in_flight = set()
+    _wakeup = threading.Event()
+    _pool = None
+    _driver_semaphores = dict()
 
     OPTS = [
         cfg.ListOpt(
@@ -82,28 +110,81 @@ class VNFMonitor(object):
         if check_intvl is None:
             check_intvl = cfg.CONF.monitor.check_intvl
         self._status_check_intvl = check_intvl
+        if VNFMonitor._pool is None:
+            VNFMonitor._pool = eventlet.GreenPool(
+                cfg.CONF.monitor.max_concurrent_probes)
         LOG.debug('Spawning VNF monitor thread')
         threading.Thread(target=self.__run__).start()
 
     def __run__(self):
         while(1):
-            time.sleep(self._status_check_intvl)
-
+            self._wakeup.clear()
+            timeout = self._run_due_probes()
+            self._wakeup.wait(timeout)
+
+    def _schedule_vnf(self, vnf_id, due):
+        # Must be called with _lock held.
+        VNFMonitor._due[vnf_id] = due
+        heapq.heappush(VNFMonitor._schedule, (due, vnf_id))
+        self._wakeup.set()
+
+    def _run_due_probes(self):
+        """Start probing the VNFs which are due.
+
+        :returns: seconds until the next VNF is due, or None if no VNF is
+                  monitored
+        """
+        now = time.monotonic()
+        due_vnfs = []
+        with self._lock:
+            while VNFMonitor._schedule and VNFMonitor._schedule[0][0] <= now:
+                due, vnf_id = heapq.heappop(VNFMonitor._schedule)
+                if VNFMonitor._due.get(vnf_id) != due:
+                    continue
+                del VNFMonitor._due[vnf_id]
+                if vnf_id in VNFMonitor._in_flight:
+                    # Rescheduled once the running probe completes.
+                    continue
+                VNFMonitor._in_flight.add(vnf_id)
+                due_vnfs.append(VNFMonitor._hosting_vnfs[vnf_id])
+            timeout = None
+            if VNFMonitor._schedule:
+                timeout = max(VNFMonitor._schedule[0][0] - now, 0)
+
+        for hosting_vnf in due_vnfs:
+            # Blocks while max_concurrent_probes probes are running.
+            self._pool.spawn_n(self._probe, hosting_vnf)
+        return timeout
+
+    def _probe(self, hosting_vnf):
+        try:
+            if hosting_vnf.get('dead', False) or (
+                    hosting_vnf['vnf']['status'] == constants.PENDING_HEAL):
+                LOG.debug('monitor skips for DEAD/PENDING_HEAL vnf %s',
+                          hosting_vnf)
+            else:
+                self.run_monitor(hosting_vnf)
+        except Exception as ex:
+            LOG.exception("Unknown exception: Monitoring failed "
+                          "for VNF '%s' due to '%s' ",
+                          hosting_vnf['id'], ex)
+        finally:
             with self._lock:
-                for hosting_vnf in VNFMonitor._hosting_vnfs.values():
-                    if hosting_vnf.get('dead', False) or (
-                            hosting_vnf['vnf']['status'] ==
-                            constants.PENDING_HEAL):
-                        LOG.debug(
-                            'monitor skips for DEAD/PENDING_HEAL vnf %s',
-                            hosting_vnf)
-                        continue
-                    try:
-                        self.run_monitor(hosting_vnf)
-                    except Exception as ex:
-                        LOG.exception("Unknown exception: Monitoring failed "
-                                      "for VNF '%s' due to '%s' ",
-                                      hosting_vnf['id'], ex)
+                VNFMonitor._in_flight.discard(hosting_vnf['id'])
+                if hosting_vnf['id'] in VNFMonitor._hosting_vnfs:
+                    self._schedule_vnf(
+                        hosting_vnf['id'],
+                        time.monotonic() + self._status_check_intvl)
+
+    def _get_driver_semaphore(self, driver):
+        limit = cfg.CONF.monitor.driver_concurrency.get(driver)
+        if not limit:
+            return None
+        with self._lock:
+            if driver not in VNFMonitor._driver_semaphores:
+                VNFMonitor._driver_semaphores[driver] = \
+                    eventlet.semaphore.Semaphore(int(limit))
+            return VNFMonitor._driver_semaphores[driver]
 
     @staticmethod
     def to_hosting_vnf(vnf_dict, action_cb):
@@ -124,6 +205,8 @@ class VNFMonitor(object):
         new_vnf['boot_at'] = timeutils.utcnow()
         with self._lock:
             VNFMonitor._hosting_vnfs[new_vnf['id']] = new_vnf
+            self._schedule_vnf(new_vnf['id'],
+                               time.monotonic() + self._status_check_intvl)
 
         attrib_dict = new_vnf['vnf']['attributes']
         mon_policy_dict = attrib_dict['monitoring_policy']
@@ -137,10 +220,11 @@ class VNFMonitor(object):
         LOG.debug('deleting vnf_id %(vnf_id)s', {'vnf_id': vnf_id})
         with self._lock:
             hosting_vnf = VNFMonitor._hosting_vnfs.pop(vnf_id, None)
-            if hosting_vnf:
-                LOG.debug('deleting vnf_id %(vnf_id)s, Mgmt IP %(ips)s',
-                          {'vnf_id': vnf_id,
-                           'ips': hosting_vnf['mgmt_ip_addresses']})
+            VNFMonitor._due.pop(vnf_id, None)
+        if hosting_vnf:
+            LOG.debug('deleting vnf_id %(vnf_id)s, Mgmt IP %(ips)s',
+                      {'vnf_id': vnf_id,
+                       'ips': hosting_vnf['mgmt_ip_addresses']})
 
     def update_hosting_vnf(self, updated_vnf_dict, evt_details=None):
         with self._lock:
@@ -152,11 +236,11 @@ class VNFMonitor(object):
                 vnf_to_update['mgmt_ip_addresses'] = jsonutils.loads(
                     updated_vnf_dict['mgmt_ip_address'])
 
-                if evt_details is not None:
-                    vnfm_utils.log_events(t_context.get_admin_context(),
-                                          vnf_to_update['vnf'],
-                                          constants.RES_EVT_HEAL,
-                                          evt_details=evt_details)
+        if vnf_to_update and evt_details is not None:
+            vnfm_utils.log_events(t_context.get_admin_context(),
+                                  vnf_to_update['vnf'],
+                                  constants.RES_EVT_HEAL,
+                                  evt_details=evt_details)
 
     def run_monitor(self, hosting_vnf):
         mgmt_ips = hosting_vnf['mgmt_ip_addresses']
@@ -183,9 +267,16 @@ class VNFMonitor(object):
                 actions = policy[driver].get('actions', {})
                 params['mgmt_ip'] = mgmt_ips[vdu]
 
-                driver_return = self.monitor_call(driver,
-                                                  hosting_vnf['vnf'],
-                                                  params)
+                semaphore = self._get_driver_semaphore(driver)
+                if semaphore is None:
+                    driver_return = self.monitor_call(driver,
+                                                      hosting_vnf['vnf'],
+                                                      params)
+                else:
+                    with semaphore:
+                        driver_return = self.monitor_call(driver,
+                                                          hosting_vnf['vnf'],
+                                                          params)
 
                 LOG.debug('driver_return %s', driver_return)
 
@@ -12,9 +12,15 @@
 #    under the License.
 #
 
+import bisect
+import random
+import threading
+import time
+
+import eventlet
 import netaddr
-from urllib import error as urlerr
-from urllib import request as urlreq
+import requests
+from requests import adapters
 
 from oslo_config import cfg
 from oslo_log import log as logging
@@ -31,7 +37,23 @@ OPTS = [
     cfg.IntOpt('timeout', default=1,
                help=_('Number of seconds to wait for a response')),
     cfg.IntOpt('port', default=80,
-               help=_('HTTP port number to send request'))
+               help=_('HTTP port number to send request')),
+    cfg.StrOpt('method', default='GET', choices=['GET', 'HEAD'],
+               help=_('HTTP method of the requests')),
+    cfg.StrOpt('path', default='/',
+               help=_('Path of the URL to send request')),
+    cfg.ListOpt('expected_status', default=['200-399'],
+                help=_('HTTP status codes, or ranges of status codes like '
+                       '200-299, of a reachable VNF')),
+    cfg.FloatOpt('jitter', default=0, min=0,
+                 help=_('Maximum number of seconds to randomly wait before '
+                        'each request, to spread the requests of VNFs '
+                        'monitored at the same time')),
+    cfg.IntOpt('pool_hosts', default=1000, min=1,
+               help=_('Number of VNF hosts whose connections are kept '
+                      'alive for the next requests')),
+    cfg.IntOpt('pool_maxsize', default=2, min=1,
+               help=_('Number of connections kept alive per VNF host')),
 ]
 cfg.CONF.register_opts(OPTS, 'monitor_http_ping')
 
@@ -40,6 +62,99 @@ def config_opts():
     return [('monitor_http_ping', OPTS)]
 
 
+def _parse_status(expected_status):
+    """Return the (low, high) ranges of a list like ['200', '300-399']."""
+    ranges = []
+    for status in expected_status:
+        low, _sep, high = str(status).partition('-')
+        ranges.append((int(low), int(high or low)))
+    return ranges
+
+
+class HTTPProber(object):
+    """Sends the HTTP probes of all VNFs through a keep-alive pool.
+
+    The connections to each VNF host are kept in a connection pool shared
+    by the probes, which may run concurrently, so a VNF is not reconnected
+    for every probe. The latency of the probes is accounted in a histogram.
+    """
+
+    # Upper bounds of the latency histogram buckets, in milliseconds.
+    LATENCY_BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+    STATS_LOG_INTERVAL = 1000
+
+    def __init__(self):
+        self._session = None
+        self._lock = threading.Lock()
+        self._histogram = [0] * (len(self.LATENCY_BUCKETS) + 1)
+        self._probes = 0
+        self._failures = 0
+
+    @property
+    def session(self):
+        with self._lock:
+            if self._session is None:
+                session = requests.Session()
+                adapter = adapters.HTTPAdapter(
+                    pool_connections=cfg.CONF.monitor_http_ping.pool_hosts,
+                    pool_maxsize=cfg.CONF.monitor_http_ping.pool_maxsize,
+                    max_retries=0)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self._session = session
+            return self._session
+
+    def probe(self, url, method, timeout, expected_status):
+        """Send a request and check its status.
+
+        :return: bool - True if the response status is expected.
+        """
+        jitter = cfg.CONF.monitor_http_ping.jitter
+        if jitter:
+            eventlet.sleep(random.uniform(0, jitter))
+
+        start = time.monotonic()
+        try:
+            resp = self.session.request(method, url, timeout=timeout)
+        except requests.RequestException as e:
+            LOG.warning('Unable to reach to the url %(url)s: %(error)s',
+                        {'url': url, 'error': e})
+            self._account(None)
+            return False
+        self._account(time.monotonic() - start)
+
+        if not any(low <= resp.status_code <= high
+                   for low, high in _parse_status(expected_status)):
+            LOG.warning('Unexpected status %(status)s from the url %(url)s',
+                        {'status': resp.status_code, 'url': url})
+            return False
+        return True
+
+    def _account(self, latency):
+        with self._lock:
+            self._probes += 1
+            if latency is None:
+                self._failures += 1
+            else:
+                self._histogram[bisect.bisect_left(
+                    self.LATENCY_BUCKETS, latency * 1000)] += 1
+            if self._probes % self.STATS_LOG_INTERVAL:
+                return
+        LOG.debug('HTTP ping stats: %s', self.get_stats())
+
+    def get_stats(self):
+        """Return the number of probes and their latency histogram."""
+        with self._lock:
+            labels = ['<=%dms' % bound for bound in self.LATENCY_BUCKETS]
+            labels.append('>%dms' % self.LATENCY_BUCKETS[-1])
+            return {'probes': self._probes,
+                    'failures': self._failures,
+                    'latency': dict(zip(labels, self._histogram))}
+
+
+PROBER = HTTPProber()
+
+
 class VNFMonitorHTTPPing(abstract_driver.VNFMonitorAbstractDriver):
     def get_type(self):
         return 'http_ping'
@@ -54,28 +169,36 @@ class VNFMonitorHTTPPing(abstract_driver.VNFMonitorAbstractDriver):
         LOG.debug('monitor_url %s', vnf)
         return vnf.get('monitor_url', '')
 
-    def _is_pingable(self, mgmt_ip='', retry=5, timeout=5, port=80, **kwargs):
-        """Checks whether the server is reachable by using urllib.
+    def _is_pingable(self, mgmt_ip='', retry=5, timeout=5, port=80,
+                     method=None, path=None, expected_status=None,
+                     **kwargs):
+        """Checks whether the server is reachable by sending HTTP requests.
 
-        Waits for connectivity for `timeout` seconds,
-        and if connection refused, it will retry `retry`
-        times.
+        Waits for a response for `timeout` seconds, and if the connection
+        fails or the response status is not expected, it will retry
+        `retry` times.
         :param mgmt_ip: IP to check
         :param retry: times to reconnect if connection refused
         :param timeout: seconds to wait for connection
         :param port: port number to check connectivity
+        :param method: HTTP method, GET or HEAD
+        :param path: path of the URL to request
+        :param expected_status: status codes or ranges of a reachable VNF
         :return: bool - True or False depending on pingability.
         """
         url = 'http://' + mgmt_ip + ':' + str(port)
         if netaddr.valid_ipv6(mgmt_ip):
             url = 'http://[' + mgmt_ip + ']:' + str(port)
+        url += '/' + (path or cfg.CONF.monitor_http_ping.path).lstrip('/')
+        method = method or cfg.CONF.monitor_http_ping.method
+        if not expected_status:
+            expected_status = cfg.CONF.monitor_http_ping.expected_status
+        elif not isinstance(expected_status, list):
+            expected_status = str(expected_status).split(',')
 
         for retry_index in range(int(retry)):
-            try:
-                urlreq.urlopen(url, timeout=timeout)
+            if PROBER.probe(url, method, timeout, expected_status):
                 return True
-            except urlerr.URLError:
-                LOG.warning('Unable to reach to the url %s', url)
         return 'failure'
 
     @log.log
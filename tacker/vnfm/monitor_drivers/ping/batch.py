@@ -0,0 +1,111 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+
+import collections
+import re
+import threading
+
+import eventlet
+from oslo_config import cfg
+from oslo_log import log as logging
+from oslo_utils import encodeutils
+
+from tacker.agent.linux import utils as linux_utils
+
+
+LOG = logging.getLogger(__name__)
+
+# Per target summary printed by "fping -q -c", e.g.
+# "192.168.120.2 : xmt/rcv/%loss = 5/5/0%, min/avg/max = 0.05/0.07/0.09"
+_SUMMARY_RE = re.compile(r'^(\S+)\s+:\s+xmt/rcv/%loss\s+=\s+(\d+)/(\d+)/')
+
+
+def parse_fping_output(output):
+    """Return the reachability of each target of a fping -q -c run.
+
+    A target is reachable if it answered at least one of the ICMP echo
+    requests, like for an exit status 0 of ping.
+    """
+    results = {}
+    for line in encodeutils.safe_decode(output or b'').splitlines():
+        match = _SUMMARY_RE.match(line.strip())
+        if match:
+            results[match.group(1)] = int(match.group(3)) > 0
+    return results
+
+
+class PingBatcher(object):
+    """Pings the addresses requested concurrently with a single fping.
+
+    Requests with the same count, timeout and interval made within
+    batch_window seconds of each other are checked by one fping process,
+    up to batch_size addresses per process. Each caller gets the result of
+    its own address.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (count, timeout, interval) => {mgmt_ip: [event, ...]}
+        self._pending = {}
+
+    def is_pingable(self, mgmt_ip, count, timeout, interval):
+        key = (count, timeout, interval)
+        result = eventlet.event.Event()
+        with self._lock:
+            batch = self._pending.get(key)
+            if batch is None:
+                batch = self._pending[key] = collections.defaultdict(list)
+                eventlet.spawn_after(cfg.CONF.monitor_ping.batch_window,
+                                     self._flush, key, batch)
+            batch[mgmt_ip].append(result)
+            if len(batch) >= cfg.CONF.monitor_ping.batch_size:
+                del self._pending[key]
+                eventlet.spawn_n(self._run, key, batch)
+        return result.wait()
+
+    def _flush(self, key, batch):
+        with self._lock:
+            if self._pending.get(key) is not batch:
+                # Already run once it was full.
+                return
+            del self._pending[key]
+        self._run(key, batch)
+
+    def _run(self, key, batch):
+        count, timeout, interval = key
+        try:
+            results = self._fping(list(batch), count, timeout, interval)
+        except Exception as e:
+            LOG.error("Failed to ping %(ips)s: %(error)s",
+                      {'ips': list(batch), 'error': e})
+            results = {}
+        for mgmt_ip, events in batch.items():
+            for event in events:
+                event.send(results.get(mgmt_ip, False))
+
+    @staticmethod
+    def _fping(mgmt_ips, count, timeout, interval):
+        fping_cmd = ['fping', '-q',
+                     '-c', count,
+                     '-t', int(float(timeout) * 1000),
+                     '-p', int(float(interval) * 1000)] + mgmt_ips
+        # NOTE: fping exits non-zero as soon as one of the targets is
+        # unreachable, the result of each target is in the summary.
+        _stdout, _stderr = linux_utils.execute(fping_cmd,
+                                               check_exit_code=False,
+                                               return_stderr=True)
+        return parse_fping_output(_stderr)
+
+
+BATCHER = PingBatcher()
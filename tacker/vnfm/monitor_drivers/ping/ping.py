@@ -21,6 +21,7 @@ from tacker._i18n import _
 from tacker.agent.linux import utils as linux_utils
 from tacker.common import log
 from tacker.vnfm.monitor_drivers import abstract_driver
+from tacker.vnfm.monitor_drivers.ping import batch
 
 
 LOG = logging.getLogger(__name__)
@@ -32,7 +33,18 @@ OPTS = [
     cfg.FloatOpt('interval', default=1,
                help=_('Number of seconds to wait between packets')),
     cfg.IntOpt('retry', default=1,
-               help=_('Number of ping retries'))
+               help=_('Number of ping retries')),
+    cfg.StrOpt('prober', default='ping', choices=['ping', 'fping'],
+               help=_('Command used to ping the management IP addresses. '
+                      'With fping, the addresses pinged concurrently are '
+                      'checked by a single fping process instead of one '
+                      'ping process each')),
+    cfg.FloatOpt('batch_window', default=0.1, min=0,
+                 help=_('Number of seconds to wait for other addresses to '
+                        'ping in the same fping process')),
+    cfg.IntOpt('batch_size', default=256, min=1,
+               help=_('Maximum number of addresses pinged by a single '
+                      'fping process')),
 ]
 cfg.CONF.register_opts(OPTS, 'monitor_ping')
 
@@ -62,6 +74,8 @@ class VNFMonitorPing(abstract_driver.VNFMonitorAbstractDriver):
         Use linux utils to execute the ping (ICMP ECHO) command.
         Sends 5 packets with an interval of 1 seconds and timeout of 1
         seconds. Runtime error implies unreachability else IP is pingable.
+        With the fping prober, the IP is pinged in a batch together with
+        the other IPs being monitored at the same time.
         :param ip: IP to check
         :return: bool - True or string 'failure' depending on pingability.
         """
@@ -78,6 +92,14 @@ class VNFMonitorPing(abstract_driver.VNFMonitorAbstractDriver):
         if not retry:
             retry = cfg.CONF.monitor_ping.retry
 
+        if cfg.CONF.monitor_ping.prober == 'fping':
+            for retry_range in range(int(retry)):
+                if batch.BATCHER.is_pingable(mgmt_ip, count, timeout,
+                                             interval):
+                    return True
+                LOG.warning("Cannot ping ip address: %s", mgmt_ip)
+            return 'failure'
+
         ping_cmd = [cmd_ping,
                     '-c', count,
                     '-W', timeout,
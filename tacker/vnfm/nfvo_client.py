@@ -10,18 +10,29 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import copy
 import io
 import os
 import requests
+import shutil
+import struct
 from tacker import auth
+import tempfile
 import time
 import zipfile
 
+import eventlet
 from oslo_config import cfg
 from oslo_log import log as logging
+from oslo_utils import fileutils
 
 LOG = logging.getLogger(__name__)
 
+# Bytes read and written at once when streaming the VNF package contents
+CHUNK_SIZE = 65536
+# Size of the fixed part of the local file header of a zip member
+_ZIP_LOCAL_HEADER_SIZE = 30
+
 
 class UndefinedExternalSettingException(Exception):
     pass
@@ -31,6 +42,45 @@ class FaliedDownloadContentException(Exception):
     pass
 
 
+def _copy_zip_member(src_zip, info, dest_zip):
+    """Copy a member of a zip file to another one, still compressed.
+
+    The member data is copied as is, so it is neither decompressed nor
+    compressed again.
+    """
+    src_zip.fp.seek(info.header_offset)
+    header = src_zip.fp.read(_ZIP_LOCAL_HEADER_SIZE)
+    name_length, extra_length = struct.unpack('<HH', header[26:30])
+    src_zip.fp.seek(
+        info.header_offset + _ZIP_LOCAL_HEADER_SIZE + name_length +
+        extra_length)
+
+    dest_info = copy.copy(info)
+    # The sizes and CRC are known, they are written in the local header
+    # rather than in a data descriptor after the data. The extra fields
+    # may hold the zip64 sizes of the source, which are written again if
+    # needed.
+    dest_info.flag_bits &= ~0x08
+    dest_info.extra = b''
+    dest_info.header_offset = dest_zip.fp.tell()
+    dest_zip.fp.write(dest_info.FileHeader())
+    remaining = info.compress_size
+    while remaining:
+        chunk = src_zip.fp.read(min(CHUNK_SIZE, remaining))
+        if not chunk:
+            raise FaliedDownloadContentException(
+                "Truncated zip member {}".format(info.filename))
+        dest_zip.fp.write(chunk)
+        remaining -= len(chunk)
+
+    # NOTE: Registered like ZipFile.write does, so that the member is in the
+    # central directory written by ZipFile.close.
+    dest_zip.filelist.append(dest_info)
+    dest_zip.NameToInfo[dest_info.filename] = dest_info
+    dest_zip.start_dir = dest_zip.fp.tell()
+    dest_zip._didModify = True
+
+
 class _Connect:
 
     def __init__(self, retry_num=0, retry_wait=0, timeout=0):
@@ -98,7 +148,18 @@ class VnfPackageRequest:
                    help="Number of vnf_packages retry wait"),
         cfg.IntOpt('timeout',
                    default=20,
-                   help="Number of vnf_packages connect timeout")
+                   help="Number of vnf_packages connect timeout"),
+        cfg.BoolOpt('stream_download',
+                    default=False,
+                    help="Download the package content, VNFD and artifacts "
+                         "of vnf_packages concurrently, spooling them to "
+                         "files in vnf_package_csar_path rather than "
+                         "keeping them in memory"),
+        cfg.IntOpt('download_workers',
+                   default=4,
+                   min=1,
+                   help="Number of vnf_packages contents downloaded "
+                        "concurrently with stream_download")
     ]
     cfg.CONF.register_opts(OPTS, group='connect_vnf_packages')
     _connector = _Connect(
@@ -118,6 +179,16 @@ class VnfPackageRequest:
             raise UndefinedExternalSettingException(
                 "Vnf package the external setting to 'base_url' undefined.")
 
+    @staticmethod
+    def _get_filename(response):
+        content_disposition = response.headers.get('Content-Disposition')
+        if not content_disposition:
+            return None
+
+        attribute = 'filename='
+        return content_disposition[content_disposition.find(
+            attribute) + len(attribute):]
+
     @classmethod
     def _write(cls, vnf_package_zip, response, filename=None):
         def write_zip():
@@ -126,20 +197,11 @@ class VnfPackageRequest:
                     vnf_package_zip.writestr(
                         info.filename, fin.read(info.filename))
 
-        def get_filename():
-            content_disposition = response.headers.get('Content-Disposition')
-            if not content_disposition:
-                return None
-
-            attribute = 'filename='
-            return content_disposition[content_disposition.find(
-                attribute) + len(attribute):]
-
         if response.headers.get('Content-Type') == 'application/zip':
             write_zip()
             return
 
-        filename = get_filename() if (not filename) else filename
+        filename = cls._get_filename(response) if (not filename) else filename
         if filename:
             vnf_package_zip.writestr(filename, response.content)
             return
@@ -157,7 +219,8 @@ class VnfPackageRequest:
             artifact_paths (list, optional): artifatcs paths. Defaults to [].
 
         Returns:
-            io.BytesIO: zip archive for vnf packages content.
+            io.BytesIO: zip archive for vnf packages content. With
+                stream_download, a temporary file removed once closed.
 
         Raises:
             takcer.nfvo.nfvo_client.UndefinedExternalSettingException:
@@ -176,6 +239,9 @@ class VnfPackageRequest:
         if artifact_paths is None:
             artifact_paths = []
 
+        if cfg.CONF.connect_vnf_packages.stream_download:
+            return cls._stream_vnf_packages(vnf_package_id, artifact_paths)
+
         def download_vnf_package(pipeline_type, vnf_package_zip):
             if pipeline_type == 'package_content':
                 cls._download_package_content(vnf_package_zip, vnf_package_id)
@@ -200,6 +266,111 @@ class VnfPackageRequest:
             zip_buffer.seek(0)
         return zip_buffer
 
+    @classmethod
+    def _stream_vnf_packages(cls, vnf_package_id, artifact_paths):
+        """Download the vnf packages contents concurrently to files.
+
+        Each content is spooled to a temporary file, then they are written
+        to the zip archive in the order of the pipeline. The members of the
+        zip contents are copied without being compressed again.
+        """
+        downloads = []
+        for pipeline_type in cfg.CONF.connect_vnf_packages.pipeline:
+            if pipeline_type in ('package_content', 'vnfd'):
+                downloads.append((cls._connector.replace_placeholder_url(
+                    cfg.CONF.connect_vnf_packages.base_url,
+                    "{}/" + pipeline_type,
+                    vnf_package_id), None))
+            elif pipeline_type == 'artifacts':
+                downloads.extend((cls._connector.replace_placeholder_url(
+                    cfg.CONF.connect_vnf_packages.base_url,
+                    "{}/artifacts/{}",
+                    vnf_package_id,
+                    artifact_path), artifact_path)
+                    for artifact_path in artifact_paths)
+            else:
+                raise UndefinedExternalSettingException(
+                    "Vnf package the external setting to 'pipeline=<{}>'"
+                    " not supported.".format(pipeline_type))
+
+        spool_dir = cfg.CONF.vnf_package.vnf_package_csar_path
+        fileutils.ensure_tree(spool_dir)
+        pool = eventlet.GreenPool(
+            cfg.CONF.connect_vnf_packages.download_workers)
+        threads = [pool.spawn(cls._spool, request_url, filename, spool_dir)
+                   for request_url, filename in downloads]
+        spools = []
+        error = None
+        for thread in threads:
+            try:
+                spools.append(thread.wait())
+            except Exception as e:
+                error = error or e
+
+        vnf_package_file = None
+        try:
+            if error is not None:
+                raise error
+            vnf_package_file = tempfile.TemporaryFile(dir=spool_dir)
+            with zipfile.ZipFile(vnf_package_file,
+                                 mode='w',
+                                 compression=zipfile.ZIP_DEFLATED
+                                 ) as vnf_package_zip:
+                for spool, is_zip, filename in spools:
+                    cls._write_spool(vnf_package_zip, spool, is_zip,
+                                     filename)
+            vnf_package_file.seek(0)
+        except Exception:
+            if vnf_package_file is not None:
+                vnf_package_file.close()
+            raise
+        finally:
+            for spool, _is_zip, _filename in spools:
+                spool.close()
+        return vnf_package_file
+
+    @classmethod
+    def _spool(cls, request_url, filename, spool_dir):
+        LOG.info("Processing: download vnf_package from %s.", request_url)
+        headers = {'Accept': 'application/zip'}
+        response = cls._connector.request(
+            'GET', request_url, headers=headers, stream=True)
+        with response:
+            is_zip = response.headers.get('Content-Type') == 'application/zip'
+            filename = filename or cls._get_filename(response)
+            if not is_zip and not filename:
+                raise FaliedDownloadContentException(
+                    "Failed response content, url={}".format(request_url))
+
+            spool = tempfile.TemporaryFile(dir=spool_dir)
+            try:
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    spool.write(chunk)
+                spool.seek(0)
+            except Exception:
+                spool.close()
+                raise
+        return spool, is_zip, filename
+
+    @classmethod
+    def _write_spool(cls, vnf_package_zip, spool, is_zip, filename):
+        if is_zip:
+            with zipfile.ZipFile(spool) as fin:
+                for info in fin.infolist():
+                    _copy_zip_member(fin, info, vnf_package_zip)
+            return
+
+        size = os.fstat(spool.fileno()).st_size
+        info = zipfile.ZipInfo(filename,
+                               date_time=time.localtime(time.time())[:6])
+        info.compress_type = vnf_package_zip.compression
+        info.external_attr = 0o600 << 16
+        info.file_size = size
+        with vnf_package_zip.open(
+                info, mode='w',
+                force_zip64=size > zipfile.ZIP64_LIMIT) as fout:
+            shutil.copyfileobj(spool, fout, CHUNK_SIZE)
+
     @classmethod
     def _download_package_content(cls, vnf_package_zip, vnf_package_id):
         LOG.info("Processing: download vnf_package to package content.")